@@ -4,18 +4,27 @@ Simple, elegant UI with solid colors and Font Awesome icons
 """
 
 import streamlit as st
+import contextvars
+import queue
 import sys
 from pathlib import Path
 from datetime import datetime
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config.settings import settings
-from src.agent import create_research_agent, AgentState
+from src.agent import estimate_research, refresh_research, run_research
 from src.utils.cost_tracker import CostTracker
+from src.utils.events import listen
 from src.utils.logger import get_logger
+from src.utils.scheduling import INTERACTIVE, request_context
+from src.storage import HistoryRecord, HistoryStore
+from src.ui import RunProgress, load_stylesheet, render_report, report_hash
 
 # Page config
 st.set_page_config(
@@ -25,339 +34,98 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Premium Theme with #2e79a7
-st.markdown("""
-<style>
-    /* Import Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    * {
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-    }
-    
-    /* Premium Dark Background with Texture */
-    .stApp {
-        background: linear-gradient(135deg, #0a0e27 0%, #0f1629 100%);
-        background-attachment: fixed;
-    }
-    
-    .stApp::before {
-        content: '';
-        position: fixed;
-        top: 0;
-        left: 0;
-        right: 0;
-        bottom: 0;
-        background-image: 
-            radial-gradient(circle at 20% 30%, rgba(46, 121, 167, 0.08) 0%, transparent 50%),
-            radial-gradient(circle at 80% 70%, rgba(46, 121, 167, 0.05) 0%, transparent 50%);
-        pointer-events: none;
-        z-index: 0;
-    }
-    
-    /* Reduce top spacing */
-    .block-container {
-        padding-top: 3rem !important;
-        padding-bottom: 3rem !important;
-        max-width: 1400px;
-    }
-    
-    /* Premium Header */
-    .main-header {
-        font-size: 3rem;
-        font-weight: 700;
-        color: #ffffff;
-        margin: 0;
-        letter-spacing: -0.02em;
-        text-shadow: 0 2px 10px rgba(46, 121, 167, 0.3);
-    }
-    
-    .subtitle {
-        font-size: 1.1rem;
-        color: rgba(255, 255, 255, 0.65);
-        margin-bottom: 3rem;
-        font-weight: 400;
-        letter-spacing: 0.02em;
-    }
-    
-    /* Premium Glass Cards */
-    .glass-card {
-        background: rgba(255, 255, 255, 0.04);
-        backdrop-filter: blur(20px);
-        -webkit-backdrop-filter: blur(20px);
-        border-radius: 16px;
-        border: 1px solid rgba(46, 121, 167, 0.15);
-        padding: 2rem;
-        box-shadow: 
-            0 8px 32px 0 rgba(0, 0, 0, 0.4),
-            inset 0 1px 0 0 rgba(255, 255, 255, 0.05);
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-    }
-    
-    .glass-card:hover {
-        transform: translateY(-2px);
-        border-color: rgba(46, 121, 167, 0.3);
-        box-shadow: 
-            0 12px 48px 0 rgba(46, 121, 167, 0.15),
-            inset 0 1px 0 0 rgba(255, 255, 255, 0.1);
-    }
-    
-    /* Premium Input Styling */
-    .stTextArea textarea {
-        background: rgba(255, 255, 255, 0.04) !important;
-        border: 1.5px solid rgba(46, 121, 167, 0.25) !important;
-        border-radius: 12px !important;
-        color: white !important;
-        font-size: 1rem !important;
-        padding: 1.25rem !important;
-        transition: all 0.3s ease !important;
-        box-shadow: inset 0 2px 4px rgba(0, 0, 0, 0.1) !important;
-    }
-    
-    .stTextArea textarea:focus {
-        border-color: #2e79a7 !important;
-        box-shadow: 
-            0 0 0 3px rgba(46, 121, 167, 0.15) !important,
-            inset 0 2px 4px rgba(0, 0, 0, 0.1) !important;
-        background: rgba(255, 255, 255, 0.06) !important;
-    }
-    
-    .stTextArea textarea::placeholder {
-        color: rgba(255, 255, 255, 0.35) !important;
-    }
-    
-    /* Premium Primary Button */
-    .stButton>button[kind="primary"] {
-        background: linear-gradient(135deg, #2e79a7 0%, #1e5c7a 100%);
-        color: white;
-        font-weight: 600;
-        border: none;
-        padding: 0.875rem 2.5rem;
-        border-radius: 10px;
-        font-size: 1.05rem;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        box-shadow: 
-            0 4px 14px rgba(46, 121, 167, 0.4),
-            inset 0 1px 0 rgba(255, 255, 255, 0.1);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .stButton>button[kind="primary"]::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(255,255,255,0.1), transparent);
-        transition: left 0.5s;
-    }
-    
-    .stButton>button[kind="primary"]:hover::before {
-        left: 100%;
-    }
-    
-    .stButton>button[kind="primary"]:hover {
-        transform: translateY(-2px);
-        box-shadow: 
-            0 6px 20px rgba(46, 121, 167, 0.5),
-            inset 0 1px 0 rgba(255, 255, 255, 0.2);
-        background: linear-gradient(135deg, #3589b8 0%, #2e79a7 100%);
-    }
-    
-    .stButton>button[kind="primary"]:active {
-        transform: translateY(0);
-    }
-    
-    /* Example Buttons - Premium Style */
-    div[data-testid="column"] .stButton>button {
-        background: rgba(46, 121, 167, 0.08);
-        border: 1px solid rgba(46, 121, 167, 0.25);
-        color: rgba(255, 255, 255, 0.9);
-        padding: 0.75rem 1.25rem;
-        font-size: 0.95rem;
-        border-radius: 10px;
-        font-weight: 500;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        box-shadow: inset 0 1px 0 rgba(255, 255, 255, 0.05);
-    }
-    
-    div[data-testid="column"] .stButton>button:hover {
-        background: rgba(46, 121, 167, 0.15);
-        border-color: rgba(46, 121, 167, 0.4);
-        transform: translateX(4px);
-        box-shadow: 
-            0 4px 12px rgba(46, 121, 167, 0.2),
-            inset 0 1px 0 rgba(255, 255, 255, 0.1);
-    }
-    
-    /* Sidebar - Premium Dark */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, rgba(10, 14, 35, 0.98) 0%, rgba(15, 22, 41, 0.98) 100%);
-        backdrop-filter: blur(20px);
-        border-right: 1px solid rgba(46, 121, 167, 0.15);
-        box-shadow: 2px 0 30px rgba(0, 0, 0, 0.3);
-    }
-    
-    /* Sidebar Text */
-    [data-testid="stSidebar"] h2,
-    [data-testid="stSidebar"] h3,
-    [data-testid="stSidebar"] h4 {
-        color: rgba(255, 255, 255, 0.95);
-        font-weight: 600;
-    }
-    
-    [data-testid="stSidebar"] p,
-    [data-testid="stSidebar"] span,
-    [data-testid="stSidebar"] div {
-        color: rgba(255, 255, 255, 0.8);
-    }
-    
-    /* Premium Metrics */
-    [data-testid="stMetricValue"] {
-        color: #2e79a7;
-        font-size: 1.75rem;
-        font-weight: 700;
-        text-shadow: 0 2px 8px rgba(46, 121, 167, 0.3);
-    }
-    
-    [data-testid="stMetricLabel"] {
-        color: rgba(255, 255, 255, 0.7);
-        font-weight: 500;
-        font-size: 0.9rem;
-    }
-    
-    /* Premium Progress Bar */
-    .stProgress > div > div > div > div {
-        background: linear-gradient(90deg, #2e79a7 0%, #1e5c7a 100%);
-        border-radius: 10px;
-        box-shadow: 0 2px 8px rgba(46, 121, 167, 0.4);
-    }
-    
-    .stProgress > div > div > div {
-        background: rgba(46, 121, 167, 0.1);
-        border-radius: 10px;
-    }
-    
-    /* Premium Expander */
-    .streamlit-expanderHeader {
-        background: rgba(46, 121, 167, 0.08);
-        border-radius: 10px;
-        color: white;
-        font-weight: 600;
-        border: 1px solid rgba(46, 121, 167, 0.2);
-        transition: all 0.3s ease;
-    }
-    
-    .streamlit-expanderHeader:hover {
-        background: rgba(46, 121, 167, 0.12);
-        border-color: rgba(46, 121, 167, 0.3);
-    }
-    
-    .streamlit-expanderContent {
-        background: rgba(255, 255, 255, 0.02);
-        border-radius: 0 0 10px 10px;
-        border: 1px solid rgba(46, 121, 167, 0.1);
-        border-top: none;
-    }
-    
-    /* Result Card - Premium */
-    .result-card {
-        background: rgba(255, 255, 255, 0.04);
-        backdrop-filter: blur(20px);
-        padding: 2rem;
-        border-radius: 16px;
-        border: 1px solid rgba(46, 121, 167, 0.2);
-        margin: 1.5rem 0;
-        box-shadow: 
-            0 8px 32px rgba(0, 0, 0, 0.3),
-            inset 0 1px 0 rgba(255, 255, 255, 0.05);
-        color: rgba(255, 255, 255, 0.9);
-        line-height: 1.8;
-    }
-    
-    /* Download Button */
-    .stDownloadButton>button {
-        background: rgba(16, 185, 129, 0.15);
-        border: 1px solid rgba(16, 185, 129, 0.3);
-        color: #10b981;
-        border-radius: 10px;
-        padding: 0.75rem 1.75rem;
-        font-weight: 600;
-        transition: all 0.3s ease;
-    }
-    
-    .stDownloadButton>button:hover {
-        background: rgba(16, 185, 129, 0.25);
-        border-color: rgba(16, 185, 129, 0.5);
-        transform: translateY(-2px);
-        box-shadow: 0 6px 20px rgba(16, 185, 129, 0.3);
-    }
-    
-    /* Premium Slider */
-    .stSlider > div > div > div {
-        background: rgba(46, 121, 167, 0.15);
-    }
-    
-    .stSlider > div > div > div > div {
-        background: #2e79a7;
-        box-shadow: 0 2px 8px rgba(46, 121, 167, 0.4);
-    }
-    
-    /* Premium Divider */
-    hr {
-        border: none;
-        height: 1px;
-        background: linear-gradient(90deg, 
-            transparent, 
-            rgba(46, 121, 167, 0.3), 
-            transparent
-        );
-        margin: 2rem 0;
-    }
-    
-    /* Text Colors */
-    p, span, div, label {
-        color: rgba(255, 255, 255, 0.9);
-    }
-    
-    h1, h2, h3, h4, h5, h6 {
-        color: white;
-        font-weight: 600;
-    }
-    
-    /* Hide Streamlit Branding */
-    #MainMenu, footer, header {
-        visibility: hidden;
-    }
-    
-    /* Scrollbar */
-    ::-webkit-scrollbar {
-        width: 8px;
-        height: 8px;
-    }
-    
-    ::-webkit-scrollbar-track {
-        background: rgba(255, 255, 255, 0.02);
-    }
-    
-    ::-webkit-scrollbar-thumb {
-        background: rgba(46, 121, 167, 0.3);
-        border-radius: 4px;
-    }
-    
-    ::-webkit-scrollbar-thumb:hover {
-        background: rgba(46, 121, 167, 0.5);
-    }
-</style>
-""", unsafe_allow_html=True)
+# Premium Theme with #2e79a7, read and minified once per server process
+st.markdown(load_stylesheet(), unsafe_allow_html=True)
+
+@st.cache_resource
+def get_history_store() -> HistoryStore:
+    """Shared history store, opened once per server process."""
+    return HistoryStore(settings.history_db_path)
+
+
+history_store = get_history_store()
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def rendered_report(digest: str, _report: str) -> Optional[str]:
+    """Report HTML memoized by content hash, so reruns skip rendering."""
+    return render_report(_report)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_history_record(record_id: int) -> Optional[HistoryRecord]:
+    """Full history record, read once when it is first opened."""
+    return history_store.get(record_id)
+
+
+def run_with_progress(fn, progress_bar, status_text, preview):
+    """
+    Run fn in a worker thread, showing its progress events as they arrive.
+    
+    Streamlit elements can only be updated from the script thread, so
+    events are queued by the run and drained here, a batch at a time.
+    
+    Returns:
+        fn's return value
+    """
+    events: queue.Queue = queue.Queue()
+    progress = RunProgress()
+    
+    def research():
+        with listen(events.put):
+            return fn()
+    
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(contextvars.copy_context().run, research)
+        while True:
+            try:
+                batch = [events.get(timeout=0.1)]
+            except queue.Empty:
+                if future.done():
+                    break
+                continue
+            while not events.empty():
+                batch.append(events.get_nowait())
+            for event in batch:
+                fraction, status = progress.update(event)
+            progress_bar.progress(fraction)
+            status_text.text(status)
+            if progress.draft:
+                preview.markdown(progress.draft)
+            else:
+                # A discarded speculative draft must not stay on screen
+                preview.empty()
+        preview.empty()
+        return future.result()
+
+
+def show_report(report: str) -> None:
+    """Display a report card from its cached HTML."""
+    html = rendered_report(report_hash(report), report)
+    if html is None:
+        # markdown package not installed; let Streamlit render it
+        st.markdown(report)
+    else:
+        st.markdown(f'<div class="result-card">{html}</div>', unsafe_allow_html=True)
+
+
+def reset_history_page() -> None:
+    """Jump back to the first page when the history search changes."""
+    st.session_state.history_page = 1
+
 
 # Session state
-if 'history' not in st.session_state:
-    st.session_state.history = []
 if 'current_query' not in st.session_state:
     st.session_state.current_query = ""
+if 'history_page' not in st.session_state:
+    st.session_state.history_page = 1
+if 'refresh_id' not in st.session_state:
+    st.session_state.refresh_id = None
+if 'open_history_id' not in st.session_state:
+    st.session_state.open_history_id = None
+if 'tenant' not in st.session_state:
+    # Each browser session is its own tenant for fair scheduling
+    st.session_state.tenant = uuid.uuid4().hex[:12]
 
 # Header - Clean design
 st.markdown('<div style="display: flex; align-items: center; gap: 1rem;"><span style="font-size: 2.5rem;">🔬</span><h1 class="main-header">Deep Research Agent</h1></div>', unsafe_allow_html=True)
@@ -439,6 +207,11 @@ with st.sidebar:
         value=settings.max_search_results,
         help="Number of results to gather per search"
     )
+    multi_hop = st.toggle(
+        "Multi-hop Research",
+        value=settings.research_mode == "multi_hop",
+        help="Split the question into sub-questions researched in parallel"
+    )
     
     # Divider
     st.markdown("<div style='height: 1px; background: rgba(102, 126, 234, 0.2); margin: 1.5rem 0;'></div>", unsafe_allow_html=True)
@@ -473,26 +246,24 @@ with st.sidebar:
     </div>
     """, unsafe_allow_html=True)
     
-    # Session Statistics (if any history)
-    if st.session_state.history:
+    # History Statistics (if any history)
+    history_stats = history_store.stats()
+    if history_stats['queries']:
         st.markdown("<div style='height: 1px; background: rgba(102, 126, 234, 0.2); margin: 1.5rem 0;'></div>", unsafe_allow_html=True)
         
         st.markdown("""
         <div style='margin: 1.5rem 0 1rem 0;'>
             <div style='font-size: 0.9rem; font-weight: 600; color: rgba(255,255,255,0.7); margin-bottom: 0.75rem; text-transform: uppercase; letter-spacing: 0.05em;'>
-                📊 Session Analytics
+                📊 History Analytics
             </div>
         </div>
         """, unsafe_allow_html=True)
         
-        total_queries = len(st.session_state.history)
-        total_cost = sum(h.get('cost', 0) for h in st.session_state.history)
-        
         col1, col2 = st.columns(2)
         with col1:
-            st.metric("Queries", total_queries, delta=None)
+            st.metric("Queries", history_stats['queries'], delta=None)
         with col2:
-            st.metric("Total Cost", f"${total_cost:.4f}", delta=None)
+            st.metric("Total Cost", f"${history_stats['total_cost_usd']:.4f}", delta=None)
 
 # Main content
 col1, col2 = st.columns([2, 1])
@@ -505,6 +276,13 @@ with col1:
         placeholder="Example: What is the current stock price of NVIDIA and why is it moving today?",
         label_visibility="collapsed"
     )
+    if query.strip():
+        estimate = estimate_research(query.strip(), "multi_hop" if multi_hop else "iterative")
+        st.caption(
+            f"Estimated cost: up to ${estimate['cost_usd']:.4f} "
+            f"({estimate['search_calls']} searches, {estimate['llm_calls']} LLM calls, "
+            f"~{estimate['prompt_tokens'] + estimate['completion_tokens']:,} tokens)"
+        )
     research_button = st.button("🚀 Start Research", use_container_width=True, type="primary")
 
 with col2:
@@ -534,38 +312,45 @@ if research_button and query:
     
     progress_bar = st.progress(0)
     status_text = st.empty()
+    preview = st.empty()
     
     try:
-        status_text.text("⚙️ Initializing...")
-        progress_bar.progress(10)
+        status_text.text("⚙️ Waiting for a research slot...")
         
-        agent = create_research_agent(cost_tracker)
-        
-        status_text.text("🔍 Searching the web...")
-        progress_bar.progress(30)
-        
-        initial_state: AgentState = {
-            "task": query,
-            "search_results": [],
-            "attempts": 0,
-            "error": None,
-            "final_report": None
-        }
-        
-        result = agent.invoke(initial_state)
+        mode = "multi_hop" if multi_hop else "iterative"
+        with request_context(tenant=st.session_state.tenant, priority=INTERACTIVE):
+            if settings.use_job_queue:
+                # Queue the run for a worker node and wait for its report
+                from src.cluster import run_queued_research
+                
+                status_text.text("📤 Queued for a research worker...")
+                result = run_queued_research(query, mode)
+            else:
+                # Identical queries already running (e.g. a popular example) are
+                # joined instead of being researched again; live progress
+                # comes from the run's own events
+                result = run_with_progress(
+                    lambda: run_research(query, cost_tracker, mode),
+                    progress_bar,
+                    status_text,
+                    preview
+                )
         progress_bar.progress(100)
         status_text.text("✅ Complete!")
         
-        if result.get('error'):
-            st.error(f"❌ Error: {result['error']}")
+        if result.error:
+            st.error(f"❌ Error: {result.error}")
         else:
+            if result.shared:
+                st.info("♻️ Joined an identical research run already in progress")
+            
             st.divider()
             st.markdown("### Research Report", unsafe_allow_html=True)
-            st.markdown(f'<div class="result-card">{result.get("final_report", "")}</div>', unsafe_allow_html=True)
+            show_report(result.report)
             
             # Metrics
             st.divider()
-            summary = cost_tracker.get_summary()
+            summary = result.cost
             col1, col2, col3, col4 = st.columns(4)
             with col1:
                 st.metric("💰 Cost", f"${summary['total_cost_usd']:.4f}")
@@ -578,30 +363,131 @@ if research_button and query:
             
             st.download_button(
                 "📥 Download Report",
-                result.get("final_report", ""),
+                result.report,
                 file_name=f"research_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
                 mime="text/plain"
             )
             
-            st.session_state.history.append({
-                'timestamp': datetime.now().isoformat(),
-                'query': query,
-                'report': result.get("final_report", ""),
-                'cost': summary['total_cost_usd']
-            })
+            # The leader's session records the run; followers would duplicate it
+            if not result.shared:
+                history_store.add(HistoryRecord(
+                    query=query,
+                    report=result.report,
+                    sources=result.sources,
+                    cost=summary['total_cost_usd'],
+                    timings={"total_seconds": result.elapsed_seconds}
+                ))
+            st.session_state.history_page = 1
     
     except Exception as e:
         st.error(f"❌ Error: {str(e)}")
 
+# Refresh a previous report with only what changed since it was written
+if st.session_state.refresh_id is not None:
+    previous = history_store.get(st.session_state.refresh_id)
+    st.session_state.refresh_id = None
+    
+    if previous is not None:
+        cost_tracker = CostTracker()
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+        preview = st.empty()
+        
+        try:
+            status_text.text(f"🔄 Refreshing: {previous.query}")
+            with request_context(tenant=st.session_state.tenant, priority=INTERACTIVE):
+                result = run_with_progress(
+                    lambda: refresh_research(
+                        previous.query,
+                        previous.report,
+                        previous.sources,
+                        since=previous.timestamp,
+                        cost_tracker=cost_tracker
+                    ),
+                    progress_bar,
+                    status_text,
+                    preview
+                )
+            progress_bar.progress(100)
+            
+            if result.error:
+                st.error(f"❌ Error: {result.error}")
+            else:
+                summary = result.cost
+                st.success(
+                    f"✅ Refreshed with {len(result.sources)} new sources "
+                    f"(${summary['total_cost_usd']:.4f}, {summary['total_tokens']} tokens)"
+                )
+                # The leader's session records the refresh; followers would duplicate it
+                if not result.shared:
+                    history_store.add(HistoryRecord(
+                        query=previous.query,
+                        report=result.report,
+                        sources=previous.sources + result.sources,
+                        cost=summary['total_cost_usd'],
+                        timings={"total_seconds": result.elapsed_seconds}
+                    ))
+                st.session_state.history_page = 1
+        
+        except Exception as e:
+            st.error(f"❌ Error: {str(e)}")
+
 # History
-if st.session_state.history:
+if history_store.count():
     st.divider()
     st.markdown("### Research History", unsafe_allow_html=True)
     
-    for idx, item in enumerate(reversed(st.session_state.history[-5:])):
-        with st.expander(f"🔍 {item['query'][:60]}... | {item['timestamp'][:10]}"):
-            st.write(f"**Cost:** ${item['cost']:.4f}")
-            st.markdown(item['report'])
+    history_query = st.text_input(
+        "Search history",
+        placeholder="Search past queries and reports...",
+        label_visibility="collapsed",
+        key="history_query",
+        on_change=reset_history_page
+    )
+    page_size = settings.history_page_size
+    total_matches = history_store.count(history_query)
+    total_pages = max(1, -(-total_matches // page_size))
+    st.session_state.history_page = min(st.session_state.history_page, total_pages)
+    
+    # Rows carry no report text; only the open entry's report is loaded and rendered
+    for item in history_store.search(history_query, st.session_state.history_page, page_size, include_report=False):
+        is_open = st.session_state.open_history_id == item.id
+        label = f"{'▾' if is_open else '▸'} 🔍 {item.query[:60]}... | {item.timestamp[:10]}"
+        if st.button(label, key=f"history_{item.id}", use_container_width=True):
+            st.session_state.open_history_id = None if is_open else item.id
+            st.rerun()
+        if not is_open:
+            continue
+        
+        record = load_history_record(item.id)
+        if record is None:
+            continue
+        with st.container(border=True):
+            st.write(f"**Cost:** ${record.cost:.4f}")
+            if record.timings.get('total_seconds') is not None:
+                st.write(f"**Time:** {record.timings['total_seconds']}s")
+            show_report(record.report)
+            if record.sources:
+                st.markdown("**Sources:**\n" + "\n".join(f"- {url}" for url in record.sources))
+            if st.button("🔄 Refresh with new information", key=f"refresh_{record.id}"):
+                st.session_state.refresh_id = record.id
+                st.rerun()
+    
+    prev_col, page_col, next_col = st.columns([1, 2, 1])
+    with prev_col:
+        if st.button("← Newer", disabled=st.session_state.history_page <= 1, use_container_width=True):
+            st.session_state.history_page -= 1
+            st.rerun()
+    with page_col:
+        st.markdown(
+            f"<div style='text-align: center;'>Page {st.session_state.history_page} of {total_pages} "
+            f"({total_matches} reports)</div>",
+            unsafe_allow_html=True
+        )
+    with next_col:
+        if st.button("Older →", disabled=st.session_state.history_page >= total_pages, use_container_width=True):
+            st.session_state.history_page += 1
+            st.rerun()
 
 # Footer
 st.divider()
@@ -0,0 +1,127 @@
+"""
+Embedding throughput on CPU, in embeddings per second.
+
+Texts are synthetic snippets of three sentences drawn from the recorded
+results in the evaluation corpus. Scenarios:
+
+    one at a time     embedder called once per text
+    batched           embedder called with --batch texts at a time
+    service, N threads  N concurrent callers, each sending --per-call texts
+                      (one batch of search results) per call through the
+                      embedding service (micro-batched, cold cache)
+    memory cache      the same texts again, all cache hits
+    file cache        a fresh service reading the memory-mapped cache
+                      another run wrote (as a new process would)
+
+The file cache is measured for each stored dtype, with the bytes per
+vector and the worst cosine error against float32.
+
+Usage:
+    python benchmarks/embedding_throughput.py
+    python benchmarks/embedding_throughput.py --texts 20000 --threads 16
+"""
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.evals.fixtures import load_cases  # noqa: E402
+from src.tools.embeddings import (  # noqa: E402
+    DTYPES,
+    EmbeddingService,
+    FileEmbeddingCache,
+    HashingEmbedder,
+    MemoryEmbeddingCache,
+)
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def snippets(cases_path: str, count: int, seed: int = 0) -> List[str]:
+    """Distinct texts of three corpus sentences each."""
+    cases = load_cases(cases_path)
+    sentences = [
+        sentence
+        for case in cases
+        for result in case.results + case.advanced_results
+        for sentence in _SENTENCE_RE.split(result["content"])
+        if sentence
+    ]
+    rng = random.Random(seed)
+    return [f"{' '.join(rng.sample(sentences, 3))} ({i})" for i in range(count)]
+
+
+def rate(texts: List[str], run: Callable[[], None]) -> float:
+    """Embeddings per second of one run over the texts."""
+    start = time.perf_counter()
+    run()
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", default="benchmarks/evals/cases.jsonl", help="Corpus of recorded results")
+    parser.add_argument("--texts", type=int, default=5000, help="Distinct texts to embed")
+    parser.add_argument("--dimensions", type=int, default=384, help="Hashing embedder width")
+    parser.add_argument("--batch", type=int, default=64, help="Batch size")
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent callers")
+    parser.add_argument("--per-call", type=int, default=8, help="Texts per service call")
+    args = parser.parse_args()
+    
+    texts = snippets(args.cases, args.texts)
+    embedder = HashingEmbedder(args.dimensions)
+    embedder.embed(texts[:10])  # Warm the n-gram hash cache like a long-running process
+    
+    def one_at_a_time():
+        for text in texts:
+            embedder.embed([text])
+    
+    def batched():
+        for start in range(0, len(texts), args.batch):
+            embedder.embed(texts[start:start + args.batch])
+    
+    def concurrent(service: EmbeddingService) -> Callable[[], None]:
+        def run():
+            calls = [texts[start:start + args.per_call] for start in range(0, len(texts), args.per_call)]
+            with ThreadPoolExecutor(args.threads) as pool:
+                list(pool.map(service.embed, calls))
+        return run
+    
+    print(f"{len(texts)} texts, {args.dimensions} dimensions, hashing embedder")
+    print(f"{'scenario':<28} {'emb/s':>10} {'mean batch':>11}")
+    print("-" * 51)
+    print(f"{'one at a time':<28} {rate(texts, one_at_a_time):>10.0f} {1:>11}")
+    print(f"{'batched':<28} {rate(texts, batched):>10.0f} {args.batch:>11}")
+    
+    service = EmbeddingService(embedder, MemoryEmbeddingCache(args.dimensions), args.batch)
+    cold = rate(texts, concurrent(service))
+    print(f"{f'service, {args.threads} threads':<28} {cold:>10.0f} {service.stats()['mean_batch']:>11}")
+    warm = rate(texts, concurrent(service))
+    print(f"{'memory cache':<28} {warm:>10.0f} {'-':>11}")
+    
+    exact = embedder.embed(texts)
+    print()
+    print(f"{'file cache':<28} {'emb/s':>10} {'bytes/vec':>11} {'max cos err':>12}")
+    print("-" * 64)
+    for dtype in DTYPES:
+        with tempfile.TemporaryDirectory() as directory:
+            writer = EmbeddingService(embedder, FileEmbeddingCache(directory, args.dimensions, dtype), args.batch)
+            writer.embed(texts)
+            reader = EmbeddingService(embedder, FileEmbeddingCache(directory, args.dimensions, dtype), args.batch)
+            speed = rate(texts, lambda: [reader.embed(texts[start:start + args.batch])
+                                         for start in range(0, len(texts), args.batch)])
+            stored = reader.embed(texts)
+            error = abs(1 - (stored * exact).sum(axis=1) / ((stored ** 2).sum(axis=1) ** 0.5)).max()
+            print(f"{dtype:<28} {speed:>10.0f} {reader.cache.row_dtype.itemsize:>11} {error:>12.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Import-time profile for the CLI and app entry points.
+
+Each module is imported in a fresh interpreter with ``-X importtime`` so
+the numbers reflect a cold start. Results can be saved as JSON and
+compared against a previous run to catch import-time regressions.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --save benchmarks/import_time_baseline.json
+    python benchmarks/import_time.py --compare benchmarks/import_time_baseline.json
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules loaded on the cold-start path of main.py and app.py
+DEFAULT_MODULES = [
+    "config.settings",
+    "src.agent",
+    "src.tools",
+    "src.storage",
+    "main",
+    "src.agent.graph",
+]
+
+_LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_module(module: str) -> Tuple[float, List[Tuple[str, float]]]:
+    """
+    Import a module in a fresh interpreter.
+    
+    Returns:
+        Cumulative import time in ms and the top-level (self time, module)
+        pairs sorted by self time
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+    
+    total_ms = 0.0
+    self_times = []
+    for line in proc.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        self_times.append((name, int(self_us) / 1000))
+        if name == module and len(indent) == 1:
+            total_ms = int(cumulative_us) / 1000
+    
+    self_times.sort(key=lambda item: item[1], reverse=True)
+    return total_ms, self_times
+
+
+def run(modules: List[str], repeats: int, top: int) -> Dict[str, Dict]:
+    """Profile each module, taking the median over several cold starts."""
+    results = {}
+    for module in modules:
+        totals = []
+        heaviest = []
+        for _ in range(repeats):
+            total_ms, self_times = profile_module(module)
+            totals.append(total_ms)
+            heaviest = self_times[:top]
+        results[module] = {
+            "median_ms": round(statistics.median(totals), 1),
+            "min_ms": round(min(totals), 1),
+            "heaviest_imports_ms": [[name, round(ms, 1)] for name, ms in heaviest],
+        }
+    return results
+
+
+def print_report(results: Dict[str, Dict], baseline: Dict[str, Dict] = None) -> None:
+    """Print a table of import times, with deltas against a baseline if given."""
+    print(f"{'module':<24} {'median ms':>10} {'min ms':>10}" + (f" {'delta ms':>10}" if baseline else ""))
+    print("-" * (46 + (11 if baseline else 0)))
+    for module, data in results.items():
+        line = f"{module:<24} {data['median_ms']:>10.1f} {data['min_ms']:>10.1f}"
+        if baseline and module in baseline:
+            line += f" {data['median_ms'] - baseline[module]['median_ms']:>+10.1f}"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="Modules to profile")
+    parser.add_argument("--repeats", type=int, default=5, help="Cold starts per module")
+    parser.add_argument("--top", type=int, default=10, help="Heaviest imports to record per module")
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Compare against a previously saved JSON file")
+    args = parser.parse_args()
+    
+    results = run(args.modules, args.repeats, args.top)
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())["modules"]
+    
+    print_report(results, baseline)
+    
+    if args.save:
+        Path(args.save).write_text(json.dumps({
+            "python": sys.version.split()[0],
+            "modules": results,
+        }, indent=2) + "\n")
+        print(f"\nSaved to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Per-call overhead of the logging configurations used by the agent.
+
+Each scenario configures a fresh logger writing to a null stream and
+times a burst of calls from the caller's point of view, which is the
+cost a graph node pays. A typical research run logs a few dozen
+records, so the per-run figure is per-call cost times ``--per-run``.
+
+Usage:
+    python benchmarks/logging_overhead.py
+    python benchmarks/logging_overhead.py --calls 50000 --per-run 40
+"""
+
+import argparse
+import io
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils import logger as logger_module  # noqa: E402
+from src.utils.logger import log_context, setup_logger  # noqa: E402
+
+
+def _configure(name: str, **kwargs) -> logging.Logger:
+    """Set up a logger and point its output at an in-memory sink."""
+    logger = setup_logger(name=name, **kwargs)
+    sink = io.StringIO()
+    handlers = logger_module._listeners[name].handlers if name in logger_module._listeners else logger.handlers
+    for handler in handlers:
+        if isinstance(handler, logging.StreamHandler):
+            handler.setStream(sink)
+    return logger
+
+
+def _time_calls(emit: Callable[[int], None], calls: int, logger_name: str) -> float:
+    """
+    Return the mean cost of one call in microseconds.
+    
+    The logger's background listener, if any, is drained and stopped
+    afterwards so its backlog does not compete with the next scenario.
+    """
+    started = time.perf_counter()
+    for i in range(calls):
+        emit(i)
+    elapsed = time.perf_counter() - started
+    listener = logger_module._listeners.pop(logger_name, None)
+    if listener:
+        listener.stop()
+    return elapsed / calls * 1e6
+
+
+def run(calls: int) -> Dict[str, float]:
+    """Time each scenario and return the mean per-call cost in microseconds."""
+    results = {}
+    payload = {"query": "nvidia stock", "results": list(range(20))}
+    
+    disabled = _configure("bench.disabled", level="WARNING", async_handlers=False)
+    results["below level, lazy args"] = _time_calls(
+        lambda i: disabled.info("Search attempt %d: %s", i, payload), calls, "bench.disabled")
+    results["below level, f-string"] = _time_calls(
+        lambda i: disabled.info(f"Search attempt {i}: {payload}"), calls, "bench.disabled")
+    
+    sync_text = _configure("bench.sync_text", async_handlers=False, sample_max_per_window=0)
+    results["sync text"] = _time_calls(
+        lambda i: sync_text.info("Search attempt %d: %s", i, payload), calls, "bench.sync_text")
+    
+    async_json = _configure("bench.async_json", fmt="json", sample_max_per_window=0)
+    with log_context(run_id="bench", node="search"):
+        results["async json"] = _time_calls(
+            lambda i: async_json.info("Search attempt %d: %s", i, payload), calls, "bench.async_json")
+    
+    sampled = _configure("bench.sampled", fmt="json", sample_window_seconds=60, sample_max_per_window=5)
+    results["async json, sampled repeats"] = _time_calls(
+        lambda i: sampled.warning("Retrying in %ss...", i), calls, "bench.sampled")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000, help="Log calls per scenario")
+    parser.add_argument("--per-run", type=int, default=40, help="Log calls in a typical research run")
+    args = parser.parse_args()
+    
+    results = run(args.calls)
+    print(f"{'scenario':<30} {'us/call':>10} {'ms/run':>10}")
+    print("-" * 52)
+    for scenario, micros in results.items():
+        print(f"{scenario:<30} {micros:>10.2f} {micros * args.per_run / 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
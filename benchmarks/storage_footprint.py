@@ -0,0 +1,96 @@
+"""
+Memory footprint of the search cache with and without compression.
+
+Fills a cache with a synthetic workload built from the recorded results
+in the evaluation corpus: queries drawn at random, each caching five of
+its case's results with fresh scores and a random result count, so the
+same snippets recur across entries as they do across real runs. Memory
+is measured with tracemalloc. The dictionary is trained on half of the
+cases and the footprint measured on all of them.
+
+Usage:
+    python benchmarks/storage_footprint.py
+    python benchmarks/storage_footprint.py --entries 2000 --codec zlib
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.evals.fixtures import EvalCase, load_cases  # noqa: E402
+from src.storage.blobs import MemoryBlobStore  # noqa: E402
+from src.storage.codec import FrameCodec, train_dictionary  # noqa: E402
+from src.tools.providers import SearchCache  # noqa: E402
+
+Entry = Tuple[str, int, List[Dict[str, Any]]]
+
+
+def workload(cases: List[EvalCase], entries: int, seed: int = 0) -> List[Entry]:
+    """Cache entries: (query, max_results, results)."""
+    rng = random.Random(seed)
+    out = []
+    for i in range(entries):
+        case = rng.choice(cases)
+        pool = case.results + case.advanced_results
+        results = [dict(result, score=round(rng.random(), 4)) for result in rng.sample(pool, min(5, len(pool)))]
+        out.append((f"{case.query} ({i % 50})", rng.choice([3, 5, 12]), results))
+    return out
+
+
+def measure(cache: SearchCache, entries: List[Entry]) -> Tuple[int, float]:
+    """Bytes allocated by filling the cache, and mean microseconds per cache hit."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for query, max_results, results in entries:
+        # Fresh objects per entry, as results arrive from the provider
+        cache.put(query, max_results, json.loads(json.dumps(results)))
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    
+    start = time.perf_counter()
+    for query, max_results, _ in entries:
+        cache.get(query, max_results)
+    return used, (time.perf_counter() - start) / len(entries) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", default="benchmarks/evals/cases.jsonl", help="Corpus of recorded results")
+    parser.add_argument("--entries", type=int, default=1000, help="Cache entries to store")
+    parser.add_argument("--codec", default="auto", help="auto, zstd, lz4 or zlib")
+    args = parser.parse_args()
+    
+    cases = load_cases(args.cases)
+    entries = workload(cases, args.entries)
+    training = [result["content"] for case in cases[::2] for result in case.results + case.advanced_results]
+    dictionary = train_dictionary(training, 16 * 1024)
+    
+    codec = FrameCodec(args.codec)
+    scenarios: Dict[str, Optional[FrameCodec]] = {
+        "plain": None,
+        codec.name: codec,
+        f"{codec.name} + dictionary": FrameCodec(args.codec, dictionary=dictionary),
+    }
+    print(f"{len(entries)} entries, {len(cases)} cases")
+    print(f"{'scenario':<24} {'KiB':>10} {'reduction':>10} {'us/get':>8}")
+    print("-" * 55)
+    baseline = None
+    for name, scenario_codec in scenarios.items():
+        blobs = MemoryBlobStore(codec=scenario_codec) if scenario_codec is not None else None
+        used, micros = measure(SearchCache(max_entries=len(entries), blobs=blobs), entries)
+        baseline = baseline or used
+        print(f"{name:<24} {used / 1024:>10.0f} {baseline / used:>9.1f}x {micros:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """Application settings and configuration management."""
 
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -22,6 +23,137 @@ class Settings(BaseSettings):
     enable_caching: bool = True
     log_level: str = "INFO"
     
+    # Logging
+    log_format: str = "text"  # "text" or "json"
+    log_async: bool = True  # Write logs from a background thread
+    log_sample_window_seconds: float = 10.0
+    log_sample_max_per_window: int = 5  # Repeats of one message per window (0 = no limit)
+    
+    # Timeouts and Hedging
+    run_timeout_seconds: float = 120.0
+    search_timeout_seconds: float = 15.0
+    llm_timeout_seconds: float = 60.0
+    writer_reserve_seconds: float = 30.0
+    search_hedge_percentile: float = 0.95
+    search_hedge_min_samples: int = 20
+    
+    # HTTP Transport (shared by all provider clients)
+    http2: bool = True  # Used when the h2 package is installed
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry_seconds: float = 60.0
+    http_connect_timeout_seconds: float = 5.0
+    
+    # Search Providers and Circuit Breakers
+    search_providers: str = "tavily,cache"
+    search_cache_size: int = 1000
+    search_cache_ttl_seconds: float = 3600.0
+    circuit_failure_threshold: float = 0.5
+    circuit_window_seconds: float = 30.0
+    circuit_min_calls: int = 5
+    circuit_open_seconds: float = 30.0
+    
+    # Storage Compression (search cache, shared cache, job results)
+    storage_codec: str = "auto"  # "auto" (zstd, else lz4, else zlib), "zstd", "lz4", "zlib" or "none"
+    storage_compression_level: int = 0  # 0 = the codec's default
+    storage_min_compress_bytes: int = 128  # Smaller values are stored uncompressed
+    storage_dictionary_path: str = "data/storage.dict"  # Trained with python -m src.storage train
+    compress_search_cache: bool = True  # Compressed entries, each distinct snippet stored once
+    search_cache_blob_dir: str = ""  # Keep cached snippets in this directory ("" = in memory)
+    
+    # Record and Replay (search and LLM traffic)
+    cassette_mode: str = "off"  # "off", "record", "replay" or "replay_or_live"
+    cassette_path: str = "cassettes/session.jsonl.gz"
+    cassette_replay_speed: float = 0.0  # 1.0 = recorded latencies, 0 = no delay
+    
+    # Fair Scheduling (priority classes: interactive > batch > monitor)
+    max_concurrent_runs: int = 8
+    max_concurrent_provider_calls: int = 16
+    interactive_reserve_fraction: float = 0.25  # Share of slots only interactive work may use
+    tenant_max_concurrent_runs: int = 4  # 0 = no per-tenant limit
+    tenant_max_queued_runs: int = 100  # Further runs are rejected (0 = no limit)
+    tenant_weights: str = ""  # e.g. "acme=2,trial=0.5"; unlisted tenants weigh 1
+    
+    # Cluster (shared job queue and cache)
+    cluster_backend: str = "memory"  # "memory" (this process only) or "redis"
+    redis_url: str = "redis://localhost:6379/0"  # "fake://" = in-process stand-in
+    cluster_namespace: str = "dra"
+    use_job_queue: bool = False  # Web UI queues runs for workers instead of running them
+    worker_concurrency: int = 2
+    job_lease_seconds: float = 30.0
+    job_heartbeat_seconds: float = 10.0
+    job_max_attempts: int = 3
+    job_retry_delay_seconds: float = 5.0
+    job_result_ttl_seconds: float = 86400.0
+    
+    # Reranking (off by default: on the offline eval set it keeps fewer key facts than provider order)
+    enable_rerank: bool = False
+    rerank_fetch_results: int = 12  # Results fetched before keeping the top max_search_results
+    rerank_lexical_weight: float = 0.5  # BM25 share of the score; the rest is n-gram similarity
+    rerank_semantic: str = "ngram"  # Similarity score: "ngram" or "embedding" (the embedding service)
+    
+    # Embeddings (batched, cached by content digest)
+    embedding_backend: str = "hashing"  # "hashing" (numpy only) or "sentence-transformers" (local CPU model)
+    embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_dimensions: int = 384  # Width of hashing embeddings (models have their own)
+    embedding_dtype: str = "float16"  # Stored precision: "float16", "int8" or "float32"
+    embedding_cache_dir: str = "data/embeddings"  # Memory-mapped vector cache ("" = in memory only)
+    embedding_memory_cache_entries: int = 100000  # Bound of the in-memory cache
+    embedding_batch_size: int = 64  # Texts per batched embedding call
+    embedding_batch_wait_ms: float = 0.0  # Hold batches open for more requests (0 = batch what is queued)
+    
+    # Adaptive Result Depth (start with a small shallow search, deepen rich ones)
+    enable_adaptive_depth: bool = True
+    adaptive_initial_fetch: int = 5  # Candidates requested by the first search
+    adaptive_max_results: int = 5  # Results kept from a deepened search
+    adaptive_novelty_threshold: float = 0.5  # Deepen only if the first batch is this new...
+    adaptive_relevance_threshold: float = 0.6  # ...and covers this share of the query terms
+    search_depth: str = "basic"  # Tavily search_depth for first searches
+    deep_search_depth: str = "advanced"  # Tavily search_depth for deepened searches
+    
+    # CPU Offload (rerank and novelty scoring)
+    enable_process_pool: bool = True
+    cpu_pool_workers: int = 0  # 0 = CPU count - 1, at most 4
+    cpu_offload_min_bytes: int = 16384  # Smaller inputs run inline
+    cpu_shared_memory_min_bytes: int = 1048576  # Larger inputs go through shared memory
+    
+    # Prompts
+    prompt_version: str = "v1"
+    prompt_versions: str = ""  # Per-prompt overrides, e.g. "writer=v2,planner=v1"
+    prompt_dir: str = ""  # Template directory (defaults to src/prompts/templates)
+    
+    # Token Budget
+    token_encoding: str = "cl100k_base"  # tiktoken encoding for closer approximate counts ("" = heuristic only)
+    writer_max_prompt_tokens: int = 8000
+    writer_max_output_tokens: int = 2000
+    writer_trim_min_fraction: float = 0.6  # Trim context only if this much of it survives
+    map_reduce_chunk_tokens: int = 4000
+    map_reduce_summary_tokens: int = 400
+    max_report_cost_usd: float = 0.05  # Refuse reports estimated to cost more
+    estimate_snippet_tokens: int = 250  # Assumed search result size for run estimates
+    
+    # History
+    history_db_path: str = "data/history.db"
+    history_page_size: int = 10
+    
+    # Multi-hop Research
+    research_mode: str = "iterative"  # "iterative" or "multi_hop"
+    multi_hop_max_subquestions: int = 4
+    multi_hop_max_depth: int = 2
+    branch_max_tokens: int = 6000
+    branch_timeout_seconds: float = 45.0
+    branch_min_novelty: float = 0.3
+    
+    # Monitors
+    monitor_poll_seconds: float = 30.0
+    monitor_jitter_fraction: float = 0.25
+    monitor_coalesce_window_seconds: float = 300.0
+    
+    # Speculative Writer
+    enable_speculative_writer: bool = False
+    speculative_sufficiency_threshold: float = 0.6
+    speculative_novelty_threshold: float = 0.3
+    
     # Cost Tracking
     track_costs: bool = True
     cost_per_search: float = 0.001
@@ -46,5 +178,27 @@ class Settings(BaseSettings):
         return True
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load and validate settings from the environment (once per process)."""
+    return Settings()
+
+
+class _LazySettings:
+    """
+    Proxy for the global settings instance.
+    
+    Settings are read from the environment and validated on first
+    attribute access rather than at import time, so importing a module
+    that depends on configuration stays cheap.
+    """
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_settings(), name)
+    
+    def __repr__(self) -> str:
+        return repr(get_settings())
+
+
 # Global settings instance
-settings = Settings()
+settings = _LazySettings()
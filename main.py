@@ -7,6 +7,7 @@ gather information, and synthesize comprehensive reports.
 
 import sys
 import os
+import uuid
 from pathlib import Path
 
 # Fix Windows console encoding for emojis
@@ -23,9 +24,21 @@ if sys.platform == 'win32':
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config.settings import settings
-from src.utils.logger import setup_logger, get_logger
+from src.utils.logger import setup_logger, get_logger, log_context
 from src.utils.cost_tracker import CostTracker
-from src.agent import create_research_agent
+from src.utils.deadline import Deadline
+from src.storage import HistoryRecord, HistoryStore
+from src.tools.transport import get_transport_metrics
+from src.utils.cpu_pool import get_cpu_metrics
+from src.utils.events import ProgressEvent, get_progress_metrics, listen
+from src.ui.progress import describe
+
+
+def print_progress(event: ProgressEvent) -> None:
+    """Print a status line for each notable progress event."""
+    status = describe(event)
+    if status:
+        print(f"  {status}", flush=True)
 
 
 def main():
@@ -34,7 +47,11 @@ def main():
     # Setup logging
     setup_logger(
         name="deep_research_agent",
-        level=settings.log_level
+        level=settings.log_level,
+        fmt=settings.log_format,
+        async_handlers=settings.log_async,
+        sample_window_seconds=settings.log_sample_window_seconds,
+        sample_max_per_window=settings.log_sample_max_per_window
     )
     logger = get_logger()
     
@@ -48,19 +65,22 @@ def main():
             cost_per_search=settings.cost_per_search
         )
         
-        # Create the agent
+        # Create the agent (LangGraph and provider SDKs are imported here,
+        # after configuration has been validated)
         logger.info("🚀 Initializing Deep Research Agent...")
-        agent = create_research_agent(cost_tracker)
+        from src.agent import create_agent
+        agent = create_agent(cost_tracker)
         
         # Define research query
         user_query = "What is the current stock price of NVIDIA and why is it moving today?"
         
-        logger.info(f"📝 Research Query: {user_query}")
+        logger.info("📝 Research Query: %s", user_query)
         
         # Initialize state
         initial_state = {
             "task": user_query,
             "search_results": [],
+            "sources": [],
             "attempts": 0,
             "error": None,
             "final_report": None
@@ -73,7 +93,20 @@ def main():
         print("="*80)
         print(f"Query: {user_query}\n")
         
-        final_state = agent.invoke(initial_state)
+        with log_context(run_id=uuid.uuid4().hex[:12]), listen(print_progress):
+            final_state = agent.invoke(
+                initial_state,
+                config={"configurable": {"deadline": Deadline.after(settings.run_timeout_seconds)}}
+            )
+        
+        # Save to history
+        if final_state.get("final_report") and not final_state.get("error"):
+            HistoryStore(settings.history_db_path).add(HistoryRecord(
+                query=user_query,
+                report=final_state["final_report"],
+                sources=final_state.get("sources", []),
+                cost=cost_tracker.get_summary()["total_cost_usd"]
+            ))
         
         # Print cost summary
         if settings.track_costs:
@@ -83,12 +116,18 @@ def main():
             summary = cost_tracker.get_summary()
             for key, value in summary.items():
                 print(f"  {key.replace('_', ' ').title()}: {value}")
+            connections = get_transport_metrics().snapshot()
+            print(f"  Connection Reuse: {connections['reused_connections']}/{connections['requests']} requests")
+            for stage, timing in get_cpu_metrics().snapshot().items():
+                print(f"  CPU {stage.title()}: {timing['cpu_ms']}ms CPU, {timing['offloaded']}/{timing['calls']} calls offloaded")
+            for node, timing in get_progress_metrics().snapshot()["nodes"].items():
+                print(f"  Node {node.title()}: {timing['calls']} calls, {timing['mean_ms']}ms mean, {timing['max_ms']}ms max")
             print("="*80 + "\n")
         
         logger.info("✅ Research workflow completed successfully")
         
     except ValueError as e:
-        logger.error(f"Configuration error: {str(e)}")
+        logger.error("Configuration error: %s", e)
         print(f"\n❌ Error: {str(e)}")
         print("\nPlease:")
         print("1. Copy .env.example to .env")
@@ -96,7 +135,7 @@ def main():
         sys.exit(1)
         
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}", exc_info=True)
+        logger.error("Unexpected error: %s", e, exc_info=True)
         print(f"\n❌ Unexpected error: {str(e)}")
         sys.exit(1)
 
@@ -1,6 +1,54 @@
 """Agent package containing the core research agent logic."""
 
-from .state import AgentState
-from .graph import create_research_agent
+from typing import TYPE_CHECKING
 
-__all__ = ["AgentState", "create_research_agent"]
+from .state import AgentState, MultiHopState, RefreshState
+from .runner import ResearchResult, refresh_research, run_research
+from .budget import BudgetExceeded, ReportPlan, estimate_research, plan_report
+
+if TYPE_CHECKING:
+    from .graph import (
+        clear_agent_cache,
+        create_agent,
+        create_multi_hop_agent,
+        create_refresh_agent,
+        create_research_agent,
+        get_agent,
+    )
+
+__all__ = [
+    "AgentState",
+    "MultiHopState",
+    "RefreshState",
+    "ResearchResult",
+    "run_research",
+    "refresh_research",
+    "BudgetExceeded",
+    "ReportPlan",
+    "estimate_research",
+    "plan_report",
+    "create_agent",
+    "create_research_agent",
+    "create_multi_hop_agent",
+    "create_refresh_agent",
+    "get_agent",
+    "clear_agent_cache",
+]
+
+# Resolved from .graph on first access
+_LAZY_GRAPH_ATTRS = {
+    "create_agent",
+    "create_research_agent",
+    "create_multi_hop_agent",
+    "create_refresh_agent",
+    "get_agent",
+    "clear_agent_cache",
+}
+
+
+def __getattr__(name: str):
+    # Defer LangGraph and provider SDK imports until a graph is actually built
+    if name in _LAZY_GRAPH_ATTRS:
+        from . import graph
+        return getattr(graph, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,241 @@
+"""Pre-call token and cost estimates for report generation."""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from config.settings import settings
+from src.prompts import PromptTemplate, load_prompt
+from src.utils.cost_tracker import CostTracker
+from src.utils.tokens import TokenEstimator, get_token_estimator
+
+CONTEXT_SEPARATOR = "\n\n---\n\n"
+
+# Report generation strategies, cheapest first
+DIRECT = "direct"
+TRIM = "trim"
+MAP_REDUCE = "map_reduce"
+REFUSE = "refuse"
+
+
+class BudgetExceeded(Exception):
+    """Raised when a report would exceed the token or cost budget."""
+
+
+@dataclass
+class ReportPlan:
+    """How a report will be generated, with its predicted size and cost."""
+    
+    strategy: str
+    prompt_tokens: int
+    completion_tokens: int
+    llm_calls: int
+    cost_usd: float
+    exact: bool  # Counted with the tiktoken encoding, not the heuristic (both approximate)
+    context: List[str] = field(default_factory=list)
+    chunks: List[List[str]] = field(default_factory=list)
+    reason: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary for logs and the UI, without the context itself."""
+        data = asdict(self)
+        data.pop("context")
+        data["chunks"] = len(self.chunks)
+        data["cost_usd"] = round(self.cost_usd, 5)
+        return data
+
+
+def plan_report(
+    task: str,
+    search_results: List[str],
+    cost_tracker: Optional[CostTracker] = None,
+    writer_prompt: Optional[PromptTemplate] = None,
+    map_prompt: Optional[PromptTemplate] = None,
+    estimator: Optional[TokenEstimator] = None
+) -> ReportPlan:
+    """
+    Decide how to generate a report before calling the LLM.
+    
+    The full context is sent when it fits writer_max_prompt_tokens. If it
+    does not, trailing snippets are dropped as long as at least
+    writer_trim_min_fraction of the context survives; otherwise snippets
+    are summarized in chunks (map) and the report is written from the
+    summaries (reduce). Any plan whose predicted cost exceeds
+    max_report_cost_usd is refused.
+    
+    Args:
+        task: User's research query
+        search_results: Context snippets, most relevant first
+        cost_tracker: Source of token prices (defaults to settings prices)
+        writer_prompt: Report template (defaults to the configured one)
+        map_prompt: Chunk summary template (defaults to the configured one)
+        estimator: Token estimator (defaults to the shared one)
+    
+    Returns:
+        The chosen plan
+    """
+    cost_tracker = cost_tracker or CostTracker(cost_per_search=settings.cost_per_search)
+    writer_prompt = writer_prompt or load_prompt("writer")
+    estimator = estimator or get_token_estimator()
+    exact = estimator.exact
+    
+    max_prompt = settings.writer_max_prompt_tokens
+    output_tokens = settings.writer_max_output_tokens
+    separator = estimator.count(CONTEXT_SEPARATOR)
+    overhead = estimator.count_messages(writer_prompt.render(context="", task=task))
+    sizes = estimator.count_many(search_results)
+    total = sum(sizes) + separator * max(len(sizes) - 1, 0)
+    budget = max_prompt - overhead
+    
+    def finish(plan: ReportPlan) -> ReportPlan:
+        if plan.strategy != REFUSE and plan.cost_usd > settings.max_report_cost_usd:
+            plan.strategy = REFUSE
+            plan.reason = (
+                f"Estimated cost ${plan.cost_usd:.4f} exceeds the "
+                f"${settings.max_report_cost_usd:.4f} report budget"
+            )
+        return plan
+    
+    if total <= budget:
+        return finish(ReportPlan(
+            strategy=DIRECT,
+            prompt_tokens=overhead + total,
+            completion_tokens=output_tokens,
+            llm_calls=1,
+            cost_usd=cost_tracker.estimate_llm_cost(overhead + total, output_tokens),
+            exact=exact,
+            context=list(search_results)
+        ))
+    
+    # Keep the leading (most relevant) snippets that fit
+    kept, used = [], 0
+    for text, size in zip(search_results, sizes):
+        extra = size + (separator if kept else 0)
+        if used + extra > budget:
+            break
+        kept.append(text)
+        used += extra
+    
+    if kept and used >= settings.writer_trim_min_fraction * total:
+        return finish(ReportPlan(
+            strategy=TRIM,
+            prompt_tokens=overhead + used,
+            completion_tokens=output_tokens,
+            llm_calls=1,
+            cost_usd=cost_tracker.estimate_llm_cost(overhead + used, output_tokens),
+            exact=exact,
+            context=kept,
+            reason=f"Dropped {len(search_results) - len(kept)} of {len(search_results)} snippets to fit {max_prompt} tokens"
+        ))
+    
+    # Map-reduce: summarize chunks that each fit a map call
+    map_prompt = map_prompt or load_prompt("map_summary")
+    summary_tokens = settings.map_reduce_summary_tokens
+    map_overhead = estimator.count_messages(map_prompt.render(context="", task=task))
+    chunk_budget = min(settings.map_reduce_chunk_tokens, max_prompt) - map_overhead
+    
+    chunks: List[List[str]] = []
+    chunk_sizes: List[int] = []
+    for text, size in zip(search_results, sizes):
+        if size > chunk_budget:
+            text, size = _truncate(text, chunk_budget), chunk_budget
+        if chunks and chunk_sizes[-1] + separator + size <= chunk_budget:
+            chunks[-1].append(text)
+            chunk_sizes[-1] += separator + size
+        else:
+            chunks.append([text])
+            chunk_sizes.append(size)
+    
+    reduce_prompt = overhead + len(chunks) * (summary_tokens + separator)
+    prompt_tokens = sum(map_overhead + size for size in chunk_sizes) + reduce_prompt
+    cost = sum(
+        cost_tracker.estimate_llm_cost(map_overhead + size, summary_tokens)
+        for size in chunk_sizes
+    ) + cost_tracker.estimate_llm_cost(reduce_prompt, output_tokens)
+    
+    plan = ReportPlan(
+        strategy=MAP_REDUCE,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=len(chunks) * summary_tokens + output_tokens,
+        llm_calls=len(chunks) + 1,
+        cost_usd=cost,
+        exact=exact,
+        chunks=chunks,
+        reason=f"Context of {total} tokens summarized in {len(chunks)} chunks"
+    )
+    if reduce_prompt > max_prompt:
+        plan.strategy = REFUSE
+        plan.reason = f"Summaries of {len(chunks)} chunks would still exceed {max_prompt} prompt tokens"
+    return finish(plan)
+
+
+def estimate_research(
+    query: str,
+    mode: Optional[str] = None,
+    cost_tracker: Optional[CostTracker] = None
+) -> Dict[str, Any]:
+    """
+    Predict the cost of a research run before it starts.
+    
+    Search results are not known yet, so each expected result is assumed
+    to be estimate_snippet_tokens long. Intended for showing an estimate
+    in the UI next to the query box.
+    
+    Args:
+        query: Research query
+        mode: "iterative" or "multi_hop" (defaults to settings.research_mode)
+        cost_tracker: Source of prices (defaults to settings prices)
+    
+    Returns:
+        Predicted search calls, LLM calls, tokens and cost in USD, plus the
+        writer strategy that a context of that size would get
+    """
+    cost_tracker = cost_tracker or CostTracker(cost_per_search=settings.cost_per_search)
+    estimator = get_token_estimator()
+    mode = mode or settings.research_mode
+    snippet = "x " * settings.estimate_snippet_tokens
+    
+    extra_calls = extra_prompt = extra_completion = 0
+    extra_cost = 0.0
+    if mode == "multi_hop":
+        branches = settings.multi_hop_max_subquestions
+        searches = branches * settings.multi_hop_max_depth
+        per_hop_prompt = estimator.count_messages(load_prompt("branch").render(
+            context=CONTEXT_SEPARATOR.join([snippet] * settings.max_search_results),
+            task=query,
+            question=query
+        ))
+        hop_output = 500
+        extra_calls = 1 + searches
+        extra_prompt = searches * per_hop_prompt
+        extra_completion = 300 + searches * hop_output
+        extra_cost = cost_tracker.estimate_llm_cost(extra_prompt, extra_completion)
+        snippets = ["x " * hop_output] * branches
+    else:
+        searches = settings.max_search_attempts
+        snippets = [snippet] * (settings.max_search_results * searches)
+    
+    plan = plan_report(query, snippets, cost_tracker=cost_tracker, estimator=estimator)
+    results_per_search = (
+        max(settings.rerank_fetch_results, settings.max_search_results)
+        if settings.enable_rerank else settings.max_search_results
+    )
+    if settings.enable_adaptive_depth:
+        # Typically only the first, shallow request is made
+        results_per_search = max(settings.adaptive_initial_fetch, settings.max_search_results)
+    return {
+        "mode": mode,
+        "strategy": plan.strategy,
+        "search_calls": searches,
+        "llm_calls": plan.llm_calls + extra_calls,
+        "prompt_tokens": plan.prompt_tokens + extra_prompt,
+        "completion_tokens": plan.completion_tokens + extra_completion,
+        "cost_usd": round(
+            plan.cost_usd + extra_cost + cost_tracker.cost_per_search * searches * results_per_search,
+            5
+        ),
+    }
+
+
+def _truncate(text: str, tokens: int) -> str:
+    """Cut a text to roughly the given number of tokens."""
+    return text[:tokens * 4]
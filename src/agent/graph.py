@@ -1,11 +1,22 @@
 """LangGraph workflow definition."""
 
+import threading
+from typing import Any, Dict, Optional
 from langgraph.graph import StateGraph, END
+from config.settings import settings
 from src.utils.logger import get_logger
 from src.utils.cost_tracker import CostTracker
-from .state import AgentState
-from .nodes import SearchNode, WriterNode
-from .routers import should_continue_search
+from .state import AgentState, MultiHopState, RefreshState
+from .nodes import (
+    SearchNode,
+    WriterNode,
+    SpeculativeWriterNode,
+    PlannerNode,
+    BranchNode,
+    RefreshSearchNode,
+    PatchWriterNode,
+)
+from .routers import should_continue_search, fan_out_sub_questions
 
 logger = get_logger()
 
@@ -16,13 +27,14 @@ def create_research_agent(cost_tracker: CostTracker):
     
     Architecture:
     1. Entry point: search node
-    2. Conditional routing: Continue searching or write report
-    3. Writer node generates final report
+    2. Conditional routing: Continue searching, speculate, or write report
+    3. Writer node generates final report (or the speculate node runs the
+       final search and a draft report concurrently)
     4. End
     
     Args:
         cost_tracker: Cost tracking instance
-        
+    
     Returns:
         Compiled LangGraph application
     """
@@ -31,6 +43,7 @@ def create_research_agent(cost_tracker: CostTracker):
     # Initialize nodes
     search_node = SearchNode(cost_tracker)
     writer_node = WriterNode(cost_tracker)
+    speculate_node = SpeculativeWriterNode(search_node, writer_node)
     
     # Create workflow graph
     workflow = StateGraph(AgentState)
@@ -38,6 +51,7 @@ def create_research_agent(cost_tracker: CostTracker):
     # Add nodes
     workflow.add_node("search", search_node)
     workflow.add_node("writer", writer_node)
+    workflow.add_node("speculate", speculate_node)
     
     # Set entry point
     workflow.set_entry_point("search")
@@ -47,13 +61,15 @@ def create_research_agent(cost_tracker: CostTracker):
         "search",
         should_continue_search,
         {
-            "search": "search",  # Loop back for more searches
-            "writer": "writer"   # Move to report generation
+            "search": "search",        # Loop back for more searches
+            "speculate": "speculate",  # Final search + draft report
+            "writer": "writer"         # Move to report generation
         }
     )
     
-    # Add terminal edge
+    # Add terminal edges
     workflow.add_edge("writer", END)
+    workflow.add_edge("speculate", END)
     
     # Compile the graph
     app = workflow.compile()
@@ -61,3 +77,155 @@ def create_research_agent(cost_tracker: CostTracker):
     logger.info("✅ Research agent workflow compiled successfully")
     
     return app
+
+
+def create_multi_hop_agent(cost_tracker: CostTracker):
+    """
+    Create and compile the multi-hop research workflow.
+    
+    Architecture:
+    1. Planner breaks the task into sub-questions
+    2. One branch per sub-question runs in parallel (Send fan-out),
+       searching and summarizing within its own budget
+    3. Branch results are joined by the state reducers
+    4. Writer node generates the final report from the branch summaries
+    5. End
+    
+    Args:
+        cost_tracker: Cost tracking instance
+    
+    Returns:
+        Compiled LangGraph application
+    """
+    logger.info("🔧 Building multi-hop research workflow...")
+    
+    # Initialize nodes
+    search_node = SearchNode(cost_tracker)
+    planner_node = PlannerNode(cost_tracker)
+    branch_node = BranchNode(search_node, cost_tracker)
+    writer_node = WriterNode(cost_tracker)
+    
+    # Create workflow graph
+    workflow = StateGraph(MultiHopState)
+    
+    # Add nodes
+    workflow.add_node("planner", planner_node)
+    workflow.add_node("branch", branch_node)
+    workflow.add_node("writer", writer_node)
+    
+    # Set entry point
+    workflow.set_entry_point("planner")
+    
+    # Fan out one branch per sub-question, then join at the writer
+    workflow.add_conditional_edges("planner", fan_out_sub_questions, ["branch"])
+    workflow.add_edge("branch", "writer")
+    
+    # Add terminal edge
+    workflow.add_edge("writer", END)
+    
+    # Compile the graph
+    app = workflow.compile()
+    
+    logger.info("✅ Multi-hop workflow compiled successfully")
+    
+    return app
+
+
+def create_refresh_agent(cost_tracker: CostTracker):
+    """
+    Create and compile the incremental refresh workflow.
+    
+    Architecture:
+    1. Refresh search: date-filtered search, dropping already-known sources
+    2. Patch writer: rewrites only the report sections that changed
+    3. End
+    
+    Args:
+        cost_tracker: Cost tracking instance
+    
+    Returns:
+        Compiled LangGraph application
+    """
+    logger.info("🔧 Building refresh workflow...")
+    
+    # Initialize nodes
+    search_node = SearchNode(cost_tracker)
+    writer_node = WriterNode(cost_tracker)
+    
+    # Create workflow graph
+    workflow = StateGraph(RefreshState)
+    
+    # Add nodes
+    workflow.add_node("refresh_search", RefreshSearchNode(search_node))
+    workflow.add_node("patch_writer", PatchWriterNode(writer_node))
+    
+    # Set entry point and edges
+    workflow.set_entry_point("refresh_search")
+    workflow.add_edge("refresh_search", "patch_writer")
+    workflow.add_edge("patch_writer", END)
+    
+    # Compile the graph
+    app = workflow.compile()
+    
+    logger.info("✅ Refresh workflow compiled successfully")
+    
+    return app
+
+
+def create_agent(cost_tracker: CostTracker, mode: Optional[str] = None):
+    """
+    Create the research workflow for a research mode.
+    
+    Args:
+        cost_tracker: Cost tracking instance
+        mode: "iterative" or "multi_hop"; defaults to the RESEARCH_MODE setting
+    
+    Returns:
+        Compiled LangGraph application
+    """
+    mode = mode or settings.research_mode
+    if mode == "multi_hop":
+        return create_multi_hop_agent(cost_tracker)
+    if mode != "iterative":
+        raise ValueError(f"Unknown research mode '{mode}'")
+    return create_research_agent(cost_tracker)
+
+
+_agents: Dict[str, Any] = {}
+_agents_lock = threading.Lock()
+
+
+def get_agent(mode: Optional[str] = None):
+    """
+    Get the process-wide compiled workflow for a mode.
+    
+    Building a graph creates its nodes and their search and LLM clients,
+    so runs share one compiled graph per mode and charge their costs
+    through track_costs instead of the graph's own tracker.
+    
+    Args:
+        mode: "iterative", "multi_hop" or "refresh"; defaults to the RESEARCH_MODE setting
+    
+    Returns:
+        Compiled LangGraph application
+    """
+    mode = mode or settings.research_mode
+    with _agents_lock:
+        if mode not in _agents:
+            cost_tracker = CostTracker(cost_per_search=settings.cost_per_search)
+            if mode == "refresh":
+                _agents[mode] = create_refresh_agent(cost_tracker)
+            else:
+                _agents[mode] = create_agent(cost_tracker, mode)
+        return _agents[mode]
+
+
+def clear_agent_cache() -> None:
+    """
+    Drop the compiled workflows built by get_agent.
+    
+    Nodes read settings (search providers, result counts) when they are
+    built, so call this after changing settings at runtime.
+    """
+    with _agents_lock:
+        _agents.clear()
@@ -1,94 +1,256 @@
 """Worker nodes for the research agent."""
 
-import os
-from typing import Dict, Any
+import contextvars
+import json
+import math
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from langchain_core.runnables import RunnableConfig
 
 from config.settings import settings
-from src.utils.logger import get_logger
-from src.utils.cost_tracker import CostTracker
+from src.utils.logger import get_logger, traced_node
+from src.utils.cost_tracker import CostTracker, active_cost_tracker
+from src.utils.deadline import Deadline, DeadlineExceeded, stage_timeout
+from src.utils.events import DraftDecided, SearchFinished, SearchStarted, WriterStarted, WriterTokens, emit, listening
+from src.utils.novelty import novelty_score_offloaded
+from src.utils.sections import merge_sections
 from src.tools.search import SearchTool
-from .state import AgentState
-
-# Set environment variables for APIs
-os.environ["TAVILY_API_KEY"] = settings.tavily_api_key
+from src.tools.rerank import Reranker, query_coverage
+from src.prompts import load_prompt
+from src.tools.llm import LLMClient, GenerationCancelled
+from .budget import CONTEXT_SEPARATOR, MAP_REDUCE, REFUSE, BudgetExceeded, plan_report
+from .state import AgentState, BranchState, MultiHopState, RefreshState
 
 logger = get_logger()
 
 
-class SearchNode:
+def _elapsed_ms(started: float) -> float:
+    return round((time.monotonic() - started) * 1000, 1)
+
+
+class _CostCharging:
+    """Mixin for nodes that record search and LLM costs."""
+    
+    _cost_tracker: CostTracker
+    
+    @property
+    def cost_tracker(self) -> CostTracker:
+        """The current run's tracker (see track_costs), or the one the node was built with."""
+        return active_cost_tracker() or self._cost_tracker
+
+
+class SearchNode(_CostCharging):
     """Node responsible for web search operations."""
     
     def __init__(self, cost_tracker: CostTracker):
         self.search_tool = SearchTool()
-        self.cost_tracker = cost_tracker
+        self.reranker = Reranker(
+            lexical_weight=settings.rerank_lexical_weight, semantic=settings.rerank_semantic
+        )
+        self._cost_tracker = cost_tracker
+    
+    def fetch(
+        self,
+        query: str,
+        timeout: Optional[float] = None,
+        rank_query: Optional[str] = None,
+        exclude_urls: Optional[set] = None,
+        seen_texts: Optional[List[str]] = None,
+        **options
+    ) -> List[Dict[str, Any]]:
+        """
+        Search, rerank locally and keep the best max_search_results hits.
+        
+        With reranking enabled, rerank_fetch_results candidates are
+        requested so the local scorer has more to choose from than the
+        provider's own top few. With adaptive depth, a small shallow batch
+        is fetched first, and the search is only deepened (more candidates,
+        the deeper search_depth, up to adaptive_max_results kept) when that
+        batch is both new relative to seen_texts and relevant to the query.
+        
+        Args:
+            query: Search query
+            timeout: Time budget for the search in seconds
+            rank_query: Text to rank against (defaults to the query)
+            exclude_urls: URLs to drop before ranking
+            seen_texts: Context already gathered, for the novelty check
+            **options: Provider search options (search_depth, topic, days, ...)
+            
+        Returns:
+            Ranked results that have content
+        """
+        emit(SearchStarted(query=query))
+        started = time.monotonic()
+        try:
+            if settings.enable_adaptive_depth:
+                results, deepened = self._fetch_adaptive(query, timeout, rank_query or query, exclude_urls, seen_texts, options)
+            else:
+                results, deepened = self._fetch(query, timeout, rank_query or query, exclude_urls, options), False
+        except Exception as e:
+            emit(SearchFinished(query=query, results=0, elapsed_ms=_elapsed_ms(started), error=str(e)))
+            raise
+        emit(SearchFinished(query=query, results=len(results), elapsed_ms=_elapsed_ms(started), deepened=deepened))
+        return results
+    
+    def _fetch(
+        self,
+        query: str,
+        timeout: Optional[float],
+        rank_query: str,
+        exclude_urls: Optional[set],
+        options: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        top_k = settings.max_search_results
+        fetch_k = max(settings.rerank_fetch_results, top_k) if settings.enable_rerank else top_k
+        results = self._request(query, timeout, fetch_k, exclude_urls, options)
+        return self._rank(rank_query, results, top_k)
+    
+    def _fetch_adaptive(
+        self,
+        query: str,
+        timeout: Optional[float],
+        rank_query: str,
+        exclude_urls: Optional[set],
+        seen_texts: Optional[List[str]],
+        options: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Fetch a small shallow batch, deepening only if it looks rich."""
+        deadline = Deadline.after(timeout) if timeout is not None else None
+        top_k = settings.max_search_results
+        first_options = {"search_depth": settings.search_depth, **options}
+        first = self._request(query, timeout, max(settings.adaptive_initial_fetch, top_k), exclude_urls, first_options)
+        kept = self._rank(rank_query, first, top_k)
+        
+        texts = [res['content'] for res in kept]
+        if not texts or len(first) < settings.adaptive_initial_fetch:
+            # Fewer usable results than requested: a deeper request would not add many
+            return kept, False
+        novelty = novelty_score_offloaded(texts, seen_texts or [])
+        relevance = query_coverage(rank_query, texts)
+        if novelty < settings.adaptive_novelty_threshold or relevance < settings.adaptive_relevance_threshold:
+            logger.debug("Search kept shallow (novelty %.2f, relevance %.2f)", novelty, relevance)
+            return kept, False
+        if deadline is not None and deadline.remaining() < settings.search_timeout_seconds / 2:
+            return kept, False
+        
+        logger.info("🔬 Deepening search (novelty %.2f, relevance %.2f)", novelty, relevance)
+        deep_options = {"search_depth": settings.deep_search_depth, **options}
+        fetch_k = settings.adaptive_max_results
+        if settings.enable_rerank:
+            fetch_k = max(settings.rerank_fetch_results, fetch_k)
+        try:
+            more = self._request(query, deadline.remaining() if deadline else None, fetch_k, exclude_urls, deep_options)
+        except Exception as e:
+            logger.warning("Deeper search failed, keeping the first batch: %s", e)
+            return kept, False
+        
+        known = {res.get('url') for res in first}
+        merged = first + [res for res in more if res.get('url') not in known]
+        return self._rank(rank_query, merged, max(settings.adaptive_max_results, top_k)), True
+    
+    def _request(
+        self,
+        query: str,
+        timeout: Optional[float],
+        max_results: int,
+        exclude_urls: Optional[set],
+        options: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """One provider request, charged and filtered to usable results."""
+        results = self.search_tool.search(query, timeout=timeout, max_results=max_results, **options)
+        
+        if settings.track_costs:
+            self.cost_tracker.track_search(num_results=len(results))
+        
+        exclude_urls = exclude_urls or set()
+        return [
+            res for res in results
+            if res.get('content') and res.get('url') not in exclude_urls
+        ]
     
-    def __call__(self, state: AgentState) -> Dict[str, Any]:
+    def _rank(self, rank_query: str, results: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+        if not settings.enable_rerank:
+            return results[:top_k]
+        return self.reranker.rerank(rank_query, results, top_k)
+    
+    @traced_node("search")
+    def __call__(self, state: AgentState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
         """
         Execute web search for the given task.
         
         Args:
             state: Current agent state
+            config: Run config, optionally carrying a deadline
             
         Returns:
             State update with search results
         """
         try:
-            logger.info(f"🔎 Search attempt #{state['attempts'] + 1}: {state['task']}")
-            
-            # Perform search
-            results = self.search_tool.search(state['task'])
+            logger.info("🔎 Search attempt #%s: %s", state['attempts'] + 1, state['task'])
             
-            # Track cost
-            if settings.track_costs:
-                self.cost_tracker.track_search(num_results=len(results))
+            # Perform search, keeping time back for the writer
+            timeout = stage_timeout(
+                config,
+                settings.search_timeout_seconds,
+                reserve=settings.writer_reserve_seconds
+            )
+            results = self.fetch(state['task'], timeout=timeout, seen_texts=state['search_results'])
             
             # Extract content
-            content = [res.get('content', '') for res in results if res.get('content')]
+            content = [res['content'] for res in results]
+            
+            sources = [res['url'] for res in results if res.get('url')]
             
             if not content:
                 logger.warning("No search results found")
                 return {
                     "search_results": ["No results found"],
+                    "sources": [],
                     "attempts": state['attempts'] + 1,
                     "error": "No search results"
                 }
             
-            logger.info(f"✅ Found {len(content)} results")
+            logger.info("✅ Found %s results", len(content))
             
             return {
                 "search_results": content,
+                "sources": sources,
                 "attempts": state['attempts'] + 1,
                 "error": None
             }
             
         except Exception as e:
-            logger.error(f"❌ Search failed: {str(e)}")
+            logger.error("❌ Search failed: %s", e)
             return {
                 "search_results": [f"Search error: {str(e)}"],
+                "sources": [],
                 "attempts": state['attempts'] + 1,
                 "error": str(e)
             }
 
 
-class WriterNode:
+class WriterNode(_CostCharging):
     """Node responsible for synthesizing research reports."""
     
     def __init__(self, cost_tracker: CostTracker):
-        from openai import OpenAI
-        
-        # Initialize Groq client (OpenAI-compatible)
-        self.client = OpenAI(
-            api_key=settings.groq_api_key,
-            base_url="https://api.groq.com/openai/v1",
-        )
-        self.cost_tracker = cost_tracker
+        self.llm = LLMClient()
+        self.prompt = load_prompt("writer")
+        self.map_prompt = load_prompt("map_summary")
+        self._cost_tracker = cost_tracker
     
-    def __call__(self, state: AgentState) -> Dict[str, Any]:
+    @traced_node("writer")
+    def __call__(self, state: AgentState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
         """
         Generate a research report from search results.
         
         Args:
             state: Current agent state
+            config: Run config, optionally carrying a deadline
             
         Returns:
             State update with final report
@@ -96,30 +258,8 @@ class WriterNode:
         try:
             logger.info("✍️ Generating research report...")
             
-            # Combine all search results
-            context = "\n\n---\n\n".join(state['search_results'])
-            
-            # Build prompt
-            prompt = self._build_prompt(state['task'], context)
-            
-            # Generate report using Groq
-            response = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",  # Groq's best model
-                messages=[
-                    {"role": "system", "content": "You are a Senior Research Analyst."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=settings.model_temperature,
-                max_tokens=2000
-            )
-            
-            report_content = response.choices[0].message.content
-            
-            # Track cost
-            if settings.track_costs:
-                input_tokens = response.usage.prompt_tokens
-                output_tokens = response.usage.completion_tokens
-                self.cost_tracker.track_llm(input_tokens, output_tokens)
+            timeout = stage_timeout(config, settings.llm_timeout_seconds)
+            report_content = self.generate(state['task'], state['search_results'], timeout=timeout)
             
             logger.info("✅ Report generated successfully")
             
@@ -131,37 +271,112 @@ class WriterNode:
                 "error": None
             }
             
+        except BudgetExceeded as e:
+            logger.warning("💸 Report refused: %s", e)
+            return {
+                "final_report": f"Report not generated: {str(e)}",
+                "error": str(e)
+            }
+            
         except Exception as e:
-            import traceback
-            logger.error(f"❌ Report generation failed: {str(e)}")
-            logger.error(f"Full traceback: {traceback.format_exc()}")
+            logger.error("❌ Report generation failed: %s", e, exc_info=True)
             return {
                 "final_report": f"Error generating report: {str(e)}",
                 "error": str(e)
             }
     
-    def _build_prompt(self, task: str, context: str) -> str:
-        """Build the prompt for report generation."""
-        return f"""You are a Senior Research Analyst with expertise in synthesizing information.
-
-Your task is to write a comprehensive, factual research report based ONLY on the context provided.
-
-User Query: {task}
-
-Context from web sources:
-{context}
-
-Instructions:
-1. Answer the user's query directly and comprehensively
-2. Focus on facts, data, and numbers
-3. Cite sources using [Source 1], [Source 2], etc.
-4. Organize information logically with clear sections
-5. If information is incomplete, state what's missing
-6. Be concise but thorough
-7. Use professional language
-
-Write the research report now:
-"""
+    def generate(
+        self,
+        task: str,
+        search_results: List[str],
+        cancel_event: Optional[threading.Event] = None,
+        timeout: Optional[float] = None,
+        speculative: bool = False
+    ) -> str:
+        """
+        Generate report text for a task from search results.
+        
+        Args:
+            task: User's research query
+            search_results: Context snippets to synthesize
+            cancel_event: If given, the report is streamed and generation
+                stops as soon as the event is set
+            timeout: Wall-clock budget for the LLM call in seconds
+            speculative: Tag the writer events as a draft that may still
+                be discarded
+            
+        Returns:
+            Report content
+            
+        Raises:
+            GenerationCancelled: If cancelled or out of time mid-stream
+            BudgetExceeded: If the report would exceed the token or cost budget
+        """
+        # Decide how to fit the context before spending any tokens
+        plan = plan_report(task, search_results, self.cost_tracker, self.prompt, self.map_prompt)
+        logger.info("🧮 Report plan: %s (~%s prompt tokens, ~$%.4f)", plan.strategy, plan.prompt_tokens, plan.cost_usd)
+        if plan.strategy == REFUSE:
+            raise BudgetExceeded(plan.reason)
+        
+        deadline = Deadline.after(timeout) if timeout is not None else None
+        snippets = plan.context
+        if plan.strategy == MAP_REDUCE:
+            snippets = self._summarize_chunks(task, plan.chunks, cancel_event, deadline)
+        
+        # Build prompt: fixed instructions first, per-call data last
+        messages = self.prompt.render(context=CONTEXT_SEPARATOR.join(snippets), task=task)
+        emit(WriterStarted(
+            strategy=plan.strategy,
+            prompt_tokens=plan.prompt_tokens,
+            max_output_tokens=settings.writer_max_output_tokens,
+            speculative=speculative
+        ))
+        
+        # Generate report using Groq, streaming text to progress listeners
+        return self._complete(
+            messages,
+            max_tokens=settings.writer_max_output_tokens,
+            timeout=deadline.budget(timeout) if deadline else None,
+            cancel_event=cancel_event,
+            on_text=(lambda text: emit(WriterTokens(text=text, speculative=speculative))) if listening() else None
+        )
+    
+    def _complete(self, messages: List[Dict[str, str]], **options) -> str:
+        """Run an LLM call and charge it, including calls cancelled mid-stream."""
+        try:
+            response = self.llm.complete(messages, **options)
+        except GenerationCancelled as e:
+            # An aborted stream is still billed for its prompt and partial output
+            if settings.track_costs:
+                self.cost_tracker.track_llm(e.prompt_tokens, e.completion_tokens)
+            raise
+        
+        # Track cost
+        if settings.track_costs:
+            self.cost_tracker.track_llm(response.prompt_tokens, response.completion_tokens, response.cached_tokens)
+        
+        return response.content
+    
+    def _summarize_chunks(
+        self,
+        task: str,
+        chunks: List[List[str]],
+        cancel_event: Optional[threading.Event],
+        deadline: Optional[Deadline]
+    ) -> List[str]:
+        """Summarize context chunks in parallel (the map step of map-reduce)."""
+        def summarize(chunk: List[str]) -> str:
+            return self._complete(
+                self.map_prompt.render(context=CONTEXT_SEPARATOR.join(chunk), task=task),
+                max_tokens=settings.map_reduce_summary_tokens,
+                timeout=deadline.budget(settings.llm_timeout_seconds) if deadline else None,
+                cancel_event=cancel_event
+            )
+        
+        logger.info("🗜️ Summarizing %s context chunks before writing", len(chunks))
+        with ThreadPoolExecutor(max_workers=min(len(chunks), 4)) as pool:
+            futures = [pool.submit(contextvars.copy_context().run, summarize, chunk) for chunk in chunks]
+            return [future.result() for future in futures]
     
     def _print_report(self, report: str) -> None:
         """Print the report with formatting."""
@@ -170,3 +385,389 @@ Write the research report now:
         print("="*80 + "\n")
         print(report)
         print("\n" + "="*80 + "\n")
+
+
+class SpeculativeWriterNode:
+    """
+    Node that overlaps the final search with a draft report.
+    
+    The draft is written from the context gathered so far while the last
+    search is in flight. If the final results add little new information
+    the draft is accepted; otherwise it is cancelled and the report is
+    rewritten from the full context.
+    """
+    
+    def __init__(self, search_node: SearchNode, writer_node: WriterNode):
+        self.search_node = search_node
+        self.writer_node = writer_node
+    
+    @traced_node("speculate")
+    def __call__(self, state: AgentState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
+        """
+        Run the final search and a draft report concurrently.
+        
+        Args:
+            state: Current agent state
+            config: Run config, optionally carrying a deadline
+            
+        Returns:
+            State update with the final search results and report
+        """
+        logger.info("⚡ Drafting report while the final search runs...")
+        cancel_event = threading.Event()
+        
+        try:
+            timeout = stage_timeout(config, settings.llm_timeout_seconds)
+        except DeadlineExceeded:
+            # Out of time: fall back to writing from what we already have
+            return self.writer_node(state, config)
+        
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            draft_future = pool.submit(
+                contextvars.copy_context().run,
+                self.writer_node.generate,
+                state['task'],
+                state['search_results'],
+                cancel_event,
+                timeout,
+                True
+            )
+            
+            search_update = self.search_node(state, config)
+            new_results = [] if search_update.get('error') else search_update['search_results']
+            novelty = novelty_score_offloaded(new_results, state['search_results'])
+            discard = novelty > settings.speculative_novelty_threshold
+            
+            if discard:
+                logger.info("Final search novelty %.2f. Discarding draft...", novelty)
+                cancel_event.set()
+            else:
+                logger.info("Final search novelty %.2f. Keeping draft...", novelty)
+            
+            try:
+                draft = draft_future.result()
+            except GenerationCancelled:
+                draft = None
+            except Exception as e:
+                logger.warning("Draft report failed: %s", e)
+                draft = None
+            
+            # A draft that finished before the cancel is just as stale
+            # (its cost was charged when it completed)
+            if discard:
+                draft = None
+        
+        # Listeners drop the draft text they were shown unless it is kept
+        emit(DraftDecided(accepted=draft is not None, novelty=novelty))
+        
+        if draft is None:
+            writer_update = self.writer_node({
+                **state,
+                "search_results": state['search_results'] + search_update['search_results']
+            }, config)
+            return {**search_update, **writer_update}
+        
+        logger.info("✅ Report generated successfully")
+        self.writer_node._print_report(draft)
+        
+        return {
+            **search_update,
+            "final_report": draft,
+            "error": None
+        }
+
+
+class PlannerNode(_CostCharging):
+    """Node that breaks a research task into independent sub-questions."""
+    
+    def __init__(self, cost_tracker: CostTracker):
+        self.llm = LLMClient()
+        self.prompt = load_prompt("planner")
+        self._cost_tracker = cost_tracker
+    
+    @traced_node("planner")
+    def __call__(self, state: MultiHopState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
+        """
+        Plan sub-questions for the task.
+        
+        Args:
+            state: Current agent state
+            config: Run config, optionally carrying a deadline
+            
+        Returns:
+            State update with the sub-questions to research
+        """
+        limit = settings.multi_hop_max_subquestions
+        try:
+            logger.info("🧭 Planning sub-questions: %s", state['task'])
+            
+            response = self.llm.complete(
+                self.prompt.render(limit=limit, task=state['task']),
+                max_tokens=300,
+                timeout=stage_timeout(config, settings.llm_timeout_seconds, reserve=settings.writer_reserve_seconds)
+            )
+            if settings.track_costs:
+                self.cost_tracker.track_llm(response.prompt_tokens, response.completion_tokens, response.cached_tokens)
+            
+            sub_questions = self._parse(response.content)[:limit]
+        except Exception as e:
+            logger.warning("Planning failed, researching the task directly: %s", e)
+            sub_questions = []
+        
+        if not sub_questions:
+            sub_questions = [state['task']]
+        
+        logger.info("✅ Planned %s sub-questions", len(sub_questions))
+        return {"sub_questions": sub_questions}
+    
+    @staticmethod
+    def _parse(content: str) -> List[str]:
+        """Extract sub-questions from a JSON array, or one per line as a fallback."""
+        match = re.search(r"\[.*\]", content, re.DOTALL)
+        if match:
+            try:
+                items = json.loads(match.group(0))
+                return [str(item).strip() for item in items if str(item).strip()]
+            except json.JSONDecodeError:
+                pass
+        lines = (re.sub(r"^[\s\-*\d.)]+", "", line).strip() for line in content.splitlines())
+        return [line for line in lines if line.endswith("?")]
+
+
+class BranchNode(_CostCharging):
+    """
+    Node that researches one sub-question.
+    
+    Each hop searches, then summarizes everything the branch has found;
+    the summary may name a follow-up query for the next hop. A branch stops
+    at the depth limit, when it runs out of token or time budget, or when
+    a hop adds nothing new.
+    """
+    
+    def __init__(self, search_node: SearchNode, cost_tracker: CostTracker):
+        self.search_node = search_node
+        self.llm = LLMClient()
+        self.prompt = load_prompt("branch")
+        self._cost_tracker = cost_tracker
+    
+    @traced_node("branch")
+    def __call__(self, state: BranchState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
+        """
+        Research a sub-question within the branch budget.
+        
+        Args:
+            state: Branch input with the task and sub-question
+            config: Run config, optionally carrying a deadline
+            
+        Returns:
+            State update with the branch summary, sources and findings
+        """
+        question = state['sub_question']
+        snippets: List[str] = []
+        sources: List[str] = []
+        summary = ""
+        tokens_used = 0
+        searches = 0
+        query = question
+        
+        try:
+            budget_seconds = stage_timeout(
+                config,
+                settings.branch_timeout_seconds,
+                reserve=settings.writer_reserve_seconds
+            )
+            deadline = Deadline.after(budget_seconds)
+            
+            for hop in range(settings.multi_hop_max_depth):
+                logger.info("🔎 Branch hop %s: %s", hop + 1, query)
+                results = self.search_node.fetch(
+                    query,
+                    timeout=deadline.budget(settings.search_timeout_seconds),
+                    rank_query=question if hop == 0 else f"{question} {query}",
+                    seen_texts=snippets
+                )
+                searches += 1
+                
+                new_snippets = [res['content'] for res in results]
+                if hop > 0 and novelty_score_offloaded(new_snippets, snippets) < settings.branch_min_novelty:
+                    logger.info("Branch hop %s added little new information. Stopping.", hop + 1)
+                    break
+                snippets.extend(new_snippets)
+                sources.extend(res['url'] for res in results if res.get('url'))
+                
+                response = self.llm.complete(
+                    self.prompt.render(
+                        context="\n\n---\n\n".join(snippets),
+                        task=state['task'],
+                        question=question
+                    ),
+                    max_tokens=500,
+                    timeout=deadline.budget(settings.llm_timeout_seconds)
+                )
+                tokens_used += response.prompt_tokens + response.completion_tokens
+                if settings.track_costs:
+                    self.cost_tracker.track_llm(response.prompt_tokens, response.completion_tokens, response.cached_tokens)
+                
+                summary, follow_up = self._split_follow_up(response.content)
+                if not follow_up or tokens_used >= settings.branch_max_tokens:
+                    break
+                query = follow_up
+        
+        except Exception as e:
+            logger.warning("Branch '%s' stopped early: %s", question, e)
+        
+        if not summary:
+            # No summary (budget or LLM failure): fall back to raw snippets
+            summary = "\n".join(snippets) or "No findings"
+        
+        logger.info("✅ Branch finished after %s searches: %s", searches, question)
+        return {
+            "search_results": [f"Sub-question: {question}\nFindings: {summary}"],
+            "sources": sources,
+            "branch_findings": [{
+                "question": question,
+                "summary": summary,
+                "sources": sources,
+                "searches": searches,
+                "tokens": tokens_used,
+            }]
+        }
+    
+    @staticmethod
+    def _split_follow_up(content: str):
+        """Separate the summary from an optional trailing follow-up query."""
+        match = re.search(r"^FOLLOW-UP:\s*(.+)$", content, re.MULTILINE)
+        if not match:
+            return content.strip(), None
+        return content[:match.start()].strip(), match.group(1).strip()
+
+
+class RefreshSearchNode:
+    """Node that searches only for information newer than the previous run."""
+    
+    def __init__(self, search_node: SearchNode):
+        self.search_node = search_node
+    
+    @traced_node("refresh_search")
+    def __call__(self, state: RefreshState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
+        """
+        Run a date-filtered search and drop sources the report already uses.
+        
+        Args:
+            state: Current refresh state
+            config: Run config, optionally carrying a deadline
+            
+        Returns:
+            State update with only the new search results
+        """
+        days = self._days_since(state.get('since'))
+        try:
+            logger.info("🔄 Searching for updates from the last %s day(s): %s", days, state['task'])
+            
+            timeout = stage_timeout(
+                config,
+                settings.search_timeout_seconds,
+                reserve=settings.writer_reserve_seconds
+            )
+            fresh = self.search_node.fetch(
+                state['task'],
+                timeout=timeout,
+                exclude_urls=set(state.get('known_sources') or []),
+                topic="news",
+                days=days
+            )
+            logger.info("✅ Found %s new sources", len(fresh))
+            
+            return {
+                "search_results": [res['content'] for res in fresh],
+                "sources": [res['url'] for res in fresh if res.get('url')],
+                "attempts": state['attempts'] + 1,
+                "error": None
+            }
+            
+        except Exception as e:
+            logger.error("❌ Refresh search failed: %s", e)
+            return {
+                "search_results": [],
+                "sources": [],
+                "attempts": state['attempts'] + 1,
+                "error": str(e)
+            }
+    
+    @staticmethod
+    def _days_since(since: Optional[str]) -> int:
+        """Whole days since the previous run, at least one (one if unknown)."""
+        if not since:
+            return 1
+        try:
+            previous = datetime.fromisoformat(since)
+        except (TypeError, ValueError):
+            logger.warning("⚠️ Unreadable previous run time %r; searching the last day", since)
+            return 1
+        if previous.tzinfo is not None:
+            # History timestamps are naive local time; compare aware ones in the same terms
+            previous = previous.astimezone().replace(tzinfo=None)
+        elapsed = datetime.now() - previous
+        return max(1, math.ceil(elapsed.total_seconds() / 86400))
+
+
+class PatchWriterNode:
+    """
+    Node that updates a previous report instead of rewriting it.
+    
+    The LLM sees the previous report and only the new findings, and returns
+    just the sections that change; those are merged into the old report.
+    With no new findings the previous report is returned without an LLM call.
+    """
+    
+    def __init__(self, writer_node: WriterNode):
+        self.writer_node = writer_node
+        self.prompt = load_prompt("patch_writer")
+    
+    @traced_node("patch_writer")
+    def __call__(self, state: RefreshState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
+        """
+        Patch the previous report with new findings.
+        
+        Args:
+            state: Current refresh state
+            config: Run config, optionally carrying a deadline
+            
+        Returns:
+            State update with the refreshed report
+        """
+        previous = state['previous_report']
+        if not state['search_results']:
+            logger.info("No new information since the last run. Keeping previous report.")
+            return {"final_report": previous, "error": state.get('error')}
+        
+        try:
+            logger.info("✍️ Patching report with new findings...")
+            
+            response = self.writer_node.llm.complete(
+                self.prompt.render(
+                    previous=previous,
+                    context="\n\n---\n\n".join(state['search_results']),
+                    task=state['task']
+                ),
+                max_tokens=1000,
+                timeout=stage_timeout(config, settings.llm_timeout_seconds)
+            )
+            
+            if settings.track_costs:
+                self.writer_node.cost_tracker.track_llm(response.prompt_tokens, response.completion_tokens, response.cached_tokens)
+            
+            patch = response.content.strip()
+            if patch.upper().startswith("NO CHANGES"):
+                report = previous
+            else:
+                report = merge_sections(previous, patch)
+            
+            logger.info("✅ Report refreshed successfully")
+            self.writer_node._print_report(report)
+            
+            return {"final_report": report, "error": None}
+            
+        except Exception as e:
+            logger.error("❌ Report refresh failed: %s", e)
+            return {"final_report": previous, "error": str(e)}
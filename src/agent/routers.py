@@ -1,14 +1,48 @@
 """Router functions for controlling agent workflow."""
 
-from typing import Literal
+from typing import List, Literal, Optional
+from langchain_core.runnables import RunnableConfig
+from langgraph.types import Send
 from config.settings import settings
 from src.utils.logger import get_logger
-from .state import AgentState
+from src.utils.deadline import deadline_from_config
+from src.utils.events import RouteDecided, SubQuestionsPlanned, emit
+from .state import AgentState, MultiHopState
 
 logger = get_logger()
 
 
-def should_continue_search(state: AgentState) -> Literal["search", "writer"]:
+def useful_results(results: List[str]) -> List[str]:
+    """Filter out placeholder entries written by SearchNode on failure."""
+    return [
+        r for r in results
+        if r != "No results found" and not r.startswith("Search error:")
+    ]
+
+
+def sufficiency_score(state: AgentState) -> float:
+    """
+    Estimate how much of the expected context has been gathered.
+    
+    The expected amount is a full page of results for every allowed
+    search attempt, so the score approaches 1.0 as the loop nears its end.
+    
+    Args:
+        state: Current agent state
+        
+    Returns:
+        Score between 0.0 and 1.0
+    """
+    expected = settings.max_search_results * settings.max_search_attempts
+    if expected <= 0:
+        return 1.0
+    return min(1.0, len(useful_results(state['search_results'])) / expected)
+
+
+def should_continue_search(
+    state: AgentState,
+    config: Optional[RunnableConfig] = None
+) -> Literal["search", "speculate", "writer"]:
     """
     Decide whether to continue searching or write the report.
     
@@ -19,29 +53,53 @@ def should_continue_search(state: AgentState) -> Literal["search", "writer"]:
     
     Args:
         state: Current agent state
+        config: Run config, optionally carrying a deadline
         
     Returns:
-        "search" to continue searching, "writer" to generate report
+        "search" to continue searching, "speculate" to run the final
+        search alongside a draft report, "writer" to generate report
     """
+    decision = _route(state, config)
+    emit(RouteDecided(decision=decision, attempts=state['attempts'], max_attempts=settings.max_search_attempts))
+    return decision
+
+
+def _route(state: AgentState, config: Optional[RunnableConfig]) -> Literal["search", "speculate", "writer"]:
     attempts = state['attempts']
     max_attempts = settings.max_search_attempts
     
     # Check if we have errors
     if state.get('error') and attempts >= max_attempts:
-        logger.warning(f"Max attempts ({max_attempts}) reached with errors. Moving to writer.")
+        logger.warning("Max attempts (%s) reached with errors. Moving to writer.", max_attempts)
+        return "writer"
+    
+    # Stop searching once only the writer's share of the deadline is left
+    deadline = deadline_from_config(config)
+    if deadline is not None and deadline.remaining() <= settings.writer_reserve_seconds:
+        logger.warning("Run deadline near (%.1fs left). Moving to writer.", deadline.remaining())
         return "writer"
     
     # Continue searching if under limit
     if attempts < max_attempts:
-        logger.info(f"Search attempts: {attempts}/{max_attempts}. Continuing search...")
+        # Draft the report while the final search is still running
+        if settings.enable_speculative_writer and attempts == max_attempts - 1:
+            score = sufficiency_score(state)
+            if score >= settings.speculative_sufficiency_threshold:
+                logger.info("Sufficiency %.2f. Speculating on final search...", score)
+                return "speculate"
+        
+        logger.info("Search attempts: %s/%s. Continuing search...", attempts, max_attempts)
         return "search"
     
     # Reached limit, time to write
-    logger.info(f"Search attempts: {attempts}/{max_attempts}. Moving to report generation.")
+    logger.info("Search attempts: %s/%s. Moving to report generation.", attempts, max_attempts)
     return "writer"
 
 
-def smart_router(state: AgentState) -> Literal["search", "writer"]:
+def smart_router(
+    state: AgentState,
+    config: Optional[RunnableConfig] = None
+) -> Literal["search", "speculate", "writer"]:
     """
     Advanced router that could use LLM to evaluate quality.
     
@@ -53,4 +111,26 @@ def smart_router(state: AgentState) -> Literal["search", "writer"]:
     """
     # For now, delegate to simple router
     # TODO: Implement LLM-based quality evaluation
-    return should_continue_search(state)
+    return should_continue_search(state, config)
+
+
+def fan_out_sub_questions(state: MultiHopState) -> List[Send]:
+    """
+    Start one research branch per planned sub-question.
+    
+    The branches run in parallel in the same graph step, so wall time is
+    bounded by the slowest branch rather than the sum of all of them.
+    
+    Args:
+        state: Current agent state
+        
+    Returns:
+        One Send to the branch node per sub-question
+    """
+    sub_questions = state['sub_questions'][:settings.multi_hop_max_subquestions]
+    logger.info("Fanning out %s research branches", len(sub_questions))
+    emit(SubQuestionsPlanned(sub_questions=list(sub_questions)))
+    return [
+        Send("branch", {"task": state['task'], "sub_question": question})
+        for question in sub_questions
+    ]
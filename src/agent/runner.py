@@ -0,0 +1,232 @@
+"""Run a complete research workflow for a query."""
+
+import dataclasses
+import hashlib
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional
+
+from config.settings import settings
+from src.utils.cost_tracker import CostTracker, track_costs
+from src.utils.deadline import Deadline
+from src.utils.events import RunFinished, RunStarted, emit, forward, listen, listening
+from src.utils.logger import get_logger, log_context
+from src.utils.scheduling import current_request, get_run_scheduler, request_context
+from src.utils.singleflight import Flight, SingleFlight
+
+logger = get_logger()
+
+# Identical concurrent runs share one execution
+_run_flights = SingleFlight()
+
+
+@dataclass
+class ResearchResult:
+    """Outcome of one research run."""
+    
+    query: str
+    report: str
+    sources: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    cost: Dict[str, Any] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+    
+    # True when the result came from another caller's identical run
+    shared: bool = False
+
+
+def initial_state(query: str) -> Dict[str, Any]:
+    """Build the starting state for a research run."""
+    return {
+        "task": query,
+        "search_results": [],
+        "sources": [],
+        "attempts": 0,
+        "error": None,
+        "final_report": None
+    }
+
+
+def run_research(
+    query: str,
+    cost_tracker: Optional[CostTracker] = None,
+    mode: Optional[str] = None,
+    timeout: Optional[float] = None,
+    tenant: Optional[str] = None,
+    priority: Optional[str] = None
+) -> ResearchResult:
+    """
+    Build the research graph and run it to completion.
+    
+    If an identical query (same normalized text, mode and priority class)
+    is already running, the call attaches to that run and returns its
+    result instead of starting another one, so an interactive caller never
+    waits behind a queued batch or monitor run. The run's progress events,
+    including the streamed report text, are replayed to the follower's
+    listeners as they happen. Followers count against their own tenant's
+    waiting quota; their cost trackers record nothing, since no extra API
+    calls were made for them.
+    
+    New runs wait for a slot in the run scheduler, which shares capacity
+    fairly between tenants and serves interactive runs before batch and
+    monitor runs. The wait counts towards the deadline.
+    
+    Args:
+        query: Research question
+        cost_tracker: Tracker to record costs in; a fresh one is used if omitted
+        mode: Research mode passed to get_agent
+        timeout: End-to-end deadline in seconds; defaults to RUN_TIMEOUT_SECONDS
+        tenant: Tenant to charge; defaults to the current request context's
+        priority: "interactive", "batch" or "monitor"; defaults to the
+            current request context's
+    
+    Returns:
+        Report, sources, cost summary and timing of the run
+    
+    Raises:
+        QuotaExceeded: If the tenant already has too many runs waiting
+        SchedulerTimeout: If no run slot became free before the deadline
+    """
+    mode = mode or settings.research_mode
+    key = (_normalize(query), mode)
+    return _run(key, query, initial_state(query), cost_tracker, mode, timeout, tenant, priority)
+
+
+def refresh_research(
+    query: str,
+    previous_report: str,
+    known_sources: List[str],
+    since: Optional[str] = None,
+    cost_tracker: Optional[CostTracker] = None,
+    timeout: Optional[float] = None,
+    tenant: Optional[str] = None,
+    priority: Optional[str] = None
+) -> ResearchResult:
+    """
+    Update a previous report with only what changed since it was written.
+    
+    Runs the refresh graph under the same scheduling, deadline, cost and
+    progress handling as run_research. Concurrent refreshes of the same
+    report at the same priority share one execution.
+    
+    Args:
+        query: Research question of the previous report
+        previous_report: Report to update
+        known_sources: Source URLs the previous report already used
+        since: ISO timestamp of the previous report
+        cost_tracker: Tracker to record costs in; a fresh one is used if omitted
+        timeout: End-to-end deadline in seconds; defaults to RUN_TIMEOUT_SECONDS
+        tenant: Tenant to charge; defaults to the current request context's
+        priority: Priority class; defaults to the current request context's
+    
+    Returns:
+        The updated report, with only the newly found sources
+    
+    Raises:
+        QuotaExceeded: If the tenant already has too many runs waiting
+        SchedulerTimeout: If no run slot became free before the deadline
+    """
+    state = {
+        **initial_state(query),
+        "previous_report": previous_report,
+        "known_sources": known_sources,
+        "since": since
+    }
+    report_digest = hashlib.sha256(previous_report.encode("utf-8")).hexdigest()
+    key = (_normalize(query), "refresh", report_digest)
+    return _run(key, query, state, cost_tracker, "refresh", timeout, tenant, priority)
+
+
+def _normalize(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _run(
+    key: Hashable,
+    query: str,
+    state: Dict[str, Any],
+    cost_tracker: Optional[CostTracker],
+    mode: str,
+    timeout: Optional[float],
+    tenant: Optional[str],
+    priority: Optional[str]
+) -> ResearchResult:
+    """Execute a run once for all concurrent callers with the same key."""
+    timeout = timeout or settings.run_timeout_seconds
+    tenant, priority = tenant or current_request()[0], priority or current_request()[1]
+    
+    # Runs are only shared within a priority class, so a follower never
+    # inherits a lower class's place in the queue
+    key = (key, priority)
+    flight, leader = _run_flights.join(key)
+    if not leader:
+        logger.info("Joined in-flight research run: %s", query)
+        with get_run_scheduler().follow(tenant):
+            result = _follow(flight, timeout)
+        return dataclasses.replace(result, query=query, shared=True)
+    
+    try:
+        # Every event is kept on the flight so late followers see the whole run
+        with listen(flight.publish):
+            result = _execute(query, state, cost_tracker, mode, timeout, tenant, priority)
+    except BaseException as e:
+        _run_flights.finish(key, flight, error=e)
+        raise
+    _run_flights.finish(key, flight, result=result)
+    return result
+
+
+def _follow(flight: Flight, timeout: float) -> ResearchResult:
+    """Wait for a shared run, replaying its progress events to this caller's listeners."""
+    if listening():
+        deadline = Deadline.after(timeout)
+        for event in flight.stream(timeout):
+            forward(event)
+        timeout = deadline.remaining()
+    return flight.wait(timeout)
+
+
+def _execute(
+    query: str,
+    state: Dict[str, Any],
+    cost_tracker: Optional[CostTracker],
+    mode: str,
+    timeout: float,
+    tenant: str,
+    priority: str
+) -> ResearchResult:
+    """Wait for a run slot, then invoke the shared graph for a mode once."""
+    from .graph import get_agent
+    
+    cost_tracker = cost_tracker or CostTracker(cost_per_search=settings.cost_per_search)
+    started_at = time.monotonic()
+    deadline = Deadline.after(timeout)
+    
+    with request_context(tenant, priority), get_run_scheduler().slot(timeout=timeout):
+        agent = get_agent(mode)
+        with log_context(run_id=uuid.uuid4().hex[:12], tenant=tenant), track_costs(cost_tracker):
+            emit(RunStarted(query=query, mode=mode))
+            try:
+                final_state = agent.invoke(
+                    state,
+                    config={"configurable": {"deadline": deadline}}
+                )
+            except Exception as e:
+                emit(RunFinished(elapsed_seconds=round(time.monotonic() - started_at, 2), error=str(e)))
+                raise
+            
+            result = ResearchResult(
+                query=query,
+                report=final_state.get("final_report") or "",
+                sources=final_state.get("sources", []),
+                error=final_state.get("error"),
+                cost=cost_tracker.get_summary(),
+                elapsed_seconds=round(time.monotonic() - started_at, 2)
+            )
+            emit(RunFinished(
+                elapsed_seconds=result.elapsed_seconds,
+                error=result.error,
+                cost_usd=result.cost.get("total_cost_usd", 0.0)
+            ))
+    return result
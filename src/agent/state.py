@@ -1,7 +1,7 @@
 """Agent state definition."""
 
 import operator
-from typing import TypedDict, Annotated, List, Optional
+from typing import TypedDict, Annotated, Any, Dict, List, Optional
 
 
 class AgentState(TypedDict):
@@ -19,6 +19,9 @@ class AgentState(TypedDict):
     # Accumulated search results from all searches
     search_results: Annotated[List[str], operator.add]
     
+    # Source URLs for the accumulated search results
+    sources: Annotated[List[str], operator.add]
+    
     # Number of search attempts made
     attempts: int
     
@@ -27,3 +30,38 @@ class AgentState(TypedDict):
     
     # Optional: Final report content
     final_report: Optional[str]
+
+
+class MultiHopState(AgentState):
+    """
+    State for the multi-hop research graph.
+    
+    Branch results are joined through the operator.add reducers, so
+    parallel branches can write to the same keys in one step.
+    """
+    
+    # Sub-questions produced by the planner
+    sub_questions: List[str]
+    
+    # One entry per finished branch: question, summary, sources, searches
+    branch_findings: Annotated[List[Dict[str, Any]], operator.add]
+
+
+class BranchState(TypedDict):
+    """Input sent to each parallel research branch."""
+    
+    task: str
+    sub_question: str
+
+
+class RefreshState(AgentState):
+    """State for refreshing a previous report with new information."""
+    
+    # Report produced by the previous run
+    previous_report: str
+    
+    # Source URLs already used by the previous report
+    known_sources: List[str]
+    
+    # ISO timestamp of the previous run
+    since: Optional[str]
@@ -0,0 +1,24 @@
+"""Shared job queue and cache for running research workers on several nodes."""
+
+from .cache import InMemoryCache, RedisCache, SharedCache, get_shared_cache
+from .fake_redis import FakeRedis, get_redis_client
+from .jobs import InMemoryJobQueue, Job, JobQueue, RedisJobQueue, get_job_queue
+from .worker import Worker, run_queued_research, submit_research, wait_for_job
+
+__all__ = [
+    "InMemoryCache",
+    "RedisCache",
+    "SharedCache",
+    "get_shared_cache",
+    "FakeRedis",
+    "get_redis_client",
+    "InMemoryJobQueue",
+    "Job",
+    "JobQueue",
+    "RedisJobQueue",
+    "get_job_queue",
+    "Worker",
+    "run_queued_research",
+    "submit_research",
+    "wait_for_job",
+]
@@ -0,0 +1,76 @@
+"""
+Command-line interface for queue-based research workers.
+
+Usage:
+    python -m src.cluster worker [--concurrency N]
+    python -m src.cluster submit "QUERY" [--mode multi_hop] [--tenant T] [--priority batch] [--wait]
+    python -m src.cluster status JOB_ID
+"""
+
+import argparse
+import sys
+import threading
+
+from config.settings import settings
+from src.utils.logger import setup_logger
+from src.utils.scheduling import BATCH, PRIORITIES
+from .jobs import get_job_queue
+from .worker import Worker, submit_research, wait_for_job
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Queue-based research workers")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    worker_parser = subparsers.add_parser("worker", help="Run a worker on this node")
+    worker_parser.add_argument("--concurrency", type=int, default=settings.worker_concurrency)
+    
+    submit_parser = subparsers.add_parser("submit", help="Queue a research query")
+    submit_parser.add_argument("query")
+    submit_parser.add_argument("--mode", choices=["iterative", "multi_hop"])
+    submit_parser.add_argument("--wait", action="store_true", help="Wait for the report")
+    submit_parser.add_argument("--tenant", default="cli")
+    submit_parser.add_argument("--priority", choices=PRIORITIES, default=BATCH)
+    
+    status_parser = subparsers.add_parser("status", help="Show a job")
+    status_parser.add_argument("job_id")
+    
+    args = parser.parse_args()
+    setup_logger(
+        level=settings.log_level,
+        fmt=settings.log_format,
+        async_handlers=settings.log_async,
+        sample_window_seconds=settings.log_sample_window_seconds,
+        sample_max_per_window=settings.log_sample_max_per_window
+    )
+    
+    if settings.cluster_backend == "memory" and args.command != "worker":
+        sys.exit("CLUSTER_BACKEND=memory is local to one process; set CLUSTER_BACKEND=redis to share jobs")
+    
+    if args.command == "worker":
+        settings.validate_keys()
+        stop_event = threading.Event()
+        try:
+            Worker().run(stop_event, concurrency=args.concurrency)
+        except KeyboardInterrupt:
+            stop_event.set()
+            sys.exit(0)
+    
+    elif args.command == "submit":
+        job_id = submit_research(args.query, args.mode, tenant=args.tenant, priority=args.priority)
+        print(f"Queued job {job_id} ({get_job_queue().pending()} pending)")
+        if args.wait:
+            job = wait_for_job(job_id)
+            print(job.result["report"] if job.result else f"Job {job.status}: {job.error}")
+    
+    elif args.command == "status":
+        job = get_job_queue().get(args.job_id)
+        if job is None:
+            sys.exit(f"Unknown job {args.job_id}")
+        print(f"{job.id}  {job.status}  attempts={job.attempts}  worker={job.worker or '-'}  {job.payload['query']}")
+        if job.error:
+            print(f"  error: {job.error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Shared key-value cache, so nodes can reuse each other's results."""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from config.settings import settings
+from src.monitor.clock import Clock, SystemClock
+from src.storage.codec import get_codec
+
+
+class SharedCache:
+    """
+    JSON value cache with per-entry time-to-live.
+    
+    Values are stored through the storage codec, so large ones (result
+    lists, reports) are kept compressed.
+    """
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value for a key, or None if missing or expired."""
+        raise NotImplementedError
+    
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a JSON-serializable value."""
+        raise NotImplementedError
+    
+    def delete(self, key: str) -> None:
+        """Remove a key."""
+        raise NotImplementedError
+
+
+class InMemoryCache(SharedCache):
+    """Cache local to this process."""
+    
+    def __init__(self, clock: Optional[Clock] = None):
+        self.clock = clock or SystemClock()
+        self._entries: Dict[str, Tuple[Optional[float], str]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and self.clock.now() >= expires_at:
+                del self._entries[key]
+                return None
+            return get_codec().unpack_text(value)
+    
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        expires_at = self.clock.now() + ttl_seconds if ttl_seconds else None
+        with self._lock:
+            self._entries[key] = (expires_at, get_codec().pack_text(value))
+    
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class RedisCache(SharedCache):
+    """Cache shared by all nodes through Redis."""
+    
+    def __init__(self, client, namespace: str = "dra"):
+        self.client = client
+        self.namespace = namespace
+    
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:cache:{key}"
+    
+    def get(self, key: str) -> Optional[Any]:
+        value = self.client.get(self._key(key))
+        return get_codec().unpack_text(value) if value is not None else None
+    
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        self.client.set(self._key(key), get_codec().pack_text(value), ex=int(ttl_seconds) if ttl_seconds else None)
+    
+    def delete(self, key: str) -> None:
+        self.client.delete(self._key(key))
+
+
+_cache: Optional[SharedCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> SharedCache:
+    """
+    Get the process-wide shared cache for CLUSTER_BACKEND.
+    
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            backend = settings.cluster_backend
+            if backend == "memory":
+                _cache = InMemoryCache()
+            elif backend == "redis":
+                from .fake_redis import get_redis_client
+                
+                _cache = RedisCache(get_redis_client(), namespace=settings.cluster_namespace)
+            else:
+                raise ValueError(f"Unknown CLUSTER_BACKEND '{backend}'. Available: memory, redis")
+        return _cache
@@ -0,0 +1,269 @@
+"""Redis client selection and an in-process stand-in for tests."""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.monitor.clock import Clock, SystemClock
+
+try:
+    from redis.exceptions import WatchError
+except ImportError:
+    class WatchError(Exception):
+        """A watched key changed before a transaction executed."""
+
+
+class FakeRedis:
+    """
+    In-process implementation of the Redis commands the cluster backends use.
+    
+    Values behave like a client created with decode_responses=True. Key
+    expiry follows the given clock, so lease expiry can be tested with a
+    FakeClock. Several workers (threads) sharing one instance behave like
+    nodes sharing one Redis server. Transactions (pipeline, WATCH, MULTI)
+    abort when a watched key is written or expires, as in Redis 6.0.9+.
+    """
+    
+    def __init__(self, clock: Optional[Clock] = None):
+        self.clock = clock or SystemClock()
+        self._data: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.RLock()
+    
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+    
+    def _live(self, key: str) -> bool:
+        expires = self._expires.get(key)
+        if expires is not None and self.clock.now() >= expires:
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+            self._touch(key)
+        return key in self._data
+    
+    def _touch(self, key: str) -> None:
+        """Mark a key as modified for transactions watching it."""
+        self._versions[key] = self._versions.get(key, 0) + 1
+    
+    def _expire_in(self, key: str, seconds: Optional[float]) -> None:
+        self._touch(key)
+        if seconds is None:
+            self._expires.pop(key, None)
+        else:
+            self._expires[key] = self.clock.now() + seconds
+    
+    # Strings
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._data[key] if self._live(key) else None
+    
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ex: Optional[float] = None,
+        px: Optional[int] = None,
+        nx: bool = False
+    ) -> Optional[bool]:
+        with self._lock:
+            if nx and self._live(key):
+                return None
+            self._data[key] = str(value)
+            self._expire_in(key, ex if ex is not None else (px / 1000 if px is not None else None))
+            return True
+    
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            removed = 0
+            for key in keys:
+                if self._live(key):
+                    removed += 1
+                    self._touch(key)
+                self._data.pop(key, None)
+                self._expires.pop(key, None)
+            return removed
+    
+    def incr(self, key: str, amount: int = 1) -> int:
+        with self._lock:
+            value = int(self._data[key]) + amount if self._live(key) else amount
+            self._data[key] = str(value)
+            self._touch(key)
+            return value
+    
+    def expire(self, key: str, seconds: float) -> bool:
+        with self._lock:
+            if not self._live(key):
+                return False
+            self._expire_in(key, seconds)
+            return True
+    
+    def pexpire(self, key: str, milliseconds: int) -> bool:
+        return self.expire(key, milliseconds / 1000)
+    
+    # Hashes
+    
+    def hset(self, key: str, field: Optional[str] = None, value: Any = None, mapping: Optional[Dict[str, Any]] = None) -> int:
+        with self._lock:
+            self._live(key)
+            table = self._data.setdefault(key, {})
+            items = dict(mapping or {})
+            if field is not None:
+                items[field] = value
+            added = sum(1 for name in items if name not in table)
+            table.update({name: str(v) for name, v in items.items()})
+            self._touch(key)
+            return added
+    
+    def hget(self, key: str, field: str) -> Optional[str]:
+        with self._lock:
+            return self._data[key].get(field) if self._live(key) else None
+    
+    def hgetall(self, key: str) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._data[key]) if self._live(key) else {}
+    
+    def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        with self._lock:
+            self._live(key)
+            table = self._data.setdefault(key, {})
+            value = int(table.get(field, 0)) + amount
+            table[field] = str(value)
+            self._touch(key)
+            return value
+    
+    # Sorted sets
+    
+    def zadd(self, key: str, mapping: Dict[str, float], nx: bool = False) -> int:
+        with self._lock:
+            self._live(key)
+            members = self._data.setdefault(key, {})
+            added = 0
+            for member, score in mapping.items():
+                if member in members and nx:
+                    continue
+                added += member not in members
+                members[member] = float(score)
+            self._touch(key)
+            return added
+    
+    def zrem(self, key: str, *members: str) -> int:
+        with self._lock:
+            if not self._live(key):
+                return 0
+            zset = self._data[key]
+            removed = sum(1 for member in members if zset.pop(member, None) is not None)
+            if removed:
+                self._touch(key)
+            if not zset:
+                self.delete(key)
+            return removed
+    
+    def zrange(self, key: str, start: int, end: int) -> List[str]:
+        with self._lock:
+            if not self._live(key):
+                return []
+            ordered: List[Tuple[float, str]] = sorted((score, member) for member, score in self._data[key].items())
+            end = len(ordered) if end == -1 else end + 1
+            return [member for _, member in ordered[start:end]]
+    
+    def zcard(self, key: str) -> int:
+        with self._lock:
+            return len(self._data[key]) if self._live(key) else 0
+    
+    def ping(self) -> bool:
+        return True
+
+
+class FakePipeline:
+    """
+    Transaction on a FakeRedis, used like a redis-py pipeline.
+    
+    After watch() commands run immediately; after multi() they are queued
+    and execute() runs them atomically, raising WatchError instead if a
+    watched key changed in between.
+    """
+    
+    def __init__(self, client: FakeRedis):
+        self.client = client
+        self._watched: Dict[str, int] = {}
+        self._queued: Optional[List[Tuple[str, tuple, dict]]] = None
+    
+    def __enter__(self) -> "FakePipeline":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.reset()
+    
+    def __getattr__(self, name: str):
+        command = getattr(self.client, name)
+        if self._queued is None:
+            return command
+        
+        def queue(*args, **kwargs) -> "FakePipeline":
+            self._queued.append((name, args, kwargs))
+            return self
+        return queue
+    
+    def watch(self, *keys: str) -> None:
+        with self.client._lock:
+            for key in keys:
+                self.client._live(key)
+                self._watched[key] = self.client._versions.get(key, 0)
+    
+    def unwatch(self) -> None:
+        self._watched = {}
+    
+    def multi(self) -> None:
+        self._queued = []
+    
+    def execute(self) -> List[Any]:
+        with self.client._lock:
+            try:
+                for key, version in self._watched.items():
+                    self.client._live(key)
+                    if self.client._versions.get(key, 0) != version:
+                        raise WatchError(f"Watched key '{key}' changed")
+                return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self._queued or []]
+            finally:
+                self.reset()
+    
+    def reset(self) -> None:
+        self._watched = {}
+        self._queued = None
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_redis_client():
+    """
+    Get the process-wide Redis client for REDIS_URL.
+    
+    "fake://" gives a shared in-process FakeRedis, which lets the Redis
+    backends run without a server.
+    
+    Returns:
+        redis.Redis (or FakeRedis) returning str values
+    
+    Raises:
+        ImportError: If a real Redis URL is configured but redis is not installed
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            from config.settings import settings
+            
+            if settings.redis_url.startswith("fake://"):
+                _client = FakeRedis()
+            else:
+                try:
+                    import redis
+                except ImportError as e:
+                    raise ImportError(
+                        "The redis package is required for CLUSTER_BACKEND=redis. "
+                        "Install it with: pip install redis"
+                    ) from e
+                _client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+        return _client
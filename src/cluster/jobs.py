@@ -0,0 +1,413 @@
+"""Shared job queue with leases, for research workers on several nodes."""
+
+import dataclasses
+import json
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from config.settings import settings
+from src.monitor.clock import Clock, SystemClock
+from src.storage.codec import get_codec
+from src.utils.logger import get_logger
+from .fake_redis import WatchError
+
+logger = get_logger()
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """A unit of work and its progress."""
+    
+    id: str
+    payload: Dict[str, Any]
+    status: str = QUEUED
+    attempts: int = 0
+    worker: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+    
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+
+class JobQueue:
+    """
+    Queue of jobs claimed by workers under time-limited leases.
+    
+    A worker that claims a job holds a lease on it and must renew it with
+    heartbeat() while working. If the worker dies the lease expires and
+    the job becomes claimable again, up to max_attempts claims in total.
+    Completing or failing a job requires still holding its lease, so a
+    worker that lost its lease cannot overwrite the retry's result.
+    """
+    
+    def __init__(self, max_attempts: int = 3, retry_delay_seconds: float = 5.0, clock: Optional[Clock] = None):
+        self.max_attempts = max_attempts
+        self.retry_delay_seconds = retry_delay_seconds
+        self.clock = clock or SystemClock()
+    
+    def enqueue(self, payload: Dict[str, Any]) -> str:
+        """
+        Add a job.
+        
+        Args:
+            payload: JSON-serializable job description
+        
+        Returns:
+            Job ID
+        """
+        raise NotImplementedError
+    
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        """
+        Claim the oldest claimable job.
+        
+        Args:
+            worker_id: Claiming worker
+            lease_seconds: How long the claim holds without a heartbeat
+        
+        Returns:
+            The claimed job, or None if nothing is claimable
+        """
+        raise NotImplementedError
+    
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """
+        Extend a lease.
+        
+        Returns:
+            False if the worker no longer holds the lease
+        """
+        raise NotImplementedError
+    
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        """
+        Store a job's result and remove it from the queue.
+        
+        Returns:
+            False if the worker no longer holds the lease
+        """
+        raise NotImplementedError
+    
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        """
+        Record a failed attempt.
+        
+        The job is retried after retry_delay_seconds until it has been
+        claimed max_attempts times, then marked failed.
+        
+        Returns:
+            False if the worker no longer holds the lease
+        """
+        raise NotImplementedError
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job, or None if unknown or expired."""
+        raise NotImplementedError
+    
+    def pending(self) -> int:
+        """Number of jobs not yet finished (queued or running)."""
+        raise NotImplementedError
+
+
+class InMemoryJobQueue(JobQueue):
+    """Job queue for a single process (workers are threads)."""
+    
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        retry_delay_seconds: float = 5.0,
+        result_ttl_seconds: float = 86400.0,
+        clock: Optional[Clock] = None
+    ):
+        super().__init__(max_attempts, retry_delay_seconds, clock)
+        self.result_ttl_seconds = result_ttl_seconds
+        self._jobs: Dict[str, Job] = {}
+        self._order: List[str] = []
+        self._leases: Dict[str, tuple] = {}  # job ID -> (worker ID, expires at)
+        self._lock = threading.Lock()
+    
+    def _holds(self, job_id: str, worker_id: str) -> bool:
+        owner, expires_at = self._leases.get(job_id, (None, 0.0))
+        return owner == worker_id and expires_at > self.clock.now()
+    
+    def enqueue(self, payload: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        now = self.clock.now()
+        with self._lock:
+            # Drop finished jobs whose results have expired
+            for old_id in [j.id for j in self._jobs.values() if j.finished and now - j.updated_at > self.result_ttl_seconds]:
+                del self._jobs[old_id]
+            self._jobs[job_id] = Job(id=job_id, payload=payload, created_at=now, updated_at=now)
+            self._order.append(job_id)
+        return job_id
+    
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        now = self.clock.now()
+        with self._lock:
+            for job_id in list(self._order):
+                if self._leases.get(job_id, (None, 0.0))[1] > now:
+                    continue
+                job = self._jobs[job_id]
+                job.attempts += 1
+                if job.attempts > self.max_attempts:
+                    logger.warning("Job %s abandoned after %s expired leases", job_id, self.max_attempts)
+                    self._finish(job, FAILED, error=job.error or "Lease expired too many times")
+                    continue
+                self._leases[job_id] = (worker_id, now + lease_seconds)
+                job.status, job.worker, job.updated_at = RUNNING, worker_id, now
+                return dataclasses.replace(job)
+        return None
+    
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        with self._lock:
+            if not self._holds(job_id, worker_id):
+                return False
+            self._leases[job_id] = (worker_id, self.clock.now() + lease_seconds)
+            return True
+    
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        with self._lock:
+            if not self._holds(job_id, worker_id):
+                return False
+            self._finish(self._jobs[job_id], DONE, result=result)
+            return True
+    
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        with self._lock:
+            if not self._holds(job_id, worker_id):
+                return False
+            job = self._jobs[job_id]
+            if job.attempts >= self.max_attempts:
+                self._finish(job, FAILED, error=error)
+            else:
+                # Hold the lease for the retry delay so the job is not reclaimed at once
+                self._leases[job_id] = ("", self.clock.now() + self.retry_delay_seconds)
+                job.status, job.error, job.updated_at = QUEUED, error, self.clock.now()
+            return True
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dataclasses.replace(job) if job else None
+    
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._order)
+    
+    def _finish(self, job: Job, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        job.status, job.updated_at = status, self.clock.now()
+        job.result = result
+        job.error = error
+        self._leases.pop(job.id, None)
+        if job.id in self._order:
+            self._order.remove(job.id)
+
+
+class RedisJobQueue(JobQueue):
+    """
+    Job queue shared through Redis.
+    
+    Keys, under a namespace:
+        queue        sorted set of unfinished job IDs by enqueue order
+        seq          counter giving that order
+        job:<id>     hash with the job's fields
+        lease:<id>   worker ID, expiring when the lease does
+    
+    A claim is a SET NX on the lease key, so exactly one worker wins each
+    job, and a dead worker's job becomes claimable again when its lease
+    key expires; no reaper process is needed. Heartbeats, completion and
+    failure are transactions watching the lease key: if the lease expires
+    or is claimed by another worker between the ownership check and the
+    write, the transaction is discarded and the call returns False.
+    """
+    
+    def __init__(
+        self,
+        client,
+        namespace: str = "dra",
+        max_attempts: int = 3,
+        retry_delay_seconds: float = 5.0,
+        result_ttl_seconds: float = 86400.0,
+        scan_limit: int = 100,
+        clock: Optional[Clock] = None
+    ):
+        super().__init__(max_attempts, retry_delay_seconds, clock)
+        self.client = client
+        self.namespace = namespace
+        self.result_ttl_seconds = result_ttl_seconds
+        self.scan_limit = scan_limit
+    
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.namespace, *parts))
+    
+    def _while_holding(self, job_id: str, worker_id: str, write: Callable[[Any], None]) -> bool:
+        """
+        Queue writes on a transaction that only commits if the worker
+        still holds the job's lease when it executes.
+        
+        Returns:
+            False if the worker did not hold the lease, or lost it before
+            the writes committed
+        """
+        lease_key = self._key("lease", job_id)
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(lease_key)
+                if pipe.get(lease_key) != worker_id:
+                    return False
+                pipe.multi()
+                write(pipe)
+                pipe.execute()
+            except WatchError:
+                return False
+        return True
+    
+    def enqueue(self, payload: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        now = self.clock.now()
+        self.client.hset(self._key("job", job_id), mapping={
+            "payload": json.dumps(payload),
+            "status": QUEUED,
+            "attempts": 0,
+            "created_at": now,
+            "updated_at": now,
+        })
+        self.client.zadd(self._key("queue"), {job_id: self.client.incr(self._key("seq"))})
+        return job_id
+    
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        for job_id in self.client.zrange(self._key("queue"), 0, self.scan_limit - 1):
+            lease_key = self._key("lease", job_id)
+            if not self.client.set(lease_key, worker_id, px=int(lease_seconds * 1000), nx=True):
+                continue
+            
+            job_key = self._key("job", job_id)
+            if self.client.hget(job_key, "status") in (DONE, FAILED, None):
+                # Finished (or expired) between listing and claiming
+                self.client.zrem(self._key("queue"), job_id)
+                self.client.delete(lease_key)
+                continue
+            
+            attempts = self.client.hincrby(job_key, "attempts", 1)
+            if attempts > self.max_attempts:
+                logger.warning("Job %s abandoned after %s expired leases", job_id, self.max_attempts)
+                error = self.client.hget(job_key, "error") or "Lease expired too many times"
+                self._finish(job_id, FAILED, error=error)
+                continue
+            
+            self.client.hset(job_key, mapping={"status": RUNNING, "worker": worker_id, "updated_at": self.clock.now()})
+            return self.get(job_id)
+        return None
+    
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        return self._while_holding(
+            job_id, worker_id,
+            lambda pipe: pipe.pexpire(self._key("lease", job_id), int(lease_seconds * 1000))
+        )
+    
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        return self._while_holding(job_id, worker_id, lambda pipe: self._finish(job_id, DONE, result=result, client=pipe))
+    
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        # Attempts only change on a claim, which also replaces the watched lease
+        attempts = int(self.client.hget(self._key("job", job_id), "attempts") or 0)
+        
+        def write(pipe) -> None:
+            if attempts >= self.max_attempts:
+                self._finish(job_id, FAILED, error=error, client=pipe)
+                return
+            pipe.hset(self._key("job", job_id), mapping={"status": QUEUED, "error": error, "updated_at": self.clock.now()})
+            # Hold the lease for the retry delay so the job is not reclaimed at once
+            pipe.set(self._key("lease", job_id), "", px=int(self.retry_delay_seconds * 1000))
+        
+        return self._while_holding(job_id, worker_id, write)
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        data = self.client.hgetall(self._key("job", job_id))
+        if not data:
+            return None
+        return Job(
+            id=job_id,
+            payload=json.loads(data["payload"]),
+            status=data["status"],
+            attempts=int(data.get("attempts", 0)),
+            worker=data.get("worker") or None,
+            result=get_codec().unpack_text(data["result"]) if data.get("result") else None,
+            error=data.get("error") or None,
+            created_at=float(data.get("created_at", 0.0)),
+            updated_at=float(data.get("updated_at", 0.0)),
+        )
+    
+    def pending(self) -> int:
+        return self.client.zcard(self._key("queue"))
+    
+    def _finish(
+        self,
+        job_id: str,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+        client: Any = None
+    ) -> None:
+        """Write a final status, on a transaction if one is given."""
+        client = client or self.client
+        job_key = self._key("job", job_id)
+        fields = {"status": status, "updated_at": self.clock.now()}
+        if result is not None:
+            fields["result"] = get_codec().pack_text(result)
+        if error is not None:
+            fields["error"] = error
+        client.hset(job_key, mapping=fields)
+        client.expire(job_key, int(self.result_ttl_seconds))
+        client.zrem(self._key("queue"), job_id)
+        client.delete(self._key("lease", job_id))
+
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Get the process-wide job queue for CLUSTER_BACKEND.
+    
+    "memory" keeps jobs in this process; "redis" shares them through
+    REDIS_URL (use "fake://" for an in-process stand-in).
+    
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            backend = settings.cluster_backend
+            if backend == "memory":
+                _queue = InMemoryJobQueue(
+                    max_attempts=settings.job_max_attempts,
+                    retry_delay_seconds=settings.job_retry_delay_seconds,
+                    result_ttl_seconds=settings.job_result_ttl_seconds
+                )
+            elif backend == "redis":
+                from .fake_redis import get_redis_client
+                
+                _queue = RedisJobQueue(
+                    get_redis_client(),
+                    namespace=settings.cluster_namespace,
+                    max_attempts=settings.job_max_attempts,
+                    retry_delay_seconds=settings.job_retry_delay_seconds,
+                    result_ttl_seconds=settings.job_result_ttl_seconds
+                )
+            else:
+                raise ValueError(f"Unknown CLUSTER_BACKEND '{backend}'. Available: memory, redis")
+        return _queue
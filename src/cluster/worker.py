@@ -0,0 +1,191 @@
+"""Research workers that drain the shared job queue, and the client side."""
+
+import dataclasses
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from config.settings import settings
+from src.agent.runner import ResearchResult
+from src.utils.logger import get_logger, log_context
+from src.utils.scheduling import current_request
+from .jobs import DONE, Job, JobQueue, get_job_queue
+
+logger = get_logger()
+
+# A handler runs one job payload and returns its JSON-serializable result
+Handler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def research_handler(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a queued research query in this process."""
+    from src.agent.runner import run_research
+    
+    result = run_research(
+        payload["query"],
+        mode=payload.get("mode"),
+        timeout=payload.get("timeout"),
+        tenant=payload.get("tenant"),
+        priority=payload.get("priority")
+    )
+    return dataclasses.asdict(result)
+
+
+class Worker:
+    """
+    Claims jobs from the queue and runs them, renewing each lease while
+    the job runs.
+    
+    A job whose handler raises is failed (and retried by the queue). If a
+    heartbeat finds the lease lost, for example after a long pause, the
+    job keeps running but its result is discarded, since another worker
+    has taken over.
+    """
+    
+    def __init__(
+        self,
+        queue: Optional[JobQueue] = None,
+        handler: Optional[Handler] = None,
+        worker_id: Optional[str] = None,
+        lease_seconds: Optional[float] = None,
+        heartbeat_seconds: Optional[float] = None
+    ):
+        self.queue = queue or get_job_queue()
+        self.handler = handler or research_handler
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds or settings.job_lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds or settings.job_heartbeat_seconds
+    
+    def run_once(self) -> bool:
+        """
+        Claim and run one job.
+        
+        Returns:
+            False if there was nothing to claim
+        """
+        job = self.queue.claim(self.worker_id, self.lease_seconds)
+        if job is None:
+            return False
+        
+        logger.info("📥 Worker %s running job %s (attempt %s)", self.worker_id, job.id, job.attempts)
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, stop), daemon=True)
+        heartbeat.start()
+        try:
+            with log_context(job_id=job.id):
+                result = self.handler(job.payload)
+        except Exception as e:
+            logger.error("❌ Job %s failed: %s", job.id, e)
+            self.queue.fail(job.id, self.worker_id, f"{type(e).__name__}: {e}")
+            return True
+        finally:
+            stop.set()
+            heartbeat.join()
+        
+        if not self.queue.complete(job.id, self.worker_id, result):
+            logger.warning("Lease on job %s was lost; result discarded", job.id)
+        return True
+    
+    def run(self, stop_event: Optional[threading.Event] = None, concurrency: int = 1, poll_seconds: float = 1.0) -> None:
+        """
+        Process jobs until stop_event is set.
+        
+        Args:
+            stop_event: Set to stop after the jobs in progress finish
+            concurrency: Jobs run at once by this worker
+            poll_seconds: Wait between claims when the queue is empty
+        """
+        stop_event = stop_event or threading.Event()
+        
+        def loop() -> None:
+            while not stop_event.is_set():
+                try:
+                    if not self.run_once():
+                        stop_event.wait(poll_seconds)
+                except Exception as e:
+                    # Queue backend unavailable; back off and try again
+                    logger.warning("Worker %s could not claim a job: %s", self.worker_id, e)
+                    stop_event.wait(poll_seconds * 5)
+        
+        logger.info("👷 Worker %s started with %s slots", self.worker_id, concurrency)
+        threads = [threading.Thread(target=loop, name=f"worker-{i}") for i in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    
+    def _heartbeat(self, job: Job, stop: threading.Event) -> None:
+        while not stop.wait(self.heartbeat_seconds):
+            if not self.queue.heartbeat(job.id, self.worker_id, self.lease_seconds):
+                logger.warning("Lost lease on job %s", job.id)
+                return
+
+
+def submit_research(
+    query: str,
+    mode: Optional[str] = None,
+    timeout: Optional[float] = None,
+    queue: Optional[JobQueue] = None,
+    tenant: Optional[str] = None,
+    priority: Optional[str] = None
+) -> str:
+    """
+    Queue a research query for any worker.
+    
+    The tenant and priority default to the current request context's, and
+    are applied by the worker's run scheduler.
+    
+    Returns:
+        Job ID
+    """
+    current_tenant, current_priority = current_request()
+    return (queue or get_job_queue()).enqueue({
+        "query": query,
+        "mode": mode,
+        "timeout": timeout,
+        "tenant": tenant or current_tenant,
+        "priority": priority or current_priority,
+    })
+
+
+def wait_for_job(job_id: str, timeout: Optional[float] = None, poll_seconds: float = 0.5, queue: Optional[JobQueue] = None) -> Job:
+    """
+    Wait until a job finishes.
+    
+    Raises:
+        KeyError: If the job is unknown
+        TimeoutError: If the job is still unfinished after timeout seconds
+    """
+    queue = queue or get_job_queue()
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    while True:
+        job = queue.get(job_id)
+        if job is None:
+            raise KeyError(f"Unknown job {job_id}")
+        if job.finished:
+            return job
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError(f"Job {job_id} still {job.status} after {timeout:.0f}s")
+        time.sleep(poll_seconds)
+
+
+def run_queued_research(query: str, mode: Optional[str] = None, timeout: Optional[float] = None) -> ResearchResult:
+    """
+    Run a research query on a worker and wait for its result.
+    
+    Drop-in alternative to run_research for front ends that should not
+    run the agent themselves.
+    
+    Returns:
+        The worker's ResearchResult, or one carrying the job's error
+    """
+    timeout = timeout or settings.run_timeout_seconds
+    job_id = submit_research(query, mode, timeout)
+    # Allow for queueing and retries on top of the run's own deadline
+    job = wait_for_job(job_id, timeout=timeout * settings.job_max_attempts + settings.job_lease_seconds)
+    if job.status == DONE:
+        return ResearchResult(**job.result)
+    return ResearchResult(query=query, report="", error=job.error)
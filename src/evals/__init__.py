@@ -0,0 +1,24 @@
+"""Offline evaluation of report quality against latency and cost."""
+
+from .fixtures import EvalCase, EvalConfig, load_cases, load_configs
+from .judge import Judge, LLMJudge, StubJudge, get_judge
+from .metrics import citation_validity, fact_coverage, score_report
+from .runner import CaseResult, ConfigResult, mark_pareto_front, run_evaluation
+
+__all__ = [
+    "EvalCase",
+    "EvalConfig",
+    "load_cases",
+    "load_configs",
+    "Judge",
+    "LLMJudge",
+    "StubJudge",
+    "get_judge",
+    "citation_validity",
+    "fact_coverage",
+    "score_report",
+    "CaseResult",
+    "ConfigResult",
+    "mark_pareto_front",
+    "run_evaluation",
+]
@@ -0,0 +1,82 @@
+"""
+Evaluate report quality, latency and cost of several configurations on
+recorded search results, without any network access.
+
+Usage:
+    python -m src.evals [CASES] [--configs FILE] [--judge none|stub|llm]
+                        [--limit N] [--timeout SECONDS] [--save FILE]
+
+Examples:
+    # All bundled cases and configurations, automatic metrics plus stub judge
+    python -m src.evals --judge stub
+    
+    # Two cases, saved for later comparison
+    python -m src.evals benchmarks/evals/cases.jsonl --limit 2 --save evals.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import List
+
+from config.settings import settings
+from src.utils.logger import setup_logger
+from .fixtures import load_cases, load_configs
+from .judge import get_judge
+from .runner import ConfigResult, run_evaluation
+
+DEFAULT_CASES = Path("benchmarks/evals/cases.jsonl")
+DEFAULT_CONFIGS = Path("benchmarks/evals/configs.json")
+
+
+def print_table(results: List[ConfigResult]) -> None:
+    """Print the quality/latency/cost table, Pareto-optimal configurations marked with *."""
+    print(f"\n{'':2}{'Configuration':<18}{'Quality':>9}{'p50 ms':>10}{'p95 ms':>10}"
+          f"{'$/query':>11}{'Tokens':>9}{'Errors':>8}")
+    print("-" * 77)
+    for result in results:
+        print(f"{'*' if result.pareto else '':2}{result.name:<18}{result.quality:>9.3f}"
+              f"{result.latency_p50_ms:>10.0f}{result.latency_p95_ms:>10.0f}"
+              f"{result.cost_per_query_usd:>11.5f}{result.tokens_per_query:>9.0f}{result.errors:>8}")
+    print("\n* on the Pareto front: no other configuration has higher quality, lower latency and lower cost")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cases", nargs="?", default=str(DEFAULT_CASES), help="JSON Lines evaluation cases")
+    parser.add_argument("--configs", default=str(DEFAULT_CONFIGS), help="JSON list of configurations")
+    parser.add_argument("--judge", choices=["none", "stub", "llm"], default="none",
+                        help="Judge folded into quality (llm needs GROQ_API_KEY)")
+    parser.add_argument("--limit", type=int, help="Evaluate only the first N cases")
+    parser.add_argument("--timeout", type=float, help="Per-run deadline in seconds")
+    parser.add_argument("--save", help="Write per-case and aggregated results to this JSON file")
+    args = parser.parse_args()
+    
+    setup_logger(level="WARNING", fmt=settings.log_format, async_handlers=settings.log_async)
+    
+    try:
+        cases = load_cases(args.cases, args.limit)
+        configs = load_configs(args.configs)
+        judge = get_judge(args.judge)
+    except (OSError, ValueError) as e:
+        sys.exit(str(e))
+    if not cases or not configs:
+        sys.exit("Nothing to evaluate")
+    
+    # Writer nodes print each report; keep the console for the table
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results = run_evaluation(cases, configs, judge, args.timeout)
+    
+    print(f"Evaluated {len(configs)} configurations on {len(cases)} cases (judge: {args.judge})")
+    print_table(results)
+    
+    if args.save:
+        Path(args.save).write_text(json.dumps([r.to_dict() for r in results], indent=2) + "\n")
+        print(f"\nSaved to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Evaluation cases with recorded search results, and the configurations to compare."""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+
+@dataclass
+class EvalCase:
+    """
+    One query with the search results recorded for it and what a good
+    report must mention.
+    
+    Each fact is a list of alternative phrasings; the fact counts as
+    covered if the report contains any of them (case-insensitive).
+    """
+    
+    id: str
+    query: str
+    results: List[Dict[str, Any]]
+    facts: List[List[str]] = field(default_factory=list)
+    # Extra results a provider only returns for search_depth="advanced"
+    advanced_results: List[Dict[str, Any]] = field(default_factory=list)
+    sub_questions: List[str] = field(default_factory=list)
+    min_words: int = 80
+    max_words: int = 1200
+
+
+@dataclass
+class EvalConfig:
+    """A named set of settings overrides to evaluate."""
+    
+    name: str
+    settings: Dict[str, Any] = field(default_factory=dict)
+    description: str = ""
+
+
+def _read_jsonl(path: Union[str, Path]) -> List[Dict[str, Any]]:
+    records = []
+    for number, line in enumerate(Path(path).read_text(encoding="utf-8").splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}:{number}: invalid JSON ({e})") from e
+    return records
+
+
+def load_cases(path: Union[str, Path], limit: Optional[int] = None) -> List[EvalCase]:
+    """
+    Load evaluation cases from a JSON Lines file.
+    
+    Each line has an "id", a "query", the recorded "results" (objects
+    with "url", "title" and "content"), and optionally "facts",
+    "advanced_results", "sub_questions", "min_words" and "max_words".
+    Facts may be given as strings or as lists of alternatives.
+    
+    Raises:
+        ValueError: If a line is invalid or has no query or results
+    """
+    cases = []
+    for number, record in enumerate(_read_jsonl(path), start=1):
+        if not record.get("query") or not record.get("results"):
+            raise ValueError(f"{path}:{number}: each case needs a 'query' and recorded 'results'")
+        record["facts"] = [[fact] if isinstance(fact, str) else list(fact) for fact in record.get("facts", [])]
+        record.setdefault("id", f"case-{number}")
+        cases.append(EvalCase(**record))
+    return cases[:limit] if limit else cases
+
+
+def load_configs(path: Union[str, Path]) -> List[EvalConfig]:
+    """
+    Load configurations from a JSON file holding a list of
+    {"name", "settings", "description"} objects.
+    
+    Raises:
+        ValueError: If names repeat or a setting does not exist
+    """
+    from config.settings import get_settings
+    
+    configs = [EvalConfig(**entry) for entry in json.loads(Path(path).read_text(encoding="utf-8"))]
+    names = [config.name for config in configs]
+    if len(set(names)) != len(names):
+        raise ValueError(f"{path}: configuration names must be unique")
+    current = get_settings()
+    for config in configs:
+        unknown = [key for key in config.settings if not hasattr(current, key)]
+        if unknown:
+            raise ValueError(f"{path}: configuration '{config.name}' has unknown settings: {', '.join(unknown)}")
+    return configs
@@ -0,0 +1,94 @@
+"""Report judges: a deterministic stub for offline runs, and an LLM judge."""
+
+import re
+from typing import Optional
+
+from src.utils.logger import get_logger
+from .fixtures import EvalCase
+from .metrics import citation_validity, fact_coverage
+
+logger = get_logger()
+
+_SCORE_RE = re.compile(r"Score:\s*([1-5])")
+
+
+class Judge:
+    """Grades a report on a 1-5 scale."""
+    
+    name = "base"
+    
+    def score(self, case: EvalCase, report: str, num_sources: int) -> Optional[float]:
+        """
+        Grade a report.
+        
+        Args:
+            case: The evaluated case
+            report: Report text
+            num_sources: Number of sources the report could cite
+        
+        Returns:
+            Score from 1 to 5, or None if no grade could be obtained
+        """
+        raise NotImplementedError
+
+
+class StubJudge(Judge):
+    """
+    Rubric applied mechanically, so runs are offline and repeatable.
+    
+    Half of the grade is fact coverage, a quarter citation validity and a
+    quarter structure (section headings and more than one paragraph).
+    """
+    
+    name = "stub"
+    
+    def score(self, case: EvalCase, report: str, num_sources: int) -> Optional[float]:
+        coverage = fact_coverage(report, case.facts)["fact_coverage"]
+        citations = citation_validity(report, num_sources)["citation_validity"]
+        structure = (0.5 if re.search(r"^#{1,6}\s", report, re.MULTILINE) else 0.0) + (
+            0.5 if len([line for line in report.splitlines() if line.strip()]) > 2 else 0.0
+        )
+        return round(1 + 4 * (0.5 * coverage + 0.25 * citations + 0.25 * structure), 2)
+
+
+class LLMJudge(Judge):
+    """Grades reports with the judge prompt on the configured LLM (needs GROQ_API_KEY)."""
+    
+    name = "llm"
+    
+    def __init__(self):
+        from src.prompts import load_prompt
+        from src.tools.llm import LLMClient
+        
+        self.llm = LLMClient()
+        self.prompt = load_prompt("judge")
+    
+    def score(self, case: EvalCase, report: str, num_sources: int) -> Optional[float]:
+        facts = "\n".join(f"- {fact[0]}" for fact in case.facts) or "- (none given)"
+        try:
+            response = self.llm.complete(self.prompt.render(query=case.query, facts=facts, report=report), max_tokens=10)
+        except Exception as e:
+            logger.warning("Judge call failed for %s: %s", case.id, e)
+            return None
+        match = _SCORE_RE.search(response.content)
+        if not match:
+            logger.warning("Judge gave no score for %s: %r", case.id, response.content[:80])
+            return None
+        return float(match.group(1))
+
+
+JUDGES = {"stub": StubJudge, "llm": LLMJudge}
+
+
+def get_judge(name: str) -> Optional[Judge]:
+    """
+    Build a judge by name ("none" for automatic metrics only).
+    
+    Raises:
+        ValueError: If the name is unknown
+    """
+    if name == "none":
+        return None
+    if name not in JUDGES:
+        raise ValueError(f"Unknown judge '{name}'. Available: none, {', '.join(JUDGES)}")
+    return JUDGES[name]()
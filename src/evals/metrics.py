@@ -0,0 +1,96 @@
+"""Automatic report quality metrics."""
+
+import re
+from typing import Any, Dict, List, Optional
+
+_CITATION_RE = re.compile(r"\[Source\s+(\d+)\]", re.IGNORECASE)
+_WORD_RE = re.compile(r"\b\w+\b")
+
+# Weights of the automatic metrics in the quality score
+COVERAGE_WEIGHT = 0.6
+CITATION_WEIGHT = 0.2
+LENGTH_WEIGHT = 0.2
+
+
+def citation_validity(report: str, num_sources: int) -> Dict[str, Any]:
+    """
+    Check [Source N] citations against the sources the run returned.
+    
+    Args:
+        report: Report text
+        num_sources: Number of sources the report could cite
+    
+    Returns:
+        Citation count, invalid citations, and the valid share (0.0 for
+        a report without citations, since an uncited report is unverifiable)
+    """
+    cited = [int(number) for number in _CITATION_RE.findall(report)]
+    invalid = [number for number in cited if not 1 <= number <= num_sources]
+    return {
+        "citations": len(cited),
+        "invalid_citations": len(invalid),
+        "citation_validity": round((len(cited) - len(invalid)) / len(cited), 3) if cited else 0.0,
+    }
+
+
+def fact_coverage(report: str, facts: List[List[str]]) -> Dict[str, Any]:
+    """
+    Share of expected facts the report mentions.
+    
+    Args:
+        report: Report text
+        facts: Expected facts, each a list of alternative phrasings
+    
+    Returns:
+        Coverage (1.0 when no facts are expected) and the facts missed
+    """
+    text = report.lower()
+    missed = [fact[0] for fact in facts if not any(phrase.lower() in text for phrase in fact)]
+    return {
+        "fact_coverage": round(1 - len(missed) / len(facts), 3) if facts else 1.0,
+        "missed_facts": missed,
+    }
+
+
+def length_score(words: int, min_words: int, max_words: int) -> float:
+    """1.0 inside [min_words, max_words], falling off linearly outside it."""
+    if words < min_words:
+        return words / min_words if min_words else 1.0
+    if words > max_words:
+        return max(0.0, 1 - (words - max_words) / max_words)
+    return 1.0
+
+
+def score_report(
+    report: str,
+    num_sources: int,
+    facts: List[List[str]],
+    min_words: int,
+    max_words: int,
+    judge_score: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    All automatic metrics for a report, and the combined quality score.
+    
+    Quality is the weighted mean of fact coverage, citation validity and
+    length score. With a judge score (1-5), quality is the average of
+    that weighted mean and the judge score scaled to 0-1.
+    
+    Returns:
+        Metric values, with "quality" between 0.0 and 1.0
+    """
+    words = len(_WORD_RE.findall(report))
+    metrics: Dict[str, Any] = {"words": words, "length_score": round(length_score(words, min_words, max_words), 3)}
+    metrics.update(citation_validity(report, num_sources))
+    metrics.update(fact_coverage(report, facts))
+    
+    quality = (
+        COVERAGE_WEIGHT * metrics["fact_coverage"]
+        + CITATION_WEIGHT * metrics["citation_validity"]
+        + LENGTH_WEIGHT * metrics["length_score"]
+    )
+    if judge_score is not None:
+        metrics["judge_score"] = judge_score
+        quality = (quality + (judge_score - 1) / 4) / 2
+    metrics["quality"] = round(quality, 3)
+    return metrics
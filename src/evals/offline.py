@@ -0,0 +1,184 @@
+"""Offline stand-ins for search and LLM providers that replay recorded fixtures."""
+
+import contextvars
+import copy
+import json
+import re
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config.settings import get_settings
+from src.tools import llm, providers
+from src.tools.llm import LLMResponse
+from src.tools.providers import SearchProvider
+from src.utils.tokens import approx_tokens
+from .fixtures import EvalCase
+
+# Provider latency model, in milliseconds (roughly Tavily and Groq-hosted Llama 70B)
+SEARCH_MS = 700.0
+SEARCH_MS_PER_RESULT = 40.0
+ADVANCED_SEARCH_FACTOR = 1.8
+LLM_MS = 250.0
+LLM_MS_PER_PROMPT_TOKEN = 0.05
+LLM_MS_PER_COMPLETION_TOKEN = 4.0
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+class SimulatedLatency:
+    """
+    Provider latency accumulated over one evaluated run.
+    
+    Calls are modelled from their size instead of slept through, so the
+    suite runs in seconds. Calls made in parallel (multi-hop branches) are
+    summed as if sequential, which overstates multi-hop latency.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.search_ms = 0.0
+        self.llm_ms = 0.0
+        self.search_calls = 0
+        self.llm_calls = 0
+    
+    def add_search(self, results: int, depth: Optional[str]) -> None:
+        ms = SEARCH_MS + SEARCH_MS_PER_RESULT * results
+        with self._lock:
+            self.search_calls += 1
+            self.search_ms += ms * (ADVANCED_SEARCH_FACTOR if depth == "advanced" else 1.0)
+    
+    def add_llm(self, prompt_tokens: int, completion_tokens: int) -> None:
+        with self._lock:
+            self.llm_calls += 1
+            self.llm_ms += (
+                LLM_MS
+                + LLM_MS_PER_PROMPT_TOKEN * prompt_tokens
+                + LLM_MS_PER_COMPLETION_TOKEN * completion_tokens
+            )
+    
+    @property
+    def total_ms(self) -> float:
+        return self.search_ms + self.llm_ms
+
+
+_case: contextvars.ContextVar[Optional[Tuple[EvalCase, SimulatedLatency]]] = contextvars.ContextVar(
+    "eval_case", default=None
+)
+
+
+@contextmanager
+def case_context(case: EvalCase) -> Iterator[SimulatedLatency]:
+    """Serve this case's fixtures to searches and LLM calls made inside the block."""
+    latency = SimulatedLatency()
+    token = _case.set((case, latency))
+    try:
+        yield latency
+    finally:
+        _case.reset(token)
+
+
+def _current() -> Tuple[EvalCase, SimulatedLatency]:
+    current = _case.get()
+    if current is None:
+        raise RuntimeError("Offline providers called outside an evaluation case")
+    return current
+
+
+class FixtureSearchProvider(SearchProvider):
+    """Returns the current case's recorded results, whatever the query."""
+    
+    name = "fixture"
+    uses_circuit_breaker = False
+    
+    def search(
+        self,
+        query: str,
+        max_results: int,
+        timeout: Optional[float] = None,
+        **options
+    ) -> List[Dict[str, Any]]:
+        """Return up to max_results recorded results (more with search_depth="advanced")."""
+        case, latency = _current()
+        depth = options.get("search_depth")
+        results = case.results + (case.advanced_results if depth == "advanced" else [])
+        results = copy.deepcopy(results[:max_results])
+        latency.add_search(len(results), depth)
+        return results
+
+
+def _sentences(text: str, count: int) -> str:
+    return " ".join(_SENTENCE_RE.split(text.strip())[:count])
+
+
+def extractive_completion(case: EvalCase, messages: List[Dict[str, str]], max_tokens: int) -> str:
+    """
+    Deterministic stand-in for the LLM.
+    
+    Planner prompts (which ask for a JSON array) get the case's recorded
+    sub-questions. Every other prompt gets an extractive summary: the
+    first two sentences of each recorded result whose lead sentence
+    appears in the prompt, in prompt order, cited as [Source N] and cut
+    off at max_tokens. Report quality therefore tracks what actually
+    reached the prompt, which is what configurations change.
+    """
+    system = messages[0]["content"] if messages and messages[0]["role"] == "system" else ""
+    if "JSON array" in system:
+        return json.dumps(case.sub_questions or [case.query])
+    
+    prompt = "\n".join(message["content"] for message in messages)
+    positions = []
+    for result in case.results + case.advanced_results:
+        position = prompt.find(_sentences(result["content"], 1))
+        if position >= 0:
+            positions.append((position, result))
+    positions.sort(key=lambda item: item[0])
+    
+    lines = [f"## {case.query}", ""]
+    used = approx_tokens(lines[0])
+    for number, (_, result) in enumerate(positions, start=1):
+        line = f"- {_sentences(result['content'], 2)} [Source {number}]"
+        used += approx_tokens(line)
+        if used > max_tokens:
+            break
+        lines.append(line)
+    if len(lines) == 2:
+        lines.append("The provided context does not contain enough information to answer the query.")
+    return "\n".join(lines)
+
+
+@contextmanager
+def offline_providers() -> Iterator[None]:
+    """
+    Route searches to FixtureSearchProvider and LLM calls to
+    extractive_completion for the case set with case_context.
+    
+    The fixture provider is the only one in the chain and its results
+    are never cached, so every search a configuration makes reaches it
+    and is counted in the latency model. A placeholder Groq key lets LLM
+    clients be built without one. Settings and the patched method are
+    restored on exit.
+    """
+    def complete(self, messages, max_tokens, timeout, cancel_event, on_text=None) -> LLMResponse:
+        case, latency = _current()
+        content = extractive_completion(case, messages, max_tokens)
+        prompt_tokens = sum(approx_tokens(message["content"]) for message in messages)
+        completion_tokens = approx_tokens(content)
+        latency.add_llm(prompt_tokens, completion_tokens)
+        if on_text is not None:
+            on_text(content)
+        return LLMResponse(content=content, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    
+    current = get_settings()
+    saved_providers, saved_key = current.search_providers, current.groq_api_key
+    saved_complete = llm.LLMClient._complete
+    providers.PROVIDERS[FixtureSearchProvider.name] = FixtureSearchProvider
+    current.search_providers = FixtureSearchProvider.name
+    current.groq_api_key = saved_key or "offline"
+    llm.LLMClient._complete = complete
+    try:
+        yield
+    finally:
+        llm.LLMClient._complete = saved_complete
+        current.search_providers, current.groq_api_key = saved_providers, saved_key
+        providers.PROVIDERS.pop(FixtureSearchProvider.name, None)
@@ -0,0 +1,215 @@
+"""Run evaluation cases under each configuration and compare the results."""
+
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config.settings import get_settings
+from src.agent.runner import ResearchResult, run_research
+from src.utils.cost_tracker import CostTracker
+from src.utils.logger import get_logger
+from .fixtures import EvalCase, EvalConfig
+from .judge import Judge
+from .metrics import score_report
+from .offline import case_context, offline_providers
+
+logger = get_logger()
+
+
+@dataclass
+class CaseResult:
+    """Metrics of one case run under one configuration."""
+    
+    case_id: str
+    quality: float
+    latency_ms: float
+    cost_usd: float
+    tokens: int
+    search_calls: int
+    llm_calls: int
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+@dataclass
+class ConfigResult:
+    """Aggregated results of one configuration over all cases."""
+    
+    name: str
+    description: str
+    cases: List[CaseResult]
+    quality: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+    cost_per_query_usd: float
+    tokens_per_query: float
+    errors: int
+    pareto: bool = False
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@contextmanager
+def override_settings(overrides: Dict[str, Any]) -> Iterator[None]:
+    """
+    Apply settings overrides for the duration of the block.
+    
+    Compiled graphs are rebuilt on entry and exit, since nodes read
+    settings when they are built.
+    """
+    from src.agent.graph import clear_agent_cache
+    
+    current = get_settings()
+    saved = {key: getattr(current, key) for key in overrides}
+    for key, value in overrides.items():
+        setattr(current, key, value)
+    clear_agent_cache()
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            setattr(current, key, value)
+        clear_agent_cache()
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percentile / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def run_case(
+    case: EvalCase,
+    mode: Optional[str] = None,
+    timeout: Optional[float] = None
+) -> Tuple[ResearchResult, CaseResult]:
+    """
+    Run one case through the research agent on offline providers.
+    
+    Must be called inside offline_providers().
+    
+    Returns:
+        (ResearchResult, CaseResult without judge score)
+    """
+    cost_tracker = CostTracker(cost_per_search=get_settings().cost_per_search)
+    with case_context(case) as latency:
+        start = time.perf_counter()
+        result = run_research(case.query, cost_tracker=cost_tracker, mode=mode, timeout=timeout)
+        wall_ms = (time.perf_counter() - start) * 1000
+    
+    metrics = score_report(result.report or "", len(result.sources), case.facts, case.min_words, case.max_words)
+    return result, CaseResult(
+        case_id=case.id,
+        quality=metrics["quality"],
+        latency_ms=round(wall_ms + latency.total_ms, 1),
+        cost_usd=cost_tracker.total_cost,
+        tokens=cost_tracker.input_tokens + cost_tracker.output_tokens,
+        search_calls=latency.search_calls,
+        llm_calls=latency.llm_calls,
+        metrics=metrics,
+        error=result.error
+    )
+
+
+def evaluate_config(
+    config: EvalConfig,
+    cases: List[EvalCase],
+    judge: Optional[Judge] = None,
+    timeout: Optional[float] = None
+) -> ConfigResult:
+    """
+    Run every case under one configuration.
+    
+    Latency is the measured in-process time plus the modelled provider
+    time (see offline.SimulatedLatency); cost and tokens come from the
+    run's cost tracker. Judging happens after the offline providers are
+    removed, so an LLM judge talks to the real model.
+    
+    Args:
+        config: Settings overrides to apply
+        cases: Cases to run
+        judge: Optional judge whose score is folded into quality
+        timeout: Per-run deadline in seconds
+    
+    Returns:
+        Per-case and aggregated results
+    """
+    runs = []
+    with override_settings(config.settings):
+        mode = get_settings().research_mode
+        with offline_providers():
+            for case in cases:
+                result, case_result = run_case(case, mode=mode, timeout=timeout)
+                runs.append((case, result, case_result))
+                logger.info(
+                    "📏 %s / %s: quality %.2f, %.0f ms, $%.5f",
+                    config.name, case.id, case_result.quality, case_result.latency_ms, case_result.cost_usd
+                )
+    
+    if judge is not None:
+        for case, result, case_result in runs:
+            judge_score = judge.score(case, result.report or "", len(result.sources))
+            case_result.metrics = score_report(
+                result.report or "", len(result.sources), case.facts, case.min_words, case.max_words, judge_score
+            )
+            case_result.quality = case_result.metrics["quality"]
+    
+    results = [case_result for _, _, case_result in runs]
+    latencies = [r.latency_ms for r in results]
+    return ConfigResult(
+        name=config.name,
+        description=config.description,
+        cases=results,
+        quality=round(statistics.fmean(r.quality for r in results), 3),
+        latency_p50_ms=round(_percentile(latencies, 50), 1),
+        latency_p95_ms=round(_percentile(latencies, 95), 1),
+        cost_per_query_usd=round(statistics.fmean(r.cost_usd for r in results), 6),
+        tokens_per_query=round(statistics.fmean(r.tokens for r in results), 1),
+        errors=sum(r.error is not None for r in results)
+    )
+
+
+def _dominates(a: ConfigResult, b: ConfigResult) -> bool:
+    at_least_as_good = (
+        a.quality >= b.quality
+        and a.latency_p50_ms <= b.latency_p50_ms
+        and a.cost_per_query_usd <= b.cost_per_query_usd
+    )
+    strictly_better = (
+        a.quality > b.quality
+        or a.latency_p50_ms < b.latency_p50_ms
+        or a.cost_per_query_usd < b.cost_per_query_usd
+    )
+    return at_least_as_good and strictly_better
+
+
+def mark_pareto_front(results: List[ConfigResult]) -> List[ConfigResult]:
+    """
+    Flag the configurations no other one beats on quality, median
+    latency and cost at once.
+    
+    Returns:
+        The same results, sorted by quality (best first)
+    """
+    for result in results:
+        result.pareto = not any(_dominates(other, result) for other in results if other is not result)
+    return sorted(results, key=lambda r: (-r.quality, r.latency_p50_ms, r.cost_per_query_usd))
+
+
+def run_evaluation(
+    cases: List[EvalCase],
+    configs: List[EvalConfig],
+    judge: Optional[Judge] = None,
+    timeout: Optional[float] = None
+) -> List[ConfigResult]:
+    """
+    Evaluate every configuration on every case, fully offline (unless the
+    judge is an LLM judge).
+    
+    Returns:
+        Results per configuration, Pareto-optimal ones flagged, best quality first
+    """
+    return mark_pareto_front([evaluate_config(config, cases, judge, timeout) for config in configs])
@@ -0,0 +1,19 @@
+"""Trace-driven load testing for the research agent."""
+
+from .histogram import LatencyHistogram
+from .trace import LatencyModel, TraceEntry, load_latency_samples, load_trace
+from .runner import LoadTestReport, QueryOutcome, agent_target, http_target, run_closed_loop, run_open_loop
+
+__all__ = [
+    "LatencyHistogram",
+    "LatencyModel",
+    "TraceEntry",
+    "load_latency_samples",
+    "load_trace",
+    "LoadTestReport",
+    "QueryOutcome",
+    "agent_target",
+    "http_target",
+    "run_closed_loop",
+    "run_open_loop",
+]
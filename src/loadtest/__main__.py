@@ -0,0 +1,176 @@
+"""
+Replay a query trace against the research agent and report latency,
+throughput, error rate and cost.
+
+Usage:
+    python -m src.loadtest TRACE [--open [--speed X | --rate QPS] | --closed --concurrency N]
+                                 [--mock [--latencies FILE] | --cassette FILE] [--url URL]
+                                 [--save FILE] [--compare FILE]
+
+Examples:
+    # Offline: simulated providers, trace replayed 5x faster
+    python -m src.loadtest benchmarks/traces/sample_queries.jsonl --mock --speed 5
+    
+    # Offline: 8 concurrent users, provider latencies from a recorded file
+    python -m src.loadtest trace.jsonl --closed --concurrency 8 --mock --latencies latencies.jsonl
+    
+    # Offline: replay recorded search and LLM traffic with its original timing
+    python -m src.loadtest trace.jsonl --cassette cassettes/session.jsonl.gz
+    
+    # Against a running HTTP service, saved for comparison
+    python -m src.loadtest trace.jsonl --url http://localhost:8000/research --save results.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+from config.settings import get_settings, settings
+from src.utils.logger import setup_logger
+from .runner import agent_target, http_target, run_closed_loop, run_open_loop
+from .trace import LatencyModel, load_latency_samples, load_trace
+
+# Headline metrics compared against a baseline
+_COMPARED = ["throughput_qps", "error_rate", "cost_per_1k_queries_usd"]
+
+
+def print_report(result: Dict[str, Any], baseline: Dict[str, Any] = None) -> None:
+    """Print a summary, with deltas against a baseline if given."""
+    def delta(current: float, previous: float) -> str:
+        if not previous:
+            return ""
+        return f"  ({(current - previous) / previous * 100:+.1f}% vs {baseline.get('label') or 'baseline'})"
+    
+    print(f"\n{result['mode']}-loop load test against {result['target']}"
+          + (f" [{result['label']}]" if result['label'] else ""))
+    print("-" * 60)
+    print(f"  Queries:        {result['queries']} in {result['duration_seconds']:.1f}s "
+          f"({result['shared_runs']} shared in-flight runs)")
+    for key in _COMPARED:
+        line = f"  {key.replace('_', ' ').capitalize() + ':':<26}{result[key]}"
+        if baseline:
+            line += delta(result[key], baseline.get(key, 0))
+        print(line)
+    print("  Latency:")
+    for name, value in result["latency"]["percentiles_ms"].items():
+        line = f"    {name:<7} {value:>10.1f} ms"
+        if baseline:
+            line += delta(value, baseline["latency"]["percentiles_ms"].get(name, 0))
+        print(line)
+    for priority, percentiles in result.get("latency_by_priority", {}).items():
+        line = f"    {priority:<12} p50 {percentiles['p50']:>9.1f} ms   p95 {percentiles['p95']:>9.1f} ms"
+        previous = (baseline or {}).get("latency_by_priority", {}).get(priority)
+        if previous:
+            line += delta(percentiles["p95"], previous.get("p95", 0))
+        print(line)
+    if result["error_samples"]:
+        print("  Sample errors:")
+        for error in result["error_samples"][:3]:
+            print(f"    {error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("trace", help="JSON Lines query trace")
+    
+    loop = parser.add_mutually_exclusive_group()
+    loop.add_argument("--open", action="store_true", help="Open loop: send queries at their arrival times (default)")
+    loop.add_argument("--closed", action="store_true", help="Closed loop: keep a fixed number of queries in flight")
+    parser.add_argument("--speed", type=float, default=1.0, help="Open loop: replay speed multiplier")
+    parser.add_argument("--rate", type=float, help="Open loop: fixed arrival rate in queries/second")
+    parser.add_argument("--max-in-flight", type=int, default=64, help="Open loop: worker threads")
+    parser.add_argument("--concurrency", type=int, default=4, help="Closed loop: concurrent workers")
+    parser.add_argument("--duration", type=float, help="Closed loop: run for this many seconds")
+    parser.add_argument("--max-queries", type=int, help="Stop after this many queries")
+    
+    parser.add_argument("--url", help="POST queries to this HTTP service instead of running in-process")
+    parser.add_argument("--mock", action="store_true", help="Simulate search and LLM providers (no API calls)")
+    parser.add_argument("--latencies", help='Recorded provider latencies, JSON Lines {"kind": "search"|"llm", "ms": ...}')
+    parser.add_argument("--cassette", help="Replay provider traffic recorded with CASSETTE_MODE=record (no API calls)")
+    parser.add_argument("--cassette-speed", type=float, default=1.0,
+                        help="Cassette replay speed (1 = recorded latencies, 0 = no delay)")
+    parser.add_argument("--search-ms", type=float, nargs=2, default=[400, 1500], metavar=("MEDIAN", "P95"),
+                        help="Mock search latency distribution")
+    parser.add_argument("--llm-ms", type=float, nargs=2, default=[2500, 8000], metavar=("MEDIAN", "P95"),
+                        help="Mock LLM latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Mock provider failure probability")
+    parser.add_argument("--seed", type=int, help="Random seed for mock providers")
+    parser.add_argument("--timeout", type=float, help="Per-query deadline in seconds")
+    
+    parser.add_argument("--label", default="", help="Version label stored with the results")
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Compare against a previously saved JSON file")
+    args = parser.parse_args()
+    
+    setup_logger(level="WARNING", fmt=settings.log_format, async_handlers=settings.log_async)
+    
+    trace = load_trace(args.trace)
+    if not trace:
+        sys.exit(f"No queries in {args.trace}")
+    
+    if args.cassette and (args.mock or args.url):
+        sys.exit("--cassette replays in-process traffic; it cannot be combined with --mock or --url")
+    
+    if args.url:
+        target, target_name = http_target(args.url, args.timeout), args.url
+    elif args.cassette:
+        current = get_settings()
+        current.cassette_mode, current.cassette_path = "replay", args.cassette
+        current.cassette_replay_speed = args.cassette_speed
+        # The LLM client needs a key to be built, though replay never uses it
+        current.groq_api_key = current.groq_api_key or "replay"
+        target, target_name = agent_target(args.timeout), f"agent (cassette {args.cassette})"
+    else:
+        target, target_name = agent_target(args.timeout), "agent" + (" (mock providers)" if args.mock else "")
+        if not args.mock:
+            settings.validate_keys()
+    
+    mocks = contextlib.nullcontext()
+    if args.mock and not args.url:
+        from .mocks import mock_providers
+        
+        recorded = load_latency_samples(args.latencies) if args.latencies else {}
+        mocks = mock_providers(
+            search_latency=LatencyModel(recorded.get("search"), *args.search_ms, seed=args.seed),
+            llm_latency=LatencyModel(recorded.get("llm"), *args.llm_ms, seed=args.seed),
+            error_rate=args.error_rate,
+            seed=args.seed
+        )
+    
+    # Writer nodes print each report; keep the console for the summary
+    with mocks, open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        if args.closed:
+            report = run_closed_loop(
+                target, trace,
+                concurrency=args.concurrency,
+                max_queries=args.max_queries,
+                duration_seconds=args.duration,
+                label=args.label,
+                target_name=target_name
+            )
+        else:
+            report = run_open_loop(
+                target, trace,
+                speed=args.speed,
+                rate=args.rate,
+                max_queries=args.max_queries,
+                max_in_flight=args.max_in_flight,
+                label=args.label,
+                target_name=target_name
+            )
+    
+    result = report.to_dict()
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_report(result, baseline)
+    
+    if args.save:
+        Path(args.save).write_text(json.dumps(result, indent=2) + "\n")
+        print(f"\nSaved to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""HDR-style latency histogram."""
+
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple
+
+DEFAULT_PERCENTILES = (50.0, 90.0, 95.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram with bounded relative error.
+    
+    Values are recorded in microseconds. Each power-of-two range is split
+    into 2**sub_bucket_bits linear sub-buckets, as in HdrHistogram, so any
+    recorded value is reported within 1 / 2**(sub_bucket_bits - 1) of its
+    true value (under 1% with the default 8 bits) at any magnitude, using
+    a few hundred buckets for latencies from microseconds to minutes.
+    """
+    
+    def __init__(self, sub_bucket_bits: int = 8):
+        self.sub_bucket_bits = sub_bucket_bits
+        self._counts: Counter = Counter()
+        self._total = 0
+        self._min = None
+        self._max = 0
+        self._lock = threading.Lock()
+    
+    def record(self, seconds: float) -> None:
+        """Record one latency given in seconds."""
+        micros = max(int(seconds * 1_000_000), 0)
+        key = self._bucket(micros)
+        with self._lock:
+            self._counts[key] += 1
+            self._total += 1
+            self._max = max(self._max, micros)
+            self._min = micros if self._min is None else min(self._min, micros)
+    
+    def record_many(self, values: Iterable[float]) -> None:
+        """Record several latencies given in seconds."""
+        for value in values:
+            self.record(value)
+    
+    @property
+    def count(self) -> int:
+        return self._total
+    
+    def percentile(self, percentile: float) -> float:
+        """
+        Latency at a percentile, in milliseconds.
+        
+        Returns the highest value equivalent to the bucket holding the
+        requested rank, so reported percentiles are never optimistic.
+        """
+        with self._lock:
+            if not self._total:
+                return 0.0
+            rank = max(1, round(percentile / 100 * self._total))
+            seen = 0
+            for key in sorted(self._counts):
+                seen += self._counts[key]
+                if seen >= rank:
+                    return min(self._upper(key), self._max) / 1000
+            return self._max / 1000
+    
+    def buckets(self) -> List[Tuple[float, float, int]]:
+        """Non-empty buckets as (lower ms, upper ms, count)."""
+        with self._lock:
+            return [
+                (self._lower(key) / 1000, self._upper(key) / 1000, count)
+                for key, count in sorted(self._counts.items())
+            ]
+    
+    def to_dict(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+        """Summary suitable for JSON output."""
+        return {
+            "count": self._total,
+            "min_ms": (self._min or 0) / 1000,
+            "max_ms": self._max / 1000,
+            "percentiles_ms": {f"p{p:g}": round(self.percentile(p), 3) for p in percentiles},
+            "buckets": [[round(lo, 3), round(hi, 3), n] for lo, hi, n in self.buckets()],
+        }
+    
+    def _bucket(self, micros: int) -> Tuple[int, int]:
+        shift = max(micros.bit_length() - self.sub_bucket_bits, 0)
+        return shift, micros >> shift
+    
+    @staticmethod
+    def _lower(key: Tuple[int, int]) -> int:
+        shift, sub = key
+        return sub << shift
+    
+    @staticmethod
+    def _upper(key: Tuple[int, int]) -> int:
+        shift, sub = key
+        return ((sub + 1) << shift) - 1
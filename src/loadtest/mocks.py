@@ -0,0 +1,115 @@
+"""Simulated search and LLM providers for offline load tests."""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from config.settings import get_settings
+from src.tools import llm, providers
+from src.tools.llm import GenerationCancelled, LLMResponse
+from src.tools.providers import SearchProvider
+from src.utils.tokens import approx_tokens
+from .trace import LatencyModel
+
+
+class SimulatedProviderError(RuntimeError):
+    """Injected provider failure."""
+
+
+def _wait(seconds: float, cancel_event: Optional[threading.Event] = None, timeout: Optional[float] = None) -> None:
+    """Sleep like a provider call would, honouring cancellation and timeouts."""
+    if timeout is not None and seconds > timeout:
+        time.sleep(max(timeout, 0))
+        raise GenerationCancelled(f"Generation exceeded {timeout:.1f}s budget")
+    if cancel_event is not None:
+        if cancel_event.wait(seconds):
+            raise GenerationCancelled("Generation cancelled")
+    else:
+        time.sleep(seconds)
+
+
+class MockSearchProvider(SearchProvider):
+    """Search provider returning synthetic results after a sampled delay."""
+    
+    name = "mock"
+    
+    def __init__(self, latency: LatencyModel, error_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+    
+    def search(
+        self,
+        query: str,
+        max_results: int,
+        timeout: Optional[float] = None,
+        **options
+    ) -> List[Dict[str, Any]]:
+        """Return max_results synthetic results for the query."""
+        time.sleep(self.latency.sample())
+        if self._random.random() < self.error_rate:
+            raise SimulatedProviderError("Simulated search failure")
+        return [
+            {
+                "title": f"Result {i + 1} for {query}",
+                "url": f"https://example.com/{abs(hash((query, i))) % 10**8}",
+                "content": f"{query}. Simulated finding {i + 1} with figures {self._random.randint(1, 999)} "
+                           f"and context about {query.lower()}. " * 4,
+            }
+            for i in range(max_results)
+        ]
+
+
+@contextmanager
+def mock_providers(
+    search_latency: LatencyModel,
+    llm_latency: LatencyModel,
+    error_rate: float = 0.0,
+    seed: Optional[int] = None
+) -> Iterator[None]:
+    """
+    Route searches and LLM calls to simulated providers.
+    
+    Registers the "mock" search provider and makes it the only provider,
+    and replaces the API call behind LLMClient.complete with a stub that
+    sleeps for a sampled latency and reports estimated token usage.
+    Everything else (graph, rerank, budget planning, retries, breakers,
+    single-flight, fair scheduling) runs as in production. Settings and the patched method are restored on exit.
+    
+    Args:
+        search_latency: Latency model for searches
+        llm_latency: Latency model for LLM calls
+        error_rate: Probability that a search or LLM call fails
+        seed: Random seed for reproducible runs
+    """
+    rng = random.Random(seed)
+    
+    def complete(self, messages, max_tokens, timeout, cancel_event, on_text=None) -> LLMResponse:
+        _wait(llm_latency.sample(), cancel_event, timeout)
+        if rng.random() < error_rate:
+            raise SimulatedProviderError("Simulated LLM failure")
+        prompt_tokens = sum(approx_tokens(m["content"]) for m in messages)
+        completion_tokens = max_tokens // 2
+        content = "## Summary\n\n" + "Simulated report text. " * (completion_tokens // 4)
+        if on_text is not None:
+            on_text(content)
+        return LLMResponse(
+            content=content,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens
+        )
+    
+    current = get_settings()
+    saved_providers = current.search_providers
+    saved_complete = llm.LLMClient._complete
+    providers.PROVIDERS[MockSearchProvider.name] = lambda: MockSearchProvider(search_latency, error_rate, seed)
+    current.search_providers = MockSearchProvider.name
+    llm.LLMClient._complete = complete
+    try:
+        yield
+    finally:
+        llm.LLMClient._complete = saved_complete
+        current.search_providers = saved_providers
+        providers.PROVIDERS.pop(MockSearchProvider.name, None)
@@ -0,0 +1,274 @@
+"""Open- and closed-loop load generation against the research agent."""
+
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.logger import get_logger
+from .histogram import LatencyHistogram
+from .trace import TraceEntry
+
+logger = get_logger()
+
+# A target runs one trace entry and reports its outcome
+Target = Callable[[TraceEntry], "QueryOutcome"]
+
+
+@dataclass
+class QueryOutcome:
+    """Result of one query as seen by the load generator."""
+    
+    error: Optional[str] = None
+    cost_usd: float = 0.0
+    shared: bool = False
+
+
+@dataclass
+class LoadTestReport:
+    """Aggregated results of a load test."""
+    
+    label: str
+    mode: str
+    target: str
+    started_at: str
+    duration_seconds: float
+    queries: int
+    errors: int
+    shared: int
+    total_cost_usd: float
+    latency: LatencyHistogram
+    latency_by_priority: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    error_samples: List[str] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable summary."""
+        return {
+            "label": self.label,
+            "mode": self.mode,
+            "target": self.target,
+            "started_at": self.started_at,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "queries": self.queries,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.queries, 4) if self.queries else 0.0,
+            "shared_runs": self.shared,
+            "throughput_qps": round(self.queries / self.duration_seconds, 3) if self.duration_seconds else 0.0,
+            "cost_per_1k_queries_usd": round(self.total_cost_usd / self.queries * 1000, 4) if self.queries else 0.0,
+            "latency": self.latency.to_dict(),
+            "latency_by_priority": {
+                priority: histogram.to_dict()["percentiles_ms"]
+                for priority, histogram in sorted(self.latency_by_priority.items())
+            },
+            "error_samples": self.error_samples,
+        }
+
+
+class _Collector:
+    """Thread-safe accumulation of query outcomes."""
+    
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.latency_by_priority: Dict[str, LatencyHistogram] = {}
+        self.queries = 0
+        self.errors = 0
+        self.shared = 0
+        self.cost = 0.0
+        self.error_samples: List[str] = []
+        self._lock = threading.Lock()
+    
+    def run(self, target: Target, entry: TraceEntry, intended_start: float) -> None:
+        """
+        Run one query and record its latency from the intended start time.
+        
+        Measuring from when the query should have started, rather than when
+        a worker got to it, keeps queueing delay in the numbers (avoiding
+        coordinated omission in open-loop runs).
+        """
+        try:
+            outcome = target(entry)
+        except Exception as e:
+            outcome = QueryOutcome(error=f"{type(e).__name__}: {e}")
+        elapsed = time.perf_counter() - intended_start
+        self.latency.record(elapsed)
+        with self._lock:
+            if entry.priority:
+                self.latency_by_priority.setdefault(entry.priority, LatencyHistogram()).record(elapsed)
+            self.queries += 1
+            self.cost += outcome.cost_usd
+            self.shared += outcome.shared
+            if outcome.error:
+                self.errors += 1
+                if len(self.error_samples) < 10:
+                    self.error_samples.append(outcome.error)
+    
+    def report(self, label: str, mode: str, target: str, started_at: str, duration: float) -> LoadTestReport:
+        return LoadTestReport(
+            label=label,
+            mode=mode,
+            target=target,
+            started_at=started_at,
+            duration_seconds=duration,
+            queries=self.queries,
+            errors=self.errors,
+            shared=self.shared,
+            total_cost_usd=self.cost,
+            latency=self.latency,
+            latency_by_priority=self.latency_by_priority,
+            error_samples=self.error_samples,
+        )
+
+
+def run_open_loop(
+    target: Target,
+    trace: List[TraceEntry],
+    speed: float = 1.0,
+    rate: Optional[float] = None,
+    max_queries: Optional[int] = None,
+    max_in_flight: int = 64,
+    label: str = "",
+    target_name: str = "agent"
+) -> LoadTestReport:
+    """
+    Replay queries at their recorded arrival times, regardless of latency.
+    
+    Args:
+        target: Function running one query
+        trace: Queries with arrival offsets
+        speed: Replay speed multiplier for recorded offsets (2.0 = twice as fast)
+        rate: If set, ignore recorded offsets and send this many queries
+            per second, cycling through the trace
+        max_queries: Stop after this many queries
+        max_in_flight: Worker threads; arrivals beyond this queue up and
+            their wait counts towards latency
+        label: Version label stored in the report
+        target_name: Target description stored in the report
+    
+    Returns:
+        Aggregated results
+    """
+    if rate:
+        count = max_queries or len(trace)
+        entries = list(itertools.islice(itertools.cycle(trace), count))
+        offsets = [i / rate for i in range(count)]
+    else:
+        entries = trace[:max_queries] if max_queries else trace
+        offsets = [entry.offset_seconds / speed for entry in entries]
+    
+    logger.info("Open-loop load test: %s queries over %.1fs", len(entries), offsets[-1] if offsets else 0.0)
+    collector = _Collector()
+    started_at = datetime.now().isoformat(timespec="seconds")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="loadtest") as pool:
+        for entry, offset in zip(entries, offsets):
+            intended = start + offset
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(collector.run, target, entry, intended)
+    duration = time.perf_counter() - start
+    return collector.report(label, "open", target_name, started_at, duration)
+
+
+def run_closed_loop(
+    target: Target,
+    trace: List[TraceEntry],
+    concurrency: int = 4,
+    max_queries: Optional[int] = None,
+    duration_seconds: Optional[float] = None,
+    label: str = "",
+    target_name: str = "agent"
+) -> LoadTestReport:
+    """
+    Keep a fixed number of queries in flight, each worker starting its next
+    query as soon as the previous one finishes.
+    
+    Args:
+        target: Function running one query
+        trace: Queries to cycle through (recorded offsets are ignored)
+        concurrency: Number of concurrent workers
+        max_queries: Stop after this many queries (defaults to the trace length)
+        duration_seconds: Stop starting new queries after this long
+        label: Version label stored in the report
+        target_name: Target description stored in the report
+    
+    Returns:
+        Aggregated results
+    """
+    if not duration_seconds and not max_queries:
+        max_queries = len(trace)
+    logger.info("Closed-loop load test: %s workers", concurrency)
+    entries = itertools.cycle(trace)
+    issued = itertools.count()
+    lock = threading.Lock()
+    collector = _Collector()
+    started_at = datetime.now().isoformat(timespec="seconds")
+    start = time.perf_counter()
+    
+    def worker() -> None:
+        while True:
+            with lock:
+                if max_queries and next(issued) >= max_queries:
+                    return
+                if duration_seconds and time.perf_counter() - start >= duration_seconds:
+                    return
+                entry = next(entries)
+            collector.run(target, entry, time.perf_counter())
+    
+    threads = [threading.Thread(target=worker, name=f"loadtest-{i}") for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - start
+    return collector.report(label, "closed", target_name, started_at, duration)
+
+
+def agent_target(timeout: Optional[float] = None) -> Target:
+    """Target that runs queries in-process through run_research."""
+    from src.agent.runner import run_research
+    
+    def run(entry: TraceEntry) -> QueryOutcome:
+        result = run_research(
+            entry.query,
+            mode=entry.mode,
+            timeout=timeout,
+            tenant=entry.tenant,
+            priority=entry.priority
+        )
+        return QueryOutcome(
+            error=result.error,
+            cost_usd=0.0 if result.shared else result.cost.get("total_cost_usd", 0.0),
+            shared=result.shared
+        )
+    return run
+
+
+def http_target(url: str, timeout: Optional[float] = None) -> Target:
+    """
+    Target that POSTs queries to a research HTTP service.
+    
+    The service is expected to accept {"query", "mode", "tenant",
+    "priority"} and
+    return JSON with optional "error" and "cost" ({"total_cost_usd": ...})
+    fields, matching ResearchResult.
+    """
+    from src.tools.transport import get_http_client
+    
+    client = get_http_client()
+    
+    def run(entry: TraceEntry) -> QueryOutcome:
+        payload = {"query": entry.query, "mode": entry.mode, "tenant": entry.tenant, "priority": entry.priority}
+        response = client.post(url, json=payload, timeout=timeout)
+        if response.status_code >= 400:
+            return QueryOutcome(error=f"HTTP {response.status_code}")
+        body = response.json()
+        return QueryOutcome(
+            error=body.get("error"),
+            cost_usd=(body.get("cost") or {}).get("total_cost_usd", 0.0),
+            shared=bool(body.get("shared"))
+        )
+    return run
@@ -0,0 +1,111 @@
+"""Query traces and provider latency models for load tests."""
+
+import json
+import math
+import random
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+
+@dataclass
+class TraceEntry:
+    """One recorded query, offset from the start of the trace."""
+    
+    offset_seconds: float
+    query: str
+    mode: Optional[str] = None
+    tenant: Optional[str] = None
+    priority: Optional[str] = None
+
+
+def _timestamp(value: Union[str, int, float]) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def load_trace(path: Union[str, Path]) -> List[TraceEntry]:
+    """
+    Load a query trace from a JSON Lines file.
+    
+    Each line is an object with a "query", an optional "mode", "tenant"
+    and "priority", and a "ts" that is either an ISO 8601 timestamp or a
+    number of seconds (Unix time or offset). Timestamps are rebased so the first query is at offset 0.
+    Lines without a "ts" are spaced one second apart.
+    
+    Args:
+        path: Trace file
+    
+    Returns:
+        Entries sorted by offset
+    
+    Raises:
+        ValueError: If a line is not valid JSON or has no query
+    """
+    raw = []
+    for number, line in enumerate(Path(path).read_text(encoding="utf-8").splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}:{number}: invalid JSON ({e})") from e
+        if not record.get("query"):
+            raise ValueError(f"{path}:{number}: missing 'query'")
+        ts = _timestamp(record["ts"]) if "ts" in record else float(len(raw))
+        raw.append((ts, record))
+    
+    raw.sort(key=lambda item: item[0])
+    start = raw[0][0] if raw else 0.0
+    return [
+        TraceEntry(ts - start, record["query"], record.get("mode"), record.get("tenant"), record.get("priority"))
+        for ts, record in raw
+    ]
+
+
+class LatencyModel:
+    """
+    Source of simulated provider latencies.
+    
+    Samples either come from recorded latencies (resampled uniformly) or
+    from a log-normal distribution fitted to a median and p95, which is a
+    reasonable shape for network and inference latency.
+    """
+    
+    def __init__(
+        self,
+        samples: Optional[Sequence[float]] = None,
+        median_ms: float = 500.0,
+        p95_ms: float = 1500.0,
+        seed: Optional[int] = None
+    ):
+        self.samples = list(samples or [])
+        self.mu = math.log(median_ms / 1000)
+        # p95 of a log-normal is exp(mu + 1.645 * sigma)
+        self.sigma = max(math.log(p95_ms / median_ms) / 1.645, 0.0)
+        self._random = random.Random(seed)
+    
+    def sample(self) -> float:
+        """Draw one latency in seconds."""
+        if self.samples:
+            return self._random.choice(self.samples)
+        return self._random.lognormvariate(self.mu, self.sigma)
+
+
+def load_latency_samples(path: Union[str, Path]) -> Dict[str, List[float]]:
+    """
+    Load recorded provider latencies from a JSON Lines file.
+    
+    Each line is {"kind": "search" | "llm", "ms": <latency>}.
+    
+    Returns:
+        Latencies in seconds, keyed by kind
+    """
+    samples: Dict[str, List[float]] = {}
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            record = json.loads(line)
+            samples.setdefault(record["kind"], []).append(float(record["ms"]) / 1000)
+    return samples
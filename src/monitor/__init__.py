@@ -0,0 +1,15 @@
+"""Scheduled monitors for recurring research queries."""
+
+from .clock import Clock, FakeClock, SystemClock
+from .store import MonitorJob, MonitorStore, Notification
+from .scheduler import MonitorScheduler
+
+__all__ = [
+    "Clock",
+    "FakeClock",
+    "SystemClock",
+    "MonitorJob",
+    "MonitorStore",
+    "Notification",
+    "MonitorScheduler",
+]
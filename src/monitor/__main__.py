@@ -0,0 +1,96 @@
+"""
+Command-line interface for research monitors.
+
+Usage:
+    python -m src.monitor add USER "QUERY" 1h
+    python -m src.monitor list [--user USER]
+    python -m src.monitor run [--once] [--dry-run]
+    python -m src.monitor notifications USER
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+from config.settings import settings
+from src.agent.runner import ResearchResult
+from src.storage import HistoryStore
+from src.utils.logger import setup_logger
+from .scheduler import MonitorScheduler
+from .store import MonitorStore
+
+
+def dry_run_runner(query: str) -> ResearchResult:
+    """Stand-in runner that makes no API calls."""
+    return ResearchResult(
+        query=query,
+        report=f"# {query}\n\nDry run at {datetime.now().isoformat(timespec='minutes')}\n"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scheduled research monitors")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    add_parser = subparsers.add_parser("add", help="Schedule a recurring query")
+    add_parser.add_argument("user")
+    add_parser.add_argument("query")
+    add_parser.add_argument("interval", help='e.g. "30m", "6h", "@daily"')
+    
+    list_parser = subparsers.add_parser("list", help="List monitor jobs")
+    list_parser.add_argument("--user")
+    
+    run_parser = subparsers.add_parser("run", help="Run the scheduler")
+    run_parser.add_argument("--once", action="store_true", help="Run due jobs once and exit")
+    run_parser.add_argument("--dry-run", action="store_true", help="Use a stub runner (no API calls)")
+    
+    notify_parser = subparsers.add_parser("notifications", help="Show unseen change notifications")
+    notify_parser.add_argument("user")
+    
+    args = parser.parse_args()
+    setup_logger(
+        level=settings.log_level,
+        fmt=settings.log_format,
+        async_handlers=settings.log_async,
+        sample_window_seconds=settings.log_sample_window_seconds,
+        sample_max_per_window=settings.log_sample_max_per_window
+    )
+    
+    store = MonitorStore(settings.history_db_path)
+    history_store = HistoryStore(settings.history_db_path)
+    runner = dry_run_runner if getattr(args, "dry_run", False) else None
+    scheduler = MonitorScheduler(store, history_store, runner=runner)
+    
+    if args.command == "add":
+        job = scheduler.add_job(args.user, args.query, args.interval)
+        print(f"Added monitor {job.id}; first run at {datetime.fromtimestamp(job.next_run_at).isoformat()}")
+    
+    elif args.command == "list":
+        for job in store.list_jobs(args.user):
+            next_run = datetime.fromtimestamp(job.next_run_at).isoformat(timespec="seconds")
+            print(
+                f"{job.id:>4}  {job.user:<12} every {job.interval_seconds:>8.0f}s  next {next_run}  "
+                f"${job.cost_usd:.4f}  {job.query}"
+            )
+    
+    elif args.command == "run":
+        if not args.dry_run:
+            settings.validate_keys()
+        if args.once:
+            print(f"Ran {scheduler.tick()} research executions")
+        else:
+            try:
+                scheduler.run_forever()
+            except KeyboardInterrupt:
+                sys.exit(0)
+    
+    elif args.command == "notifications":
+        for notification in store.notifications(args.user):
+            record = history_store.get(notification.history_id) if notification.history_id else None
+            when = datetime.fromtimestamp(notification.created_at).isoformat(timespec="seconds")
+            print(f"{when}  monitor {notification.job_id}: {record.query if record else '?'} changed")
+        store.mark_seen(args.user)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Clocks for the monitor scheduler."""
+
+import time
+
+
+class Clock:
+    """Source of wall-clock time for the scheduler."""
+    
+    def now(self) -> float:
+        """Current time as a Unix timestamp."""
+        raise NotImplementedError
+    
+    def sleep(self, seconds: float) -> None:
+        """Wait for a number of seconds."""
+        raise NotImplementedError
+
+
+class SystemClock(Clock):
+    """Real time."""
+    
+    def now(self) -> float:
+        return time.time()
+    
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class FakeClock(Clock):
+    """Manually advanced clock for local runs and tests."""
+    
+    def __init__(self, start: float = 0.0):
+        self._now = start
+    
+    def now(self) -> float:
+        return self._now
+    
+    def sleep(self, seconds: float) -> None:
+        self.advance(seconds)
+    
+    def advance(self, seconds: float) -> None:
+        """Move time forward."""
+        self._now += seconds
@@ -0,0 +1,245 @@
+"""Scheduler that runs recurring research monitors."""
+
+import contextvars
+import hashlib
+import re
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+from config.settings import settings
+from src.agent.runner import ResearchResult
+from src.storage import HistoryRecord, HistoryStore
+from src.utils.logger import get_logger
+from src.utils.scheduling import MONITOR, request_context
+from .clock import Clock, SystemClock
+from .store import MonitorJob, MonitorStore, Notification
+
+logger = get_logger()
+
+_ALIASES = {
+    "@hourly": 3600.0,
+    "@daily": 86400.0,
+    "@weekly": 604800.0,
+}
+_UNITS = {"s": 1.0, "m": 60.0, "h": 3600.0, "d": 86400.0, "w": 604800.0}
+_INTERVAL_RE = re.compile(r"^(?:every\s+)?(\d+(?:\.\d+)?)\s*([smhdw])$")
+
+# Due jobs read from the store at a time
+_PAGE_SIZE = 500
+
+
+def parse_interval(spec) -> float:
+    """
+    Parse a cron-like interval into seconds.
+    
+    Accepts seconds as a number, "@hourly"/"@daily"/"@weekly", or a count
+    with a unit such as "15m", "6h", "1d" or "every 30m".
+    
+    Raises:
+        ValueError: If the interval is not understood or not positive
+    """
+    if isinstance(spec, (int, float)):
+        seconds = float(spec)
+    else:
+        text = spec.strip().lower()
+        if text in _ALIASES:
+            seconds = _ALIASES[text]
+        else:
+            match = _INTERVAL_RE.match(text)
+            if not match:
+                raise ValueError(f"Unrecognized interval '{spec}'")
+            seconds = float(match.group(1)) * _UNITS[match.group(2)]
+    
+    if seconds <= 0:
+        raise ValueError("Interval must be positive")
+    return seconds
+
+
+def normalize_query(query: str) -> str:
+    """Key used to coalesce identical queries across users."""
+    return " ".join(query.lower().split())
+
+
+class MonitorScheduler:
+    """
+    Runs due monitor jobs, one research execution per distinct query.
+    
+    - Jobs whose normalized query matches are coalesced into a single run,
+      including jobs due within the coalescing window, and every owner is
+      notified from the same result. The run's cost is split evenly
+      between the coalesced jobs.
+    - Distinct queries run concurrently, each waiting for a slot in the
+      run scheduler at monitor priority.
+    - Each query gets a stable phase offset (a hash of the query scaled by
+      the jitter fraction of its interval), so monitors created at the same
+      moment fire spread out while identical queries stay aligned.
+    - Results go to the history store; owners get a notification when the
+      report differs from the one they last received.
+    
+    The clock and runner are injectable so the scheduler can be driven
+    locally with a FakeClock and a stub runner.
+    """
+    
+    def __init__(
+        self,
+        store: MonitorStore,
+        history_store: HistoryStore,
+        runner: Optional[Callable[[str], ResearchResult]] = None,
+        clock: Optional[Clock] = None,
+        notifier: Optional[Callable[[MonitorJob, Notification], None]] = None
+    ):
+        self.store = store
+        self.history_store = history_store
+        self.runner = runner or self._default_runner
+        self.clock = clock or SystemClock()
+        self.notifier = notifier
+    
+    @staticmethod
+    def _default_runner(query: str) -> ResearchResult:
+        from src.agent.runner import run_research
+        return run_research(query)
+    
+    def add_job(self, user: str, query: str, interval) -> MonitorJob:
+        """
+        Schedule a recurring query.
+        
+        Args:
+            user: Owner of the monitor
+            query: Research question
+            interval: Seconds or a cron-like interval such as "1h" or "@daily"
+        
+        Returns:
+            The stored job
+        """
+        seconds = parse_interval(interval)
+        job = MonitorJob(
+            user=user,
+            query=query,
+            interval_seconds=seconds,
+            next_run_at=self.clock.now() + self._phase(query, seconds)
+        )
+        self.store.add_job(job)
+        logger.info("Scheduled monitor %s for %s: '%s' every %.0fs", job.id, user, query, seconds)
+        return job
+    
+    def tick(self) -> int:
+        """
+        Run every due query once.
+        
+        Returns:
+            Number of research executions performed
+        """
+        now = self.clock.now()
+        window = settings.monitor_coalesce_window_seconds
+        
+        groups: Dict[str, List[MonitorJob]] = defaultdict(list)
+        for job in self._due_jobs(now + window):
+            groups[normalize_query(job.query)].append(job)
+        
+        # Only run a group once one of its members is actually due
+        due = [jobs for jobs in groups.values() if min(job.next_run_at for job in jobs) <= now]
+        if not due:
+            return 0
+        
+        # Research runs in parallel; results are recorded on this thread as they finish
+        with ThreadPoolExecutor(max_workers=min(len(due), settings.max_concurrent_runs)) as pool:
+            futures = {
+                pool.submit(contextvars.copy_context().run, self._research, jobs): jobs
+                for jobs in due
+            }
+            for future in as_completed(futures):
+                self._record(futures[future], future, now)
+        
+        return len(due)
+    
+    def run_forever(self, poll_seconds: Optional[float] = None, max_ticks: Optional[int] = None) -> None:
+        """Poll for due jobs until interrupted (or for max_ticks polls)."""
+        poll_seconds = poll_seconds or settings.monitor_poll_seconds
+        ticks = 0
+        while max_ticks is None or ticks < max_ticks:
+            executions = self.tick()
+            if executions:
+                logger.info("Monitor tick ran %s research executions", executions)
+            ticks += 1
+            self.clock.sleep(poll_seconds)
+    
+    def _due_jobs(self, until: float) -> Iterator[MonitorJob]:
+        """Every job due by a time, read from the store a page at a time."""
+        after = None
+        while True:
+            page = self.store.due_jobs(until, limit=_PAGE_SIZE, after=after)
+            yield from page
+            if len(page) < _PAGE_SIZE:
+                return
+            after = (page[-1].next_run_at, page[-1].id)
+    
+    def _research(self, jobs: List[MonitorJob]) -> ResearchResult:
+        """Run a group's query; raises if the run failed."""
+        query = jobs[0].query
+        logger.info("Running monitor query for %s job(s): '%s'", len(jobs), query)
+        
+        # Monitor runs yield to interactive and batch work
+        with request_context(tenant=jobs[0].user, priority=MONITOR):
+            result = self.runner(query)
+        if result.error:
+            raise RuntimeError(result.error)
+        return result
+    
+    def _record(self, jobs: List[MonitorJob], future: "Future[ResearchResult]", now: float) -> None:
+        """Save a group's result, notify owners and reschedule its jobs."""
+        query = jobs[0].query
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error("Monitor query '%s' failed: %s", query, e)
+            for job in jobs:
+                job.next_run_at = self._next_run(job, now)
+                self.store.update_job(job)
+            return
+        
+        # A run joined from another caller cost this group nothing
+        cost = 0.0 if result.shared else result.cost.get("total_cost_usd", 0.0)
+        history_id = self.history_store.add(HistoryRecord(
+            query=query,
+            report=result.report,
+            sources=result.sources,
+            cost=cost,
+            timings={"total_seconds": result.elapsed_seconds},
+            timestamp=datetime.fromtimestamp(now).isoformat()
+        ))
+        report_hash = hashlib.sha256(result.report.encode("utf-8")).hexdigest()
+        
+        for job in jobs:
+            if job.last_report_hash is not None and job.last_report_hash != report_hash:
+                notification = Notification(
+                    job_id=job.id,
+                    user=job.user,
+                    history_id=history_id,
+                    created_at=now
+                )
+                self.store.add_notification(notification)
+                if self.notifier:
+                    self.notifier(job, notification)
+            
+            job.last_report_hash = report_hash
+            job.last_run_at = now
+            job.next_run_at = self._next_run(job, now)
+            job.cost_usd += cost / len(jobs)
+            self.store.update_job(job)
+    
+    def _next_run(self, job: MonitorJob, now: float) -> float:
+        """Next slot on the job's schedule, skipping slots missed while down."""
+        next_run = job.next_run_at + job.interval_seconds
+        if next_run <= now:
+            missed = (now - job.next_run_at) // job.interval_seconds
+            next_run = job.next_run_at + (missed + 1) * job.interval_seconds
+        return next_run
+    
+    @staticmethod
+    def _phase(query: str, interval_seconds: float) -> float:
+        """Stable offset within the jitter fraction of the interval."""
+        digest = hashlib.sha256(normalize_query(query).encode("utf-8")).digest()
+        fraction = int.from_bytes(digest[:8], "big") / 2 ** 64
+        return fraction * settings.monitor_jitter_fraction * interval_seconds
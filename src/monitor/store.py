@@ -0,0 +1,195 @@
+"""SQLite storage for monitor jobs and change notifications."""
+
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS monitor_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user TEXT NOT NULL,
+    query TEXT NOT NULL,
+    interval_seconds REAL NOT NULL,
+    next_run_at REAL NOT NULL,
+    last_run_at REAL,
+    last_report_hash TEXT,
+    active INTEGER NOT NULL DEFAULT 1,
+    cost_usd REAL NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_monitor_jobs_due ON monitor_jobs (active, next_run_at);
+
+CREATE TABLE IF NOT EXISTS monitor_notifications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL,
+    user TEXT NOT NULL,
+    history_id INTEGER,
+    created_at REAL NOT NULL,
+    seen INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_monitor_notifications_user ON monitor_notifications (user, seen);
+"""
+
+
+@dataclass
+class MonitorJob:
+    """A recurring research query owned by a user."""
+    
+    user: str
+    query: str
+    interval_seconds: float
+    next_run_at: float
+    last_run_at: Optional[float] = None
+    last_report_hash: Optional[str] = None
+    active: bool = True
+    
+    # This job's share of the cost of the runs it took part in
+    cost_usd: float = 0.0
+    id: Optional[int] = None
+
+
+@dataclass
+class Notification:
+    """Notice that a monitored report changed."""
+    
+    job_id: int
+    user: str
+    history_id: Optional[int]
+    created_at: float
+    seen: bool = False
+    id: Optional[int] = None
+
+
+class MonitorStore:
+    """Persistent store of monitor jobs, sharing the history database file."""
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._memory_conn = sqlite3.connect(":memory:", check_same_thread=False) if db_path == ":memory:" else None
+        
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(monitor_jobs)")}
+            if "cost_usd" not in columns:
+                # Databases created before per-job cost accounting
+                conn.execute("ALTER TABLE monitor_jobs ADD COLUMN cost_usd REAL NOT NULL DEFAULT 0")
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = self._memory_conn or sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            if conn is not self._memory_conn:
+                conn.close()
+    
+    def add_job(self, job: MonitorJob) -> int:
+        """Save a new job and return its ID."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO monitor_jobs (user, query, interval_seconds, next_run_at, active) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job.user, job.query, job.interval_seconds, job.next_run_at, int(job.active))
+            )
+            job.id = cursor.lastrowid
+        return job.id
+    
+    def update_job(self, job: MonitorJob) -> None:
+        """Persist a job's schedule and last-run state."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE monitor_jobs SET interval_seconds = ?, next_run_at = ?, last_run_at = ?, "
+                "last_report_hash = ?, active = ?, cost_usd = ? WHERE id = ?",
+                (job.interval_seconds, job.next_run_at, job.last_run_at,
+                 job.last_report_hash, int(job.active), job.cost_usd, job.id)
+            )
+    
+    def due_jobs(
+        self,
+        now: float,
+        limit: int = 500,
+        after: Optional[Tuple[float, int]] = None
+    ) -> List[MonitorJob]:
+        """
+        Active jobs whose next run is at or before now, earliest first.
+        
+        Args:
+            now: Latest next-run time to include
+            limit: Maximum jobs to return
+            after: (next_run_at, id) of the last job of the previous page
+        """
+        sql = "SELECT * FROM monitor_jobs WHERE active = 1 AND next_run_at <= ?"
+        params: list = [now]
+        if after is not None:
+            sql += " AND (next_run_at > ? OR (next_run_at = ? AND id > ?))"
+            params += [after[0], after[0], after[1]]
+        with self._connect() as conn:
+            rows = conn.execute(sql + " ORDER BY next_run_at, id LIMIT ?", (*params, limit)).fetchall()
+        return [self._to_job(row) for row in rows]
+    
+    def list_jobs(self, user: Optional[str] = None) -> List[MonitorJob]:
+        """All jobs, optionally for one user."""
+        with self._connect() as conn:
+            if user is None:
+                rows = conn.execute("SELECT * FROM monitor_jobs ORDER BY id").fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT * FROM monitor_jobs WHERE user = ? ORDER BY id", (user,)
+                ).fetchall()
+        return [self._to_job(row) for row in rows]
+    
+    def add_notification(self, notification: Notification) -> int:
+        """Save a change notification."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO monitor_notifications (job_id, user, history_id, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (notification.job_id, notification.user, notification.history_id, notification.created_at)
+            )
+            notification.id = cursor.lastrowid
+        return notification.id
+    
+    def notifications(self, user: str, unseen_only: bool = True) -> List[Notification]:
+        """Notifications for a user, newest first."""
+        sql = "SELECT * FROM monitor_notifications WHERE user = ?"
+        if unseen_only:
+            sql += " AND seen = 0"
+        with self._connect() as conn:
+            rows = conn.execute(sql + " ORDER BY created_at DESC, id DESC", (user,)).fetchall()
+        return [
+            Notification(
+                id=row["id"],
+                job_id=row["job_id"],
+                user=row["user"],
+                history_id=row["history_id"],
+                created_at=row["created_at"],
+                seen=bool(row["seen"])
+            )
+            for row in rows
+        ]
+    
+    def mark_seen(self, user: str) -> None:
+        """Mark all of a user's notifications as seen."""
+        with self._connect() as conn:
+            conn.execute("UPDATE monitor_notifications SET seen = 1 WHERE user = ?", (user,))
+    
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> MonitorJob:
+        return MonitorJob(
+            id=row["id"],
+            user=row["user"],
+            query=row["query"],
+            interval_seconds=row["interval_seconds"],
+            next_run_at=row["next_run_at"],
+            last_run_at=row["last_run_at"],
+            last_report_hash=row["last_report_hash"],
+            active=bool(row["active"]),
+            cost_usd=row["cost_usd"]
+        )
@@ -0,0 +1,5 @@
+"""Versioned prompt templates."""
+
+from .loader import PromptTemplate, load_prompt, prompt_version
+
+__all__ = ["PromptTemplate", "load_prompt", "prompt_version"]
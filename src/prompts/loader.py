@@ -0,0 +1,128 @@
+"""Versioned prompt templates loaded from files."""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from config.settings import settings
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+
+_SECTION_RE = re.compile(r"^\[(system|user)\]\s*$", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """
+    A chat prompt split into a stable system prefix and a variable suffix.
+    
+    The system part should only use variables that are fixed for a
+    deployment (such as limits from settings), so it is byte-identical
+    across calls and can be served from the provider's prompt cache.
+    Per-call data (task, context) belongs in the user part, with the
+    longest and most reusable values first.
+    """
+    
+    name: str
+    version: str
+    system: str
+    user: str
+    
+    def render(self, **variables) -> List[Dict[str, str]]:
+        """
+        Render the template into chat messages.
+        
+        Args:
+            **variables: Values for the ${name} placeholders
+        
+        Returns:
+            System and user messages
+        """
+        values = {key: str(value) for key, value in variables.items()}
+        system_values = tuple(sorted((key, values[key]) for key in _identifiers(self.system) if key in values))
+        return [
+            {"role": "system", "content": _render_system(self, system_values)},
+            {"role": "user", "content": _compile(self.user).substitute(values)},
+        ]
+
+
+@lru_cache(maxsize=128)
+def _compile(text: str) -> Template:
+    """Parsed template text, shared by every render."""
+    return Template(text)
+
+
+@lru_cache(maxsize=128)
+def _identifiers(text: str) -> FrozenSet[str]:
+    """Names of the ${name} placeholders in template text."""
+    return frozenset(
+        match.group("named") or match.group("braced")
+        for match in Template.pattern.finditer(text)
+        if match.group("named") or match.group("braced")
+    )
+
+
+@lru_cache(maxsize=64)
+def _render_system(template: PromptTemplate, variables: Tuple[Tuple[str, str], ...]) -> str:
+    """
+    Render the static system prefix, memoized on the few deployment-level
+    variables it uses; per-call user text is rendered fresh every call.
+    """
+    return _compile(template.system).substitute(dict(variables))
+
+
+def prompt_version(name: str) -> str:
+    """
+    Resolve the template version to use for a prompt.
+    
+    Per-prompt overrides in settings.prompt_versions ("writer=v2,planner=v1")
+    take precedence over the default settings.prompt_version.
+    """
+    for entry in settings.prompt_versions.split(","):
+        key, _, version = entry.partition("=")
+        if key.strip() == name and version.strip():
+            return version.strip()
+    return settings.prompt_version
+
+
+def load_prompt(name: str, version: Optional[str] = None) -> PromptTemplate:
+    """
+    Load a prompt template by name.
+    
+    Templates live at <prompt_dir>/<version>/<name>.txt, with a [system]
+    section followed by a [user] section.
+    
+    Args:
+        name: Template name (writer, planner, branch, patch_writer, judge)
+        version: Template version (defaults to prompt_version(name))
+    
+    Returns:
+        The parsed template
+    
+    Raises:
+        FileNotFoundError: If the template file does not exist
+        ValueError: If the file lacks a [system] or [user] section
+    """
+    version = version or prompt_version(name)
+    directory = Path(settings.prompt_dir) if settings.prompt_dir else TEMPLATES_DIR
+    return _load(directory / version / f"{name}.txt", name, version)
+
+
+@lru_cache(maxsize=64)
+def _load(path: Path, name: str, version: str) -> PromptTemplate:
+    if not path.exists():
+        raise FileNotFoundError(f"Prompt template '{name}' version '{version}' not found at {path}")
+    
+    parts = _SECTION_RE.split(path.read_text(encoding="utf-8"))
+    sections = dict(zip(parts[1::2], (part.strip() for part in parts[2::2])))
+    if "system" not in sections or "user" not in sections:
+        raise ValueError(f"Prompt template {path} needs [system] and [user] sections")
+    
+    logger.debug("Loaded prompt template %s@%s", name, version)
+    return PromptTemplate(name=name, version=version, system=sections["system"], user=sections["user"])
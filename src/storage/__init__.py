@@ -0,0 +1,18 @@
+"""Persistent storage for research results."""
+
+from .history import HistoryRecord, HistoryStore
+from .codec import FrameCodec, get_codec, save_dictionary, train_dictionary
+from .blobs import BlobStore, FileBlobStore, MemoryBlobStore, content_digest
+
+__all__ = [
+    "HistoryRecord",
+    "HistoryStore",
+    "FrameCodec",
+    "get_codec",
+    "save_dictionary",
+    "train_dictionary",
+    "BlobStore",
+    "FileBlobStore",
+    "MemoryBlobStore",
+    "content_digest",
+]
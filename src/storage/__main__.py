@@ -0,0 +1,98 @@
+"""
+Storage codec tools.
+
+Usage:
+    python -m src.storage train [--history DB] [--samples FILE ...] [--size BYTES] [--output PATH]
+    python -m src.storage stats [--blob-dir DIR]
+
+Samples files are JSON Lines with search results (evaluation cases) or
+recorded cassettes (*.jsonl.gz); snippets and reports in them are used
+for training.
+"""
+
+import argparse
+import gzip
+import json
+import sys
+from pathlib import Path
+from typing import Any, Iterator, List
+
+from config.settings import settings
+from src.utils.logger import setup_logger
+from .codec import get_codec, save_dictionary, train_dictionary
+from .history import HistoryStore
+
+
+def _texts(value: Any) -> Iterator[str]:
+    """Snippet and report strings nested in a recorded value."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in ("content", "raw_content", "report") and isinstance(item, str):
+                yield item
+            else:
+                yield from _texts(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _texts(item)
+
+
+def load_samples(paths: List[str], history_db: str = "") -> List[str]:
+    """Collect training samples from JSON Lines files and the history database."""
+    samples = []
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    samples.extend(_texts(json.loads(line)))
+    if history_db and Path(history_db).exists():
+        store = HistoryStore(history_db)
+        page = 1
+        while True:
+            records = store.list(page=page, page_size=100)
+            if not records:
+                break
+            samples.extend(record.report for record in records)
+            page += 1
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    train_parser = subparsers.add_parser("train", help="Train the shared compression dictionary")
+    train_parser.add_argument("--history", default=settings.history_db_path, help="History database to sample reports from")
+    train_parser.add_argument("--samples", nargs="*", default=[], help="JSON Lines files with results or cassettes")
+    train_parser.add_argument("--size", type=int, default=64 * 1024, help="Dictionary size in bytes")
+    train_parser.add_argument("--output", default=settings.storage_dictionary_path)
+    
+    stats_parser = subparsers.add_parser("stats", help="Show the codec and a blob directory's footprint")
+    stats_parser.add_argument("--blob-dir", default=settings.search_cache_blob_dir)
+    
+    args = parser.parse_args()
+    setup_logger(level="WARNING", fmt=settings.log_format, async_handlers=settings.log_async)
+    
+    if args.command == "train":
+        samples = load_samples(args.samples, args.history)
+        try:
+            dictionary = train_dictionary(samples, args.size)
+        except ValueError as e:
+            sys.exit(str(e))
+        dict_id = save_dictionary(dictionary, args.output)
+        print(f"Trained a {len(dictionary)}-byte dictionary ({dict_id:08x}) on {len(samples)} samples -> {args.output}")
+    
+    elif args.command == "stats":
+        codec = get_codec()
+        print(f"Codec: {codec.name}" + (f" with dictionary {codec.dict_id:08x}" if codec.dict_id else " (no dictionary)"))
+        if args.blob_dir:
+            from .blobs import FileBlobStore
+            
+            stats = FileBlobStore(args.blob_dir).stats()
+            ratio = stats["logical_bytes"] / stats["stored_bytes"] if stats["stored_bytes"] else 0.0
+            print(f"Blobs in {args.blob_dir}: {stats['blobs']}, {stats['logical_bytes']} bytes "
+                  f"stored in {stats['stored_bytes']} ({ratio:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""Content-addressed stores for compressed payloads (snippets, reports, pages)."""
+
+import hashlib
+import mmap
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from src.utils.logger import get_logger
+from .codec import Buffer, FrameCodec, get_codec
+
+logger = get_logger()
+
+
+def content_digest(data: Buffer) -> str:
+    """Address of a payload: hex SHA-256 of its uncompressed bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore:
+    """
+    Stores each distinct payload once, compressed, under its content digest.
+    
+    Identical payloads (the same snippet returned for different queries,
+    or by different runs) share one stored copy.
+    """
+    
+    def __init__(self, codec: Optional[FrameCodec] = None):
+        self.codec = codec or get_codec()
+        self._lock = threading.Lock()
+        self.puts = 0
+        self.dedup_hits = 0
+    
+    def put(self, data: Buffer) -> str:
+        """
+        Store a payload.
+        
+        Returns:
+            Its content digest
+        """
+        raise NotImplementedError
+    
+    def get(self, digest: str) -> bytes:
+        """
+        Read a payload back in full.
+        
+        Raises:
+            KeyError: If no payload has this digest
+        """
+        raise NotImplementedError
+    
+    def read_prefix(self, digest: str, limit: int) -> bytes:
+        """First limit bytes of a payload, decompressing as little as possible."""
+        return self.get(digest)[:limit]
+    
+    def release(self, digest: str) -> None:
+        """Drop one reference to a payload (stores without reference counts keep it)."""
+    
+    def put_text(self, text: str) -> str:
+        """Store text as UTF-8."""
+        return self.put(text.encode("utf-8"))
+    
+    def get_text(self, digest: str) -> str:
+        """Read text stored with put_text."""
+        return self.get(digest).decode("utf-8")
+    
+    def stats(self) -> Dict[str, Any]:
+        """Stored blobs, their logical and stored sizes, and dedup hits."""
+        raise NotImplementedError
+    
+    def _count_put(self, duplicate: bool) -> None:
+        with self._lock:
+            self.puts += 1
+            self.dedup_hits += duplicate
+
+
+class MemoryBlobStore(BlobStore):
+    """Reference-counted blobs in process memory; a blob is freed with its last reference."""
+    
+    def __init__(self, codec: Optional[FrameCodec] = None):
+        super().__init__(codec)
+        self._blobs: Dict[str, bytes] = {}
+        self._refs: Dict[str, int] = {}
+    
+    def put(self, data: Buffer) -> str:
+        digest = content_digest(data)
+        with self._lock:
+            duplicate = digest in self._blobs
+            if duplicate:
+                self._refs[digest] += 1
+        if not duplicate:
+            # Compress outside the lock; a concurrent put of the same payload just wins the race
+            frame = self.codec.encode(data)
+            with self._lock:
+                if digest in self._blobs:
+                    duplicate = True
+                else:
+                    self._blobs[digest] = frame
+                self._refs[digest] = self._refs.get(digest, 0) + 1
+        self._count_put(duplicate)
+        return digest
+    
+    def get(self, digest: str) -> bytes:
+        with self._lock:
+            frame = self._blobs[digest]
+        return self.codec.decode(frame)
+    
+    def read_prefix(self, digest: str, limit: int) -> bytes:
+        with self._lock:
+            frame = self._blobs[digest]
+        return self.codec.decode_prefix(frame, limit)
+    
+    def release(self, digest: str) -> None:
+        with self._lock:
+            refs = self._refs.get(digest, 0) - 1
+            if refs > 0:
+                self._refs[digest] = refs
+            else:
+                self._refs.pop(digest, None)
+                self._blobs.pop(digest, None)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            frames = list(self._blobs.values())
+            puts, dedup_hits = self.puts, self.dedup_hits
+        return {
+            "blobs": len(frames),
+            "logical_bytes": sum(self.codec.frame_size(frame) for frame in frames),
+            "stored_bytes": sum(len(frame) for frame in frames),
+            "puts": puts,
+            "dedup_hits": dedup_hits,
+        }
+
+
+class FileBlobStore(BlobStore):
+    """
+    Blobs as files under root/<digest[:2]>/<digest>, shared by every
+    process and run using the directory.
+    
+    Reads memory-map the file, so the compressed bytes are never copied
+    into Python objects; payloads stored uncompressed (small or
+    incompressible) and prefix reads of streaming codecs skip most of the
+    decompression work. Writes are atomic renames, so concurrent writers
+    of the same payload are harmless. Blobs are immutable and never
+    deleted by the store.
+    """
+    
+    def __init__(self, root: Union[str, Path], codec: Optional[FrameCodec] = None):
+        super().__init__(codec)
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+    
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+    
+    def put(self, data: Buffer) -> str:
+        digest = content_digest(data)
+        path = self._path(digest)
+        duplicate = path.exists()
+        if not duplicate:
+            path.parent.mkdir(exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(self.codec.encode(data))
+                os.replace(tmp, path)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        self._count_put(duplicate)
+        return digest
+    
+    def _read(self, digest: str, limit: Optional[int]) -> bytes:
+        try:
+            f = open(self._path(digest), "rb")
+        except FileNotFoundError:
+            raise KeyError(digest) from None
+        with f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                if limit is None:
+                    return self.codec.decode(view)
+                return self.codec.decode_prefix(view, limit)
+            finally:
+                view.release()
+    
+    def get(self, digest: str) -> bytes:
+        return self._read(digest, None)
+    
+    def read_prefix(self, digest: str, limit: int) -> bytes:
+        return self._read(digest, limit)
+    
+    def stats(self) -> Dict[str, Any]:
+        blobs = logical = stored = 0
+        for path in self.root.glob("??/*"):
+            if path.name.startswith(".tmp-"):
+                continue
+            blobs += 1
+            stored += path.stat().st_size
+            with open(path, "rb") as f:
+                logical += self.codec.frame_size(f.read(16))
+        with self._lock:
+            puts, dedup_hits = self.puts, self.dedup_hits
+        return {
+            "blobs": blobs,
+            "logical_bytes": logical,
+            "stored_bytes": stored,
+            "puts": puts,
+            "dedup_hits": dedup_hits,
+        }
@@ -0,0 +1,440 @@
+"""Compression codecs and the self-describing frames stored in caches and blobs."""
+
+import base64
+import hashlib
+import json
+import struct
+import threading
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+# Frame: magic, codec id, dictionary id (0 = none), uncompressed size, payload
+MAGIC = 0xD7
+_HEADER = struct.Struct(">BBII")
+HEADER_SIZE = _HEADER.size
+
+# Text frames (for str-only stores such as Redis with decode_responses) start
+# with a character no JSON document can start with
+TEXT_PREFIX = "~"
+
+# zlib only looks back 32 KiB, so longer dictionaries are cut to their tail
+_ZLIB_MAX_DICTIONARY = 32 * 1024
+
+
+class Codec:
+    """A compression algorithm, optionally primed with a shared dictionary."""
+    
+    name = "base"
+    codec_id = -1
+    default_level = 0
+    
+    def __init__(self, level: int = 0, dictionary: Optional[bytes] = None):
+        self.level = level or self.default_level
+        self.dictionary = dictionary
+    
+    @classmethod
+    def available(cls) -> bool:
+        """Whether the codec's library is installed."""
+        return True
+    
+    def compress(self, data: Buffer) -> bytes:
+        """Compress a payload."""
+        raise NotImplementedError
+    
+    def decompress(self, data: Buffer, size: int) -> bytes:
+        """
+        Decompress a payload.
+        
+        Args:
+            data: Compressed payload
+            size: Uncompressed size recorded in the frame
+        """
+        raise NotImplementedError
+    
+    def decompress_prefix(self, data: Buffer, size: int, limit: int) -> bytes:
+        """Decompress only the first limit bytes (the whole payload unless the codec can stream)."""
+        return self.decompress(data, size)[:limit]
+
+
+class RawCodec(Codec):
+    """Stores payloads as they are."""
+    
+    name = "none"
+    codec_id = 0
+    
+    def compress(self, data: Buffer) -> bytes:
+        return bytes(data)
+    
+    def decompress(self, data: Buffer, size: int) -> bytes:
+        return bytes(data)
+    
+    def decompress_prefix(self, data: Buffer, size: int, limit: int) -> bytes:
+        return bytes(data[:limit])
+
+
+class ZlibCodec(Codec):
+    """Standard-library deflate, the fallback when neither zstd nor lz4 is installed."""
+    
+    name = "zlib"
+    codec_id = 1
+    default_level = 6
+    
+    def __init__(self, level: int = 0, dictionary: Optional[bytes] = None):
+        super().__init__(level, dictionary[-_ZLIB_MAX_DICTIONARY:] if dictionary else None)
+    
+    def _decompressor(self):
+        return zlib.decompressobj(zdict=self.dictionary) if self.dictionary else zlib.decompressobj()
+    
+    def compress(self, data: Buffer) -> bytes:
+        compressor = (
+            zlib.compressobj(self.level, zdict=self.dictionary) if self.dictionary
+            else zlib.compressobj(self.level)
+        )
+        return compressor.compress(data) + compressor.flush()
+    
+    def decompress(self, data: Buffer, size: int) -> bytes:
+        decompressor = self._decompressor()
+        return decompressor.decompress(data) + decompressor.flush()
+    
+    def decompress_prefix(self, data: Buffer, size: int, limit: int) -> bytes:
+        return self._decompressor().decompress(data, limit)
+
+
+class ZstdCodec(Codec):
+    """Zstandard (zstandard package): fast, with trained dictionaries."""
+    
+    name = "zstd"
+    codec_id = 2
+    default_level = 3
+    
+    def __init__(self, level: int = 0, dictionary: Optional[bytes] = None):
+        import zstandard
+        
+        super().__init__(level, dictionary)
+        self._zstandard = zstandard
+        self._dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        # Compressor and decompressor objects are not thread-safe; keep one pair per thread
+        self._local = threading.local()
+    
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            return False
+        return True
+    
+    def _compressor(self):
+        compressor = getattr(self._local, "compressor", None)
+        if compressor is None:
+            compressor = self._zstandard.ZstdCompressor(level=self.level, dict_data=self._dict_data, write_checksum=False)
+            self._local.compressor = compressor
+        return compressor
+    
+    def _decompressor(self):
+        decompressor = getattr(self._local, "decompressor", None)
+        if decompressor is None:
+            decompressor = self._zstandard.ZstdDecompressor(dict_data=self._dict_data)
+            self._local.decompressor = decompressor
+        return decompressor
+    
+    def compress(self, data: Buffer) -> bytes:
+        return self._compressor().compress(data)
+    
+    def decompress(self, data: Buffer, size: int) -> bytes:
+        return self._decompressor().decompress(data, max_output_size=size)
+    
+    def decompress_prefix(self, data: Buffer, size: int, limit: int) -> bytes:
+        with self._decompressor().stream_reader(data) as reader:
+            return reader.read(limit)
+
+
+class Lz4Codec(Codec):
+    """LZ4 block format (lz4 package): the fastest to decompress."""
+    
+    name = "lz4"
+    codec_id = 3
+    default_level = 0
+    
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            import lz4.block  # noqa: F401
+        except ImportError:
+            return False
+        return True
+    
+    def compress(self, data: Buffer) -> bytes:
+        import lz4.block
+        
+        mode = "high_compression" if self.level > 0 else "default"
+        kwargs = {"dict": self.dictionary} if self.dictionary else {}
+        return lz4.block.compress(bytes(data), mode=mode, compression=self.level, store_size=False, **kwargs)
+    
+    def decompress(self, data: Buffer, size: int) -> bytes:
+        import lz4.block
+        
+        kwargs = {"dict": self.dictionary} if self.dictionary else {}
+        return lz4.block.decompress(bytes(data), uncompressed_size=size, **kwargs)
+
+
+# Preference order for STORAGE_CODEC=auto
+CODECS = {codec.name: codec for codec in (ZstdCodec, Lz4Codec, ZlibCodec, RawCodec)}
+_BY_ID = {codec.codec_id: codec for codec in CODECS.values()}
+
+
+def dictionary_id(dictionary: bytes) -> int:
+    """Non-zero 32-bit identifier of a dictionary, stored in every frame that uses it."""
+    return (int.from_bytes(hashlib.sha256(dictionary).digest()[:4], "big") | 1) & 0xFFFFFFFF
+
+
+def _archive_path(path: Path, dict_id: int) -> Path:
+    return path.with_name(f"{path.stem}.{dict_id:08x}{path.suffix}")
+
+
+def save_dictionary(dictionary: bytes, path: Union[str, Path]) -> int:
+    """
+    Install a dictionary as the current one, keeping an archived copy
+    so frames compressed with it stay readable after it is replaced.
+    
+    Returns:
+        Dictionary id
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    dict_id = dictionary_id(dictionary)
+    _archive_path(path, dict_id).write_bytes(dictionary)
+    path.write_bytes(dictionary)
+    return dict_id
+
+
+def _build_dictionary(samples: List[bytes], size: int) -> bytes:
+    """
+    Dictionary of the most frequent lines and sentences, for codecs
+    without a trainer. Fragments are ordered by weight so the most useful
+    ones sit at the end, closest to the data.
+    """
+    counts: Counter = Counter()
+    for sample in samples:
+        for fragment in set(sample.replace(b". ", b".\n").splitlines()):
+            if len(fragment) >= 8:
+                counts[fragment] += 1
+    weighted = sorted(
+        (fragment for fragment, count in counts.items() if count > 1),
+        key=lambda fragment: counts[fragment] * len(fragment)
+    )
+    chosen: List[bytes] = []
+    total = 0
+    for fragment in reversed(weighted):
+        if total + len(fragment) + 1 > size:
+            continue
+        chosen.append(fragment)
+        total += len(fragment) + 1
+    return b"\n".join(reversed(chosen))
+
+
+def train_dictionary(samples: Iterable[Union[str, bytes]], size: int = 64 * 1024) -> bytes:
+    """
+    Train a shared dictionary on representative payloads (reports,
+    snippets, cached JSON), which mostly helps small values.
+    
+    Args:
+        samples: Payloads to learn from
+        size: Dictionary size in bytes
+    
+    Returns:
+        Dictionary bytes (zstd-trained when zstandard is installed)
+    
+    Raises:
+        ValueError: If there are too few samples to learn anything
+    """
+    data = [sample.encode("utf-8") if isinstance(sample, str) else bytes(sample) for sample in samples]
+    data = [sample for sample in data if sample]
+    if len(data) < 8:
+        raise ValueError(f"Need at least 8 samples to train a dictionary, got {len(data)}")
+    if ZstdCodec.available():
+        import zstandard
+        
+        try:
+            return zstandard.train_dictionary(size, data).as_bytes()
+        except zstandard.ZstdError as e:
+            logger.warning("zstd dictionary training failed (%s); building a plain one", e)
+    dictionary = _build_dictionary(data, size)
+    if not dictionary:
+        raise ValueError("Samples share no repeated content to build a dictionary from")
+    return dictionary
+
+
+class FrameCodec:
+    """
+    Encodes payloads as self-describing frames with one codec and
+    dictionary, and decodes frames made by any codec or dictionary.
+    """
+    
+    def __init__(
+        self,
+        codec: str = "auto",
+        level: int = 0,
+        dictionary: Optional[bytes] = None,
+        min_compress_bytes: int = 128,
+        dictionary_path: Optional[Union[str, Path]] = None
+    ):
+        """
+        Args:
+            codec: "auto" (zstd, else lz4, else zlib), "zstd", "lz4", "zlib" or "none"
+            level: Compression level (0 = the codec's default)
+            dictionary: Shared dictionary for new frames
+            min_compress_bytes: Smaller payloads are stored uncompressed
+            dictionary_path: Where archived dictionaries are looked up for old frames
+        
+        Raises:
+            ValueError: If the codec is unknown or not installed
+        """
+        if codec == "auto":
+            codec = next(name for name, cls in CODECS.items() if cls.available())
+        if codec not in CODECS:
+            raise ValueError(f"Unknown storage codec '{codec}'. Available: auto, {', '.join(CODECS)}")
+        if not CODECS[codec].available():
+            raise ValueError(f"Storage codec '{codec}' is not installed (pip install {'zstandard' if codec == 'zstd' else codec})")
+        self.level = level
+        self.min_compress_bytes = min_compress_bytes
+        self.dictionary_path = Path(dictionary_path) if dictionary_path else None
+        self.dict_id = dictionary_id(dictionary) if dictionary else 0
+        self.codec = CODECS[codec](level, dictionary)
+        self._dictionaries: Dict[int, Optional[bytes]] = {0: None}
+        if dictionary:
+            self._dictionaries[self.dict_id] = dictionary
+        self._decoders: Dict[Tuple[int, int], Codec] = {(self.codec.codec_id, self.dict_id): self.codec}
+        self._lock = threading.Lock()
+    
+    @property
+    def name(self) -> str:
+        return self.codec.name
+    
+    def encode(self, data: Buffer) -> bytes:
+        """Compress a payload into a frame (stored raw if small or incompressible)."""
+        size = len(data)
+        if size >= self.min_compress_bytes:
+            payload = self.codec.compress(data)
+            if len(payload) < size:
+                return _HEADER.pack(MAGIC, self.codec.codec_id, self.dict_id, size) + payload
+        return _HEADER.pack(MAGIC, RawCodec.codec_id, 0, size) + bytes(data)
+    
+    def decode(self, frame: Buffer) -> bytes:
+        """
+        Decompress a frame.
+        
+        Raises:
+            ValueError: If the frame is malformed or its dictionary is missing
+        """
+        decoder, size, payload = self._open(frame)
+        return decoder.decompress(payload, size)
+    
+    def decode_prefix(self, frame: Buffer, limit: int) -> bytes:
+        """First limit bytes of a frame's payload, decompressing no more than the codec must."""
+        decoder, size, payload = self._open(frame)
+        return decoder.decompress_prefix(payload, size, limit)
+    
+    def frame_size(self, frame: Buffer) -> int:
+        """Uncompressed size recorded in a frame."""
+        return self._header(frame)[3]
+    
+    def _header(self, frame: Buffer) -> Tuple[int, int, int, int]:
+        if len(frame) < HEADER_SIZE or frame[0] != MAGIC:
+            raise ValueError("Not a storage frame")
+        return _HEADER.unpack_from(frame)
+    
+    def _open(self, frame: Buffer) -> Tuple[Codec, int, memoryview]:
+        _, codec_id, dict_id, size = self._header(frame)
+        return self._decoder(codec_id, dict_id), size, memoryview(frame)[HEADER_SIZE:]
+    
+    def _decoder(self, codec_id: int, dict_id: int) -> Codec:
+        key = (codec_id, dict_id)
+        decoder = self._decoders.get(key)
+        if decoder is not None:
+            return decoder
+        if codec_id not in _BY_ID:
+            raise ValueError(f"Unknown codec id {codec_id} in frame")
+        with self._lock:
+            if key not in self._decoders:
+                self._decoders[key] = _BY_ID[codec_id](self.level, self._dictionary(dict_id))
+            return self._decoders[key]
+    
+    def _dictionary(self, dict_id: int) -> Optional[bytes]:
+        if dict_id not in self._dictionaries:
+            path = _archive_path(self.dictionary_path, dict_id) if self.dictionary_path else None
+            if path is None or not path.exists():
+                raise ValueError(f"Frame needs dictionary {dict_id:08x}, which is not available")
+            self._dictionaries[dict_id] = path.read_bytes()
+        return self._dictionaries[dict_id]
+    
+    def encode_json(self, value: Any) -> bytes:
+        """Frame a JSON-serializable value."""
+        return self.encode(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    
+    def decode_json(self, frame: Buffer) -> Any:
+        """Inverse of encode_json."""
+        return json.loads(self.decode(frame))
+    
+    def pack_text(self, value: Any) -> str:
+        """
+        Serialize a value for a store that only holds text: plain JSON if
+        small, otherwise a base85 frame marked with TEXT_PREFIX.
+        """
+        text = json.dumps(value, ensure_ascii=False)
+        data = text.encode("utf-8")
+        if len(data) < self.min_compress_bytes:
+            return text
+        packed = TEXT_PREFIX + base64.b85encode(self.encode(data)).decode("ascii")
+        return packed if len(packed) < len(text) else text
+    
+    def unpack_text(self, text: str) -> Any:
+        """Inverse of pack_text; plain JSON written before compression is read as is."""
+        if text.startswith(TEXT_PREFIX):
+            return json.loads(self.decode(base64.b85decode(text[len(TEXT_PREFIX):])))
+        return json.loads(text)
+
+
+_codec: Optional[FrameCodec] = None
+_codec_lock = threading.Lock()
+
+
+def get_codec() -> FrameCodec:
+    """
+    Get the process-wide frame codec for STORAGE_CODEC, primed with the
+    dictionary at STORAGE_DICTIONARY_PATH if one has been trained.
+    """
+    global _codec
+    with _codec_lock:
+        if _codec is None:
+            from config.settings import settings
+            
+            path = Path(settings.storage_dictionary_path) if settings.storage_dictionary_path else None
+            dictionary = path.read_bytes() if path is not None and path.exists() else None
+            _codec = FrameCodec(
+                codec=settings.storage_codec,
+                level=settings.storage_compression_level,
+                dictionary=dictionary,
+                min_compress_bytes=settings.storage_min_compress_bytes,
+                dictionary_path=path
+            )
+            logger.debug(
+                "Storage codec %s%s", _codec.name,
+                f" with dictionary {_codec.dict_id:08x}" if dictionary else ""
+            )
+        return _codec
+
+
+def reset_codec() -> None:
+    """Rebuild the codec on next use (after changing settings or the dictionary)."""
+    global _codec
+    with _codec_lock:
+        _codec = None
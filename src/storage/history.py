@@ -0,0 +1,220 @@
+"""SQLite-backed research history with full-text search."""
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    query TEXT NOT NULL,
+    report TEXT NOT NULL,
+    sources TEXT NOT NULL DEFAULT '[]',
+    cost REAL NOT NULL DEFAULT 0,
+    timings TEXT NOT NULL DEFAULT '{}'
+);
+
+CREATE INDEX IF NOT EXISTS idx_history_timestamp ON history (timestamp DESC);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+    query, report, content='history', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS history_ai AFTER INSERT ON history BEGIN
+    INSERT INTO history_fts (rowid, query, report) VALUES (new.id, new.query, new.report);
+END;
+
+CREATE TRIGGER IF NOT EXISTS history_ad AFTER DELETE ON history BEGIN
+    INSERT INTO history_fts (history_fts, rowid, query, report)
+    VALUES ('delete', old.id, old.query, old.report);
+END;
+
+CREATE TRIGGER IF NOT EXISTS history_au AFTER UPDATE ON history BEGIN
+    INSERT INTO history_fts (history_fts, rowid, query, report)
+    VALUES ('delete', old.id, old.query, old.report);
+    INSERT INTO history_fts (rowid, query, report) VALUES (new.id, new.query, new.report);
+END;
+"""
+
+
+@dataclass
+class HistoryRecord:
+    """A completed research run."""
+    
+    query: str
+    report: str
+    sources: List[str] = field(default_factory=list)
+    cost: float = 0.0
+    timings: Dict[str, float] = field(default_factory=dict)
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    id: Optional[int] = None
+
+
+class HistoryStore:
+    """
+    Persistent store of research runs.
+    
+    Records live in a plain SQLite table with an FTS5 index over query and
+    report text, so prior reports can be found without re-running research.
+    Connections are opened per operation, which keeps the store safe to
+    share between Streamlit sessions and threads.
+    """
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._memory_conn = sqlite3.connect(":memory:", check_same_thread=False) if db_path == ":memory:" else None
+        
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = self._memory_conn or sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            if conn is not self._memory_conn:
+                conn.close()
+    
+    def add(self, record: HistoryRecord) -> int:
+        """
+        Save a research run.
+        
+        Args:
+            record: Run to store
+        
+        Returns:
+            ID of the stored record
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO history (timestamp, query, report, sources, cost, timings) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    record.timestamp,
+                    record.query,
+                    record.report,
+                    json.dumps(record.sources),
+                    record.cost,
+                    json.dumps(record.timings),
+                )
+            )
+            record.id = cursor.lastrowid
+        logger.debug("Saved history record %s", record.id)
+        return record.id
+    
+    def get(self, record_id: int) -> Optional[HistoryRecord]:
+        """Fetch a single record by ID."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM history WHERE id = ?", (record_id,)).fetchone()
+        return self._to_record(row) if row else None
+    
+    def list(self, page: int = 1, page_size: int = 10, include_report: bool = True) -> List[HistoryRecord]:
+        """
+        List records, newest first.
+        
+        Args:
+            page: 1-based page number
+            page_size: Records per page
+            include_report: Load report text; when False, reports are left empty
+        
+        Returns:
+            Records on the requested page
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {self._columns(include_report)} FROM history "
+                "ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?",
+                (page_size, (max(page, 1) - 1) * page_size)
+            ).fetchall()
+        return [self._to_record(row) for row in rows]
+    
+    def search(self, text: str, page: int = 1, page_size: int = 10, include_report: bool = True) -> List[HistoryRecord]:
+        """
+        Full-text search over queries and reports, best matches first.
+        
+        Args:
+            text: Free-text search terms
+            page: 1-based page number
+            page_size: Records per page
+            include_report: Load report text; when False, reports are left empty
+        
+        Returns:
+            Matching records on the requested page
+        """
+        match = self._match_expression(text)
+        if not match:
+            return self.list(page, page_size, include_report)
+        
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {self._columns(include_report)} FROM history_fts "
+                "JOIN history ON history.id = history_fts.rowid "
+                "WHERE history_fts MATCH ? ORDER BY bm25(history_fts) LIMIT ? OFFSET ?",
+                (match, page_size, (max(page, 1) - 1) * page_size)
+            ).fetchall()
+        return [self._to_record(row) for row in rows]
+    
+    def count(self, text: str = "") -> int:
+        """Number of records, optionally restricted to a full-text search."""
+        match = self._match_expression(text)
+        with self._connect() as conn:
+            if match:
+                row = conn.execute(
+                    "SELECT COUNT(*) FROM history_fts WHERE history_fts MATCH ?", (match,)
+                ).fetchone()
+            else:
+                row = conn.execute("SELECT COUNT(*) FROM history").fetchone()
+        return row[0]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Aggregate totals across all records."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT COUNT(*), COALESCE(SUM(cost), 0) FROM history").fetchone()
+        return {"queries": row[0], "total_cost_usd": row[1]}
+    
+    def delete(self, record_id: int) -> None:
+        """Remove a record."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM history WHERE id = ?", (record_id,))
+    
+    @staticmethod
+    def _columns(include_report: bool) -> str:
+        """Select list for history rows, optionally skipping the report body."""
+        if include_report:
+            return "history.*"
+        return (
+            "history.id, history.timestamp, history.query, '' AS report, "
+            "history.sources, history.cost, history.timings"
+        )
+    
+    @staticmethod
+    def _match_expression(text: str) -> str:
+        """Turn free text into a safe FTS5 query (quoted prefix terms, ANDed)."""
+        terms = [t.replace('"', '""') for t in text.split()]
+        return " ".join(f'"{t}"*' for t in terms if t)
+    
+    @staticmethod
+    def _to_record(row: sqlite3.Row) -> HistoryRecord:
+        return HistoryRecord(
+            id=row["id"],
+            timestamp=row["timestamp"],
+            query=row["query"],
+            report=row["report"],
+            sources=json.loads(row["sources"]),
+            cost=row["cost"],
+            timings=json.loads(row["timings"]),
+        )
@@ -1,5 +1,32 @@
 """Tools package for external integrations."""
 
 from .search import SearchTool
+from .llm import LLMClient, LLMResponse, GenerationCancelled
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .providers import SearchProvider, TavilyProvider, CacheProvider, build_providers
+from .cassette import Cassette, CassetteMiss, RecordedError, get_cassette
+from .rerank import Reranker
+from .embeddings import EmbeddingService, get_embedding_service
+from .transport import get_http_client, get_transport_metrics
 
-__all__ = ["SearchTool"]
+__all__ = [
+    "SearchTool",
+    "LLMClient",
+    "LLMResponse",
+    "GenerationCancelled",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "SearchProvider",
+    "TavilyProvider",
+    "CacheProvider",
+    "build_providers",
+    "Cassette",
+    "CassetteMiss",
+    "RecordedError",
+    "get_cassette",
+    "Reranker",
+    "EmbeddingService",
+    "get_embedding_service",
+    "get_http_client",
+    "get_transport_metrics",
+]
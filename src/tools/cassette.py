@@ -0,0 +1,299 @@
+"""Record provider traffic to a cassette file and replay it deterministically."""
+
+import atexit
+import copy
+import dataclasses
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+import zlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from config.settings import settings
+from src.utils.logger import get_logger
+from .providers import CacheMiss, SearchProvider
+
+logger = get_logger()
+
+MODES = ("off", "record", "replay", "replay_or_live")
+
+REDACTED = "[REDACTED]"
+
+# Credentials that must never reach a cassette, whatever field they turn up in
+_SECRET_PATTERNS = [
+    re.compile(r"(?i)\bBearer\s+[A-Za-z0-9._\-]+"),
+    re.compile(r"\btvly-[A-Za-z0-9_\-]{8,}"),
+    re.compile(r"\bgsk_[A-Za-z0-9]{8,}"),
+    re.compile(r"(?i)(api[_-]?key[\"']?\s*[:=]\s*[\"']?)[A-Za-z0-9._\-]{8,}"),
+]
+
+
+class CassetteMiss(CacheMiss):
+    """Raised in replay mode when a request was never recorded."""
+
+
+class RecordedError(RuntimeError):
+    """Replayed failure of a recorded call."""
+
+
+def redact(value: Any, secrets: List[str]) -> Any:
+    """
+    Replace credentials in strings nested anywhere in a JSON-like value.
+    
+    Args:
+        value: Request or response data
+        secrets: Literal secret values to remove (e.g. configured API keys)
+    
+    Returns:
+        Copy of the value with secrets replaced by REDACTED
+    """
+    if isinstance(value, str):
+        for secret in secrets:
+            value = value.replace(secret, REDACTED)
+        for pattern in _SECRET_PATTERNS:
+            value = pattern.sub(lambda m: (m.group(1) if m.re.groups else "") + REDACTED, value)
+        return value
+    if isinstance(value, dict):
+        return {key: redact(item, secrets) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(item, secrets) for item in value]
+    return value
+
+
+def request_key(kind: str, request: Dict[str, Any]) -> str:
+    """Stable identity of a request: hash of its canonical JSON form."""
+    canonical = json.dumps({"kind": kind, **request}, sort_keys=True, separators=(",", ":"), default=repr)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclasses.dataclass
+class Interaction:
+    """One recorded provider call."""
+    
+    kind: str  # "search" or "llm"
+    key: str
+    request: Dict[str, Any]
+    response: Any = None
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+    recorded_at: float = 0.0
+
+
+class Cassette:
+    """
+    Recorded search and LLM calls, stored as gzip-compressed JSON Lines.
+    
+    Modes:
+        record: every call goes to the live provider and is written to a
+            fresh cassette
+        replay: calls are answered from the cassette only; unknown
+            requests raise CassetteMiss
+        replay_or_live: recorded requests are replayed, others go to the
+            live provider and are appended to the cassette
+    
+    A request recorded several times (the same search repeated in one
+    run) replays its recordings in order and then keeps repeating the
+    last one. Replays sleep for the recorded latency divided by
+    replay_speed, or not at all when replay_speed is 0. Recorded failures
+    are replayed as RecordedError.
+    
+    The file is one gzip stream flushed after every record, so records
+    share one compression window and a crashed recording stays readable
+    up to its last complete record. API keys are redacted before writing.
+    In record mode calls are only streamed to the file, never kept in
+    memory, so long recordings run in constant memory.
+    """
+    
+    def __init__(self, path: str, mode: str = "replay", replay_speed: float = 0.0):
+        """
+        Open a cassette.
+        
+        Args:
+            path: Cassette file (conventionally *.jsonl.gz)
+            mode: "record", "replay" or "replay_or_live"
+            replay_speed: 1.0 replays recorded latencies, 2.0 twice as
+                fast, 0 without any delay
+        
+        Raises:
+            ValueError: If the mode is unknown
+            FileNotFoundError: In replay mode, if the cassette is missing
+        """
+        if mode not in MODES or mode == "off":
+            raise ValueError(f"Unknown cassette mode '{mode}'. Available: {', '.join(MODES[1:])}")
+        self.path = Path(path)
+        self.mode = mode
+        self.replay_speed = replay_speed
+        self._lock = threading.Lock()
+        self._recorded: Dict[str, List[Interaction]] = defaultdict(list)
+        self._played: Dict[str, int] = defaultdict(int)
+        self._file = None
+        self._secrets = [key for key in (settings.tavily_api_key, settings.groq_api_key, settings.google_api_key)
+                         if key and len(key) >= 8]
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        
+        if mode == "replay" and not self.path.exists():
+            raise FileNotFoundError(f"Cassette {self.path} does not exist")
+        if mode != "record" and self.path.exists():
+            for interaction in self.interactions():
+                self._recorded[interaction.key].append(interaction)
+            logger.info("📼 Loaded %s recorded calls from %s", sum(map(len, self._recorded.values())), self.path)
+    
+    def interactions(self) -> Iterator[Interaction]:
+        """Read the recorded calls in order, stopping at a truncated tail."""
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    if line.strip():
+                        yield Interaction(**json.loads(line))
+            except (EOFError, zlib.error, gzip.BadGzipFile, json.JSONDecodeError) as e:
+                logger.warning("Cassette %s was not closed cleanly (%s); using the records before that point", self.path, e)
+    
+    def call(
+        self,
+        kind: str,
+        request: Dict[str, Any],
+        live: Callable[[], Any],
+        wait: Callable[[float], Any] = time.sleep
+    ) -> Any:
+        """
+        Answer a call from the cassette or the live provider.
+        
+        Args:
+            kind: "search" or "llm"
+            request: JSON-serializable description of what is sent
+            live: Makes the real call and returns a JSON-serializable response
+            wait: Sleeps for the replay delay (e.g. an Event's wait, so
+                a cancelled call stops waiting)
+        
+        Returns:
+            The recorded or live response
+        
+        Raises:
+            CassetteMiss: In replay mode, if the request was never recorded
+            RecordedError: If the recorded call failed
+        """
+        key = request_key(kind, request)
+        if self.mode != "record":
+            interaction = self._next(key)
+            if interaction is not None:
+                return self._replay(interaction, wait)
+            with self._lock:
+                self.misses += 1
+            if self.mode == "replay":
+                raise CassetteMiss(f"No recorded {kind} call matches this request (key {key[:12]})")
+        
+        started = time.perf_counter()
+        try:
+            response = live()
+        except Exception as e:
+            self._write(Interaction(kind, key, request, error=f"{type(e).__name__}: {e}",
+                                    elapsed_ms=(time.perf_counter() - started) * 1000, recorded_at=time.time()))
+            raise
+        self._write(Interaction(kind, key, request, response=response,
+                                elapsed_ms=(time.perf_counter() - started) * 1000, recorded_at=time.time()))
+        return response
+    
+    def _next(self, key: str) -> Optional[Interaction]:
+        with self._lock:
+            recordings = self._recorded.get(key)
+            if not recordings:
+                return None
+            index = min(self._played[key], len(recordings) - 1)
+            self._played[key] += 1
+            self.hits += 1
+            return recordings[index]
+    
+    def _replay(self, interaction: Interaction, wait: Callable[[float], Any]) -> Any:
+        if self.replay_speed > 0 and interaction.elapsed_ms > 0:
+            wait(interaction.elapsed_ms / 1000 / self.replay_speed)
+        if interaction.error is not None:
+            raise RecordedError(interaction.error)
+        # Callers may annotate results in place; recordings must stay as recorded
+        return copy.deepcopy(interaction.response)
+    
+    def _write(self, interaction: Interaction) -> None:
+        interaction.request = redact(interaction.request, self._secrets)
+        interaction.response = redact(interaction.response, self._secrets)
+        if interaction.error is not None:
+            interaction.error = redact(interaction.error, self._secrets)
+        line = json.dumps(dataclasses.asdict(interaction), ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = gzip.open(self.path, "wt" if self.mode == "record" else "at", encoding="utf-8")
+            self._file.write(line)
+            # Sync flush: the record is readable now, without ending the stream
+            self._file.flush()
+            if self.mode != "record":
+                # replay_or_live replays new recordings to later identical calls
+                self._recorded[interaction.key].append(interaction)
+            self.recorded += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hits, misses and calls recorded since the cassette was opened."""
+        with self._lock:
+            return {
+                "path": str(self.path),
+                "mode": self.mode,
+                "hits": self.hits,
+                "misses": self.misses,
+                "recorded": self.recorded,
+                "requests": len(self._recorded),  # Distinct requests available for replay
+            }
+    
+    def close(self) -> None:
+        """Finish the gzip stream of a recording."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                logger.info("📼 Cassette %s closed (%s calls recorded)", self.path, self.recorded)
+
+
+class CassetteSearchProvider(SearchProvider):
+    """Records or replays the searches of a live provider."""
+    
+    def __init__(self, provider: SearchProvider, cassette: Cassette):
+        self.provider = provider
+        self.cassette = cassette
+        self.name = provider.name
+        self.uses_circuit_breaker = provider.uses_circuit_breaker
+    
+    def search(
+        self,
+        query: str,
+        max_results: int,
+        timeout: Optional[float] = None,
+        **options
+    ) -> List[Dict[str, Any]]:
+        """Search through the cassette (the timeout is not part of the recorded request)."""
+        request = {"query": query, "max_results": max_results, "options": options}
+        return self.cassette.call(
+            "search", request, lambda: self.provider.search(query, max_results, timeout=timeout, **options)
+        )
+
+
+_cassette: Optional[Cassette] = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Optional[Cassette]:
+    """
+    Get the process-wide cassette configured by CASSETTE_MODE and
+    CASSETTE_PATH, or None when recording and replay are off.
+    """
+    global _cassette
+    if settings.cassette_mode == "off":
+        return None
+    with _cassette_lock:
+        if _cassette is None:
+            _cassette = Cassette(settings.cassette_path, settings.cassette_mode, settings.cassette_replay_speed)
+            atexit.register(_cassette.close)
+        return _cassette
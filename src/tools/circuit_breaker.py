@@ -0,0 +1,156 @@
+"""Per-provider circuit breakers."""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict
+
+from config.settings import settings
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker driven by the error rate over a sliding time window.
+    
+    - closed: calls pass through; outcomes are recorded in the window
+    - open: calls are rejected immediately until the cool-down elapses
+    - half_open: a single trial call is let through; success closes the
+      circuit, failure opens it again
+    
+    Every allowed call must end in record_success, record_failure or
+    release_trial; otherwise a half-open circuit waits for its trial
+    forever.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: float = 0.5,
+        window_seconds: float = 30.0,
+        min_calls: int = 5,
+        open_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self._clock = clock
+        
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._outcomes = deque()  # (timestamp, succeeded)
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        """Current state, moving open circuits to half-open after cool-down."""
+        with self._lock:
+            self._refresh_state()
+            return self._state
+    
+    def allow_request(self) -> bool:
+        """Whether a call may proceed right now."""
+        with self._lock:
+            self._refresh_state()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+    
+    def record_success(self) -> None:
+        """Record a successful call."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                logger.info("Circuit '%s' closed after successful trial", self.name)
+                self._state = CLOSED
+                self._trial_in_flight = False
+                self._outcomes.clear()
+                return
+            self._append(True)
+    
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit if the error rate is too high."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._open()
+                return
+            self._append(False)
+            
+            if len(self._outcomes) >= self.min_calls:
+                failures = sum(1 for _, ok in self._outcomes if not ok)
+                if failures / len(self._outcomes) >= self.failure_threshold:
+                    self._open()
+    
+    def release_trial(self) -> None:
+        """
+        End an allowed call without counting its outcome (e.g. a cache
+        miss or an interrupted call), freeing the half-open trial slot.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+    
+    def call(self, fn: Callable, *args, **kwargs):
+        """Run fn through the breaker."""
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            self.release_trial()
+            raise
+        self.record_success()
+        return result
+    
+    def _append(self, succeeded: bool) -> None:
+        now = self._clock()
+        self._outcomes.append((now, succeeded))
+        while self._outcomes and self._outcomes[0][0] < now - self.window_seconds:
+            self._outcomes.popleft()
+    
+    def _open(self) -> None:
+        logger.warning("Circuit '%s' opened for %.0fs", self.name, self.open_seconds)
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._trial_in_flight = False
+        self._outcomes.clear()
+    
+    def _refresh_state(self) -> None:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Get the process-wide breaker for a provider, creating it on first use."""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(
+                name,
+                failure_threshold=settings.circuit_failure_threshold,
+                window_seconds=settings.circuit_window_seconds,
+                min_calls=settings.circuit_min_calls,
+                open_seconds=settings.circuit_open_seconds
+            )
+        return _breakers[name]
@@ -0,0 +1,595 @@
+"""Batched text embeddings with a content-addressed, quantized vector cache."""
+
+import hashlib
+import math
+import os
+import queue
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from config.settings import settings
+from src.utils.logger import get_logger
+from .rerank import _tokens
+
+try:
+    import fcntl
+except ImportError:  # Windows: one process per cache directory
+    fcntl = None
+
+logger = get_logger()
+
+DTYPES = ("float32", "float16", "int8")
+
+# Bytes of the SHA-256 digest keying each cached row
+DIGEST_SIZE = 32
+
+
+def text_digest(text: str) -> bytes:
+    """Cache key of a text: SHA-256 of its whitespace-normalized UTF-8 bytes."""
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).digest()
+
+
+@lru_cache(maxsize=65536)
+def _token_features(token: str, ngram: int, dimensions: int) -> Tuple[Tuple[int, ...], Tuple[float, ...]]:
+    """Hashed columns and signs of a word and its character n-grams."""
+    padded = f" {token} "
+    grams = [f"w:{token}"] + [padded[start:start + ngram] for start in range(max(len(padded) - ngram + 1, 1))]
+    hashes = [zlib.crc32(gram.encode()) for gram in grams]
+    return tuple(h % dimensions for h in hashes), tuple(1.0 if h & 0x80000000 else -1.0 for h in hashes)
+
+
+class Embedder:
+    """Turns a batch of texts into L2-normalized float32 vectors."""
+    
+    name = "base"
+    dimensions = 0
+    
+    def embed(self, texts: Sequence[str]):
+        """
+        Embed texts in one vectorized call.
+        
+        Args:
+            texts: Texts to embed
+        
+        Returns:
+            float32 numpy array of shape (len(texts), dimensions)
+        """
+        raise NotImplementedError
+
+
+class HashingEmbedder(Embedder):
+    """
+    Signed feature hashing of words and character n-grams.
+    
+    Needs nothing beyond numpy and no model download, and is fast enough
+    to embed every snippet a run sees. It captures lexical and sub-word
+    overlap, not synonyms; use a model backend for that. The random sign
+    per feature keeps hash collisions from adding up to false similarity.
+    """
+    
+    def __init__(self, dimensions: int = 384, ngram: int = 3):
+        self.dimensions = dimensions
+        self.ngram = ngram
+        self.name = f"hashing-{dimensions}-{ngram}"
+    
+    def embed(self, texts: Sequence[str]):
+        import numpy as np
+        
+        # Texts x distinct words (sublinear counts), then distinct words x
+        # features: each word of the batch is hashed once, and one matrix
+        # product sums the features of every text
+        vocabulary: Dict[str, int] = {}
+        rows: List[int] = []
+        columns: List[int] = []
+        weights: List[float] = []
+        for row, text in enumerate(texts):
+            for token, count in Counter(_tokens(text)).items():
+                rows.append(row)
+                columns.append(vocabulary.setdefault(token, len(vocabulary)))
+                weights.append(1.0 + math.log(count))
+        
+        counts = np.zeros((len(texts), len(vocabulary)), dtype=np.float32)
+        counts[rows, columns] = weights
+        
+        flat: List[int] = []
+        signs: List[float] = []
+        for index, token in enumerate(vocabulary):
+            token_columns, token_signs = _token_features(token, self.ngram, self.dimensions)
+            offset = index * self.dimensions
+            flat.extend(offset + col for col in token_columns)
+            signs.extend(token_signs)
+        features = np.bincount(
+            np.array(flat, dtype=np.int64),
+            weights=np.array(signs, dtype=float),
+            minlength=len(vocabulary) * self.dimensions
+        ).reshape(len(vocabulary), self.dimensions).astype(np.float32)
+        
+        return _normalize_rows(counts @ features)
+
+
+class SentenceTransformerEmbedder(Embedder):
+    """Local CPU embedding model loaded with sentence-transformers."""
+    
+    def __init__(self, model: str, device: str = "cpu"):
+        """
+        Load a model.
+        
+        Raises:
+            ImportError: If sentence-transformers is not installed
+        """
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "EMBEDDING_BACKEND=sentence-transformers requires the sentence-transformers package"
+            ) from e
+        
+        self.model = SentenceTransformer(model, device=device)
+        self.dimensions = self.model.get_sentence_embedding_dimension()
+        self.name = f"st-{model.replace('/', '_')}"
+    
+    def embed(self, texts: Sequence[str]):
+        import numpy as np
+        
+        vectors = self.model.encode(
+            list(texts), batch_size=max(len(texts), 1), convert_to_numpy=True, normalize_embeddings=True
+        )
+        return np.asarray(vectors, dtype=np.float32).reshape(len(texts), self.dimensions)
+
+
+def _normalize_rows(matrix):
+    import numpy as np
+    
+    norms = np.linalg.norm(matrix, axis=1)
+    norms[norms == 0] = 1.0
+    return matrix / norms[:, None]
+
+
+def row_dtype(dimensions: int, dtype: str):
+    """
+    numpy record type of one stored vector.
+    
+    int8 rows carry a float32 scale (largest absolute component / 127),
+    so each vector keeps its own full range.
+    
+    Raises:
+        ValueError: If the dtype is unknown
+    """
+    import numpy as np
+    
+    if dtype == "int8":
+        return np.dtype([("scale", "<f4"), ("vector", "i1", (dimensions,))])
+    if dtype in ("float16", "float32"):
+        return np.dtype([("vector", "<f2" if dtype == "float16" else "<f4", (dimensions,))])
+    raise ValueError(f"Unknown embedding dtype '{dtype}'. Available: {', '.join(DTYPES)}")
+
+
+def quantize(vectors, dtype: str):
+    """Pack float32 vectors into row_dtype records."""
+    import numpy as np
+    
+    rows = np.zeros(len(vectors), dtype=row_dtype(vectors.shape[1], dtype))
+    if dtype == "int8":
+        scale = np.abs(vectors).max(axis=1) / 127
+        scale[scale == 0] = 1.0
+        rows["scale"] = scale
+        rows["vector"] = np.rint(vectors / scale[:, None])
+    else:
+        rows["vector"] = vectors
+    return rows
+
+
+def dequantize(rows):
+    """Unpack row_dtype records into float32 vectors."""
+    import numpy as np
+    
+    vectors = rows["vector"].astype(np.float32)
+    if "scale" in rows.dtype.names:
+        vectors *= rows["scale"][:, None]
+    return vectors
+
+
+class EmbeddingCache:
+    """
+    Quantized vectors keyed by text digest, so each text is embedded once.
+    
+    Vectors are stored quantized and returned dequantized; a vector
+    computed now and one read back later are identical.
+    """
+    
+    def __init__(self, dimensions: int, dtype: str = "float16"):
+        self.dimensions = dimensions
+        self.dtype = dtype
+        self.row_dtype = row_dtype(dimensions, dtype)
+        self._lock = threading.Lock()
+    
+    def lookup(self, digests: Sequence[bytes]) -> Tuple[Any, List[int]]:
+        """
+        Read cached vectors.
+        
+        Args:
+            digests: Keys from text_digest
+        
+        Returns:
+            (float32 matrix with a row per digest, zero where missing;
+            positions of the digests that were not cached)
+        """
+        raise NotImplementedError
+    
+    def add(self, digests: Sequence[bytes], vectors) -> None:
+        """Store vectors (float32, one row per distinct digest)."""
+        raise NotImplementedError
+    
+    def __len__(self) -> int:
+        raise NotImplementedError
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cached vectors and the bytes they take."""
+        return {
+            "vectors": len(self),
+            "dtype": self.dtype,
+            "bytes": len(self) * self.row_dtype.itemsize,
+        }
+
+
+class MemoryEmbeddingCache(EmbeddingCache):
+    """Bounded in-process cache; least recently used vectors are dropped first."""
+    
+    def __init__(self, dimensions: int, dtype: str = "float16", max_entries: int = 100000):
+        super().__init__(dimensions, dtype)
+        self.max_entries = max_entries
+        self._rows: "OrderedDict[bytes, Any]" = OrderedDict()
+    
+    def lookup(self, digests: Sequence[bytes]) -> Tuple[Any, List[int]]:
+        import numpy as np
+        
+        found = np.zeros(len(digests), dtype=self.row_dtype)
+        missing = []
+        with self._lock:
+            for i, digest in enumerate(digests):
+                row = self._rows.get(digest)
+                if row is None:
+                    missing.append(i)
+                else:
+                    self._rows.move_to_end(digest)
+                    found[i] = row
+        return dequantize(found), missing
+    
+    def add(self, digests: Sequence[bytes], vectors) -> None:
+        rows = quantize(vectors, self.dtype)
+        with self._lock:
+            for digest, row in zip(digests, rows):
+                self._rows[digest] = row.copy()
+                self._rows.move_to_end(digest)
+            while len(self._rows) > self.max_entries:
+                self._rows.popitem(last=False)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+
+class FileEmbeddingCache(EmbeddingCache):
+    """
+    Append-only vector matrix on disk, shared by every process and run
+    using the directory.
+    
+    vectors.bin is a memory-mapped array of row_dtype records and
+    index.bin the digest of each row, in row order. A new vector is
+    written to its row before its digest is appended, so the index only
+    ever names complete rows and a crash at worst leaves an unused row.
+    Appends take an exclusive file lock and first pick up rows other
+    processes appended, so concurrent writers never overwrite each
+    other. The matrix file grows by doubling.
+    """
+    
+    INITIAL_ROWS = 1024
+    
+    def __init__(self, directory: Union[str, Path], dimensions: int, dtype: str = "float16"):
+        super().__init__(dimensions, dtype)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = self.directory / "vectors.bin"
+        self._index_path = self.directory / "index.bin"
+        self._index_path.touch(exist_ok=True)
+        self._rows_by_digest: Dict[bytes, int] = {}
+        self._index_bytes = 0
+        self._matrix = None
+        with self._lock:
+            self._refresh()
+        logger.info("🧮 Embedding cache %s: %s vectors (%s)", self.directory, len(self._rows_by_digest), dtype)
+    
+    def _refresh(self) -> None:
+        """Pick up rows appended by other processes (call with the lock held)."""
+        with open(self._index_path, "rb") as f:
+            f.seek(self._index_bytes)
+            tail = f.read()
+        tail = tail[:len(tail) - len(tail) % DIGEST_SIZE]
+        row = len(self._rows_by_digest)
+        for start in range(0, len(tail), DIGEST_SIZE):
+            # A digest appended twice (two writers racing) keeps its first row
+            self._rows_by_digest.setdefault(tail[start:start + DIGEST_SIZE], row)
+            row += 1
+        self._index_bytes += len(tail)
+        self._map(row)
+    
+    def _map(self, rows: int) -> None:
+        """Map at least rows records of the matrix file, growing it if needed."""
+        import numpy as np
+        
+        itemsize = self.row_dtype.itemsize
+        capacity = os.path.getsize(self._vectors_path) // itemsize if self._vectors_path.exists() else 0
+        if capacity < rows or capacity == 0:
+            capacity = max(self.INITIAL_ROWS, capacity * 2, rows)
+            with open(self._vectors_path, "ab") as f:
+                f.truncate(capacity * itemsize)
+        if self._matrix is None or len(self._matrix) < capacity:
+            if self._matrix is not None:
+                self._matrix.flush()
+            self._matrix = np.memmap(self._vectors_path, dtype=self.row_dtype, mode="r+", shape=(capacity,))
+    
+    def lookup(self, digests: Sequence[bytes]) -> Tuple[Any, List[int]]:
+        import numpy as np
+        
+        with self._lock:
+            rows = [self._rows_by_digest.get(digest, -1) for digest in digests]
+            if -1 in rows and os.path.getsize(self._index_path) > self._index_bytes:
+                self._refresh()
+                rows = [self._rows_by_digest.get(digest, -1) for digest in digests]
+            rows = np.array(rows, dtype=np.int64)
+            found = self._matrix[np.maximum(rows, 0)]
+        vectors = dequantize(found)
+        missing = np.flatnonzero(rows < 0)
+        vectors[missing] = 0.0
+        return vectors, missing.tolist()
+    
+    def add(self, digests: Sequence[bytes], vectors) -> None:
+        packed = quantize(vectors, self.dtype)
+        with self._lock, open(self._index_path, "ab") as index:
+            if fcntl is not None:
+                fcntl.flock(index, fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                fresh = [i for i, digest in enumerate(digests) if digest not in self._rows_by_digest]
+                if not fresh:
+                    return
+                first = len(self._rows_by_digest)
+                self._map(first + len(fresh))
+                self._matrix[first:first + len(fresh)] = packed[fresh]
+                self._matrix.flush()
+                index.write(b"".join(digests[i] for i in fresh))
+                index.flush()
+                for offset, i in enumerate(fresh):
+                    self._rows_by_digest[digests[i]] = first + offset
+                self._index_bytes += len(fresh) * DIGEST_SIZE
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(index, fcntl.LOCK_UN)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows_by_digest)
+
+
+class MicroBatcher:
+    """
+    Merges embedding requests from concurrent callers into batched calls.
+    
+    There is no batching thread: a caller that finds no batch running
+    becomes the leader, takes every queued request (up to max_batch
+    texts) and embeds them in one call on its own thread, repeating
+    until the queue is empty. Callers arriving meanwhile queue up and
+    wait for the leader, so the batch size follows the load: a lone
+    caller is served at once, and concurrent runs share each vectorized
+    call. A positive max_wait_ms also holds each batch open that long
+    for more requests, trading latency for larger batches. Texts
+    repeated across the merged requests are embedded once.
+    """
+    
+    def __init__(self, embed, max_batch: int = 64, max_wait_ms: float = 0.0):
+        """
+        Args:
+            embed: Batch function, (digests, texts) -> float32 matrix
+            max_batch: Texts per call; a single larger request is embedded whole
+            max_wait_ms: How long to hold a batch open for more requests
+        """
+        self._embed = embed
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[Tuple[List[bytes], List[str], Future]]" = queue.Queue()
+        self._leader = threading.Lock()
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.texts = 0
+    
+    def submit(self, digests: List[bytes], texts: List[str]) -> "Future":
+        """
+        Queue distinct texts (with their digests) and run batches if no
+        other caller is.
+        
+        Returns:
+            Future of their vectors, one row per text
+        """
+        future: Future = Future()
+        self._queue.put((digests, texts, future))
+        # A leader that finds the queue empty may still be releasing; check again after it does
+        while not self._queue.empty() and self._leader.acquire(blocking=False):
+            try:
+                while not self._queue.empty():
+                    self._process(self._collect())
+            finally:
+                self._leader.release()
+        return future
+    
+    def _collect(self) -> List[Tuple[List[bytes], List[str], Future]]:
+        pending = [self._queue.get()]
+        size = len(pending[0][1])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                # Requests already queued always join; new ones only until the deadline
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            pending.append(request)
+            size += len(request[1])
+        return pending
+    
+    def _process(self, pending: List[Tuple[List[bytes], List[str], Future]]) -> None:
+        position: Dict[bytes, int] = {}
+        texts: List[str] = []
+        for digests, request_texts, _ in pending:
+            for digest, text in zip(digests, request_texts):
+                if digest not in position:
+                    position[digest] = len(texts)
+                    texts.append(text)
+        try:
+            vectors = self._embed(list(position), texts)
+        except Exception as e:
+            for _, _, future in pending:
+                future.set_exception(e)
+            return
+        with self._lock:
+            self.batches += 1
+            self.texts += len(texts)
+        for digests, _, future in pending:
+            future.set_result(vectors[[position[digest] for digest in digests]])
+
+
+class EmbeddingService:
+    """
+    One entry point for embeddings: cache lookup by content digest,
+    micro-batched embedding of the misses, and storage of the results.
+    """
+    
+    def __init__(
+        self,
+        embedder: Embedder,
+        cache: Optional[EmbeddingCache] = None,
+        max_batch: int = 64,
+        max_wait_ms: float = 0.0
+    ):
+        self.embedder = embedder
+        self.dimensions = embedder.dimensions
+        self.cache = cache if cache is not None else MemoryEmbeddingCache(embedder.dimensions)
+        self.batcher = MicroBatcher(self._embed_and_store, max_batch, max_wait_ms)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def _embed_and_store(self, digests: List[bytes], texts: List[str]):
+        # Runs once per batch, on the leading caller's thread: cache what was
+        # computed and return it as it will read back from the cache
+        vectors = self.embedder.embed(texts)
+        self.cache.add(digests, vectors)
+        return dequantize(quantize(vectors, self.cache.dtype))
+    
+    def embed(self, texts: Sequence[str], timeout: Optional[float] = None):
+        """
+        Embed texts, computing only those never embedded before.
+        
+        Args:
+            texts: Texts to embed
+            timeout: Seconds to wait for the batched call
+        
+        Returns:
+            float32 numpy array of L2-normalized (up to quantization)
+            vectors, shape (len(texts), dimensions)
+        
+        Raises:
+            TimeoutError: If the batched call does not finish in time
+        """
+        import numpy as np
+        
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        
+        digests = [text_digest(text) for text in texts]
+        vectors, missing = self.cache.lookup(digests)
+        with self._lock:
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+        if missing:
+            distinct: Dict[bytes, str] = {}
+            for i in missing:
+                distinct.setdefault(digests[i], texts[i])
+            future = self.batcher.submit(list(distinct), list(distinct.values()))
+            fresh = future.result(timeout=timeout)
+            row = {digest: j for j, digest in enumerate(distinct)}
+            vectors[missing] = fresh[[row[digests[i]] for i in missing]]
+        return vectors
+    
+    def similarity(self, query: str, texts: Sequence[str]):
+        """
+        Cosine similarity of each text to a query.
+        
+        Returns:
+            numpy array of scores in [-1, 1], one per text
+        """
+        vectors = self.embed([query, *texts])
+        return vectors[1:] @ vectors[0]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache hits and misses, batches run and the cache footprint."""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {
+            "embedder": self.embedder.name,
+            "hits": hits,
+            "misses": misses,
+            "batches": self.batcher.batches,
+            "embedded": self.batcher.texts,
+            "mean_batch": round(self.batcher.texts / self.batcher.batches, 1) if self.batcher.batches else 0.0,
+            **self.cache.stats(),
+        }
+
+
+def build_embedder(backend: str) -> Embedder:
+    """
+    Create the embedder for a backend name.
+    
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if backend == "hashing":
+        return HashingEmbedder(settings.embedding_dimensions)
+    if backend == "sentence-transformers":
+        return SentenceTransformerEmbedder(settings.embedding_model)
+    raise ValueError(f"Unknown embedding backend '{backend}'. Available: hashing, sentence-transformers")
+
+
+_service: Optional[EmbeddingService] = None
+_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """
+    Get the process-wide embedding service configured by the
+    EMBEDDING_* settings.
+    
+    With EMBEDDING_CACHE_DIR set, vectors are cached on disk under a
+    subdirectory per embedder and dtype, so changing either never mixes
+    incompatible vectors.
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            embedder = build_embedder(settings.embedding_backend)
+            if settings.embedding_cache_dir:
+                directory = Path(settings.embedding_cache_dir) / f"{embedder.name}-{settings.embedding_dtype}"
+                cache = FileEmbeddingCache(directory, embedder.dimensions, settings.embedding_dtype)
+            else:
+                cache = MemoryEmbeddingCache(
+                    embedder.dimensions, settings.embedding_dtype, settings.embedding_memory_cache_entries
+                )
+            _service = EmbeddingService(
+                embedder, cache, settings.embedding_batch_size, settings.embedding_batch_wait_ms
+            )
+        return _service
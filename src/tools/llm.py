@@ -0,0 +1,284 @@
+"""Groq LLM client with timeouts and cancellation."""
+
+import dataclasses
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from config.settings import settings
+from src.utils.logger import get_logger
+from src.utils.scheduling import get_call_scheduler
+from .cassette import Cassette, get_cassette
+
+logger = get_logger()
+
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+DEFAULT_MODEL = "llama-3.3-70b-versatile"  # Groq's best model
+ABORT_POLL_SECONDS = 0.05  # How often a stalled stream checks for cancel or timeout
+
+
+class GenerationCancelled(Exception):
+    """
+    Raised when a streaming generation is cancelled or times out.
+    
+    The provider still bills the prompt and the tokens streamed before
+    the request was aborted; prompt_tokens and completion_tokens estimate
+    them so callers can charge the abandoned call.
+    """
+    
+    def __init__(self, message: str, prompt_tokens: int = 0, completion_tokens: int = 0):
+        super().__init__(message)
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+
+@dataclass
+class LLMResponse:
+    """Completion text and token usage."""
+    
+    content: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0  # Prompt tokens served from the provider's prompt cache
+
+
+def _abort(stream) -> None:
+    """
+    Close a stream from another thread.
+    
+    Closing alone does not wake a read blocked on the socket, so an
+    HTTP/1.1 connection is shut down first. HTTP/2 connections are
+    shared with other requests and only get their own stream reset.
+    """
+    response = getattr(stream, "response", None)
+    if response is not None and getattr(response, "http_version", "") == "HTTP/1.1":
+        network_stream = response.extensions.get("network_stream")
+        sock = network_stream.get_extra_info("socket") if network_stream is not None else None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+    stream.close()
+
+
+def _cached_tokens(usage) -> int:
+    """Read cached prompt tokens from a usage block, if the API reports them."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return (getattr(details, "cached_tokens", None) or 0) if details else 0
+
+
+class LLMClient:
+    """Wrapper around the OpenAI-compatible Groq API."""
+    
+    def __init__(self, model: str = DEFAULT_MODEL):
+        from openai import OpenAI
+        from .transport import get_http_client
+        
+        self.model = model
+        self.client = OpenAI(
+            api_key=settings.groq_api_key,
+            base_url=GROQ_BASE_URL,
+            timeout=settings.llm_timeout_seconds,
+            http_client=get_http_client(),
+        )
+    
+    def complete(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int = 2000,
+        timeout: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+        on_text: Optional[Callable[[str], None]] = None
+    ) -> LLMResponse:
+        """
+        Run a chat completion.
+        
+        Args:
+            messages: Chat messages
+            max_tokens: Completion token limit
+            timeout: Wall-clock budget for the whole call in seconds
+            cancel_event: If given, the completion is streamed and the
+                HTTP request is aborted as soon as the event is set
+            on_text: If given, the completion is streamed and each piece
+                of text is passed to it as it arrives
+        
+        Returns:
+            Completion text and token usage
+        
+        Raises:
+            GenerationCancelled: If cancelled or out of time mid-stream
+            SchedulerTimeout: If no provider-call slot became free in time
+        """
+        started = time.monotonic()
+        with get_call_scheduler().slot(timeout=timeout):
+            if timeout is not None:
+                timeout = max(timeout - (time.monotonic() - started), 0.001)
+            cassette = get_cassette()
+            if cassette is not None:
+                return self._complete_with_cassette(cassette, messages, max_tokens, timeout, cancel_event, on_text)
+            return self._complete(messages, max_tokens, timeout, cancel_event, on_text)
+    
+    def _complete_with_cassette(
+        self,
+        cassette: Cassette,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        timeout: Optional[float],
+        cancel_event: Optional[threading.Event],
+        on_text: Optional[Callable[[str], None]] = None
+    ) -> LLMResponse:
+        """
+        Record a completion, or replay a recorded one.
+        
+        A replayed completion waits out its recorded latency (scaled by
+        CASSETTE_REPLAY_SPEED) under the same timeout and cancellation
+        rules as a live call, then passes its whole text to on_text.
+        """
+        request = {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": settings.model_temperature,
+        }
+        went_live = []
+        
+        def live() -> Dict[str, Any]:
+            went_live.append(True)
+            return dataclasses.asdict(self._complete(messages, max_tokens, timeout, cancel_event, on_text))
+        
+        def wait(seconds: float) -> None:
+            budget = seconds if timeout is None else min(seconds, timeout)
+            if cancel_event is not None and cancel_event.wait(budget):
+                raise GenerationCancelled("Generation cancelled")
+            if cancel_event is None:
+                time.sleep(budget)
+            if budget < seconds:
+                raise GenerationCancelled(f"Generation exceeded {timeout:.1f}s budget")
+        
+        response = LLMResponse(**cassette.call("llm", request, live, wait))
+        if on_text is not None and not went_live:
+            on_text(response.content)
+        return response
+    
+    def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        timeout: Optional[float],
+        cancel_event: Optional[threading.Event],
+        on_text: Optional[Callable[[str], None]] = None
+    ) -> LLMResponse:
+        """Run a chat completion (see complete)."""
+        client = self.client
+        if timeout is not None:
+            # A bounded call must not be multiplied by client-side retries
+            client = client.with_options(timeout=timeout, max_retries=0)
+        
+        if cancel_event is None and timeout is None and on_text is None:
+            response = client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=settings.model_temperature,
+                max_tokens=max_tokens
+            )
+            return LLMResponse(
+                content=response.choices[0].message.content,
+                prompt_tokens=response.usage.prompt_tokens,
+                completion_tokens=response.usage.completion_tokens,
+                cached_tokens=_cached_tokens(response.usage)
+            )
+        
+        # Bounded or cancellable calls are streamed so the budget covers the
+        # whole response rather than each individual socket read
+        return self._stream(client, messages, max_tokens, timeout, cancel_event, on_text)
+    
+    def _stream(
+        self,
+        client,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        timeout: Optional[float],
+        cancel_event: Optional[threading.Event],
+        on_text: Optional[Callable[[str], None]] = None
+    ) -> LLMResponse:
+        """Stream a completion, aborting the request on cancel or timeout."""
+        expires_at = time.monotonic() + timeout if timeout is not None else None
+        
+        stream = client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=settings.model_temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        
+        parts = []
+        usage = None
+        
+        def cancelled(reason: str) -> GenerationCancelled:
+            from src.utils.tokens import approx_tokens
+            
+            return GenerationCancelled(
+                reason,
+                prompt_tokens=sum(approx_tokens(message["content"]) for message in messages),
+                completion_tokens=approx_tokens("".join(parts))
+            )
+        
+        def stop_reason() -> Optional[str]:
+            if cancel_event is not None and cancel_event.is_set():
+                return "Generation cancelled"
+            if expires_at is not None and time.monotonic() > expires_at:
+                return f"Generation exceeded {timeout:.1f}s budget"
+            return None
+        
+        # A stream stalled between chunks never reaches the checks in the
+        # loop, so a watcher closes it from outside on cancel or timeout
+        finished = threading.Event()
+        aborted: List[str] = []
+        
+        def watch() -> None:
+            while not finished.wait(ABORT_POLL_SECONDS):
+                reason = stop_reason()
+                if reason is not None:
+                    aborted.append(reason)
+                    _abort(stream)
+                    return
+        
+        if cancel_event is not None or expires_at is not None:
+            threading.Thread(target=watch, name="llm-stream-watch", daemon=True).start()
+        
+        try:
+            for chunk in stream:
+                reason = stop_reason()
+                if reason is not None:
+                    raise cancelled(reason)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    if on_text is not None:
+                        on_text(chunk.choices[0].delta.content)
+                if getattr(chunk, "usage", None):
+                    usage = chunk.usage
+            if aborted:
+                raise cancelled(aborted[0])
+        except GenerationCancelled:
+            raise
+        except Exception:
+            # Reading a stream the watcher closed fails with a transport error
+            if aborted:
+                raise cancelled(aborted[0]) from None
+            raise
+        finally:
+            finished.set()
+            # Closing the stream drops the underlying HTTP connection
+            stream.close()
+        
+        return LLMResponse(
+            content="".join(parts),
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+            cached_tokens=_cached_tokens(usage) if usage else 0
+        )
@@ -0,0 +1,322 @@
+"""Pluggable search provider backends."""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import settings
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+
+class CacheMiss(LookupError):
+    """Raised by the cache provider when a query has no cached results."""
+
+
+class SearchCache:
+    """
+    Thread-safe LRU cache of search results with a time-to-live.
+    
+    With a shared cache attached, entries are also written to it and local
+    misses are looked up there, so nodes reuse each other's searches.
+    
+    With a blob store attached, entries are kept compressed: snippet text
+    goes to the content-addressed store (so a page returned for several
+    queries is held once) and the rest of each result list is a single
+    compressed frame.
+    """
+    
+    # Result fields stored once per distinct text
+    _SNIPPET_FIELDS = ("content", "raw_content")
+    
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 3600.0, shared=None, blobs=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.shared = shared
+        self.blobs = blobs
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(query: str, max_results: int, options: Dict[str, Any]) -> Tuple:
+        return (
+            " ".join(query.lower().split()),
+            max_results,
+            tuple(sorted((k, repr(v)) for k, v in options.items()))
+        )
+    
+    @staticmethod
+    def _shared_key(key: Tuple) -> str:
+        return "search:" + hashlib.sha1(json.dumps(key).encode("utf-8")).hexdigest()
+    
+    def get(self, query: str, max_results: int, **options) -> Optional[List[Dict[str, Any]]]:
+        """Return cached results, or None if missing or expired."""
+        key = self._key(query, max_results, options)
+        hit = expired = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if time.time() - entry[0] <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    hit = entry
+                else:
+                    expired = self._entries.pop(key)
+        if hit is not None:
+            try:
+                return self._unpack(hit[1])
+            except KeyError:
+                pass  # Evicted (and its snippets released) while being read
+        if expired is not None:
+            self._release(expired)
+        
+        if self.shared is None:
+            return None
+        try:
+            results = self.shared.get(self._shared_key(key))
+        except Exception as e:
+            logger.warning("Shared search cache unavailable: %s", e)
+            return None
+        if results is not None:
+            self._store(key, results)
+        return results
+    
+    def put(self, query: str, max_results: int, results: List[Dict[str, Any]], **options) -> None:
+        """Store results for a query and its search options."""
+        key = self._key(query, max_results, options)
+        self._store(key, results)
+        if self.shared is not None:
+            try:
+                self.shared.set(self._shared_key(key), results, ttl_seconds=self.ttl_seconds)
+            except Exception as e:
+                logger.warning("Shared search cache unavailable: %s", e)
+    
+    def _store(self, key: Tuple, results: List[Dict[str, Any]]) -> None:
+        value = self._pack(results)
+        evicted = []
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                evicted.append(previous)
+            self._entries[key] = (time.time(), value)
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[1])
+        for entry in evicted:
+            self._release(entry)
+    
+    def _pack(self, results: List[Dict[str, Any]]) -> Any:
+        """Compressed form of a result list (the list itself without a blob store)."""
+        if self.blobs is None:
+            return results
+        skeletons, snippets = [], []
+        for result in results:
+            skeleton = dict(result)
+            snippets.append({
+                field: self.blobs.put_text(skeleton.pop(field))
+                for field in self._SNIPPET_FIELDS
+                if isinstance(skeleton.get(field), str)
+            })
+            skeletons.append(skeleton)
+        return self.blobs.codec.encode_json([skeletons, snippets])
+    
+    def _unpack(self, value: Any) -> List[Dict[str, Any]]:
+        if self.blobs is None:
+            return value
+        skeletons, snippets = self.blobs.codec.decode_json(value)
+        for skeleton, fields in zip(skeletons, snippets):
+            for field, digest in fields.items():
+                skeleton[field] = self.blobs.get_text(digest)
+        return skeletons
+    
+    def _release(self, entry: Tuple[float, Any]) -> None:
+        if self.blobs is None:
+            return
+        _, snippets = self.blobs.codec.decode_json(entry[1])
+        for fields in snippets:
+            for digest in fields.values():
+                self.blobs.release(digest)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and, when compressed, the snippet store's footprint."""
+        with self._lock:
+            entries = len(self._entries)
+            packed = sum(len(value) for _, value in self._entries.values()) if self.blobs is not None else None
+        stats: Dict[str, Any] = {"entries": entries, "compressed": self.blobs is not None}
+        if self.blobs is not None:
+            stats["entry_bytes"] = packed
+            stats["snippets"] = self.blobs.stats()
+        return stats
+
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """Get the process-wide search result cache."""
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            shared = None
+            if settings.cluster_backend != "memory":
+                from src.cluster import get_shared_cache
+                
+                shared = get_shared_cache()
+            blobs = None
+            if settings.compress_search_cache:
+                from src.storage.blobs import FileBlobStore, MemoryBlobStore
+                
+                blobs = (
+                    FileBlobStore(settings.search_cache_blob_dir) if settings.search_cache_blob_dir
+                    else MemoryBlobStore()
+                )
+            _search_cache = SearchCache(
+                max_entries=settings.search_cache_size,
+                ttl_seconds=settings.search_cache_ttl_seconds,
+                shared=shared,
+                blobs=blobs
+            )
+        return _search_cache
+
+
+class SearchProvider:
+    """Base class for search backends."""
+    
+    name = "base"
+    
+    # Whether failures should count towards the provider's circuit breaker
+    uses_circuit_breaker = True
+    
+    def search(
+        self,
+        query: str,
+        max_results: int,
+        timeout: Optional[float] = None,
+        **options
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a search.
+        
+        Args:
+            query: Search query string
+            max_results: Number of results to return
+            timeout: Seconds left in the caller's budget; network providers
+                give up on the request after this long
+            **options: Provider search options (e.g. search_depth, topic,
+                days); providers ignore options they do not support
+        
+        Returns:
+            List of result dicts with at least 'content' and 'url' keys
+        """
+        raise NotImplementedError
+
+
+class TavilyProvider(SearchProvider):
+    """Tavily web search over the REST API, on the shared HTTP client."""
+    
+    name = "tavily"
+    
+    endpoint = "https://api.tavily.com/search"
+    
+    # Options forwarded to the search endpoint
+    supported_options = {"search_depth", "topic", "days", "exclude_domains", "include_domains"}
+    
+    def __init__(self):
+        from .transport import get_http_client
+        
+        self.client = get_http_client()
+        self.headers = {"Authorization": f"Bearer {settings.tavily_api_key}"}
+    
+    def search(
+        self,
+        query: str,
+        max_results: int,
+        timeout: Optional[float] = None,
+        **options
+    ) -> List[Dict[str, Any]]:
+        """Run a Tavily search, bounded by the caller's remaining budget."""
+        payload = {k: v for k, v in options.items() if k in self.supported_options and v is not None}
+        payload.update(query=query, max_results=max_results)
+        if timeout is None:
+            timeout = settings.search_timeout_seconds
+        response = self.client.post(
+            self.endpoint,
+            json=payload,
+            headers=self.headers,
+            timeout=min(timeout, settings.search_timeout_seconds)
+        )
+        response.raise_for_status()
+        return response.json().get("results", [])
+
+
+class CacheProvider(SearchProvider):
+    """Serve results only from the local search cache."""
+    
+    name = "cache"
+    uses_circuit_breaker = False
+    
+    def __init__(self, cache: Optional[SearchCache] = None):
+        self.cache = cache or get_search_cache()
+    
+    def search(
+        self,
+        query: str,
+        max_results: int,
+        timeout: Optional[float] = None,
+        **options
+    ) -> List[Dict[str, Any]]:
+        """Return cached results for the query."""
+        results = self.cache.get(query, max_results, **options)
+        if results is None:
+            raise CacheMiss(f"No cached results for '{query}'")
+        return results
+
+
+# Registry of provider names usable in SEARCH_PROVIDERS
+PROVIDERS = {
+    TavilyProvider.name: TavilyProvider,
+    CacheProvider.name: CacheProvider,
+}
+
+
+def build_providers(names: str) -> List[SearchProvider]:
+    """
+    Build a fallback chain of providers.
+    
+    Args:
+        names: Comma-separated provider names in priority order,
+            e.g. "tavily,cache" or "cache" for cache-only mode
+    
+    Returns:
+        Provider instances in priority order, live ones wrapped in the
+        cassette when recording or replaying (see CASSETTE_MODE)
+    
+    Raises:
+        ValueError: If a name is not registered
+    """
+    providers = []
+    for name in (n.strip() for n in names.split(",")):
+        if not name:
+            continue
+        if name not in PROVIDERS:
+            raise ValueError(
+                f"Unknown search provider '{name}'. Available: {', '.join(PROVIDERS)}"
+            )
+        providers.append(PROVIDERS[name]())
+    
+    if not providers:
+        raise ValueError("SEARCH_PROVIDERS must name at least one provider")
+    
+    from .cassette import CassetteSearchProvider, get_cassette
+    
+    cassette = get_cassette()
+    if cassette is not None:
+        # Only live backends are recorded; the local cache is not provider traffic
+        providers = [
+            CassetteSearchProvider(p, cassette) if p.uses_circuit_breaker else p
+            for p in providers
+        ]
+    return providers
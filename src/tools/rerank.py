@@ -0,0 +1,220 @@
+"""Local reranking of search results against the research task."""
+
+import math
+import re
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.utils.cpu_pool import run_cpu_stage
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+@lru_cache(maxsize=65536)
+def _token_ngrams(token: str, n: int, dimensions: int) -> Tuple[int, ...]:
+    """Hashed character n-grams of a word, padded with word boundaries."""
+    padded = f" {token} "
+    return tuple(
+        zlib.crc32(padded[start:start + n].encode()) % dimensions
+        for start in range(max(len(padded) - n + 1, 1))
+    )
+
+
+def _result_text(result: Dict[str, Any]) -> str:
+    return f"{result.get('title') or ''} {result.get('content') or ''}"
+
+
+def rank_texts(
+    texts: List[str],
+    query: str,
+    top_k: int,
+    params: Dict[str, Any],
+    semantic: Optional[List[float]] = None
+) -> List[int]:
+    """
+    Indices of the top_k texts for a query, best first.
+    
+    Module-level so it can run in the CPU pool.
+    """
+    import numpy as np
+    
+    scores = Reranker(**params).scores(query, texts, semantic)
+    return np.argsort(-scores, kind="stable")[:top_k].tolist()
+
+
+def query_coverage(query: str, texts: Sequence[str]) -> float:
+    """
+    Mean share of the query's distinct terms found in each text.
+    
+    An absolute relevance signal (unlike the batch-normalized rerank
+    scores); terms of one or two characters are ignored.
+    
+    Returns:
+        Coverage between 0.0 and 1.0 (0.0 for no texts or terms)
+    """
+    terms = {t for t in _tokens(query) if len(t) > 2}
+    if not terms or not texts:
+        return 0.0
+    return sum(len(terms & set(_tokens(text))) / len(terms) for text in texts) / len(texts)
+
+
+class Reranker:
+    """
+    Cheap lexical + semantic scorer for a batch of search results.
+    
+    The lexical score is BM25 over the query terms, with document
+    frequencies taken from the candidate batch itself. The semantic score
+    is the cosine similarity of hashed character n-gram vectors, which
+    tolerates inflections and partial word matches that BM25 misses. Both
+    are computed for the whole batch at once with numpy.
+    
+    With semantic="embedding" the similarity comes from the embedding
+    service instead, so snippets seen before are not embedded again.
+    """
+    
+    def __init__(
+        self,
+        lexical_weight: float = 0.5,
+        dimensions: int = 4096,
+        ngram: int = 3,
+        k1: float = 1.5,
+        b: float = 0.75,
+        semantic: str = "ngram"
+    ):
+        self.lexical_weight = lexical_weight
+        self.dimensions = dimensions
+        self.ngram = ngram
+        self.k1 = k1
+        self.b = b
+        self.semantic = semantic
+    
+    def scores(self, query: str, texts: Sequence[str], semantic: Optional[Sequence[float]] = None):
+        """
+        Score texts against a query.
+        
+        Args:
+            query: Research task or sub-question
+            texts: Candidate texts
+            semantic: Precomputed similarity per text (replaces the n-gram cosine)
+        
+        Returns:
+            numpy array of combined scores in [0, 1], one per text
+        """
+        import numpy as np
+        
+        if not texts:
+            return np.zeros(0)
+        
+        query_tokens = _tokens(query)
+        doc_tokens = [_tokens(text) for text in texts]
+        lexical = self._bm25(query_tokens, doc_tokens)
+        if semantic is None:
+            semantic = self._cosine(query_tokens, doc_tokens)
+        else:
+            semantic = np.asarray(semantic, dtype=float)
+        
+        w = self.lexical_weight
+        return w * self._normalize(lexical) + (1 - w) * self._normalize(semantic)
+    
+    def rerank(self, query: str, results: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+        """
+        Order search results by relevance to the query and keep the best.
+        
+        Args:
+            query: Research task or sub-question
+            results: Search results with 'content' (and optionally 'title')
+            top_k: Number of results to keep
+        
+        Returns:
+            Up to top_k results, best first. Ties keep the provider's order.
+        """
+        if len(results) <= 1:
+            return results[:top_k]
+        
+        params = {
+            "lexical_weight": self.lexical_weight,
+            "dimensions": self.dimensions,
+            "ngram": self.ngram,
+            "k1": self.k1,
+            "b": self.b,
+        }
+        texts = [_result_text(res) for res in results]
+        semantic = None
+        if self.semantic == "embedding":
+            from .embeddings import get_embedding_service
+            
+            # Embedded here, not in the CPU pool, so concurrent runs share batches and the cache
+            semantic = get_embedding_service().similarity(query, texts).tolist()
+        order = run_cpu_stage("rerank", rank_texts, texts, query, top_k, params, semantic)
+        logger.debug("Reranked %s results, kept %s", len(results), len(order))
+        return [results[i] for i in order]
+    
+    def _bm25(self, query_terms: List[str], doc_tokens: List[List[str]]):
+        import numpy as np
+        
+        terms = list(dict.fromkeys(query_terms))
+        if not terms:
+            return np.zeros(len(doc_tokens))
+        
+        index = {term: j for j, term in enumerate(terms)}
+        tf = np.zeros((len(doc_tokens), len(terms)))
+        for i, tokens in enumerate(doc_tokens):
+            for term, count in Counter(t for t in tokens if t in index).items():
+                tf[i, index[term]] = count
+        
+        lengths = np.array([len(tokens) for tokens in doc_tokens], dtype=float)
+        avg_length = lengths.mean() or 1.0
+        df = (tf > 0).sum(axis=0)
+        n = len(doc_tokens)
+        idf = np.log1p((n - df + 0.5) / (df + 0.5))
+        
+        norm = self.k1 * (1 - self.b + self.b * lengths / avg_length)
+        return ((tf * (self.k1 + 1)) / (tf + norm[:, None]) * idf).sum(axis=1)
+    
+    def _cosine(self, query_tokens: List[str], doc_tokens: List[List[str]]):
+        import numpy as np
+        
+        matrix = self._hashed_ngrams([query_tokens, *doc_tokens])
+        norms = np.linalg.norm(matrix, axis=1)
+        norms[norms == 0] = 1.0
+        matrix /= norms[:, None]
+        return matrix[1:] @ matrix[0]
+    
+    def _hashed_ngrams(self, token_lists: List[List[str]]):
+        """Sublinear TF vectors of character n-grams, hashed into a fixed width."""
+        import numpy as np
+        
+        # Hash each distinct word once per text, weighted by its count
+        flat: List[int] = []
+        weights: List[int] = []
+        for row, tokens in enumerate(token_lists):
+            offset = row * self.dimensions
+            for token, count in Counter(tokens).items():
+                ngrams = _token_ngrams(token, self.ngram, self.dimensions)
+                flat.extend(offset + col for col in ngrams)
+                weights.extend([count] * len(ngrams))
+        
+        counts = np.bincount(
+            np.array(flat, dtype=np.int64),
+            weights=np.array(weights, dtype=float),
+            minlength=len(token_lists) * self.dimensions
+        )
+        return np.log1p(counts.reshape(len(token_lists), self.dimensions))
+    
+    @staticmethod
+    def _normalize(values):
+        import numpy as np
+        
+        span = values.max() - values.min()
+        if not math.isfinite(span) or span <= 0:
+            return np.zeros_like(values)
+        return (values - values.min()) / span
@@ -1,71 +1,282 @@
 """Web search tool integration."""
 
-import os
-from typing import List, Dict, Any
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional
 from config.settings import settings
 from src.utils.logger import get_logger
+from src.utils.deadline import DeadlineExceeded
+from src.utils.scheduling import get_call_scheduler
+from src.utils.singleflight import SingleFlight
+from .circuit_breaker import CircuitOpenError, get_breaker
+from .providers import CacheMiss, SearchProvider, build_providers, get_search_cache
 
 logger = get_logger()
 
+# Shared pool for primary and hedged search calls
+_search_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="search")
+
+# Identical concurrent searches (from any SearchTool) share one execution
+_search_flights = SingleFlight()
+
 
 class SearchTool:
-    """Wrapper for Tavily search with error handling and retry logic."""
+    """Search across a fallback chain of providers with retries and circuit breakers."""
     
-    def __init__(self):
-        """Initialize Tavily search tool."""
-        # Set environment variable for Tavily
-        os.environ["TAVILY_API_KEY"] = settings.tavily_api_key
-        
-        # Try new package first, fall back to old one
-        try:
-            from langchain_tavily import TavilySearchResults
-            logger.debug("Using langchain-tavily package")
-        except ImportError:
-            from langchain_community.tools.tavily_search import TavilySearchResults
-            logger.debug("Using langchain-community tavily (deprecated)")
-        
-        self.tavily = TavilySearchResults(
-            max_results=settings.max_search_results
-        )
+    def __init__(self, providers: Optional[List[SearchProvider]] = None):
+        """
+        Initialize the provider chain.
+        
+        Args:
+            providers: Providers in priority order; defaults to the chain
+                named by the SEARCH_PROVIDERS setting
+        """
+        self.providers = providers if providers is not None else build_providers(settings.search_providers)
+        self.cache = get_search_cache()
+        
+        # Recent successful call latencies per provider, used to pick the hedge delay
+        self._latencies = {p.name: deque(maxlen=200) for p in self.providers}
+        self._latency_lock = threading.Lock()
     
-    def search(self, query: str, max_retries: int = 3) -> List[Dict[str, Any]]:
+    def search(
+        self,
+        query: str,
+        max_retries: int = 3,
+        timeout: Optional[float] = None,
+        max_results: Optional[int] = None,
+        **options
+    ) -> List[Dict[str, Any]]:
         """
-        Execute a web search with retry logic.
+        Execute a web search, falling back through the provider chain.
+        
+        Each provider is retried with exponential backoff while its circuit
+        stays closed; providers with an open circuit are skipped at once.
+        Identical searches already in flight are joined rather than repeated.
         
         Args:
             query: Search query string
-            max_retries: Maximum number of retry attempts
-            
+            max_retries: Maximum number of attempts per provider
+            timeout: Total time budget in seconds across all attempts
+            max_results: Results to request; defaults to MAX_SEARCH_RESULTS
+            **options: Provider search options (e.g. search_depth, topic, days)
+        
         Returns:
             List of search results
-            
+        
         Raises:
-            Exception: If all retries fail
+            Exception: If every provider fails or is unavailable
         """
+        timeout = settings.search_timeout_seconds if timeout is None else timeout
+        max_results = max_results or settings.max_search_results
+        
+        key = (
+            " ".join(query.lower().split()),
+            max_results,
+            tuple(sorted((k, repr(v)) for k, v in options.items()))
+        )
+        results, shared = _search_flights.do(
+            key,
+            self._scheduled_search_chain,
+            query,
+            max_retries,
+            timeout,
+            max_results,
+            options,
+            timeout=timeout
+        )
+        if shared:
+            logger.debug("Joined in-flight search: %s", query)
+        return results
+    
+    def _scheduled_search_chain(
+        self,
+        query: str,
+        max_retries: int,
+        timeout: float,
+        max_results: int,
+        options: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Wait for a provider-call slot, then search with the time left."""
+        started = time.monotonic()
+        with get_call_scheduler().slot(timeout=timeout):
+            remaining = timeout - (time.monotonic() - started)
+            return self._search_chain(query, max_retries, remaining, max_results, options)
+    
+    def _search_chain(
+        self,
+        query: str,
+        max_retries: int,
+        timeout: float,
+        max_results: int,
+        options: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Try each provider in order until one returns results."""
+        expires_at = time.monotonic() + timeout
+        errors = []
+        answered = False
+        
+        for provider in self.providers:
+            try:
+                results = self._search_provider(provider, query, max_results, options, max_retries, expires_at)
+            except (CircuitOpenError, CacheMiss) as e:
+                logger.info("Skipping provider '%s': %s", provider.name, e)
+                errors.append(f"{provider.name}: {str(e)}")
+                continue
+            except Exception as e:
+                errors.append(f"{provider.name}: {str(e)}")
+                continue
+            
+            if not results:
+                # Another provider may still find something
+                logger.warning("Search returned empty results from '%s'", provider.name)
+                answered = True
+                continue
+            
+            if settings.enable_caching and provider.uses_circuit_breaker:
+                self.cache.put(query, max_results, results, **options)
+            return results
+        
+        if answered:
+            # Nothing found anywhere is an answer, not a failure
+            return []
+        
+        # Every provider failed
+        error_msg = f"Search failed on all providers: {'; '.join(errors)}"
+        logger.error(error_msg)
+        raise Exception(error_msg)
+    
+    def _search_provider(
+        self,
+        provider: SearchProvider,
+        query: str,
+        max_results: int,
+        options: Dict[str, Any],
+        max_retries: int,
+        expires_at: float
+    ) -> List[Dict[str, Any]]:
+        """Search one provider with retries, respecting its circuit breaker."""
+        if not provider.uses_circuit_breaker:
+            return provider.search(query, max_results, timeout=max(expires_at - time.monotonic(), 0.001), **options)
+        
+        breaker = get_breaker(provider.name)
         last_error = None
+        attempts = 0
         
         for attempt in range(max_retries):
+            attempts = attempt + 1
+            if not breaker.allow_request():
+                raise CircuitOpenError(f"Circuit '{provider.name}' is open")
+            
             try:
-                logger.debug(f"Search attempt {attempt + 1}/{max_retries}")
-                results = self.tavily.invoke(query)
-                
-                if not results:
-                    logger.warning("Search returned empty results")
-                    return []
-                
+                logger.debug("%s attempt %s/%s", provider.name, attempt + 1, max_retries)
+                results = self._hedged_invoke(
+                    provider, query, max_results, options, expires_at - time.monotonic()
+                )
+                breaker.record_success()
                 return results
-                
+            
+            except CacheMiss:
+                # Nothing stored for this request; retrying cannot change that,
+                # and it says nothing about the provider's health
+                breaker.release_trial()
+                raise
+            
             except Exception as e:
+                breaker.record_failure()
                 last_error = e
-                logger.warning(f"Search attempt {attempt + 1} failed: {str(e)}")
+                logger.warning("%s attempt %s failed: %s", provider.name, attempt + 1, e)
                 
                 if attempt < max_retries - 1:
-                    import time
                     wait_time = 2 ** attempt  # Exponential backoff
-                    logger.info(f"Retrying in {wait_time}s...")
+                    if time.monotonic() + wait_time >= expires_at:
+                        logger.warning("No time left in search budget for another retry")
+                        break
+                    logger.info("Retrying in %ss...", wait_time)
                     time.sleep(wait_time)
+            
+            except BaseException:
+                # Interrupted: no verdict on the provider
+                breaker.release_trial()
+                raise
         
-        # All retries failed
-        error_msg = f"Search failed after {max_retries} attempts: {str(last_error)}"
-        logger.error(error_msg)
-        raise Exception(error_msg)
+        raise Exception(f"{provider.name} failed after {attempts} attempts: {str(last_error)}")
+    
+    def hedge_delay(self, provider_name: str) -> Optional[float]:
+        """
+        Delay after which a duplicate request is fired.
+        
+        Returns:
+            The configured latency percentile of recent calls to the
+            provider, or None while there are too few samples
+        """
+        with self._latency_lock:
+            latencies = self._latencies.setdefault(provider_name, deque(maxlen=200))
+            if len(latencies) < settings.search_hedge_min_samples:
+                return None
+            samples = sorted(latencies)
+        index = min(len(samples) - 1, int(len(samples) * settings.search_hedge_percentile))
+        return samples[index]
+    
+    def _timed_invoke(
+        self,
+        provider: SearchProvider,
+        query: str,
+        max_results: int,
+        options: Dict[str, Any],
+        expires_at: float
+    ) -> List[Dict[str, Any]]:
+        """Call a provider within the remaining budget and record the latency of successful calls."""
+        start = time.monotonic()
+        results = provider.search(query, max_results, timeout=max(expires_at - start, 0.001), **options)
+        with self._latency_lock:
+            self._latencies.setdefault(provider.name, deque(maxlen=200)).append(time.monotonic() - start)
+        return results
+    
+    def _hedged_invoke(
+        self,
+        provider: SearchProvider,
+        query: str,
+        max_results: int,
+        options: Dict[str, Any],
+        timeout: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Call a provider, firing a duplicate request if the first one is slow.
+        
+        Whichever call succeeds first wins; the other is left to finish in
+        the background and its result is discarded.
+        """
+        if timeout <= 0:
+            raise DeadlineExceeded("Search budget exhausted")
+        
+        expires_at = time.monotonic() + timeout
+        pending = {_search_executor.submit(contextvars.copy_context().run, self._timed_invoke, provider, query, max_results, options, expires_at)}
+        hedge_delay = self.hedge_delay(provider.name)
+        hedged = hedge_delay is None
+        last_error = None
+        
+        while pending:
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                break
+            wait_for = remaining if hedged else min(hedge_delay, remaining)
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                try:
+                    return future.result()
+                except Exception as e:
+                    last_error = e
+            
+            if not hedged:
+                # Primary is slower than the hedge percentile (or failed fast)
+                logger.debug("Hedging %s search after %.2fs", provider.name, hedge_delay)
+                pending.add(_search_executor.submit(contextvars.copy_context().run, self._timed_invoke, provider, query, max_results, options, expires_at))
+                hedged = True
+        
+        if last_error is not None and not pending:
+            raise last_error
+        raise DeadlineExceeded(f"Search timed out after {timeout:.1f}s")
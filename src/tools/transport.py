@@ -0,0 +1,133 @@
+"""Shared pooled HTTP transport for provider clients."""
+
+import atexit
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+from config.settings import settings
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+
+@dataclass
+class TransportMetrics:
+    """Connection reuse counters for the shared HTTP client."""
+    
+    requests: int = 0
+    new_connections: int = 0
+    tls_handshakes: int = 0
+    http2_responses: int = 0
+    connect_seconds: float = 0.0
+    
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters plus derived reuse rate and average handshake time."""
+        with self._lock:
+            reused = max(self.requests - self.new_connections, 0)
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": reused,
+                "reuse_rate": round(reused / self.requests, 3) if self.requests else 0.0,
+                "tls_handshakes": self.tls_handshakes,
+                "http2_responses": self.http2_responses,
+                "avg_connect_ms": round(self.connect_seconds / self.new_connections * 1000, 1) if self.new_connections else 0.0,
+            }
+    
+    def reset(self) -> None:
+        """Reset all counters."""
+        with self._lock:
+            self.requests = self.new_connections = self.tls_handshakes = self.http2_responses = 0
+            self.connect_seconds = 0.0
+
+
+class _RequestTrace:
+    """httpcore trace callback recording connection setup for one request."""
+    
+    def __init__(self, metrics: TransportMetrics):
+        self.metrics = metrics
+        self.started: Dict[str, float] = {}
+    
+    def __call__(self, event: str, info: Dict[str, Any]) -> None:
+        step, _, phase = event.rpartition(".")
+        if step not in ("connection.connect_tcp", "connection.start_tls"):
+            return
+        if phase == "started":
+            self.started[step] = time.perf_counter()
+        elif phase == "complete":
+            elapsed = time.perf_counter() - self.started.pop(step, time.perf_counter())
+            with self.metrics._lock:
+                self.metrics.connect_seconds += elapsed
+                if step == "connection.connect_tcp":
+                    self.metrics.new_connections += 1
+                else:
+                    self.metrics.tls_handshakes += 1
+
+
+_metrics = TransportMetrics()
+_client = None
+_client_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_http_client():
+    """
+    Get the process-wide pooled HTTP client.
+    
+    All provider adapters send requests through this client so TCP and
+    TLS connections are kept alive and reused across nodes, graph builds
+    and Streamlit reruns. HTTP/2 is used when enabled and the optional
+    h2 package is installed, which lets concurrent requests to one host
+    share a single connection.
+    
+    Returns:
+        Shared httpx.Client
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            import httpx
+            
+            http2 = settings.http2 and _http2_available()
+            if settings.http2 and not http2:
+                logger.info("HTTP/2 requested but the h2 package is not installed. Using HTTP/1.1.")
+            
+            def on_request(request) -> None:
+                with _metrics._lock:
+                    _metrics.requests += 1
+                request.extensions["trace"] = _RequestTrace(_metrics)
+            
+            def on_response(response) -> None:
+                if response.http_version == "HTTP/2":
+                    with _metrics._lock:
+                        _metrics.http2_responses += 1
+            
+            _client = httpx.Client(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=settings.http_max_connections,
+                    max_keepalive_connections=settings.http_max_keepalive_connections,
+                    keepalive_expiry=settings.http_keepalive_expiry_seconds,
+                ),
+                timeout=httpx.Timeout(settings.llm_timeout_seconds, connect=settings.http_connect_timeout_seconds),
+                follow_redirects=True,
+                event_hooks={"request": [on_request], "response": [on_response]},
+            )
+            atexit.register(_client.close)
+        return _client
+
+
+def get_transport_metrics() -> TransportMetrics:
+    """Get the connection reuse metrics of the shared client."""
+    return _metrics
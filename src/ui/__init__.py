@@ -0,0 +1,6 @@
+"""Helpers for the Streamlit web interface."""
+
+from .progress import RunProgress, describe
+from .rendering import load_stylesheet, render_report, report_hash
+
+__all__ = ["RunProgress", "describe", "load_stylesheet", "render_report", "report_hash"]
@@ -0,0 +1,125 @@
+"""Turn a run's progress events into a progress fraction and status text."""
+
+from typing import Optional, Tuple
+
+from config.settings import settings
+from src.utils.events import (
+    DraftDecided,
+    NodeFinished,
+    ProgressEvent,
+    RouteDecided,
+    RunFinished,
+    SearchFinished,
+    SearchStarted,
+    SubQuestionsPlanned,
+    WriterStarted,
+    WriterTokens,
+)
+from src.utils.tokens import approx_tokens
+
+# Share of the bar covered by searching (and branches); the writer fills the rest
+_SEARCH_SHARE = 0.6
+_PLANNER_SHARE = 0.1
+
+_ROUTES = {
+    "search": "🔁 Searching again ({attempts}/{max_attempts} searches done)",
+    "speculate": "⚡ Drafting the report while the final search runs",
+    "writer": "✍️ Enough material gathered, writing the report",
+}
+
+
+def describe(event: ProgressEvent) -> Optional[str]:
+    """
+    One-line status for an event.
+    
+    Returns:
+        Status text, or None for events not worth showing on their own
+    """
+    if isinstance(event, SearchStarted):
+        return f"🔍 Searching: {event.query[:80]}"
+    if isinstance(event, SearchFinished):
+        if event.error:
+            return f"⚠️ Search failed after {event.elapsed_ms / 1000:.1f}s: {event.error}"
+        return f"✅ {event.results} results in {event.elapsed_ms / 1000:.1f}s"
+    if isinstance(event, RouteDecided):
+        template = _ROUTES.get(event.decision)
+        return template.format(attempts=event.attempts, max_attempts=event.max_attempts) if template else None
+    if isinstance(event, SubQuestionsPlanned):
+        count = len(event.sub_questions)
+        return f"🧭 Researching {count} sub-question{'s' if count != 1 else ''} in parallel"
+    if isinstance(event, WriterStarted):
+        verb = "Drafting" if event.speculative else "Writing"
+        return f"✍️ {verb} the report ({event.strategy}, ~{event.prompt_tokens} prompt tokens)"
+    if isinstance(event, DraftDecided):
+        if event.accepted:
+            return f"✅ Keeping the draft (final search novelty {event.novelty:.2f})"
+        return f"🗑️ Discarding the draft (final search novelty {event.novelty:.2f}), rewriting"
+    if isinstance(event, RunFinished):
+        return f"❌ {event.error}" if event.error else f"✅ Complete in {event.elapsed_seconds:.1f}s"
+    return None
+
+
+class RunProgress:
+    """
+    Progress of one run, estimated from its events.
+    
+    Searching fills the first part of the bar (one step per allowed
+    search, or per branch in multi-hop mode) and the writer the rest, in
+    proportion to the tokens streamed so far. The fraction never goes
+    backwards, even when a speculative draft is discarded; the draft
+    preview is cleared then and draft_speculative says whether the
+    preview may still be thrown away.
+    """
+    
+    def __init__(self):
+        self.fraction = 0.0
+        self.status = "⚙️ Waiting for a research slot..."
+        self.draft = ""
+        self.draft_speculative = False
+        self._searches = 0
+        self._branches = 0
+        self._branches_done = 0
+        self._max_output_tokens = settings.writer_max_output_tokens
+        self._draft_tokens = 0
+    
+    def update(self, event: ProgressEvent) -> Tuple[float, str]:
+        """
+        Fold in an event.
+        
+        Returns:
+            (fraction between 0 and 1, status text)
+        """
+        fraction = self.fraction
+        if isinstance(event, SearchFinished) and event.node in ("search", "speculate"):
+            self._searches += 1
+            fraction = _SEARCH_SHARE * min(1.0, self._searches / max(settings.max_search_attempts, 1))
+        elif isinstance(event, SubQuestionsPlanned):
+            self._branches = len(event.sub_questions)
+            fraction = _PLANNER_SHARE
+        elif isinstance(event, NodeFinished) and event.node == "branch" and self._branches:
+            self._branches_done += 1
+            fraction = _PLANNER_SHARE + (_SEARCH_SHARE - _PLANNER_SHARE) * self._branches_done / self._branches
+            self.status = f"🌿 {self._branches_done}/{self._branches} research branches done"
+        elif isinstance(event, WriterStarted):
+            self.draft = ""
+            self.draft_speculative = event.speculative
+            self._draft_tokens = 0
+            self._max_output_tokens = max(event.max_output_tokens, 1)
+            fraction = _SEARCH_SHARE
+        elif isinstance(event, WriterTokens):
+            self.draft += event.text
+            self._draft_tokens += approx_tokens(event.text)
+            written = min(1.0, self._draft_tokens / self._max_output_tokens)
+            fraction = _SEARCH_SHARE + (0.98 - _SEARCH_SHARE) * written
+            verb = "Drafting" if event.speculative else "Writing"
+            self.status = f"✍️ {verb} the report... {self._draft_tokens} tokens"
+        elif isinstance(event, DraftDecided):
+            self.draft_speculative = False
+            if not event.accepted:
+                self.draft = ""
+        elif isinstance(event, RunFinished):
+            fraction = 1.0
+        
+        self.fraction = max(self.fraction, min(fraction, 1.0))
+        self.status = describe(event) or self.status
+        return self.fraction, self.status
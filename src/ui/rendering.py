@@ -0,0 +1,90 @@
+"""Cached rendering of the web interface's stylesheet and reports."""
+
+import hashlib
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+from src.utils.logger import get_logger
+from src.utils.sections import split_sections
+
+logger = get_logger()
+
+STYLESHEET = Path(__file__).parent / "style.css"
+
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_SPACE_RE = re.compile(r"\s+")
+# Spaces around these are never significant in the stylesheet (":" is left
+# alone, since " :hover" and ":hover" are different selectors)
+_PUNCTUATION_RE = re.compile(r"\s*([{};,>])\s*")
+
+
+@lru_cache(maxsize=4)
+def load_stylesheet(path: str = str(STYLESHEET)) -> str:
+    """
+    Read a stylesheet once and return it minified in a <style> block.
+    
+    Args:
+        path: CSS file to load
+    
+    Returns:
+        HTML for st.markdown(..., unsafe_allow_html=True)
+    """
+    css = Path(path).read_text(encoding="utf-8")
+    css = _COMMENT_RE.sub("", css)
+    css = _SPACE_RE.sub(" ", css)
+    css = _PUNCTUATION_RE.sub(r"\1", css).strip()
+    logger.debug("Loaded stylesheet %s (%s bytes minified)", path, len(css))
+    return f"<style>{css}</style>"
+
+
+def report_hash(report: str) -> str:
+    """Content hash used as the cache key for a rendered report."""
+    return hashlib.sha256(report.encode("utf-8")).hexdigest()[:16]
+
+
+def _blocks(markdown_text: str) -> List[str]:
+    """
+    Split a report into independently renderable blocks, one per section.
+    
+    Sections are merged while a fenced code block is open, so a "#" line
+    inside code never splits it.
+    """
+    blocks: List[str] = []
+    pending = ""
+    for _, body in split_sections(markdown_text):
+        pending += body
+        if pending.count("```") % 2 == 0:
+            blocks.append(pending)
+            pending = ""
+    if pending:
+        blocks.append(pending)
+    return blocks
+
+
+@lru_cache(maxsize=1024)
+def _render_block(block: str) -> str:
+    import markdown
+    
+    return markdown.markdown(block, extensions=["fenced_code", "tables", "sane_lists"])
+
+
+def render_report(report: str) -> Optional[str]:
+    """
+    Render a markdown report to HTML, one section at a time.
+    
+    Rendered sections are memoized by content, so a refreshed report that
+    patched two sections only renders those two again.
+    
+    Args:
+        report: Markdown report
+    
+    Returns:
+        Report HTML, or None if the markdown package is not installed
+    """
+    try:
+        import markdown  # noqa: F401
+    except ImportError:
+        return None
+    return "".join(_render_block(block if block.endswith("\n") else block + "\n") for block in _blocks(report))
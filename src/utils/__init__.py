@@ -1,6 +1,11 @@
 """Utility modules for the agent."""
 
-from .logger import setup_logger, get_logger
+from .logger import setup_logger, get_logger, log_context, traced_node
 from .cost_tracker import CostTracker
+from .novelty import novelty_score
+from .cpu_pool import get_cpu_metrics, run_cpu_stage
+from .events import ProgressEvent, emit, get_progress_metrics, listen, subscribe
+from .scheduling import FairScheduler, QuotaExceeded, request_context
+from .tokens import TokenEstimator, approx_tokens
 
-__all__ = ["setup_logger", "get_logger", "CostTracker"]
+__all__ = ["setup_logger", "get_logger", "log_context", "traced_node", "CostTracker", "novelty_score", "get_cpu_metrics", "run_cpu_stage", "ProgressEvent", "emit", "get_progress_metrics", "listen", "subscribe", "FairScheduler", "QuotaExceeded", "request_context", "TokenEstimator", "approx_tokens"]
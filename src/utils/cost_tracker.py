@@ -1,6 +1,9 @@
 """Cost tracking for API usage."""
 
-from typing import Dict
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
 
@@ -18,30 +21,52 @@ class CostTracker:
     # Paid tier (if you exceed limits):
     cost_per_1k_input_tokens: float = 0.00059  # $0.59 per 1M tokens
     cost_per_1k_output_tokens: float = 0.00079  # $0.79 per 1M tokens
+    cost_per_1k_cached_input_tokens: float = 0.000295  # Prompt cache hits are billed at 50%
     
     total_cost: float = field(default=0.0, init=False)
     search_calls: int = field(default=0, init=False)
     llm_calls: int = field(default=0, init=False)
     input_tokens: int = field(default=0, init=False)
     output_tokens: int = field(default=0, init=False)
+    cached_tokens: int = field(default=0, init=False)
     
     session_start: datetime = field(default_factory=datetime.now, init=False)
     
+    # Parallel branches update the same tracker
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    
     def track_search(self, num_results: int = 1) -> None:
         """Track a search API call."""
-        self.search_calls += 1
-        self.total_cost += self.cost_per_search * num_results
+        with self._lock:
+            self.search_calls += 1
+            self.total_cost += self.cost_per_search * num_results
     
-    def track_llm(self, input_tokens: int, output_tokens: int) -> None:
-        """Track an LLM API call."""
-        self.llm_calls += 1
-        self.input_tokens += input_tokens
-        self.output_tokens += output_tokens
+    def track_llm(self, input_tokens: int, output_tokens: int, cached_tokens: int = 0) -> None:
+        """
+        Track an LLM API call.
         
-        input_cost = (input_tokens / 1000) * self.cost_per_1k_input_tokens
-        output_cost = (output_tokens / 1000) * self.cost_per_1k_output_tokens
+        Args:
+            input_tokens: Prompt tokens, including any served from cache
+            output_tokens: Completion tokens
+            cached_tokens: Prompt tokens the provider reported as cache hits
+        """
+        cached_tokens = min(cached_tokens, input_tokens)
+        cost = self.estimate_llm_cost(input_tokens, output_tokens, cached_tokens)
         
-        self.total_cost += input_cost + output_cost
+        with self._lock:
+            self.llm_calls += 1
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+            self.cached_tokens += cached_tokens
+            self.total_cost += cost
+    
+    def estimate_llm_cost(self, input_tokens: int, output_tokens: int, cached_tokens: int = 0) -> float:
+        """Price an LLM call in USD without recording it."""
+        cached_tokens = min(cached_tokens, input_tokens)
+        input_cost = ((input_tokens - cached_tokens) / 1000) * self.cost_per_1k_input_tokens
+        input_cost += (cached_tokens / 1000) * self.cost_per_1k_cached_input_tokens
+        output_cost = (output_tokens / 1000) * self.cost_per_1k_output_tokens
+        return input_cost + output_cost
     
     def get_summary(self) -> Dict[str, any]:
         """Get a summary of tracked costs."""
@@ -54,14 +79,41 @@ class CostTracker:
             "total_tokens": self.input_tokens + self.output_tokens,
             "input_tokens": self.input_tokens,
             "output_tokens": self.output_tokens,
+            "cached_tokens": self.cached_tokens,
+            "prompt_cache_hit_rate": round(self.cached_tokens / self.input_tokens, 3) if self.input_tokens else 0.0,
             "session_duration_seconds": round(duration, 2),
         }
     
     def reset(self) -> None:
         """Reset all counters."""
-        self.total_cost = 0.0
-        self.search_calls = 0
-        self.llm_calls = 0
-        self.input_tokens = 0
-        self.output_tokens = 0
-        self.session_start = datetime.now()
+        with self._lock:
+            self.total_cost = 0.0
+            self.search_calls = 0
+            self.llm_calls = 0
+            self.input_tokens = 0
+            self.output_tokens = 0
+            self.cached_tokens = 0
+            self.session_start = datetime.now()
+
+
+_active: contextvars.ContextVar[Optional[CostTracker]] = contextvars.ContextVar("cost_tracker", default=None)
+
+
+@contextmanager
+def track_costs(cost_tracker: CostTracker) -> Iterator[CostTracker]:
+    """
+    Charge costs recorded in this context to a tracker.
+    
+    Lets one compiled graph serve many runs: nodes charge the tracker of
+    the run they are working for rather than the one they were built with.
+    """
+    token = _active.set(cost_tracker)
+    try:
+        yield cost_tracker
+    finally:
+        _active.reset(token)
+
+
+def active_cost_tracker() -> Optional[CostTracker]:
+    """The tracker set by the innermost track_costs block, if any."""
+    return _active.get()
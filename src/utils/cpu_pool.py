@@ -0,0 +1,232 @@
+"""Process pool for CPU-bound post-processing stages."""
+
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from config.settings import settings
+from .logger import get_logger
+
+logger = get_logger()
+
+
+@dataclass
+class StageMetrics:
+    """CPU and wall time spent in one post-processing stage."""
+    
+    calls: int = 0
+    offloaded: int = 0
+    cpu_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    input_bytes: int = 0
+
+
+@dataclass
+class CpuStageMetrics:
+    """Per-stage timings, used to check which stages are worth offloading."""
+    
+    stages: Dict[str, StageMetrics] = field(default_factory=dict)
+    
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    
+    def record(self, stage: str, cpu: float, wall: float, input_bytes: int, offloaded: bool) -> None:
+        """Add one stage run."""
+        with self._lock:
+            metrics = self.stages.setdefault(stage, StageMetrics())
+            metrics.calls += 1
+            metrics.offloaded += offloaded
+            metrics.cpu_seconds += cpu
+            metrics.wall_seconds += wall
+            metrics.input_bytes += input_bytes
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Totals per stage, with times in milliseconds."""
+        with self._lock:
+            return {
+                stage: {
+                    "calls": m.calls,
+                    "offloaded": m.offloaded,
+                    "cpu_ms": round(m.cpu_seconds * 1000, 2),
+                    "wall_ms": round(m.wall_seconds * 1000, 2),
+                    "input_kb": round(m.input_bytes / 1024, 1),
+                }
+                for stage, m in self.stages.items()
+            }
+    
+    def reset(self) -> None:
+        """Clear all stages."""
+        with self._lock:
+            self.stages.clear()
+
+
+class PackedTexts:
+    """
+    A list of strings packed into one UTF-8 buffer plus end offsets.
+    
+    Pickling a single bytes object is cheaper than pickling many small
+    strings. Large buffers are placed in shared memory instead, so only
+    the segment name crosses the process boundary.
+    """
+    
+    def __init__(self, texts: Sequence[str], shared: bool = False):
+        encoded = [text.encode("utf-8") for text in texts]
+        self.offsets: List[int] = []
+        end = 0
+        for chunk in encoded:
+            end += len(chunk)
+            self.offsets.append(end)
+        self.size = end
+        self.data = b"".join(encoded)
+        self.shm_name = None
+        self._shm = None
+        if shared and self.size:
+            from multiprocessing import shared_memory
+            
+            self._shm = shared_memory.SharedMemory(create=True, size=self.size)
+            self._shm.buf[:self.size] = self.data
+            self.shm_name = self._shm.name
+            self.data = b""
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"data": self.data, "offsets": self.offsets, "size": self.size, "shm_name": self.shm_name}
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._shm = None
+    
+    def texts(self) -> List[str]:
+        """Unpack the strings."""
+        data = self.data
+        if self.shm_name:
+            shm = _attach(self.shm_name)
+            try:
+                data = bytes(shm.buf[:self.size])
+            finally:
+                shm.close()
+        
+        texts, start = [], 0
+        for end in self.offsets:
+            texts.append(data[start:end].decode("utf-8"))
+            start = end
+        return texts
+    
+    def release(self) -> None:
+        """Free the shared memory segment, if any (owner side only)."""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+def _attach(name: str):
+    """Open an existing shared memory segment without taking ownership of it."""
+    from multiprocessing import shared_memory
+    
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching also registers the segment, but pool
+        # workers share the parent's resource tracker, so unlinking it in
+        # the parent still clears that registration
+        return shared_memory.SharedMemory(name=name)
+
+
+def _run_packed(fn: Callable, packed: PackedTexts, args: Tuple) -> Tuple[Any, float]:
+    """Worker entry point: unpack inputs, run the stage and time its CPU use."""
+    start = time.process_time()
+    result = fn(packed.texts(), *args)
+    return result, time.process_time() - start
+
+
+_metrics = CpuStageMetrics()
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _worker_count() -> int:
+    if settings.cpu_pool_workers > 0:
+        return settings.cpu_pool_workers
+    return max(1, min((os.cpu_count() or 2) - 1, 4))
+
+
+def get_cpu_pool() -> ProcessPoolExecutor:
+    """
+    Get the process-wide pool for CPU-bound stages.
+    
+    Workers are started with forkserver (or spawn where it is not
+    available) rather than fork, since the parent runs many threads.
+    
+    Returns:
+        Shared ProcessPoolExecutor
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _pool = ProcessPoolExecutor(max_workers=_worker_count(), mp_context=context)
+            logger.info("⚙️ Started CPU pool with %s workers", _worker_count())
+        return _pool
+
+
+def shutdown_cpu_pool() -> None:
+    """Stop the pool's worker processes, if started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+atexit.register(shutdown_cpu_pool)
+
+
+def get_cpu_metrics() -> CpuStageMetrics:
+    """Get the per-stage CPU time metrics."""
+    return _metrics
+
+
+def run_cpu_stage(stage: str, fn: Callable, texts: Sequence[str], *args) -> Any:
+    """
+    Run a CPU-bound stage over a batch of texts, in the pool if worthwhile.
+    
+    Inputs below cpu_offload_min_bytes run inline, where pickling and a
+    process round trip would cost more than the work itself. Larger ones
+    run in the shared process pool, off the GIL of the threads serving
+    other research runs; inputs above cpu_shared_memory_min_bytes are
+    passed through shared memory. If the pool fails the stage runs inline.
+    
+    Args:
+        stage: Stage name for metrics
+        fn: Module-level function taking (texts, *args); must be picklable
+        texts: Input texts
+        *args: Extra picklable arguments for fn
+    
+    Returns:
+        Whatever fn returns
+    """
+    input_bytes = sum(len(text) for text in texts)
+    wall_start = time.perf_counter()
+    
+    if settings.enable_process_pool and input_bytes >= settings.cpu_offload_min_bytes:
+        packed = PackedTexts(texts, shared=input_bytes >= settings.cpu_shared_memory_min_bytes)
+        try:
+            result, cpu = get_cpu_pool().submit(_run_packed, fn, packed, args).result()
+            _metrics.record(stage, cpu, time.perf_counter() - wall_start, input_bytes, offloaded=True)
+            return result
+        except BrokenProcessPool as e:
+            logger.warning("CPU pool failed during %s, running inline: %s", stage, e)
+            shutdown_cpu_pool()
+        finally:
+            packed.release()
+    
+    cpu_start = time.thread_time()
+    result = fn(list(texts), *args)
+    _metrics.record(stage, time.thread_time() - cpu_start, time.perf_counter() - wall_start, input_bytes, offloaded=False)
+    return result
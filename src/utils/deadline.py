@@ -0,0 +1,73 @@
+"""End-to-end deadlines for research runs."""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a run or stage has used up its time budget."""
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """
+    Absolute point in time by which a research run must finish.
+    
+    The deadline travels with the run in the LangGraph config under
+    ``configurable.deadline`` so every stage draws from the same budget.
+    """
+    
+    expires_at: float
+    
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        """Create a deadline a number of seconds from now."""
+        return cls(expires_at=time.monotonic() + seconds)
+    
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)."""
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has passed."""
+        return self.remaining() <= 0.0
+    
+    def budget(self, stage_cap: float, reserve: float = 0.0) -> float:
+        """
+        Time a single stage may spend.
+        
+        Args:
+            stage_cap: Upper bound for the stage on its own
+            reserve: Time to keep back for later stages
+            
+        Returns:
+            Seconds available to the stage
+            
+        Raises:
+            DeadlineExceeded: If no time is left for the stage
+        """
+        available = min(stage_cap, self.remaining() - reserve)
+        if available <= 0:
+            raise DeadlineExceeded("Run deadline exceeded")
+        return available
+
+
+def deadline_from_config(config: Optional[Dict[str, Any]]) -> Optional[Deadline]:
+    """Extract the run deadline from a LangGraph config, if any."""
+    if not config:
+        return None
+    return config.get("configurable", {}).get("deadline")
+
+
+def stage_timeout(
+    config: Optional[Dict[str, Any]],
+    stage_cap: float,
+    reserve: float = 0.0
+) -> float:
+    """Per-call timeout for a stage, bounded by the run deadline if present."""
+    deadline = deadline_from_config(config)
+    if deadline is None:
+        return stage_cap
+    return deadline.budget(stage_cap, reserve)
@@ -0,0 +1,291 @@
+"""Typed progress events emitted while a research run executes."""
+
+import contextvars
+import dataclasses
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, ClassVar, Dict, Iterator, List, Optional, Tuple
+
+from .logger import current_log_context, get_logger
+
+logger = get_logger()
+
+
+def _run_id() -> Optional[str]:
+    return current_log_context()[0]
+
+
+def _node() -> Optional[str]:
+    return current_log_context()[1]
+
+
+@dataclass(frozen=True, kw_only=True)
+class ProgressEvent:
+    """Base class of all progress events; run and node are taken from the log context."""
+    
+    kind: ClassVar[str] = "event"
+    
+    run_id: Optional[str] = field(default_factory=_run_id)
+    node: Optional[str] = field(default_factory=_node)
+    at: float = field(default_factory=time.time)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form, with the event kind."""
+        return {"kind": self.kind, **dataclasses.asdict(self)}
+
+
+@dataclass(frozen=True)
+class RunStarted(ProgressEvent):
+    """A research run got its slot and is about to start."""
+    
+    kind: ClassVar[str] = "run_started"
+    query: str
+    mode: str
+
+
+@dataclass(frozen=True)
+class RunFinished(ProgressEvent):
+    """A research run completed, successfully or not."""
+    
+    kind: ClassVar[str] = "run_finished"
+    elapsed_seconds: float
+    error: Optional[str] = None
+    cost_usd: float = 0.0
+
+
+@dataclass(frozen=True)
+class NodeStarted(ProgressEvent):
+    """A graph node began executing."""
+    
+    kind: ClassVar[str] = "node_started"
+
+
+@dataclass(frozen=True)
+class NodeFinished(ProgressEvent):
+    """A graph node returned its state update."""
+    
+    kind: ClassVar[str] = "node_finished"
+    elapsed_ms: float
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class SearchStarted(ProgressEvent):
+    """A web search was sent to the provider chain."""
+    
+    kind: ClassVar[str] = "search_started"
+    query: str
+
+
+@dataclass(frozen=True)
+class SearchFinished(ProgressEvent):
+    """A web search returned (results counts hits kept after filtering)."""
+    
+    kind: ClassVar[str] = "search_finished"
+    query: str
+    results: int
+    elapsed_ms: float
+    error: Optional[str] = None
+    deepened: bool = False
+
+
+@dataclass(frozen=True)
+class RouteDecided(ProgressEvent):
+    """The router chose the next step: search, speculate or writer."""
+    
+    kind: ClassVar[str] = "route_decided"
+    decision: str
+    attempts: int
+    max_attempts: int
+
+
+@dataclass(frozen=True)
+class SubQuestionsPlanned(ProgressEvent):
+    """The planner split the task into parallel research branches."""
+    
+    kind: ClassVar[str] = "sub_questions_planned"
+    sub_questions: List[str]
+
+
+@dataclass(frozen=True)
+class WriterStarted(ProgressEvent):
+    """The writer planned its prompt and is about to call the LLM."""
+    
+    kind: ClassVar[str] = "writer_started"
+    strategy: str
+    prompt_tokens: int
+    max_output_tokens: int
+    speculative: bool = False  # Writing a draft that may still be discarded
+
+
+@dataclass(frozen=True)
+class WriterTokens(ProgressEvent):
+    """A piece of report text streamed from the LLM."""
+    
+    kind: ClassVar[str] = "writer_tokens"
+    text: str
+    speculative: bool = False  # Part of a draft that may still be discarded
+
+
+@dataclass(frozen=True)
+class DraftDecided(ProgressEvent):
+    """The speculative draft was kept as the report or discarded for a rewrite."""
+    
+    kind: ClassVar[str] = "draft_decided"
+    accepted: bool
+    novelty: float
+
+
+Listener = Callable[[ProgressEvent], None]
+
+# Listeners for the runs started in this context, and process-wide subscribers
+_listeners: contextvars.ContextVar[Tuple[Listener, ...]] = contextvars.ContextVar("progress_listeners", default=())
+_subscribers: List[Listener] = []
+_subscribers_lock = threading.Lock()
+
+
+@contextmanager
+def listen(listener: Listener) -> Iterator[None]:
+    """
+    Pass events emitted in this context to a listener.
+    
+    Graph nodes run in threads started from a copy of the caller's
+    context, so a listener registered around agent.invoke sees every
+    event of that run and none of other runs. Listeners are called on the
+    emitting thread and should only hand the event off (e.g. to a queue).
+    """
+    token = _listeners.set(_listeners.get() + (listener,))
+    try:
+        yield
+    finally:
+        _listeners.reset(token)
+
+
+def subscribe(listener: Listener) -> Callable[[], None]:
+    """
+    Pass every event in the process to a listener (e.g. for metrics).
+    
+    Returns:
+        Function that removes the subscription
+    """
+    with _subscribers_lock:
+        _subscribers.append(listener)
+    
+    def unsubscribe() -> None:
+        with _subscribers_lock:
+            if listener in _subscribers:
+                _subscribers.remove(listener)
+    
+    return unsubscribe
+
+
+def listening() -> bool:
+    """Whether a listener is registered for the current context."""
+    return bool(_listeners.get())
+
+
+def emit(event: ProgressEvent) -> None:
+    """Deliver an event; a failing listener never affects the run."""
+    _deliver(event, _listeners.get() + tuple(_subscribers))
+
+
+def forward(event: ProgressEvent) -> None:
+    """
+    Deliver another context's event to this context's listeners only.
+    
+    Used to replay a shared run's events to the callers that joined it;
+    process-wide subscribers already saw them when they were emitted.
+    """
+    _deliver(event, _listeners.get())
+
+
+def _deliver(event: ProgressEvent, listeners: Tuple[Listener, ...]) -> None:
+    for listener in listeners:
+        try:
+            listener(event)
+        except Exception as e:
+            logger.debug("Progress listener failed on %s: %s", event.kind, e)
+
+
+@dataclass
+class NodeTiming:
+    """Running totals for one graph node."""
+    
+    calls: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+class ProgressMetrics:
+    """Aggregates progress events into counters and per-node timings."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def record(self, event: ProgressEvent) -> None:
+        """Fold one event into the totals."""
+        with self._lock:
+            self._events[event.kind] += 1
+            if isinstance(event, NodeFinished) and event.node:
+                timing = self._nodes.setdefault(event.node, NodeTiming())
+                timing.calls += 1
+                timing.errors += event.error is not None
+                timing.total_ms += event.elapsed_ms
+                timing.max_ms = max(timing.max_ms, event.elapsed_ms)
+            elif isinstance(event, SearchFinished):
+                self._search_results += event.results
+                self._search_errors += event.error is not None
+                self._searches_deepened += event.deepened
+            elif isinstance(event, RouteDecided):
+                self._routes[event.decision] += 1
+            elif isinstance(event, RunFinished):
+                self._run_errors += event.error is not None
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Event counts, router decisions and per-node latency."""
+        with self._lock:
+            searches = self._events[SearchFinished.kind]
+            return {
+                "events": dict(self._events),
+                "runs": self._events[RunFinished.kind],
+                "run_errors": self._run_errors,
+                "searches": searches,
+                "search_errors": self._search_errors,
+                "searches_deepened": self._searches_deepened,
+                "results_per_search": round(self._search_results / searches, 2) if searches else 0.0,
+                "routes": dict(self._routes),
+                "nodes": {
+                    name: {
+                        "calls": t.calls,
+                        "errors": t.errors,
+                        "mean_ms": round(t.total_ms / t.calls, 1),
+                        "max_ms": round(t.max_ms, 1),
+                    }
+                    for name, t in self._nodes.items()
+                },
+            }
+    
+    def reset(self) -> None:
+        """Clear all totals."""
+        with self._lock:
+            self._events: Counter = Counter()
+            self._routes: Counter = Counter()
+            self._nodes: Dict[str, NodeTiming] = {}
+            self._search_results = 0
+            self._search_errors = 0
+            self._searches_deepened = 0
+            self._run_errors = 0
+
+
+_metrics = ProgressMetrics()
+subscribe(_metrics.record)
+
+
+def get_progress_metrics() -> ProgressMetrics:
+    """Get the process-wide metrics fed by every progress event."""
+    return _metrics
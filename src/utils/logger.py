@@ -1,15 +1,181 @@
 """Logging configuration for the application."""
 
+import atexit
+import contextvars
+import copy
+import functools
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+# Correlation IDs attached to every record logged within a run, node or job
+_run_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("run_id", default=None)
+_node: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("node", default=None)
+_job_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("job_id", default=None)
+_tenant: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("log_tenant", default=None)
+_CONTEXT_FIELDS: Dict[str, contextvars.ContextVar] = {
+    "run_id": _run_id,
+    "node": _node,
+    "job_id": _job_id,
+    "tenant": _tenant,
+}
+
+# Background listeners started by setup_logger, keyed by logger name
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
+# Standard LogRecord attributes, excluded from the JSON "extra" fields
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+@contextmanager
+def log_context(**fields: Optional[str]) -> Iterator[None]:
+    """
+    Attach correlation IDs to records logged inside the block.
+    
+    Supported fields are run_id, node, job_id and tenant. Values
+    propagate to threads started with contextvars.copy_context().
+    
+    Raises:
+        TypeError: If a field is not supported
+    """
+    unknown = set(fields) - set(_CONTEXT_FIELDS)
+    if unknown:
+        raise TypeError(f"Unsupported log context fields: {', '.join(sorted(unknown))}")
+    tokens = [(_CONTEXT_FIELDS[name], _CONTEXT_FIELDS[name].set(value)) for name, value in fields.items()]
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+def current_log_context() -> Tuple[Optional[str], Optional[str]]:
+    """The (run_id, node) of the current context."""
+    return _run_id.get(), _node.get()
+
+
+def traced_node(name: str) -> Callable:
+    """
+    Decorator that tags records logged by a graph node with its name and
+    emits NodeStarted/NodeFinished progress events around it.
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            from .events import NodeFinished, NodeStarted, emit
+            
+            with log_context(node=name):
+                emit(NodeStarted())
+                started = time.monotonic()
+                try:
+                    update = fn(*args, **kwargs)
+                except Exception as e:
+                    emit(NodeFinished(elapsed_ms=round((time.monotonic() - started) * 1000, 1), error=str(e)))
+                    raise
+                error = update.get("error") if isinstance(update, dict) else None
+                emit(NodeFinished(elapsed_ms=round((time.monotonic() - started) * 1000, 1), error=error))
+                return update
+        return wrapper
+    return decorator
+
+
+class ContextFilter(logging.Filter):
+    """Copy the current correlation IDs onto each record."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        for name, var in _CONTEXT_FIELDS.items():
+            setattr(record, name, var.get())
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Drop repeats of the same message beyond a per-window budget.
+    
+    Messages are keyed by logger, level and the unformatted message
+    template, so "Search attempt %d failed" counts as one message however
+    its arguments vary. The first record after a suppressed burst carries
+    a ``suppressed`` count. ERROR and CRITICAL records are never dropped.
+    """
+    
+    def __init__(self, window_seconds: float = 10.0, max_per_window: int = 5):
+        super().__init__()
+        self.window_seconds = window_seconds
+        self.max_per_window = max_per_window
+        self._windows: Dict[Tuple[str, int, str], Tuple[float, int, int]] = {}
+        self._lock = threading.Lock()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            started, count, suppressed = self._windows.get(key, (now, 0, 0))
+            if now - started >= self.window_seconds:
+                started, count = now, 0
+            count += 1
+            if count > self.max_per_window:
+                self._windows[key] = (started, count, suppressed + 1)
+                return False
+            self._windows[key] = (started, count, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves most formatting to the listener thread.
+    
+    The stock QueueHandler runs the full formatter (timestamp, level,
+    JSON or text layout) before queueing each record. Here only the
+    message is merged with its arguments on the calling thread, so
+    mutable arguments are captured as they were when logged; the layout
+    is applied by the listener.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        message = record.getMessage()
+        record = copy.copy(record)
+        record.msg = message
+        record.args = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Render records as single-line JSON objects."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and value is not None:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
 
 
 def setup_logger(
     name: str = "deep_research_agent",
     level: str = "INFO",
-    log_file: Optional[str] = None
+    log_file: Optional[str] = None,
+    fmt: str = "text",
+    async_handlers: bool = True,
+    sample_window_seconds: float = 10.0,
+    sample_max_per_window: int = 5
 ) -> logging.Logger:
     """
     Set up a logger with consistent formatting.
@@ -18,7 +184,13 @@ def setup_logger(
         name: Logger name
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Optional log file path
-        
+        fmt: "text" for human-readable lines or "json" for structured logs
+        async_handlers: Write through a queue on a background thread so
+            logging calls never block on stdout or disk
+        sample_window_seconds: Window for rate-limiting repeated messages
+        sample_max_per_window: Repeats of one message allowed per window
+            (0 disables rate limiting)
+    
     Returns:
         Configured logger instance
     """
@@ -30,15 +202,18 @@ def setup_logger(
         return logger
     
     # Create formatter
-    formatter = logging.Formatter(
-        fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
+    if fmt == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S"
+        )
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
     
     # File handler (optional)
     if log_file:
@@ -47,11 +222,35 @@ def setup_logger(
         
         file_handler = logging.FileHandler(log_file)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    # Filters run in the calling thread, before the record is queued
+    logger.addFilter(ContextFilter())
+    if sample_max_per_window > 0:
+        logger.addFilter(RateLimitFilter(sample_window_seconds, sample_max_per_window))
+    
+    if async_handlers:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        logger.addHandler(DeferredQueueHandler(log_queue))
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        if not _listeners:
+            atexit.register(stop_listeners)
+        _listeners[name] = listener
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
     
     return logger
 
 
+def stop_listeners() -> None:
+    """Flush and stop the background log writers started by setup_logger."""
+    while _listeners:
+        _, listener = _listeners.popitem()
+        listener.stop()
+
+
 def get_logger(name: str = "deep_research_agent") -> logging.Logger:
     """Get an existing logger by name."""
     return logging.getLogger(name)
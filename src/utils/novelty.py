@@ -0,0 +1,62 @@
+"""Lightweight text novelty scoring for search results."""
+
+import re
+from typing import Iterable, List, Set, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text: str, size: int = 3) -> Set[Tuple[str, ...]]:
+    """Return the set of word n-grams (shingles) in a text."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) < size:
+        return {tuple(tokens)} if tokens else set()
+    return {tuple(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def novelty_score(new_texts: Iterable[str], seen_texts: Iterable[str], size: int = 3) -> float:
+    """
+    Measure how much new information a batch of texts adds.
+    
+    Args:
+        new_texts: Freshly retrieved texts
+        seen_texts: Texts already known
+        size: Shingle size in words
+    
+    Returns:
+        Fraction of shingles in new_texts not present in seen_texts (0.0-1.0)
+    """
+    new_shingles: Set[Tuple[str, ...]] = set()
+    for text in new_texts:
+        new_shingles |= shingles(text, size)
+    
+    if not new_shingles:
+        return 0.0
+    
+    seen_shingles: Set[Tuple[str, ...]] = set()
+    for text in seen_texts:
+        seen_shingles |= shingles(text, size)
+    
+    return len(new_shingles - seen_shingles) / len(new_shingles)
+
+
+def _novelty_stage(texts: List[str], split: int, size: int) -> float:
+    return novelty_score(texts[:split], texts[split:], size)
+
+
+def novelty_score_offloaded(new_texts: Iterable[str], seen_texts: Iterable[str], size: int = 3) -> float:
+    """
+    novelty_score as a CPU stage, run in the process pool for large inputs.
+    
+    Args:
+        new_texts: Freshly retrieved texts
+        seen_texts: Texts already known
+        size: Shingle size in words
+    
+    Returns:
+        Fraction of shingles in new_texts not present in seen_texts (0.0-1.0)
+    """
+    from .cpu_pool import run_cpu_stage
+    
+    new_texts = list(new_texts)
+    return run_cpu_stage("novelty", _novelty_stage, new_texts + list(seen_texts), len(new_texts), size)
@@ -0,0 +1,340 @@
+"""Per-tenant fair scheduling of research runs and provider calls."""
+
+import contextvars
+import math
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from config.settings import settings
+from .logger import get_logger
+
+logger = get_logger()
+
+# Priority classes, highest first
+INTERACTIVE = "interactive"
+BATCH = "batch"
+MONITOR = "monitor"
+PRIORITIES = (INTERACTIVE, BATCH, MONITOR)
+
+DEFAULT_TENANT = "default"
+
+_tenant: contextvars.ContextVar[str] = contextvars.ContextVar("tenant", default=DEFAULT_TENANT)
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("priority", default=INTERACTIVE)
+
+
+class QuotaExceeded(RuntimeError):
+    """Raised when a tenant already has its maximum number of queued requests."""
+
+
+class SchedulerTimeout(TimeoutError):
+    """Raised when no slot became free within the caller's time budget."""
+
+
+@contextmanager
+def request_context(tenant: Optional[str] = None, priority: Optional[str] = None) -> Iterator[None]:
+    """
+    Attribute work in this context (and threads started from a copy of
+    it) to a tenant and priority class.
+    
+    Raises:
+        ValueError: If the priority class is unknown
+    """
+    if priority is not None and priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority '{priority}'. Available: {', '.join(PRIORITIES)}")
+    tokens = []
+    if tenant is not None:
+        tokens.append((_tenant, _tenant.set(tenant)))
+    if priority is not None:
+        tokens.append((_priority, _priority.set(priority)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+def current_request() -> Tuple[str, str]:
+    """The (tenant, priority) of the current context."""
+    return _tenant.get(), _priority.get()
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """Parse "tenant=weight" pairs, e.g. "acme=2,trial=0.5"."""
+    weights = {}
+    for entry in spec.split(","):
+        tenant, _, weight = entry.partition("=")
+        if tenant.strip() and weight.strip():
+            weights[tenant.strip()] = float(weight)
+    return weights
+
+
+class _Waiter:
+    __slots__ = ("tenant", "priority", "enqueued_at", "granted")
+    
+    def __init__(self, tenant: str, priority: str):
+        self.tenant = tenant
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+
+
+class FairScheduler:
+    """
+    Admission control with priority classes and weighted fair sharing.
+    
+    At most `capacity` holders run at once. Waiting requests are served in
+    strict priority order (interactive, then batch, then monitor), and
+    `reserve` slots can only be taken by interactive work, so a burst of
+    interactive requests never has to wait for long batch runs to finish.
+    Within a class, tenants take turns by stride scheduling: each grant
+    advances the tenant's pass by 1/weight, and the tenant with the lowest
+    pass goes next, so a tenant with 500 queued requests gets no more than
+    its share while others are waiting and all spare capacity otherwise.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        capacity: int,
+        reserve: int = 0,
+        tenant_max_running: int = 0,
+        tenant_max_queued: int = 0,
+        weights: Optional[Dict[str, float]] = None
+    ):
+        """
+        Args:
+            name: Name for logs and metrics
+            capacity: Maximum concurrent holders
+            reserve: Slots only interactive requests may use
+            tenant_max_running: Per-tenant concurrency quota (0 = none)
+            tenant_max_queued: Per-tenant waiting quota (0 = none)
+            weights: Tenant weights (default 1.0)
+        """
+        self.name = name
+        self.capacity = max(capacity, 1)
+        self.reserve = min(max(reserve, 0), self.capacity - 1)
+        self.tenant_max_running = tenant_max_running
+        self.tenant_max_queued = tenant_max_queued
+        self.weights = weights or {}
+        
+        self._cond = threading.Condition()
+        self._queues: Dict[str, Dict[str, Deque[_Waiter]]] = {p: {} for p in PRIORITIES}
+        self._running = 0
+        self._running_by_tenant: Counter = Counter()
+        self._queued_by_tenant: Counter = Counter()
+        self._following_by_tenant: Counter = Counter()
+        self._pass: Dict[str, float] = {}
+        self._virtual_time = 0.0
+        self._waits: Dict[str, Deque[float]] = {p: deque(maxlen=1000) for p in PRIORITIES}
+        self._granted: Counter = Counter()
+    
+    @contextmanager
+    def slot(self, tenant: Optional[str] = None, priority: Optional[str] = None, timeout: Optional[float] = None) -> Iterator[None]:
+        """
+        Hold a slot for the duration of a block.
+        
+        Args:
+            tenant: Tenant to charge (defaults to the current request's)
+            priority: Priority class (defaults to the current request's)
+            timeout: Maximum seconds to wait for a slot
+        
+        Raises:
+            QuotaExceeded: If the tenant has too many queued requests
+            SchedulerTimeout: If no slot was granted in time
+        """
+        current_tenant, current_priority = current_request()
+        tenant = tenant or current_tenant
+        self.acquire(tenant, priority or current_priority, timeout)
+        try:
+            yield
+        finally:
+            self.release(tenant)
+    
+    @contextmanager
+    def follow(self, tenant: Optional[str] = None) -> Iterator[None]:
+        """
+        Count a caller waiting on another caller's slot (e.g. a joined
+        identical run) against its tenant's waiting quota for a block.
+        
+        Raises:
+            QuotaExceeded: If the tenant has too many queued requests
+        """
+        tenant = tenant or current_request()[0]
+        with self._cond:
+            self._check_queued_quota(tenant)
+            self._following_by_tenant[tenant] += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._following_by_tenant[tenant] -= 1
+                if self._following_by_tenant[tenant] <= 0:
+                    del self._following_by_tenant[tenant]
+    
+    def acquire(self, tenant: str, priority: str, timeout: Optional[float] = None) -> float:
+        """
+        Wait for a slot.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}'. Available: {', '.join(PRIORITIES)}")
+        waiter = _Waiter(tenant, priority)
+        expires_at = waiter.enqueued_at + timeout if timeout is not None else None
+        with self._cond:
+            self._check_queued_quota(tenant)
+            self._queues[priority].setdefault(tenant, deque()).append(waiter)
+            self._queued_by_tenant[tenant] += 1
+            self._dispatch()
+            
+            while not waiter.granted:
+                remaining = expires_at - time.monotonic() if expires_at is not None else None
+                if remaining is not None and remaining <= 0:
+                    self._remove(waiter)
+                    raise SchedulerTimeout(f"No {self.name} slot free within {timeout:.1f}s")
+                self._cond.wait(remaining)
+            
+            waited = time.monotonic() - waiter.enqueued_at
+            self._waits[priority].append(waited)
+        if waited > 1.0:
+            logger.debug("%s slot for %s (%s) after %.1fs", self.name, tenant, priority, waited)
+        return waited
+    
+    def release(self, tenant: str) -> None:
+        """Free a slot taken with acquire."""
+        with self._cond:
+            self._running -= 1
+            self._running_by_tenant[tenant] -= 1
+            if self._running_by_tenant[tenant] <= 0:
+                del self._running_by_tenant[tenant]
+            self._dispatch()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Running and queued counts, and wait times per priority class."""
+        with self._cond:
+            classes = {}
+            for priority in PRIORITIES:
+                waits = sorted(self._waits[priority])
+                classes[priority] = {
+                    "queued": sum(len(q) for q in self._queues[priority].values()),
+                    "granted": self._granted[priority],
+                    "wait_p50_ms": round(_percentile(waits, 50) * 1000, 1),
+                    "wait_p95_ms": round(_percentile(waits, 95) * 1000, 1),
+                }
+            return {
+                "capacity": self.capacity,
+                "running": self._running,
+                "running_by_tenant": dict(self._running_by_tenant),
+                "classes": classes,
+            }
+    
+    def _check_queued_quota(self, tenant: str) -> None:
+        waiting = self._queued_by_tenant[tenant] + self._following_by_tenant[tenant]
+        if self.tenant_max_queued and waiting >= self.tenant_max_queued:
+            raise QuotaExceeded(
+                f"Tenant '{tenant}' already has {self.tenant_max_queued} requests waiting for {self.name}"
+            )
+    
+    def _limit(self, priority: str) -> int:
+        return self.capacity if priority == INTERACTIVE else self.capacity - self.reserve
+    
+    def _dispatch(self) -> None:
+        """Grant slots to as many waiters as capacity and quotas allow."""
+        granted = False
+        while True:
+            waiter = self._next()
+            if waiter is None:
+                break
+            queue = self._queues[waiter.priority][waiter.tenant]
+            queue.popleft()
+            if not queue:
+                del self._queues[waiter.priority][waiter.tenant]
+            self._queued_by_tenant[waiter.tenant] -= 1
+            if self._queued_by_tenant[waiter.tenant] <= 0:
+                del self._queued_by_tenant[waiter.tenant]
+            
+            # Idle tenants rejoin at the current virtual time rather than
+            # with credit saved up while they were away
+            start = max(self._pass.get(waiter.tenant, 0.0), self._virtual_time)
+            self._virtual_time = start
+            self._pass[waiter.tenant] = start + 1.0 / self.weights.get(waiter.tenant, 1.0)
+            
+            waiter.granted = True
+            self._running += 1
+            self._running_by_tenant[waiter.tenant] += 1
+            self._granted[waiter.priority] += 1
+            granted = True
+        
+        if granted:
+            self._cond.notify_all()
+        if len(self._pass) > 1000:
+            active = set(self._queued_by_tenant) | set(self._running_by_tenant)
+            self._pass = {t: p for t, p in self._pass.items() if t in active or p > self._virtual_time}
+    
+    def _next(self) -> Optional[_Waiter]:
+        """Head waiter of the eligible tenant with the lowest pass, by priority."""
+        for priority in PRIORITIES:
+            if self._running >= self._limit(priority):
+                # Lower classes have the same or a smaller limit
+                return None
+            candidates = [
+                tenant for tenant in self._queues[priority]
+                if not self.tenant_max_running or self._running_by_tenant[tenant] < self.tenant_max_running
+            ]
+            if candidates:
+                tenant = min(candidates, key=lambda t: max(self._pass.get(t, 0.0), self._virtual_time))
+                return self._queues[priority][tenant][0]
+        return None
+    
+    def _remove(self, waiter: _Waiter) -> None:
+        queue = self._queues[waiter.priority].get(waiter.tenant)
+        if queue and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del self._queues[waiter.priority][waiter.tenant]
+            self._queued_by_tenant[waiter.tenant] -= 1
+            if self._queued_by_tenant[waiter.tenant] <= 0:
+                del self._queued_by_tenant[waiter.tenant]
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(percentile / 100 * len(values)) - 1))]
+
+
+_schedulers: Dict[str, FairScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def _get(name: str, capacity: int, tenant_max_running: int, tenant_max_queued: int) -> FairScheduler:
+    with _schedulers_lock:
+        if name not in _schedulers:
+            _schedulers[name] = FairScheduler(
+                name,
+                capacity=capacity,
+                reserve=math.ceil(capacity * settings.interactive_reserve_fraction),
+                tenant_max_running=tenant_max_running,
+                tenant_max_queued=tenant_max_queued,
+                weights=parse_weights(settings.tenant_weights)
+            )
+        return _schedulers[name]
+
+
+def get_run_scheduler() -> FairScheduler:
+    """Get the process-wide scheduler for whole research runs."""
+    return _get(
+        "run",
+        settings.max_concurrent_runs,
+        settings.tenant_max_concurrent_runs,
+        settings.tenant_max_queued_runs
+    )
+
+
+def get_call_scheduler() -> FairScheduler:
+    """Get the process-wide scheduler for search and LLM provider calls."""
+    return _get("provider call", settings.max_concurrent_provider_calls, 0, 0)
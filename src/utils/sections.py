@@ -0,0 +1,104 @@
+"""Split and patch markdown reports by section."""
+
+import re
+from typing import List, Tuple
+
+_HEADING_RE = re.compile(r"^#{1,6}\s+(.+?)\s*#*\s*$")
+
+
+def split_sections(markdown: str) -> List[Tuple[str, str]]:
+    """
+    Split a markdown document into (heading, body) pairs.
+    
+    Text before the first heading is returned under an empty heading.
+    The heading line itself is kept at the start of each body so that
+    joining the bodies reproduces the document.
+    """
+    sections: List[Tuple[str, str]] = []
+    heading = ""
+    lines: List[str] = []
+    
+    for line in markdown.splitlines(keepends=True):
+        match = _HEADING_RE.match(line.rstrip("\n"))
+        if match:
+            if lines:
+                sections.append((heading, "".join(lines)))
+            heading = match.group(1)
+            lines = [line]
+        else:
+            lines.append(line)
+    
+    if lines:
+        sections.append((heading, "".join(lines)))
+    return sections
+
+
+def _normalize(heading: str) -> str:
+    return " ".join(heading.lower().split())
+
+
+def _level(heading: str, body: str) -> int:
+    """Heading level of a section (0 for text before the first heading)."""
+    return len(body) - len(body.lstrip("#")) if heading else 0
+
+
+def _units(markdown: str) -> List[Tuple[str, int, str]]:
+    """
+    Split a document into (heading, level, body) units, each running to
+    the next heading of the same or a higher level, so a unit's body
+    includes its subsections.
+    """
+    units: List[Tuple[str, int, str]] = []
+    for heading, body in split_sections(markdown):
+        level = _level(heading, body)
+        if units and units[-1][1] and level > units[-1][1]:
+            units[-1] = (units[-1][0], units[-1][1], units[-1][2] + body)
+        else:
+            units.append((heading, level, body))
+    return units
+
+
+def merge_sections(previous: str, patch: str) -> str:
+    """
+    Apply a section patch to a previous report.
+    
+    A section runs to the next heading of the same or a higher level, so
+    it includes its subsections. Sections in the patch replace sections
+    with the same heading in the previous report, subsections and all;
+    sections with new headings are appended at the end.
+    
+    Args:
+        previous: Full previous report
+        patch: Markdown containing only changed or new sections
+        
+    Returns:
+        The patched report
+    """
+    replacements = {
+        _normalize(heading): body if body.endswith("\n") else body + "\n"
+        for heading, _, body in _units(patch)
+        if heading
+    }
+    
+    merged = []
+    replaced_level = None
+    for heading, body in split_sections(previous):
+        level = _level(heading, body)
+        if replaced_level is not None:
+            if level > replaced_level:
+                # Subsection of a replaced section: the replacement covers it
+                continue
+            replaced_level = None
+        key = _normalize(heading)
+        if heading and key in replacements:
+            merged.append(replacements.pop(key))
+            replaced_level = level
+        else:
+            merged.append(body)
+    
+    for body in replacements.values():
+        if merged and not merged[-1].endswith("\n"):
+            merged[-1] += "\n"
+        merged.append("\n" + body)
+    
+    return "".join(merged).rstrip("\n") + "\n"
@@ -0,0 +1,152 @@
+"""Single-flight deduplication of identical concurrent calls."""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+
+class Flight:
+    """
+    One in-flight execution shared by its leader and any followers.
+    
+    The leader may publish partial output while it runs; followers can
+    either wait for the final result or stream the published chunks.
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._chunks: List[Any] = []
+        self._done = False
+        self._result: Any = None
+        self._error: Optional[BaseException] = None
+        self.followers = 0
+    
+    def publish(self, chunk: Any) -> None:
+        """Make a partial result available to followers."""
+        with self._cond:
+            self._chunks.append(chunk)
+            self._cond.notify_all()
+    
+    def stream(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Yield published chunks, including earlier ones, until the flight ends.
+        
+        Args:
+            timeout: Seconds until the whole stream must have ended
+        
+        Raises:
+            TimeoutError: If the flight is still running after timeout
+        """
+        expires_at = time.monotonic() + timeout if timeout is not None else None
+        index = 0
+        while True:
+            with self._cond:
+                while index >= len(self._chunks) and not self._done:
+                    remaining = expires_at - time.monotonic() if expires_at is not None else None
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("Timed out waiting for shared result")
+                    self._cond.wait(remaining)
+                chunks = self._chunks[index:]
+                done = self._done
+            for chunk in chunks:
+                yield chunk
+            index += len(chunks)
+            if done and index >= len(self._chunks):
+                return
+    
+    def wait(self, timeout: Optional[float] = None) -> Any:
+        """Block until the leader finishes and return its result."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._done, timeout):
+                raise TimeoutError("Timed out waiting for shared result")
+            if self._error is not None:
+                raise self._error
+            return self._result
+    
+    def _finish(self, result: Any = None, error: Optional[BaseException] = None) -> None:
+        with self._cond:
+            self._result = result
+            self._error = error
+            self._done = True
+            self._cond.notify_all()
+
+
+class SingleFlight:
+    """
+    Collapse identical concurrent calls into one execution.
+    
+    The first caller for a key becomes the leader and runs the call; callers
+    arriving while it is in flight attach to it and receive the same result
+    (or exception). Nothing is cached: once the call finishes the key is
+    free again.
+    """
+    
+    def __init__(self):
+        self._flights: Dict[Hashable, Flight] = {}
+        self._lock = threading.Lock()
+    
+    def join(self, key: Hashable) -> Tuple[Flight, bool]:
+        """
+        Attach to the flight for a key, starting one if none is running.
+        
+        Returns:
+            The flight and whether the caller is its leader. A leader must
+            call finish() when done.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.followers += 1
+                return flight, False
+            flight = Flight()
+            self._flights[key] = flight
+            return flight, True
+    
+    def finish(
+        self,
+        key: Hashable,
+        flight: Flight,
+        result: Any = None,
+        error: Optional[BaseException] = None
+    ) -> None:
+        """Complete a flight, releasing its followers and the key."""
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight._finish(result, error)
+    
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[..., Any],
+        *args,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Tuple[Any, bool]:
+        """
+        Run fn once for all concurrent callers with the same key.
+        
+        Args:
+            key: Identity of the call
+            fn: Function to run if no identical call is in flight
+            timeout: How long a follower waits for the leader
+            
+        Returns:
+            The result and whether it was shared from another caller's flight
+        """
+        flight, leader = self.join(key)
+        if not leader:
+            return flight.wait(timeout), True
+        
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self.finish(key, flight, error=e)
+            raise
+        self.finish(key, flight, result=result)
+        return result, False
+    
+    def in_flight(self) -> int:
+        """Number of keys currently executing."""
+        with self._lock:
+            return len(self._flights)
@@ -0,0 +1,111 @@
+"""Local prompt token estimation."""
+
+import math
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+# Chat formatting overhead per message (role markers and separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def approx_tokens(text: str) -> int:
+    """
+    Fast token estimate without a tokenizer.
+    
+    BPE vocabularies average about four characters per token for English,
+    but split punctuation, numbers and rare words into extra pieces; the
+    larger of the two counts tracks real tokenizers within about 15%.
+    """
+    if not text:
+        return 0
+    return max(math.ceil(len(text) / 4), len(_PIECE_RE.findall(text)))
+
+
+class TokenEstimator:
+    """
+    Count prompt tokens before an LLM call.
+    
+    The tokenizer path uses a tiktoken encoding when the optional
+    tiktoken package and its encoding files are available. tiktoken only
+    ships OpenAI encodings, not the Llama 3 tokenizer of the Groq model,
+    so its counts are still approximate (typically within a few percent
+    for English); they are just closer than the character heuristic.
+    Counts are cached per text, since the same search snippets are
+    re-sent on every writer and branch call. Without tiktoken the fast
+    heuristic is used.
+    """
+    
+    def __init__(self, encoding: Optional[str] = "cl100k_base", cache_size: int = 4096):
+        self.encoding_name = encoding
+        self._encoding = None
+        self._encoding_failed = not encoding
+        self._lock = threading.Lock()
+        self._count_exact = lru_cache(maxsize=cache_size)(self._encode_length)
+    
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from a tokenizer (closer, but not the model's own)."""
+        return self._get_encoding() is not None
+    
+    def count(self, text: str, exact: bool = True) -> int:
+        """
+        Count tokens in a text.
+        
+        Args:
+            text: Text to count
+            exact: Use the tokenizer if available (otherwise the heuristic);
+                either way the count approximates the model's tokenizer
+        
+        Returns:
+            Token count
+        """
+        if not text:
+            return 0
+        if exact and self._get_encoding() is not None:
+            return self._count_exact(text)
+        return approx_tokens(text)
+    
+    def count_many(self, texts: Iterable[str], exact: bool = True) -> List[int]:
+        """Count tokens for each text."""
+        return [self.count(text, exact) for text in texts]
+    
+    def count_messages(self, messages: List[Dict[str, str]], exact: bool = True) -> int:
+        """Count prompt tokens for a list of chat messages."""
+        return sum(self.count(m.get("content", ""), exact) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+    
+    def _encode_length(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
+    
+    def _get_encoding(self):
+        if self._encoding is not None or self._encoding_failed:
+            return self._encoding
+        with self._lock:
+            if self._encoding is None and not self._encoding_failed:
+                try:
+                    import tiktoken
+                    self._encoding = tiktoken.get_encoding(self.encoding_name)
+                except Exception as e:
+                    # Optional dependency, or encoding files unavailable offline
+                    logger.info("Tokenizer-based counting unavailable (%s). Using estimates.", e)
+                    self._encoding_failed = True
+        return self._encoding
+
+
+_estimator: Optional[TokenEstimator] = None
+
+
+def get_token_estimator() -> TokenEstimator:
+    """Return the process-wide estimator configured from settings."""
+    global _estimator
+    if _estimator is None:
+        from config.settings import settings
+        _estimator = TokenEstimator(settings.token_encoding or None)
+    return _estimator
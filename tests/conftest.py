@@ -0,0 +1,24 @@
+"""Shared fixtures: the repository root on sys.path and placeholder API keys."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Settings require keys to load; tests never call the real providers
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("TAVILY_API_KEY", "test")
+
+from config.settings import get_settings  # noqa: E402
+
+
+@pytest.fixture
+def override_settings(monkeypatch):
+    """Set settings for one test; the originals are restored afterwards."""
+    def override(**values):
+        for name, value in values.items():
+            monkeypatch.setattr(get_settings(), name, value)
+    return override
@@ -0,0 +1,106 @@
+"""Report planning: direct, trimmed, map-reduce or refused."""
+
+import pytest
+
+from src.agent.budget import DIRECT, MAP_REDUCE, REFUSE, TRIM, BudgetExceeded, plan_report
+from src.agent.nodes import WriterNode
+from src.utils.cost_tracker import CostTracker
+
+
+class WordEstimator:
+    """One token per word, so sizes in the tests are easy to follow."""
+    
+    exact = False
+    
+    def count(self, text, exact=True):
+        return len(text.split())
+    
+    def count_many(self, texts, exact=True):
+        return [self.count(text) for text in texts]
+    
+    def count_messages(self, messages, exact=True):
+        return sum(self.count(message["content"]) for message in messages)
+
+
+class Prompt:
+    def render(self, context, task):
+        return [{"role": "user", "content": f"Task: {task}\n{context}"}]
+
+
+def words(count):
+    return "w " * count
+
+
+@pytest.fixture(autouse=True)
+def small_budget(override_settings):
+    override_settings(
+        writer_max_prompt_tokens=1000,
+        writer_max_output_tokens=100,
+        writer_trim_min_fraction=0.6,
+        map_reduce_chunk_tokens=300,
+        map_reduce_summary_tokens=50,
+        max_report_cost_usd=1.0,
+    )
+
+
+def plan(snippets):
+    return plan_report("q", snippets, CostTracker(), Prompt(), Prompt(), WordEstimator())
+
+
+def test_context_that_fits_is_sent_whole():
+    snippets = [words(100)] * 3
+    result = plan(snippets)
+    
+    assert result.strategy == DIRECT
+    assert result.context == snippets
+    assert result.prompt_tokens == 2 + 300 + 2  # prompt, snippets, separators
+    assert result.llm_calls == 1
+
+
+def test_trailing_snippets_are_dropped_when_most_of_the_context_survives():
+    result = plan([words(400), words(401), words(402)])
+    
+    assert result.strategy == TRIM
+    assert result.context == [words(400), words(401)]
+    assert "Dropped 1 of 3" in result.reason
+
+
+def test_large_context_is_summarized_in_chunks():
+    result = plan([words(100)] * 4 + [words(200)] * 6)
+    
+    assert result.strategy == MAP_REDUCE
+    # 100-word snippets pair up to fit 298 tokens per chunk; 200-word ones do not
+    assert [len(chunk) for chunk in result.chunks] == [2, 2, 1, 1, 1, 1, 1, 1]
+    assert result.llm_calls == len(result.chunks) + 1
+    assert result.completion_tokens == len(result.chunks) * 50 + 100
+
+
+def test_oversized_snippets_are_truncated_to_a_chunk():
+    result = plan([words(2000)])
+    
+    assert result.strategy == MAP_REDUCE
+    assert result.chunks == [[words(2000)[:298 * 4]]]
+
+
+def test_too_many_summaries_are_refused():
+    result = plan([words(200)] * 30)
+    
+    assert result.strategy == REFUSE
+    assert "would still exceed 1000 prompt tokens" in result.reason
+
+
+def test_plans_over_the_cost_budget_are_refused(override_settings):
+    override_settings(max_report_cost_usd=0.0)
+    result = plan([words(10)])
+    
+    assert result.strategy == REFUSE
+    assert "report budget" in result.reason
+
+
+def test_writer_refuses_before_calling_the_llm(override_settings):
+    override_settings(max_report_cost_usd=0.0)
+    writer = WriterNode(CostTracker())
+    writer.llm = None  # Any LLM call would fail
+    
+    with pytest.raises(BudgetExceeded):
+        writer.generate("q", [words(10)])
@@ -0,0 +1,136 @@
+"""Circuit breaker states, the error-rate window and the half-open trial."""
+
+import pytest
+
+from src.tools.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from src.tools.providers import CacheMiss, SearchProvider
+from src.tools.search import SearchTool
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def breaker(clock, **options):
+    options = {"failure_threshold": 0.5, "window_seconds": 30, "min_calls": 4, "open_seconds": 10, **options}
+    return CircuitBreaker("test", clock=clock, **options)
+
+
+def fail(breaker, times):
+    for _ in range(times):
+        assert breaker.allow_request()
+        breaker.record_failure()
+
+
+def open_breaker(clock):
+    circuit = breaker(clock)
+    fail(circuit, 4)
+    return circuit
+
+
+def test_opens_once_the_error_rate_crosses_the_threshold():
+    circuit = breaker(Clock())
+    circuit.record_success()
+    circuit.record_success()
+    fail(circuit, 1)
+    assert circuit.state == CLOSED  # 1/3 failures, and fewer than min_calls
+    
+    fail(circuit, 1)
+    assert circuit.state == OPEN  # 2/4 failures
+    assert not circuit.allow_request()
+
+
+def test_outcomes_older_than_the_window_are_forgotten():
+    clock = Clock()
+    circuit = breaker(clock)
+    fail(circuit, 3)
+    clock.now = 31
+    circuit.record_success()
+    fail(circuit, 1)
+    assert circuit.state == CLOSED
+
+
+def test_half_open_lets_a_single_trial_through():
+    clock = Clock()
+    circuit = open_breaker(clock)
+    clock.now = 10
+    
+    assert circuit.state == HALF_OPEN
+    assert circuit.allow_request()
+    assert not circuit.allow_request()
+
+
+def test_trial_success_closes_and_failure_reopens():
+    clock = Clock()
+    circuit = open_breaker(clock)
+    clock.now = 10
+    assert circuit.allow_request()
+    circuit.record_success()
+    assert circuit.state == CLOSED
+    
+    fail(circuit, 4)
+    clock.now = 20
+    assert circuit.allow_request()
+    circuit.record_failure()
+    assert circuit.state == OPEN
+    assert not circuit.allow_request()
+
+
+def test_released_trial_lets_the_next_call_try():
+    clock = Clock()
+    circuit = open_breaker(clock)
+    clock.now = 10
+    assert circuit.allow_request()
+    
+    circuit.release_trial()
+    
+    assert circuit.state == HALF_OPEN
+    assert circuit.allow_request()
+
+
+def test_call_releases_the_trial_when_interrupted():
+    clock = Clock()
+    circuit = open_breaker(clock)
+    clock.now = 10
+    
+    def interrupted():
+        raise KeyboardInterrupt
+    
+    with pytest.raises(KeyboardInterrupt):
+        circuit.call(interrupted)
+    assert circuit.state == HALF_OPEN
+    assert circuit.call(lambda: "ok") == "ok"
+    assert circuit.state == CLOSED
+
+
+def test_call_rejects_while_open():
+    circuit = open_breaker(Clock())
+    with pytest.raises(CircuitOpenError):
+        circuit.call(lambda: "never")
+
+
+def test_search_cache_miss_releases_the_half_open_trial(monkeypatch, override_settings):
+    override_settings(enable_caching=False)
+    clock = Clock()
+    circuit = open_breaker(clock)
+    clock.now = 10
+    class Uncached(SearchProvider):
+        name = "uncached"
+        calls = 0
+        
+        def search(self, query, max_results, timeout=None, **options):
+            self.calls += 1
+            raise CacheMiss("not recorded")
+    
+    provider = Uncached()
+    monkeypatch.setattr("src.tools.search.get_breaker", lambda name: circuit)
+    
+    with pytest.raises(Exception, match="failed on all providers"):
+        SearchTool([provider])._search_chain("query", 3, 5.0, 5, {})
+    
+    assert provider.calls == 1
+    assert circuit.allow_request()
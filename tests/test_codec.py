@@ -0,0 +1,163 @@
+"""Frame codecs, shared dictionaries and the blob stores built on them."""
+
+import json
+import random
+
+import pytest
+
+from src.storage.blobs import FileBlobStore, MemoryBlobStore, content_digest
+from src.storage.codec import (
+    CODECS,
+    HEADER_SIZE,
+    TEXT_PREFIX,
+    FrameCodec,
+    RawCodec,
+    save_dictionary,
+    train_dictionary,
+)
+
+INSTALLED = [name for name, codec in CODECS.items() if codec.available()]
+COMPRESSING = [name for name in INSTALLED if name != "none"]
+
+REPORT = (
+    "## Solid-state batteries\n\n"
+    "Solid-state cells replace the liquid electrolyte with a solid one. "
+    "Reported energy densities reach 400 Wh/kg in laboratory cells.\n"
+) * 40
+
+SAMPLES = [
+    json.dumps({
+        "title": f"Result {i}",
+        "url": f"https://example.com/articles/{i}",
+        "content": f"Solid-state battery research update number {i}. Energy density and cycle life keep improving.",
+        "score": 0.5 + i / 100,
+    })
+    for i in range(40)
+]
+
+
+def codec_id(frame):
+    return frame[1]
+
+
+@pytest.mark.parametrize("codec", INSTALLED)
+def test_round_trip(codec):
+    frames = FrameCodec(codec)
+    frame = frames.encode(REPORT.encode())
+    
+    assert frames.decode(frame) == REPORT.encode()
+    assert frames.frame_size(frame) == len(REPORT.encode())
+    assert frames.decode_prefix(frame, 20) == REPORT.encode()[:20]
+
+
+@pytest.mark.parametrize("codec", COMPRESSING)
+def test_large_payloads_are_compressed(codec):
+    frame = FrameCodec(codec).encode(REPORT.encode())
+    assert codec_id(frame) == CODECS[codec].codec_id
+    assert len(frame) < len(REPORT) // 4
+
+
+def test_small_and_incompressible_payloads_are_stored_raw():
+    frames = FrameCodec("zlib", min_compress_bytes=128)
+    small = frames.encode(b"tiny")
+    noise = random.Random(0).randbytes(512)
+    
+    assert codec_id(small) == RawCodec.codec_id
+    assert codec_id(frames.encode(noise)) == RawCodec.codec_id
+    assert frames.decode(small) == b"tiny"
+    assert len(small) == HEADER_SIZE + 4
+
+
+def test_frames_from_any_codec_decode_with_any_other():
+    frame = FrameCodec("zlib").encode(REPORT.encode())
+    assert FrameCodec(INSTALLED[0]).decode(frame) == REPORT.encode()
+
+
+def test_malformed_frames_are_rejected():
+    with pytest.raises(ValueError, match="Not a storage frame"):
+        FrameCodec("zlib").decode(b"{}")
+
+
+@pytest.mark.parametrize("codec", COMPRESSING)
+def test_dictionary_frames_shrink_small_payloads(codec):
+    dictionary = train_dictionary(SAMPLES[:30], size=4096)
+    plain = FrameCodec(codec, min_compress_bytes=16)
+    primed = FrameCodec(codec, min_compress_bytes=16, dictionary=dictionary)
+    payload = SAMPLES[35].encode()
+    
+    frame = primed.encode(payload)
+    
+    assert primed.decode(frame) == payload
+    assert len(frame) < len(plain.encode(payload))
+
+
+@pytest.mark.parametrize("codec", COMPRESSING)
+def test_old_dictionary_frames_stay_readable_after_replacement(tmp_path, codec):
+    path = tmp_path / "storage.dict"
+    old = train_dictionary(SAMPLES[:20], size=4096)
+    save_dictionary(old, path)
+    frame = FrameCodec(codec, min_compress_bytes=16, dictionary=old, dictionary_path=path).encode(SAMPLES[30].encode())
+    
+    new = train_dictionary(SAMPLES[20:], size=4096)
+    save_dictionary(new, path)
+    current = FrameCodec(codec, min_compress_bytes=16, dictionary=path.read_bytes(), dictionary_path=path)
+    
+    assert current.decode(frame) == SAMPLES[30].encode()
+    with pytest.raises(ValueError, match="dictionary"):
+        FrameCodec(codec).decode(frame)
+
+
+def test_training_needs_enough_samples():
+    with pytest.raises(ValueError, match="at least 8 samples"):
+        train_dictionary(SAMPLES[:3])
+
+
+def test_text_frames_round_trip_and_read_plain_json():
+    frames = FrameCodec("zlib")
+    value = {"report": REPORT, "sources": ["https://example.com"]}
+    
+    packed = frames.pack_text(value)
+    
+    assert packed.startswith(TEXT_PREFIX)
+    assert frames.unpack_text(packed) == value
+    assert frames.pack_text({"a": 1}) == '{"a": 1}'
+    assert frames.unpack_text('{"a": 1}') == {"a": 1}
+
+
+@pytest.fixture(params=["memory", "file"])
+def store(request, tmp_path):
+    codec = FrameCodec("zlib")
+    return MemoryBlobStore(codec) if request.param == "memory" else FileBlobStore(tmp_path / "blobs", codec)
+
+
+def test_blob_round_trip_and_prefix(store):
+    digest = store.put_text(REPORT)
+    
+    assert digest == content_digest(REPORT.encode())
+    assert store.get_text(digest) == REPORT
+    assert store.read_prefix(digest, 12) == REPORT.encode()[:12]
+    with pytest.raises(KeyError):
+        store.get("0" * 64)
+
+
+def test_identical_blobs_are_stored_once(store):
+    store.put_text(REPORT)
+    store.put_text(REPORT)
+    stats = store.stats()
+    
+    assert stats["blobs"] == 1
+    assert stats["dedup_hits"] == 1
+    assert stats["logical_bytes"] == len(REPORT.encode())
+    assert stats["stored_bytes"] < stats["logical_bytes"]
+
+
+def test_memory_blobs_are_freed_with_their_last_reference():
+    store = MemoryBlobStore(FrameCodec("zlib"))
+    digest = store.put_text(REPORT)
+    store.put_text(REPORT)
+    
+    store.release(digest)
+    assert store.get_text(digest) == REPORT
+    store.release(digest)
+    with pytest.raises(KeyError):
+        store.get(digest)
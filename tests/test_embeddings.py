@@ -0,0 +1,105 @@
+"""Quantized embedding storage: row layouts, round-trip error and the caches."""
+
+import numpy as np
+import pytest
+
+from src.tools.embeddings import (
+    DTYPES,
+    FileEmbeddingCache,
+    HashingEmbedder,
+    MemoryEmbeddingCache,
+    dequantize,
+    quantize,
+    row_dtype,
+    text_digest,
+)
+
+DIMENSIONS = 64
+TEXTS = [
+    "Solid-state batteries replace the liquid electrolyte.",
+    "Coral reefs bleach in warm water.",
+    "Energy density of lithium cells keeps improving.",
+]
+
+
+def vectors():
+    return HashingEmbedder(dimensions=DIMENSIONS).embed(TEXTS)
+
+
+def digests(texts=TEXTS):
+    return [text_digest(text) for text in texts]
+
+
+@pytest.mark.parametrize("dtype, itemsize", [("float32", 4 * DIMENSIONS), ("float16", 2 * DIMENSIONS), ("int8", 4 + DIMENSIONS)])
+def test_row_sizes(dtype, itemsize):
+    assert row_dtype(DIMENSIONS, dtype).itemsize == itemsize
+
+
+def test_unknown_dtype_is_rejected():
+    with pytest.raises(ValueError, match="Unknown embedding dtype"):
+        row_dtype(DIMENSIONS, "int4")
+
+
+@pytest.mark.parametrize("dtype, tolerance", [("float32", 0.0), ("float16", 1e-3), ("int8", 1e-2)])
+def test_round_trip_stays_close(dtype, tolerance):
+    original = vectors()
+    restored = dequantize(quantize(original, dtype))
+    
+    assert restored.dtype == np.float32
+    assert np.abs(restored - original).max() <= tolerance
+    # Similarities, which is what the vectors are used for, barely move
+    assert np.abs(restored @ restored.T - original @ original.T).max() < max(tolerance * 5, 1e-6)
+
+
+def test_int8_scales_each_row_to_its_own_range():
+    original = np.array([[0.5, -0.25, 0.0], [0.001, 0.002, -0.004], [0.0, 0.0, 0.0]], dtype=np.float32)
+    rows = quantize(original, "int8")
+    
+    assert np.abs(rows["vector"]).max(axis=1).tolist() == [127, 127, 0]
+    assert rows["scale"][2] == 1.0
+    assert np.allclose(dequantize(rows), original, atol=original.max() / 127)
+
+
+@pytest.fixture(params=["memory", "file"])
+def cache_factory(request, tmp_path):
+    def build(dtype):
+        if request.param == "memory":
+            return MemoryEmbeddingCache(DIMENSIONS, dtype)
+        return FileEmbeddingCache(tmp_path / dtype, DIMENSIONS, dtype)
+    return build
+
+
+@pytest.mark.parametrize("dtype", DTYPES)
+def test_cached_vectors_equal_their_quantized_form(cache_factory, dtype):
+    cache = cache_factory(dtype)
+    cache.add(digests(), vectors())
+    
+    found, missing = cache.lookup(digests(TEXTS[::-1]) + [text_digest("never embedded")])
+    
+    assert missing == [3]
+    assert np.array_equal(found[:3], dequantize(quantize(vectors(), dtype))[::-1])
+    assert not found[3].any()
+    assert cache.stats() == {"vectors": 3, "dtype": dtype, "bytes": 3 * row_dtype(DIMENSIONS, dtype).itemsize}
+
+
+def test_memory_cache_drops_least_recently_used():
+    cache = MemoryEmbeddingCache(DIMENSIONS, max_entries=2)
+    cache.add(digests()[:2], vectors()[:2])
+    cache.lookup(digests()[:1])
+    cache.add(digests()[2:], vectors()[2:])
+    
+    _, missing = cache.lookup(digests())
+    assert missing == [1]
+
+
+def test_file_cache_is_shared_across_instances(tmp_path):
+    writer = FileEmbeddingCache(tmp_path, DIMENSIONS, "int8")
+    reader = FileEmbeddingCache(tmp_path, DIMENSIONS, "int8")
+    writer.add(digests(), vectors())
+    writer.add(digests()[:1], vectors()[:1])
+    
+    found, missing = reader.lookup(digests())
+    
+    assert missing == []
+    assert np.array_equal(found, dequantize(quantize(vectors(), "int8")))
+    assert len(FileEmbeddingCache(tmp_path, DIMENSIONS, "int8")) == 3
@@ -0,0 +1,169 @@
+"""Job queue leases and retries, for the in-memory and Redis backends."""
+
+import pytest
+
+from src.cluster.fake_redis import FakeRedis
+from src.cluster.jobs import DONE, FAILED, QUEUED, RUNNING, InMemoryJobQueue, RedisJobQueue
+from src.monitor import FakeClock
+
+LEASE = 30.0
+RETRY_DELAY = 5.0
+
+
+@pytest.fixture
+def clock():
+    return FakeClock(start=1_000_000.0)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def queue(request, clock):
+    if request.param == "memory":
+        return InMemoryJobQueue(max_attempts=2, retry_delay_seconds=RETRY_DELAY, clock=clock)
+    return RedisJobQueue(FakeRedis(clock), max_attempts=2, retry_delay_seconds=RETRY_DELAY, clock=clock)
+
+
+def test_jobs_are_claimed_oldest_first_by_one_worker_each(queue):
+    first = queue.enqueue({"query": "a"})
+    second = queue.enqueue({"query": "b"})
+    
+    claimed = queue.claim("w1", LEASE)
+    assert claimed.id == first
+    assert claimed.status == RUNNING and claimed.worker == "w1" and claimed.attempts == 1
+    assert queue.claim("w2", LEASE).id == second
+    assert queue.claim("w3", LEASE) is None
+
+
+def test_completed_jobs_keep_their_result_and_leave_the_queue(queue):
+    job_id = queue.enqueue({"query": "a"})
+    queue.claim("w1", LEASE)
+    
+    assert queue.complete(job_id, "w1", {"report": "done"})
+    job = queue.get(job_id)
+    assert job.status == DONE and job.result == {"report": "done"}
+    assert queue.pending() == 0
+    assert queue.claim("w2", LEASE) is None
+
+
+def test_expired_lease_is_reclaimed_and_the_old_worker_locked_out(queue, clock):
+    job_id = queue.enqueue({"query": "a"})
+    queue.claim("w1", LEASE)
+    
+    clock.advance(LEASE + 1)
+    reclaimed = queue.claim("w2", LEASE)
+    assert reclaimed.id == job_id and reclaimed.attempts == 2
+    
+    assert not queue.heartbeat(job_id, "w1", LEASE)
+    assert not queue.complete(job_id, "w1", {"report": "stale"})
+    assert queue.complete(job_id, "w2", {"report": "fresh"})
+    assert queue.get(job_id).result == {"report": "fresh"}
+
+
+def test_heartbeat_extends_the_lease(queue, clock):
+    job_id = queue.enqueue({"query": "a"})
+    queue.claim("w1", LEASE)
+    
+    clock.advance(LEASE - 1)
+    assert queue.heartbeat(job_id, "w1", LEASE)
+    clock.advance(LEASE - 1)
+    assert queue.claim("w2", LEASE) is None
+    assert queue.complete(job_id, "w1", {"report": "done"})
+
+
+def test_failed_job_is_retried_after_the_delay(queue, clock):
+    job_id = queue.enqueue({"query": "a"})
+    queue.claim("w1", LEASE)
+    
+    assert queue.fail(job_id, "w1", "provider down")
+    job = queue.get(job_id)
+    assert job.status == QUEUED and job.error == "provider down"
+    assert queue.claim("w2", LEASE) is None
+    
+    clock.advance(RETRY_DELAY + 1)
+    retry = queue.claim("w2", LEASE)
+    assert retry.id == job_id and retry.attempts == 2
+
+
+def test_job_fails_for_good_after_max_attempts(queue, clock):
+    job_id = queue.enqueue({"query": "a"})
+    for worker in ("w1", "w2"):
+        queue.claim(worker, LEASE)
+        assert queue.fail(job_id, worker, f"error from {worker}")
+        clock.advance(RETRY_DELAY + 1)
+    
+    job = queue.get(job_id)
+    assert job.status == FAILED and job.error == "error from w2"
+    assert queue.pending() == 0
+    assert queue.claim("w3", LEASE) is None
+
+
+def test_job_is_abandoned_after_max_expired_leases(queue, clock):
+    job_id = queue.enqueue({"query": "a"})
+    for worker in ("w1", "w2"):
+        assert queue.claim(worker, LEASE).id == job_id
+        clock.advance(LEASE + 1)
+    
+    assert queue.claim("w3", LEASE) is None
+    job = queue.get(job_id)
+    assert job.status == FAILED
+    assert queue.pending() == 0
+
+
+class InterleavingRedis(FakeRedis):
+    """Runs a callback once, right after a worker reads a lease and before it writes."""
+    
+    def __init__(self, clock):
+        super().__init__(clock)
+        self.after_lease_read = None
+    
+    def get(self, key):
+        value = super().get(key)
+        if self.after_lease_read and ":lease:" in key:
+            callback, self.after_lease_read = self.after_lease_read, None
+            callback()
+        return value
+
+
+@pytest.fixture
+def racing_queue(clock):
+    client = InterleavingRedis(clock)
+    queue = RedisJobQueue(client, max_attempts=3, retry_delay_seconds=RETRY_DELAY, clock=clock)
+    
+    def reclaim_after_check(job_id):
+        def reclaim():
+            clock.advance(LEASE + 1)
+            assert queue.claim("w2", LEASE).id == job_id
+        client.after_lease_read = reclaim
+    return queue, reclaim_after_check
+
+
+def test_complete_is_rejected_if_the_lease_is_reclaimed_mid_call(racing_queue):
+    queue, reclaim_after_check = racing_queue
+    job_id = queue.enqueue({"query": "a"})
+    queue.claim("w1", LEASE)
+    
+    reclaim_after_check(job_id)
+    assert not queue.complete(job_id, "w1", {"report": "stale"})
+    assert queue.get(job_id).status == RUNNING
+    assert queue.complete(job_id, "w2", {"report": "fresh"})
+    assert queue.get(job_id).result == {"report": "fresh"}
+
+
+def test_fail_cannot_overwrite_the_new_holders_lease(racing_queue):
+    queue, reclaim_after_check = racing_queue
+    job_id = queue.enqueue({"query": "a"})
+    queue.claim("w1", LEASE)
+    
+    reclaim_after_check(job_id)
+    assert not queue.fail(job_id, "w1", "stale error")
+    assert queue.heartbeat(job_id, "w2", LEASE)
+    assert queue.get(job_id).error is None
+
+
+def test_heartbeat_is_rejected_if_the_lease_is_reclaimed_mid_call(racing_queue):
+    queue, reclaim_after_check = racing_queue
+    job_id = queue.enqueue({"query": "a"})
+    queue.claim("w1", LEASE)
+    
+    reclaim_after_check(job_id)
+    assert not queue.heartbeat(job_id, "w1", LEASE)
+    assert queue.complete(job_id, "w2", {"report": "fresh"})
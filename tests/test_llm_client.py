@@ -0,0 +1,94 @@
+"""Cancelling a streamed completion while the stream is stalled."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.tools.llm import GenerationCancelled, LLMClient
+
+
+class StalledStream:
+    """Yields one chunk, then blocks like a socket read until closed."""
+    
+    def __init__(self):
+        self.closed = threading.Event()
+    
+    def __iter__(self):
+        delta = SimpleNamespace(content="partial ")
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+        # A real read would block for the client's whole socket timeout
+        if not self.closed.wait(30):
+            raise AssertionError("stream was never closed")
+        raise ConnectionError("stream closed")
+    
+    def close(self):
+        self.closed.set()
+
+
+def fake_client(stream):
+    create = lambda **kwargs: stream  # noqa: E731
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def stream_in_thread(stream, timeout=None, cancel_event=None):
+    client = LLMClient.__new__(LLMClient)
+    client.model = "test"
+    first_chunk = threading.Event()
+    outcome = {}
+    
+    def run():
+        try:
+            client._stream(
+                fake_client(stream),
+                [{"role": "user", "content": "question"}],
+                100,
+                timeout,
+                cancel_event,
+                on_text=lambda text: first_chunk.set(),
+            )
+        except GenerationCancelled as exc:
+            outcome["error"] = exc
+    
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert first_chunk.wait(5)
+    return thread, outcome
+
+
+def test_cancel_closes_a_stalled_stream():
+    stream = StalledStream()
+    cancel_event = threading.Event()
+    thread, outcome = stream_in_thread(stream, cancel_event=cancel_event)
+    
+    started = time.monotonic()
+    cancel_event.set()
+    thread.join(5)
+    
+    assert not thread.is_alive()
+    assert time.monotonic() - started < 1
+    assert stream.closed.is_set()
+    assert str(outcome["error"]) == "Generation cancelled"
+    assert outcome["error"].completion_tokens > 0
+
+
+def test_timeout_closes_a_stalled_stream():
+    stream = StalledStream()
+    thread, outcome = stream_in_thread(stream, timeout=0.2)
+    thread.join(5)
+    
+    assert not thread.is_alive()
+    assert "budget" in str(outcome["error"])
+
+
+def test_errors_without_cancel_are_not_reported_as_cancelled():
+    class BrokenStream(StalledStream):
+        def __iter__(self):
+            raise ConnectionError("reset by peer")
+            yield  # pragma: no cover
+    
+    client = LLMClient.__new__(LLMClient)
+    client.model = "test"
+    with pytest.raises(ConnectionError):
+        client._stream(fake_client(BrokenStream()), [{"role": "user", "content": "q"}], 100, 10.0, threading.Event())
@@ -0,0 +1,31 @@
+"""Correlation fields attached to log records."""
+
+import logging
+
+import pytest
+
+from src.utils.logger import ContextFilter, log_context
+
+
+def make_record():
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "message", None, None)
+    ContextFilter().filter(record)
+    return record
+
+
+def test_context_fields_are_copied_onto_records():
+    with log_context(run_id="run-1", tenant="acme"), log_context(job_id="job-7", node="search"):
+        record = make_record()
+    assert (record.run_id, record.node, record.job_id, record.tenant) == ("run-1", "search", "job-7", "acme")
+
+
+def test_fields_are_reset_after_the_block():
+    with log_context(job_id="job-7"):
+        pass
+    assert make_record().job_id is None
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(TypeError, match="request_id"):
+        with log_context(request_id="r1"):
+            pass
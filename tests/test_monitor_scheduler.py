@@ -0,0 +1,199 @@
+"""Monitor scheduler driven by a FakeClock and a stub runner."""
+
+import threading
+import time
+
+import pytest
+
+from src.agent.runner import ResearchResult
+from src.monitor import FakeClock, MonitorScheduler, MonitorStore
+from src.monitor import scheduler as scheduler_module
+from src.storage import HistoryStore
+
+HOUR = 3600.0
+
+
+class StubRunner:
+    """Returns a fixed report per query and records every call."""
+    
+    def __init__(self, reports=None, cost=0.0, delay=0.0):
+        self.reports = reports or {}
+        self.cost = cost
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+    
+    def __call__(self, query: str) -> ResearchResult:
+        with self._lock:
+            self.calls.append(query)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        report = self.reports.get(query, f"# {query}")
+        if isinstance(report, Exception):
+            return ResearchResult(query=query, report="", error=str(report))
+        return ResearchResult(query=query, report=report, cost={"total_cost_usd": self.cost})
+
+
+@pytest.fixture
+def clock():
+    return FakeClock(start=1_000_000.0)
+
+
+@pytest.fixture
+def store():
+    return MonitorStore(":memory:")
+
+
+@pytest.fixture
+def make_scheduler(store, clock, override_settings):
+    override_settings(monitor_jitter_fraction=0.0, monitor_coalesce_window_seconds=300.0)
+    
+    def make(runner, notifier=None):
+        return MonitorScheduler(store, HistoryStore(":memory:"), runner=runner, clock=clock, notifier=notifier)
+    return make
+
+
+def test_identical_queries_are_coalesced_into_one_run(make_scheduler, store, clock):
+    runner = StubRunner()
+    scheduler = make_scheduler(runner)
+    scheduler.add_job("alice", "Bitcoin price", HOUR)
+    scheduler.add_job("bob", "  bitcoin   PRICE ", HOUR)
+    scheduler.add_job("carol", "NVIDIA earnings", HOUR)
+    
+    assert scheduler.tick() == 2
+    assert sorted(runner.calls) == ["Bitcoin price", "NVIDIA earnings"]
+    assert all(job.last_run_at == clock.now() for job in store.list_jobs())
+
+
+def test_jobs_due_within_the_window_join_a_due_run(make_scheduler, store, clock):
+    runner = StubRunner()
+    scheduler = make_scheduler(runner)
+    scheduler.add_job("alice", "Bitcoin price", HOUR)
+    clock.advance(120)
+    scheduler.add_job("bob", "Bitcoin price", HOUR)
+    
+    assert scheduler.tick() == 1
+    assert runner.calls == ["Bitcoin price"]
+    bob = store.list_jobs("bob")[0]
+    assert bob.last_run_at == clock.now()
+    assert bob.next_run_at == clock.now() + HOUR
+
+
+def test_groups_wait_until_a_member_is_due(make_scheduler, clock):
+    runner = StubRunner()
+    scheduler = make_scheduler(runner)
+    job = scheduler.add_job("alice", "Bitcoin price", HOUR)
+    job.next_run_at = clock.now() + 60
+    scheduler.store.update_job(job)
+    
+    assert scheduler.tick() == 0
+    clock.advance(60)
+    assert scheduler.tick() == 1
+
+
+def test_cost_is_split_between_coalesced_jobs(make_scheduler, store):
+    scheduler = make_scheduler(StubRunner(cost=0.3))
+    for user in ("alice", "bob", "carol"):
+        scheduler.add_job(user, "Bitcoin price", HOUR)
+    scheduler.add_job("dave", "NVIDIA earnings", HOUR)
+    
+    scheduler.tick()
+    costs = {job.user: job.cost_usd for job in store.list_jobs()}
+    assert costs["alice"] == costs["bob"] == costs["carol"] == pytest.approx(0.1)
+    assert costs["dave"] == pytest.approx(0.3)
+
+
+def test_distinct_queries_run_concurrently(make_scheduler, override_settings):
+    override_settings(max_concurrent_runs=4)
+    runner = StubRunner(delay=0.1)
+    scheduler = make_scheduler(runner)
+    for i in range(4):
+        scheduler.add_job(f"user{i}", f"query {i}", HOUR)
+    
+    assert scheduler.tick() == 4
+    assert runner.peak > 1
+
+
+def test_due_jobs_are_read_past_one_page(make_scheduler, store, monkeypatch):
+    monkeypatch.setattr(scheduler_module, "_PAGE_SIZE", 3)
+    runner = StubRunner()
+    scheduler = make_scheduler(runner)
+    for i in range(8):
+        scheduler.add_job(f"user{i}", f"query {i}", HOUR)
+    
+    assert scheduler.tick() == 8
+    assert sorted(runner.calls) == sorted(f"query {i}" for i in range(8))
+
+
+def test_phase_is_stable_per_query_and_within_the_jitter(make_scheduler, clock, override_settings):
+    scheduler = make_scheduler(StubRunner())
+    override_settings(monitor_jitter_fraction=0.25)
+    
+    first = scheduler.add_job("alice", "Bitcoin price", HOUR)
+    same = scheduler.add_job("bob", "BITCOIN  price", HOUR)
+    other = scheduler.add_job("carol", "NVIDIA earnings", HOUR)
+    
+    offset = first.next_run_at - clock.now()
+    assert 0 <= offset < 0.25 * HOUR
+    assert same.next_run_at == first.next_run_at
+    assert other.next_run_at != first.next_run_at
+    assert 0 <= other.next_run_at - clock.now() < 0.25 * HOUR
+
+
+def test_missed_slots_are_skipped_not_replayed(make_scheduler, store, clock):
+    runner = StubRunner()
+    scheduler = make_scheduler(runner)
+    job = scheduler.add_job("alice", "Bitcoin price", HOUR)
+    first_slot = job.next_run_at
+    
+    # Down for five and a half intervals
+    clock.advance(5.5 * HOUR)
+    assert scheduler.tick() == 1
+    assert scheduler.tick() == 0
+    
+    job = store.list_jobs()[0]
+    assert runner.calls == ["Bitcoin price"]
+    assert job.next_run_at == first_slot + 6 * HOUR
+    assert job.next_run_at > clock.now()
+
+
+def test_owners_are_notified_only_when_the_report_changes(make_scheduler, store, clock):
+    runner = StubRunner({"Bitcoin price": "v1"})
+    notified = []
+    scheduler = make_scheduler(runner, notifier=lambda job, notification: notified.append((job.user, notification)))
+    scheduler.add_job("alice", "Bitcoin price", HOUR)
+    scheduler.add_job("bob", "bitcoin price", HOUR)
+    
+    scheduler.tick()
+    clock.advance(HOUR)
+    scheduler.tick()
+    assert notified == []
+    
+    runner.reports["Bitcoin price"] = "v2"
+    clock.advance(HOUR)
+    scheduler.tick()
+    
+    assert sorted(user for user, _ in notified) == ["alice", "bob"]
+    stored = store.notifications("alice")
+    assert len(stored) == 1
+    assert stored[0].history_id == notified[0][1].history_id
+    assert scheduler.history_store.get(stored[0].history_id).report == "v2"
+
+
+def test_failed_runs_reschedule_without_notifying(make_scheduler, store, clock):
+    runner = StubRunner({"Bitcoin price": RuntimeError("provider down")})
+    notified = []
+    scheduler = make_scheduler(runner, notifier=lambda job, notification: notified.append(job))
+    job = scheduler.add_job("alice", "Bitcoin price", HOUR)
+    
+    assert scheduler.tick() == 1
+    job = store.list_jobs()[0]
+    assert job.last_run_at is None
+    assert job.next_run_at == clock.now() + HOUR
+    assert notified == []
+    assert scheduler.history_store.count() == 0
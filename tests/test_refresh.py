@@ -0,0 +1,49 @@
+"""Refresh search window computed from the previous run's timestamp."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.agent.nodes import RefreshSearchNode
+
+
+class StubSearchNode:
+    """Records the search window and returns one fresh result."""
+    
+    def __init__(self):
+        self.days = None
+    
+    def fetch(self, query, timeout=None, exclude_urls=None, topic=None, days=None):
+        self.days = days
+        return [{"content": "news", "url": "https://example.com/new"}]
+
+
+def refresh_state(since):
+    return {
+        "task": "Bitcoin price",
+        "search_results": [],
+        "sources": [],
+        "attempts": 0,
+        "error": None,
+        "final_report": None,
+        "previous_report": "# Bitcoin",
+        "known_sources": [],
+        "since": since,
+    }
+
+
+@pytest.mark.parametrize("since, days", [
+    (None, 1),
+    ((datetime.now() - timedelta(days=3, hours=1)).isoformat(), 4),
+    ((datetime.now(timezone.utc) - timedelta(days=2, hours=1)).isoformat(), 3),
+    ((datetime.now(timezone(timedelta(hours=-7))) - timedelta(hours=1)).isoformat(), 1),
+    ("last tuesday", 1),
+    ("2026-13-45T99:00:00", 1),
+])
+def test_search_window_covers_the_time_since_the_previous_run(since, days):
+    search = StubSearchNode()
+    update = RefreshSearchNode(search)(refresh_state(since))
+    
+    assert update["error"] is None
+    assert search.days == days
+    assert update["sources"] == ["https://example.com/new"]
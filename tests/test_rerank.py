@@ -0,0 +1,72 @@
+"""Ordering behaviour of the local reranker."""
+
+import pytest
+
+from src.tools.rerank import Reranker, query_coverage, rank_texts
+
+QUERY = "solid state battery energy density"
+
+
+def result(title, content):
+    return {"title": title, "content": content, "url": f"https://example.com/{title.lower().replace(' ', '-')}"}
+
+
+RELEVANT = result("Solid-state batteries", "Solid state battery cells reach an energy density of 400 Wh/kg.")
+PARTIAL = result("Battery basics", "A battery stores energy in chemical form.")
+UNRELATED = result("Coral reefs", "Warm water makes corals expel the algae living in their tissue.")
+
+
+def titles(results):
+    return [res["title"] for res in results]
+
+
+def test_results_matching_more_query_terms_rank_first():
+    ranked = Reranker().rerank(QUERY, [UNRELATED, PARTIAL, RELEVANT], top_k=3)
+    assert titles(ranked) == ["Solid-state batteries", "Battery basics", "Coral reefs"]
+
+
+def test_only_top_k_results_are_kept():
+    ranked = Reranker().rerank(QUERY, [UNRELATED, PARTIAL, RELEVANT], top_k=1)
+    assert titles(ranked) == ["Solid-state batteries"]
+
+
+@pytest.mark.parametrize("lexical_weight", [0.0, 1.0])
+def test_each_score_alone_prefers_the_relevant_result(lexical_weight):
+    ranked = Reranker(lexical_weight=lexical_weight).rerank(QUERY, [UNRELATED, RELEVANT], top_k=2)
+    assert titles(ranked)[0] == "Solid-state batteries"
+
+
+def test_ngram_similarity_matches_inflections_bm25_misses():
+    inflected = result("Densities", "Batteries with solid electrolytes and higher densities.")
+    reranker = Reranker(lexical_weight=0.0)
+    scores = reranker.scores("battery density", [UNRELATED["content"], inflected["content"]])
+    assert scores[1] > scores[0]
+    assert Reranker(lexical_weight=1.0).scores("battery density", [inflected["content"]])[0] == 0.0
+
+
+def test_ties_keep_the_provider_order():
+    copies = [dict(RELEVANT, url=f"https://example.com/copy-{i}") for i in range(3)]
+    ranked = Reranker().rerank(QUERY, copies + [UNRELATED], top_k=4)
+    assert [res["url"] for res in ranked[:3]] == [res["url"] for res in copies]
+
+
+def test_small_inputs_are_returned_unchanged():
+    assert Reranker().rerank(QUERY, [], top_k=3) == []
+    assert Reranker().rerank(QUERY, [UNRELATED], top_k=3) == [UNRELATED]
+
+
+def test_rank_texts_returns_indices_best_first():
+    texts = [UNRELATED["content"], RELEVANT["content"], PARTIAL["content"]]
+    assert rank_texts(texts, QUERY, 2, {}) == [1, 2]
+
+
+def test_precomputed_similarity_replaces_the_ngram_score():
+    texts = [RELEVANT["content"], UNRELATED["content"]]
+    order = rank_texts(texts, QUERY, 2, {"lexical_weight": 0.0}, semantic=[0.1, 0.9])
+    assert order == [1, 0]
+
+
+def test_query_coverage_is_the_mean_share_of_query_terms():
+    assert query_coverage("solid state battery", ["solid state battery", "solid"]) == pytest.approx(2 / 3)
+    assert query_coverage("solid state battery", []) == 0.0
+    assert query_coverage("a an", ["a an"]) == 0.0
@@ -0,0 +1,112 @@
+"""FairScheduler: priority order, stride sharing, the interactive reserve and quotas."""
+
+import threading
+import time
+
+import pytest
+
+from src.utils.scheduling import BATCH, INTERACTIVE, FairScheduler, QuotaExceeded, SchedulerTimeout
+
+
+def queued(scheduler):
+    return sum(cls["queued"] for cls in scheduler.snapshot()["classes"].values())
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def grant_order(scheduler, requests):
+    """
+    Queue requests behind a held slot, one at a time, then release it.
+    
+    Each request records its tenant when granted and releases at once, so
+    the returned list is the order the scheduler granted them in.
+    """
+    order = []
+    scheduler.acquire("holder", INTERACTIVE)
+    threads = []
+    for tenant, priority in requests:
+        def run(tenant=tenant, priority=priority):
+            scheduler.acquire(tenant, priority)
+            order.append(tenant)
+            scheduler.release(tenant)
+        
+        before = queued(scheduler)
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        threads.append(thread)
+        wait_until(lambda: queued(scheduler) == before + 1)
+    
+    scheduler.release("holder")
+    for thread in threads:
+        thread.join(5)
+    return order
+
+
+def test_higher_priority_is_served_first():
+    scheduler = FairScheduler("test", capacity=1)
+    order = grant_order(scheduler, [("batch", BATCH), ("monitor", "monitor"), ("interactive", INTERACTIVE)])
+    assert order == ["interactive", "batch", "monitor"]
+
+
+def test_tenants_take_turns_within_a_class():
+    scheduler = FairScheduler("test", capacity=1)
+    order = grant_order(scheduler, [("noisy", BATCH)] * 4 + [("quiet", BATCH)] * 2)
+    assert order[:4] == ["noisy", "quiet", "noisy", "quiet"]
+
+
+def test_weights_set_each_tenants_share():
+    scheduler = FairScheduler("test", capacity=1, weights={"heavy": 2.0})
+    order = grant_order(scheduler, [("heavy", BATCH)] * 6 + [("light", BATCH)] * 6)
+    assert order[:6].count("heavy") == 4
+    assert order[:6].count("light") == 2
+    assert len(order) == 12
+
+
+def test_reserve_keeps_slots_for_interactive_work():
+    scheduler = FairScheduler("test", capacity=2, reserve=1)
+    scheduler.acquire("a", BATCH)
+    
+    with pytest.raises(SchedulerTimeout):
+        scheduler.acquire("b", BATCH, timeout=0.05)
+    assert scheduler.acquire("c", INTERACTIVE, timeout=0.05) < 0.05
+    assert scheduler.snapshot()["running"] == 2
+
+
+def test_reserve_never_takes_the_whole_capacity():
+    scheduler = FairScheduler("test", capacity=1, reserve=5)
+    assert scheduler.reserve == 0
+    scheduler.acquire("a", BATCH, timeout=0.05)
+
+
+def test_tenant_running_quota_lets_other_tenants_pass():
+    scheduler = FairScheduler("test", capacity=3, tenant_max_running=1)
+    scheduler.acquire("a", INTERACTIVE)
+    
+    with pytest.raises(SchedulerTimeout):
+        scheduler.acquire("a", INTERACTIVE, timeout=0.05)
+    scheduler.acquire("b", INTERACTIVE, timeout=0.05)
+
+
+def test_waiting_quota_counts_queued_and_following_callers():
+    scheduler = FairScheduler("test", capacity=1, tenant_max_queued=2)
+    scheduler.acquire("holder", INTERACTIVE)
+    waiter = threading.Thread(target=lambda: scheduler.acquire("a", INTERACTIVE, timeout=5), daemon=True)
+    waiter.start()
+    wait_until(lambda: queued(scheduler) == 1)
+    
+    with scheduler.follow("a"):
+        with pytest.raises(QuotaExceeded):
+            scheduler.acquire("a", INTERACTIVE, timeout=0.05)
+        with pytest.raises(QuotaExceeded):
+            with scheduler.follow("a"):
+                pass
+    
+    scheduler.release("holder")
+    waiter.join(5)
+    with scheduler.follow("a"), scheduler.follow("a"):
+        pass
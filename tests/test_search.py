@@ -0,0 +1,62 @@
+"""Provider fallback in SearchTool: retries, errors and empty results."""
+
+import itertools
+
+import pytest
+
+from src.tools.providers import SearchProvider
+from src.tools.search import SearchTool
+
+_names = itertools.count()
+
+
+class StubProvider(SearchProvider):
+    """Returns canned results (or raises) and counts its calls."""
+    
+    def __init__(self, results=None, error=None):
+        # A fresh name per provider keeps circuit breakers independent between tests
+        self.name = f"stub-{next(_names)}"
+        self.results = results or []
+        self.error = error
+        self.calls = 0
+    
+    def search(self, query, max_results, timeout=None, **options):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return self.results
+
+
+@pytest.fixture(autouse=True)
+def no_caching(override_settings):
+    override_settings(enable_caching=False)
+
+
+def search(providers, max_retries=1):
+    return SearchTool(providers)._search_chain("solid state batteries", max_retries, 5.0, 5, {})
+
+
+def test_empty_results_fall_through_to_the_next_provider():
+    hits = [{"url": "https://example.com", "content": "found"}]
+    empty, full = StubProvider(), StubProvider(results=hits)
+    
+    assert search([empty, full]) == hits
+    assert empty.calls == 1 and full.calls == 1
+
+
+def test_empty_results_everywhere_are_not_an_error():
+    failing = StubProvider(error=RuntimeError("down"))
+    assert search([failing, StubProvider()]) == []
+
+
+def test_errors_everywhere_raise():
+    with pytest.raises(Exception, match="failed on all providers"):
+        search([StubProvider(error=RuntimeError("down")), StubProvider(error=RuntimeError("down"))])
+
+
+def test_zero_retries_skips_the_provider_without_crashing():
+    provider = StubProvider(results=[{"url": "https://example.com", "content": "found"}])
+    
+    with pytest.raises(Exception, match="failed after 0 attempts"):
+        search([provider], max_retries=0)
+    assert provider.calls == 0
@@ -0,0 +1,73 @@
+"""Splitting reports into sections and patching them section by section."""
+
+from src.utils.sections import merge_sections, split_sections
+
+REPORT = """Intro line.
+
+# Report
+
+## Summary
+Old summary.
+
+## Findings
+Old findings.
+
+### Cost
+Old cost detail.
+
+### Safety
+Old safety detail.
+
+## Sources
+- https://example.com/a
+"""
+
+
+def headings(markdown):
+    return [heading for heading, _ in split_sections(markdown)]
+
+
+def test_split_keeps_every_line():
+    sections = split_sections(REPORT)
+    
+    assert sections[0] == ("", "Intro line.\n\n")
+    assert headings(REPORT) == ["", "Report", "Summary", "Findings", "Cost", "Safety", "Sources"]
+    assert "".join(body for _, body in sections) == REPORT
+
+
+def test_patched_section_replaces_the_old_one_in_place():
+    merged = merge_sections(REPORT, "## summary \nNew summary.\n")
+    
+    assert "New summary." in merged
+    assert "Old summary." not in merged
+    # Headings match ignoring case and spacing; the patch's wording wins
+    assert headings(merged) == ["", "Report", "summary", "Findings", "Cost", "Safety", "Sources"]
+
+
+def test_replacing_a_section_replaces_its_subsections():
+    merged = merge_sections(REPORT, "## Findings\nNew findings.\n\n### Cost\nNew cost detail.\n")
+    
+    assert "Old safety detail." not in merged
+    assert "Old cost detail." not in merged
+    assert headings(merged) == ["", "Report", "Summary", "Findings", "Cost", "Sources"]
+    assert merged.index("New cost detail.") < merged.index("## Sources")
+
+
+def test_patching_a_subsection_keeps_its_siblings():
+    merged = merge_sections(REPORT, "### Cost\nNew cost detail.\n")
+    
+    assert "New cost detail." in merged
+    assert "Old safety detail." in merged
+    assert "Old findings." in merged
+    assert headings(merged) == headings(REPORT)
+
+
+def test_new_sections_are_appended():
+    merged = merge_sections(REPORT, "## Outlook\nWhat comes next.")
+    
+    assert headings(merged)[-2:] == ["Sources", "Outlook"]
+    assert merged.endswith("- https://example.com/a\n\n## Outlook\nWhat comes next.\n")
+
+
+def test_text_outside_sections_in_a_patch_is_ignored():
+    assert merge_sections(REPORT, "Some chatter before the sections.\n") == REPORT
@@ -0,0 +1,140 @@
+"""Single-flight sharing of identical concurrent calls and research runs."""
+
+import threading
+import time
+
+import pytest
+
+import src.agent.graph as graph
+from src.agent.runner import run_research
+from src.utils.events import WriterTokens, emit, listen, subscribe
+from src.utils.singleflight import SingleFlight
+
+
+def run_threads(count, target):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    calls = []
+    release = threading.Event()
+    results = {}
+    
+    def work():
+        calls.append(1)
+        release.wait(2)
+        return "result"
+    
+    def caller(i):
+        results[i] = flights.do("key", work, timeout=2)
+    
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline and not (calls and flights._flights["key"].followers == 3):
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+    
+    assert len(calls) == 1
+    assert sorted(results.values()) == [("result", False)] + [("result", True)] * 3
+    assert flights.in_flight() == 0
+
+
+def test_leader_errors_reach_every_follower():
+    flights = SingleFlight()
+    errors = []
+    
+    def work():
+        time.sleep(0.1)
+        raise ValueError("boom")
+    
+    def caller(i):
+        try:
+            flights.do("key", work, timeout=2)
+        except ValueError as e:
+            errors.append(str(e))
+    
+    run_threads(3, caller)
+    assert errors == ["boom"] * 3
+    assert flights.in_flight() == 0
+
+
+def test_key_is_free_once_the_call_finishes():
+    flights = SingleFlight()
+    assert flights.do("key", lambda: 1) == (1, False)
+    assert flights.do("key", lambda: 2) == (2, False)
+
+
+def test_stream_replays_earlier_chunks_then_follows_the_leader():
+    flights = SingleFlight()
+    flight, leader = flights.join("key")
+    assert leader
+    flight.publish("a")
+    
+    follower, is_leader = flights.join("key")
+    assert follower is flight and not is_leader
+    received = []
+    reader = threading.Thread(target=lambda: received.extend(follower.stream(timeout=2)))
+    reader.start()
+    flight.publish("b")
+    flights.finish("key", flight, result="done")
+    reader.join()
+    
+    assert received == ["a", "b"]
+    assert follower.wait(0) == "done"
+
+
+def test_stream_times_out_if_the_leader_never_finishes():
+    flight, _ = SingleFlight().join("key")
+    with pytest.raises(TimeoutError):
+        list(flight.stream(timeout=0.05))
+
+
+class StreamingAgent:
+    """Graph stand-in that streams report text as writer events."""
+    
+    def __init__(self):
+        self.invocations = 0
+    
+    def invoke(self, state, config):
+        self.invocations += 1
+        for text in ("Re", "po", "rt"):
+            emit(WriterTokens(text=text))
+            time.sleep(0.05)
+        return {"final_report": "Report", "sources": ["https://example.com"], "error": None}
+
+
+def test_followers_receive_the_leaders_progress(monkeypatch):
+    agent = StreamingAgent()
+    monkeypatch.setattr(graph, "get_agent", lambda mode=None: agent)
+    subscribed = []
+    unsubscribe = subscribe(subscribed.append)
+    outcomes = {}
+    
+    def caller(i):
+        time.sleep(0.03 * i)
+        events = []
+        with listen(events.append):
+            result = run_research("Same  question", mode="iterative", priority="interactive")
+        text = "".join(event.text for event in events if isinstance(event, WriterTokens))
+        outcomes[i] = (result.shared, result.report, text)
+    
+    try:
+        run_threads(3, caller)
+    finally:
+        unsubscribe()
+    
+    assert agent.invocations == 1
+    assert sorted(shared for shared, _, _ in outcomes.values()) == [False, True, True]
+    assert all(report == "Report" and text == "Report" for _, report, text in outcomes.values())
+    # Replayed events are not delivered to process-wide subscribers again
+    assert sum(isinstance(event, WriterTokens) for event in subscribed) == 3
+
@@ -0,0 +1,76 @@
+"""Speculative draft events: tagged while undecided, then kept or discarded."""
+
+from src.agent.nodes import SpeculativeWriterNode, WriterNode
+from src.tools.llm import LLMResponse
+from src.ui.progress import RunProgress
+from src.utils.cost_tracker import CostTracker
+from src.utils.events import DraftDecided, WriterStarted, WriterTokens, listen
+
+SEEN = ["Solid state batteries use a solid electrolyte instead of a liquid one."]
+
+
+class StreamingLLM:
+    """Streams each completion in two pieces, numbering the calls."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def complete(self, messages, max_tokens, timeout=None, cancel_event=None, on_text=None):
+        self.calls += 1
+        content = f"report {self.calls}"
+        if on_text is not None:
+            on_text("report ")
+            on_text(str(self.calls))
+        return LLMResponse(content=content, prompt_tokens=10, completion_tokens=2)
+
+
+class StubSearch:
+    def __init__(self, results):
+        self.results = results
+    
+    def __call__(self, state, config=None):
+        return {"search_results": self.results, "sources": [], "attempts": state["attempts"] + 1, "error": None}
+
+
+def run_speculation(new_results):
+    writer = WriterNode(CostTracker())
+    writer.llm = StreamingLLM()
+    writer._print_report = lambda report: None
+    node = SpeculativeWriterNode(StubSearch(new_results), writer)
+    events = []
+    with listen(events.append):
+        update = node({"task": "solid state batteries", "search_results": SEEN, "attempts": 1})
+    return update, [event for event in events if isinstance(event, (WriterStarted, WriterTokens, DraftDecided))]
+
+
+def test_kept_draft_is_tagged_then_accepted():
+    update, events = run_speculation(SEEN)
+    
+    assert update["final_report"] == "report 1"
+    assert [type(event) for event in events] == [WriterStarted, WriterTokens, WriterTokens, DraftDecided]
+    assert all(event.speculative for event in events[:-1])
+    assert events[-1].accepted
+
+
+def test_discarded_draft_is_followed_by_an_untagged_rewrite():
+    update, events = run_speculation(["Coral reefs bleach when warm water drives out their algae."])
+    
+    assert update["final_report"] == "report 2"
+    decided = next(i for i, event in enumerate(events) if isinstance(event, DraftDecided))
+    assert not events[decided].accepted
+    assert all(event.speculative for event in events[:decided])
+    assert events[decided + 1:] and not any(event.speculative for event in events[decided + 1:])
+
+
+def test_progress_clears_a_discarded_draft():
+    progress = RunProgress()
+    progress.update(WriterStarted(strategy="stuff", prompt_tokens=100, max_output_tokens=100, speculative=True))
+    progress.update(WriterTokens(text="stale draft", speculative=True))
+    assert progress.draft == "stale draft" and progress.draft_speculative
+    
+    fraction, status = progress.update(DraftDecided(accepted=False, novelty=0.8))
+    
+    assert progress.draft == ""
+    assert not progress.draft_speculative
+    assert fraction > 0.6
+    assert "Discarding the draft" in status